@@ -97,9 +97,12 @@ for i, cenario in enumerate(cenarios, 1):
     print("-" * 70)
     
     try:
-        # Executar pipeline
+        # Executar pipeline (cenário registrado no store results/run_store)
         resultado = subprocess.run(
-            cenario["comando"],
+            cenario["comando"] + [
+                "--scenario", cenario["nome"],
+                "--scenario-description", cenario["descricao"]
+            ],
             capture_output=True,
             text=True,
             check=True,
@@ -114,7 +117,7 @@ for i, cenario in enumerate(cenarios, 1):
         arquivos_copiados = []
         if Path("results").exists():
             for arquivo in Path("results").glob("*"):
-                if arquivo.is_file() and arquivo.suffix in ['.csv', '.parquet', '.png']:
+                if arquivo.is_file() and arquivo.suffix in ['.csv', '.parquet', '.png', '.jsonl']:
                     shutil.copy2(arquivo, destino / arquivo.name)
                     arquivos_copiados.append(arquivo.name)
         
@@ -244,6 +247,7 @@ with open(resumo_path, 'w', encoding='utf-8') as f:
             f.write(f"│   ├── execucao_output.txt (output completo)\n")
             f.write(f"│   ├── forecast_results.csv\n")
             f.write(f"│   ├── forecast_results.parquet\n")
+            f.write(f"│   ├── metrics.jsonl (métricas estruturadas)\n")
             f.write(f"│   ├── forecast_comparison.png\n")
             f.write(f"│   ├── surplus_deficit.png\n")
             f.write(f"│   ├── cumulative_profit.png\n")
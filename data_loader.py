@@ -2,19 +2,17 @@
 
 from pathlib import Path
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+
+from src.data.synthetic import simulate_climate, simulate_consumption, simulate_production
 
 BASE_DIR = Path(__file__).resolve().parents[2]  # aponta para a pasta do projeto (dois níveis acima de src/utils)
 
 def _generate_simulated(dias=100, seed=42, start_date="2024-01-01"):
-    np.random.seed(seed)
-    start = datetime.fromisoformat(start_date)
-    dates = [start + timedelta(days=i) for i in range(dias)]
-    consumo = 80 + 20 * np.sin(np.linspace(0, 6.28, dias)) + np.random.normal(0, 5, size=dias)
-    producao = 70 + 25 * np.cos(np.linspace(0, 6.28, dias)) + np.random.normal(0, 7, size=dias)
-    df_consumo = pd.DataFrame({"date": [d.strftime("%Y-%m-%d") for d in dates], "consumption": consumo.round(2)})
-    df_producao = pd.DataFrame({"date": [d.strftime("%Y-%m-%d") for d in dates], "production": producao.round(2)})
+    dates = pd.date_range(start=start_date, periods=dias, freq="D")
+    clima = simulate_climate(dates, seed=seed)
+    date_str = dates.strftime("%Y-%m-%d")
+    df_consumo = pd.DataFrame({"date": date_str, "consumption": simulate_consumption(dates, seed=seed).round(2)})
+    df_producao = pd.DataFrame({"date": date_str, "production": simulate_production(clima, seed=seed).round(2)})
     return df_consumo, df_producao
 
 def _read_if_exists(path: Path):
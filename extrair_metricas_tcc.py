@@ -1,91 +1,159 @@
 #!/usr/bin/env python3
 """Extrai métricas comparativas de todos os cenários coletados."""
+import json
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from src.data.store import RunStore
+
 tcc_results = Path("results/tcc_coleta_completa")
+run_store_dir = Path("results/run_store")
 metricas_todos = []
 cenarios_sem_dados = []
 
-print("=" * 70)
-print("EXTRAINDO MÉTRICAS DE TODOS OS CENÁRIOS")
-print("=" * 70)
+# Métricas do resumo financeiro (store) -> colunas do relatório
+COLUNAS_RESUMO = {
+    "total.total_periods": "total_periodos",
+    "total.net_profit_total_brl": "lucro_liquido_total_brl",
+    "total.sell_revenue_total_brl": "receita_total_vendas_brl",
+    "total.buy_cost_total_brl": "custo_total_compras_brl",
+    "total.fixed_cost_total_brl": "custo_fixo_total_brl",
+    "total.surplus_total_kwh": "excedente_total_kwh",
+    "total.deficit_total_kwh": "deficit_total_kwh",
+    "total.net_profit_mean_brl": "lucro_medio_por_periodo_brl",
+    "total.consumption_mean_kwh": "consumo_medio_kwh",
+    "total.production_mean_kwh": "producao_media_kwh",
+    "total.consumption_total_kwh": "consumo_total_kwh",
+    "total.production_total_kwh": "producao_total_kwh",
+    "total.decisions_vender": "decisoes_vender",
+    "total.decisions_comprar": "decisoes_comprar",
+    "total.decisions_neutro": "decisoes_neutro",
+    "total.decisions_vender_pct": "percentual_vender",
+    "total.decisions_comprar_pct": "percentual_comprar",
+    "total.decisions_neutro_pct": "percentual_neutro"
+}
+
+COLUNAS_INTEIRAS = ["total_periodos", "decisoes_vender", "decisoes_comprar", "decisoes_neutro"]
+
+def completar_metricas(metricas):
+    """Adiciona ROI e lucro por kWh excedente às métricas de um cenário."""
+    # Calcular ROI se houver custos
+    if metricas["custo_total_compras_brl"] > 0:
+        metricas["roi_percentual"] = float(
+            (metricas["lucro_liquido_total_brl"] / metricas["custo_total_compras_brl"]) * 100
+        )
+    else:
+        metricas["roi_percentual"] = None
+    
+    # Lucro por kWh excedente
+    if metricas["excedente_total_kwh"] > 0:
+        metricas["lucro_por_kwh_excedente_brl"] = float(
+            metricas["lucro_liquido_total_brl"] / metricas["excedente_total_kwh"]
+        )
+    else:
+        metricas["lucro_por_kwh_excedente_brl"] = None
+    
+    return metricas
+
+def extrair_do_store(store):
+    """Extrai métricas da execução mais recente de cada cenário (consulta única)."""
+    runs = store.runs(latest_per_scenario=True)
+    if len(runs) == 0:
+        return []
+    
+    resumo = store.compare(group="financial").merge(
+        runs[["run_id", "description", "params"]], on="run_id", how="left"
+    )
+    
+    metricas_store = []
+    for _, row in resumo.sort_values("scenario").iterrows():
+        metricas = {
+            "cenario": row["scenario"],
+            "descricao": row["description"] or row["scenario"],
+            "parametros": " | ".join(
+                f"{k}={v}" for k, v in json.loads(row["params"]).items() if v is not None
+            )
+        }
+        for coluna_store, coluna in COLUNAS_RESUMO.items():
+            valor = row.get(coluna_store, 0.0)
+            metricas[coluna] = int(valor) if coluna in COLUNAS_INTEIRAS else float(valor)
+        metricas_store.append(completar_metricas(metricas))
+        print(f"[OK] {row['scenario']}: {metricas['total_periodos']} períodos (run_id={row['run_id']})")
+    
+    return metricas_store
 
-# Para cada cenário
-for cenario_dir in sorted(tcc_results.iterdir()):
-    if not cenario_dir.is_dir() or cenario_dir.name.startswith('.') or cenario_dir.name.startswith('__'):
-        continue
+def extrair_de_csvs():
+    """Extrai métricas varrendo forecast_results.csv de cada pasta de cenário (coletas antigas)."""
+    # Para cada cenário
+    for cenario_dir in sorted(tcc_results.iterdir()):
+        if not cenario_dir.is_dir() or cenario_dir.name.startswith('.') or cenario_dir.name.startswith('__'):
+            continue
     
-    csv_path = cenario_dir / "forecast_results.csv"
-    if csv_path.exists():
-        try:
-            df = pd.read_csv(csv_path)
+        csv_path = cenario_dir / "forecast_results.csv"
+        if csv_path.exists():
+            try:
+                df = pd.read_csv(csv_path)
             
-            if len(df) > 0:
-                # Ler README para pegar descrição
-                descricao = cenario_dir.name
-                parametros = ""
-                readme_path = cenario_dir / "README.txt"
-                if readme_path.exists():
-                    with open(readme_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if "Descrição:" in content:
-                            descricao = content.split("Descrição:")[1].split("\n")[0].strip()
-                        if "Parâmetros:" in content:
-                            parametros = content.split("Parâmetros:")[1].split("\n")[0].strip()
-                
-                metricas = {
-                    "cenario": cenario_dir.name,
-                    "descricao": descricao,
-                    "parametros": parametros,
-                    "total_periodos": len(df),
-                    "lucro_liquido_total_brl": float(df['net_profit_brl'].sum()),
-                    "receita_total_vendas_brl": float(df['sell_revenue_brl'].sum()),
-                    "custo_total_compras_brl": float(df['buy_cost_brl'].sum()),
-                    "custo_fixo_total_brl": float(df.get('fixed_cost_brl', pd.Series([0])).sum()),
-                    "excedente_total_kwh": float(df['surplus_kwh'].sum()),
-                    "deficit_total_kwh": float(df['deficit_kwh'].sum()),
-                    "lucro_medio_por_periodo_brl": float(df['net_profit_brl'].mean()),
-                    "consumo_medio_kwh": float(df['consumption_kwh'].mean()),
-                    "producao_media_kwh": float(df['production_kwh'].mean()),
-                    "consumo_total_kwh": float(df['consumption_kwh'].sum()),
-                    "producao_total_kwh": float(df['production_kwh'].sum()),
-                    "decisoes_vender": int((df['decision'] == 'Vender').sum()),
-                    "decisoes_comprar": int((df['decision'] == 'Comprar').sum()),
-                    "decisoes_neutro": int((df['decision'] == 'Neutro').sum()),
-                    "percentual_vender": float((df['decision'] == 'Vender').sum() / len(df) * 100),
-                    "percentual_comprar": float((df['decision'] == 'Comprar').sum() / len(df) * 100),
-                    "percentual_neutro": float((df['decision'] == 'Neutro').sum() / len(df) * 100)
-                }
+                if len(df) > 0:
+                    # Ler README para pegar descrição
+                    descricao = cenario_dir.name
+                    parametros = ""
+                    readme_path = cenario_dir / "README.txt"
+                    if readme_path.exists():
+                        with open(readme_path, 'r', encoding='utf-8') as f:
+                            content = f.read()
+                            if "Descrição:" in content:
+                                descricao = content.split("Descrição:")[1].split("\n")[0].strip()
+                            if "Parâmetros:" in content:
+                                parametros = content.split("Parâmetros:")[1].split("\n")[0].strip()
                 
-                # Calcular ROI se houver custos
-                if metricas["custo_total_compras_brl"] > 0:
-                    metricas["roi_percentual"] = float(
-                        (metricas["lucro_liquido_total_brl"] / metricas["custo_total_compras_brl"]) * 100
-                    )
-                else:
-                    metricas["roi_percentual"] = None
+                    metricas = {
+                        "cenario": cenario_dir.name,
+                        "descricao": descricao,
+                        "parametros": parametros,
+                        "total_periodos": len(df),
+                        "lucro_liquido_total_brl": float(df['net_profit_brl'].sum()),
+                        "receita_total_vendas_brl": float(df['sell_revenue_brl'].sum()),
+                        "custo_total_compras_brl": float(df['buy_cost_brl'].sum()),
+                        "custo_fixo_total_brl": float(df.get('fixed_cost_brl', pd.Series([0])).sum()),
+                        "excedente_total_kwh": float(df['surplus_kwh'].sum()),
+                        "deficit_total_kwh": float(df['deficit_kwh'].sum()),
+                        "lucro_medio_por_periodo_brl": float(df['net_profit_brl'].mean()),
+                        "consumo_medio_kwh": float(df['consumption_kwh'].mean()),
+                        "producao_media_kwh": float(df['production_kwh'].mean()),
+                        "consumo_total_kwh": float(df['consumption_kwh'].sum()),
+                        "producao_total_kwh": float(df['production_kwh'].sum()),
+                        "decisoes_vender": int((df['decision'] == 'Vender').sum()),
+                        "decisoes_comprar": int((df['decision'] == 'Comprar').sum()),
+                        "decisoes_neutro": int((df['decision'] == 'Neutro').sum()),
+                        "percentual_vender": float((df['decision'] == 'Vender').sum() / len(df) * 100),
+                        "percentual_comprar": float((df['decision'] == 'Comprar').sum() / len(df) * 100),
+                        "percentual_neutro": float((df['decision'] == 'Neutro').sum() / len(df) * 100)
+                    }
                 
-                # Lucro por kWh excedente
-                if metricas["excedente_total_kwh"] > 0:
-                    metricas["lucro_por_kwh_excedente_brl"] = float(
-                        metricas["lucro_liquido_total_brl"] / metricas["excedente_total_kwh"]
-                    )
+                    metricas_todos.append(completar_metricas(metricas))
+                    print(f"[OK] {cenario_dir.name}: {len(df)} períodos")
                 else:
-                    metricas["lucro_por_kwh_excedente_brl"] = None
-                
-                metricas_todos.append(metricas)
-                print(f"[OK] {cenario_dir.name}: {len(df)} períodos")
-            else:
-                cenarios_sem_dados.append(cenario_dir.name)
-                print(f"[AVISO] {cenario_dir.name}: CSV vazio")
-        except Exception as e:
-            cenarios_sem_dados.append(f"{cenario_dir.name} (erro: {str(e)[:30]})")
-            print(f"[ERRO] {cenario_dir.name}: {e}")
-    else:
-        cenarios_sem_dados.append(cenario_dir.name)
-        print(f"[AVISO] {cenario_dir.name}: CSV não encontrado")
+                    cenarios_sem_dados.append(cenario_dir.name)
+                    print(f"[AVISO] {cenario_dir.name}: CSV vazio")
+            except Exception as e:
+                cenarios_sem_dados.append(f"{cenario_dir.name} (erro: {str(e)[:30]})")
+                print(f"[ERRO] {cenario_dir.name}: {e}")
+        else:
+            cenarios_sem_dados.append(cenario_dir.name)
+            print(f"[AVISO] {cenario_dir.name}: CSV não encontrado")
+
+print("=" * 70)
+print("EXTRAINDO MÉTRICAS DE TODOS OS CENÁRIOS")
+print("=" * 70)
+
+# Preferir o store colunar; varrer pastas apenas para coletas antigas
+if (run_store_dir / "runs").exists():
+    metricas_todos = extrair_do_store(RunStore(run_store_dir))
+else:
+    print(f"[AVISO] Store de execuções não encontrado em {run_store_dir}. Varrendo {tcc_results}...")
+    extrair_de_csvs()
 
 # Criar DataFrame comparativo
 if metricas_todos:
@@ -4,22 +4,26 @@
 Gera dados simulados de consumo e produção e salva em CSV.
 Uso:
     python generate_simulated_data.py --out raw --days 120
+
+    # Carga de teste: 5 anos horários x 50 sites direto em Parquet (em blocos)
+    python generate_simulated_data.py --parquet carga.parquet --start 2020-01-01 \
+        --days 1827 --freq h --sites 50
 """
 
 import argparse
 from pathlib import Path
-import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+
+from src.data.synthetic import (
+    simulate_climate, simulate_consumption, simulate_production, write_parquet
+)
 
 def generate_simulated(dias=100, seed=42, start_date="2024-01-01"):
-    np.random.seed(seed)
-    start = datetime.fromisoformat(start_date)
-    dates = [start + timedelta(days=i) for i in range(dias)]
-    consumo = 80 + 20 * np.sin(np.linspace(0, 6.28, dias)) + np.random.normal(0, 5, size=dias)
-    producao = 70 + 25 * np.cos(np.linspace(0, 6.28, dias)) + np.random.normal(0, 7, size=dias)
-    df_consumo = pd.DataFrame({"date": [d.strftime("%Y-%m-%d") for d in dates], "consumption": consumo.round(2)})
-    df_producao = pd.DataFrame({"date": [d.strftime("%Y-%m-%d") for d in dates], "production": producao.round(2)})
+    dates = pd.date_range(start=start_date, periods=dias, freq="D")
+    clima = simulate_climate(dates, seed=seed)
+    date_str = dates.strftime("%Y-%m-%d")
+    df_consumo = pd.DataFrame({"date": date_str, "consumption": simulate_consumption(dates, seed=seed).round(2)})
+    df_producao = pd.DataFrame({"date": date_str, "production": simulate_production(clima, seed=seed).round(2)})
     return df_consumo, df_producao
 
 def main():
@@ -29,8 +33,30 @@ def main():
     parser.add_argument("--days", type=int, default=100)
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--start", type=str, default="2024-01-01")
+    parser.add_argument("--parquet", type=str, default=None,
+                        help="Gravar histórico combinado multi-site neste arquivo Parquet")
+    parser.add_argument("--freq", type=str, default="D",
+                        help="Frequência pandas para --parquet (ex: D, h, 15min)")
+    parser.add_argument("--sites", type=int, default=1,
+                        help="Número de sites para --parquet")
+    parser.add_argument("--chunk-sites", type=int, default=10,
+                        help="Sites por bloco gravado (limita a memória)")
     args = parser.parse_args()
 
+    if args.parquet:
+        end = pd.Timestamp(args.start) + pd.Timedelta(days=args.days) - pd.tseries.frequencies.to_offset(args.freq)
+        rows = write_parquet(
+            Path(args.parquet),
+            start=args.start,
+            end=str(end),
+            freq=args.freq,
+            n_sites=args.sites,
+            seed=args.seed,
+            chunk_sites=args.chunk_sites
+        )
+        print(f"Arquivo gerado: {args.parquet} ({rows} linhas)")
+        return
+
     df_c, df_p = generate_simulated(dias=args.days, seed=args.seed, start_date=args.start)
 
     base = Path(__file__).resolve().parents[2] / "src" / "data"
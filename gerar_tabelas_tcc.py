@@ -2,7 +2,9 @@
 """Gera tabelas formatadas para o TCC em LaTeX e Markdown."""
 import pandas as pd
 from pathlib import Path
-import re
+
+from src.data.store import RunStore
+from src.utils.emitter import load_metrics
 
 tcc_results = Path("results/tcc_coleta_completa")
 
@@ -22,101 +24,67 @@ nome_cenarios = {
     '09_treino_longo': 'Treino Longo'
 }
 
-def extrair_metricas_validacao(cenario_dir):
-    """Extrai métricas de validação do arquivo execucao_output.txt"""
-    output_path = cenario_dir / "execucao_output.txt"
-    if not output_path.exists():
-        return None
-    
-    with open(output_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    metricas = {}
-    
-    # Buscar métricas de consumo
-    consumo_match = re.search(r'Consumo - MAE: ([\d.]+) kWh, RMSE: ([\d.]+) kWh', content)
-    if consumo_match:
-        metricas['consumo_mae'] = float(consumo_match.group(1))
-        metricas['consumo_rmse'] = float(consumo_match.group(2))
-    
-    consumo_mape = re.search(r'Consumo - MAPE: ([\d.]+)%, R²: ([\d.-]+)', content)
-    if consumo_mape:
-        metricas['consumo_mape'] = float(consumo_mape.group(1))
-        metricas['consumo_r2'] = float(consumo_mape.group(2))
+# Nomes das séries/estatísticas emitidas pelo pipeline -> chaves das tabelas
+SERIES_PT = {'consumption': 'consumo', 'production': 'producao'}
+CHAVES_VALIDACAO = [f"{serie}_{metrica}" for serie in SERIES_PT.values()
+                    for metrica in ('mae', 'rmse', 'mape', 'r2')]
+ESTATISTICAS = {'count': 'count', 'mean': 'mean', 'std': 'std', 'min': 'min',
+                '25%': 'q25', '50%': 'q50', '75%': 'q75', 'max': 'max'}
+
+def carregar_metricas_estruturadas():
+    """Carrega em lote as métricas de validação e estatísticas descritivas de todos os cenários."""
+    grupos = ['validation', 'descriptive']
+    run_store_dir = Path("results/run_store")
+    if (run_store_dir / "runs").exists():
+        store = RunStore(run_store_dir)
+        latest = store.runs(latest_per_scenario=True)['run_id']
+        return store.read("metrics", filters={'group': grupos, 'run_id': list(latest)})
     
-    # Buscar métricas de produção
-    prod_match = re.search(r'Producao - MAE: ([\d.]+) kWh, RMSE: ([\d.]+) kWh', content)
-    if prod_match:
-        metricas['producao_mae'] = float(prod_match.group(1))
-        metricas['producao_rmse'] = float(prod_match.group(2))
+    # Sem store: metrics.jsonl copiado para cada pasta de cenário
+    metricas = load_metrics(sorted(tcc_results.glob("*/metrics.jsonl")))
+    return metricas[metricas['group'].isin(grupos)]
+
+def extrair_metricas_validacao(metricas_df):
+    """Monta {cenario: {consumo_mae, ..., producao_r2}} a partir das métricas de validação."""
+    val = metricas_df[metricas_df['group'] == 'validation']
+    if len(val) == 0:
+        return {}
     
-    prod_mape = re.search(r'Producao - MAPE: ([\d.]+)%, R²: ([\d.-]+)', content)
-    if prod_mape:
-        metricas['producao_mape'] = float(prod_mape.group(1))
-        metricas['producao_r2'] = float(prod_mape.group(2))
+    val = val.assign(chave=val['series'].map(SERIES_PT) + '_' + val['name'].str.lower())
+    tabela = val.pivot_table(index='scenario', columns='chave', values='value', aggfunc='last')
     
-    return metricas if metricas else None
+    validacoes = {}
+    for cenario, row in tabela.iterrows():
+        metricas = row.dropna().to_dict()
+        if all(chave in metricas for chave in CHAVES_VALIDACAO):
+            validacoes[cenario] = metricas
+    return validacoes
 
-def extrair_estatisticas_descritivas(cenario_dir):
-    """Extrai estatísticas descritivas do output"""
-    output_path = cenario_dir / "execucao_output.txt"
-    if not output_path.exists():
+def extrair_estatisticas_descritivas(metricas_df, cenario):
+    """Monta {estatistica: (consumo, producao)} a partir das estatísticas descritivas de um cenário."""
+    desc = metricas_df[(metricas_df['group'] == 'descriptive') & (metricas_df['scenario'] == cenario)]
+    if len(desc) == 0:
         return None
     
-    with open(output_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    stats = {}
-    in_stats = False
-    
-    for i, line in enumerate(lines):
-        if 'Estatisticas dos dados historicos:' in line:
-            in_stats = True
-            continue
-        
-        if in_stats and 'count' in line.lower():
-            # Processar linhas de estatísticas
-            for j in range(i, min(i+8, len(lines))):
-                stat_line = lines[j].strip()
-                if stat_line and not stat_line.startswith('='):
-                    parts = stat_line.split()
-                    if len(parts) >= 3:
-                        stat_name = parts[0]
-                        consumo_val = parts[1]
-                        producao_val = parts[2]
-                        
-                        if stat_name == 'count':
-                            stats['count'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == 'mean':
-                            stats['mean'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == 'std':
-                            stats['std'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == 'min':
-                            stats['min'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == '25%':
-                            stats['q25'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == '50%':
-                            stats['q50'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == '75%':
-                            stats['q75'] = (float(consumo_val), float(producao_val))
-                        elif stat_name == 'max':
-                            stats['max'] = (float(consumo_val), float(producao_val))
-                            break
-            break
+    tabela = desc.pivot_table(index='name', columns='series', values='value', aggfunc='last')
+    if not {'consumption_kwh', 'production_kwh'} <= set(tabela.columns):
+        return None
     
-    return stats if stats else None
+    return {
+        chave: (float(tabela.loc[nome, 'consumption_kwh']), float(tabela.loc[nome, 'production_kwh']))
+        for nome, chave in ESTATISTICAS.items() if nome in tabela.index
+    }
 
 # Coletar métricas de validação de todos os cenários
-validacoes = {}
-for cenario in nome_cenarios.keys():
-    cenario_dir = tcc_results / cenario
-    if cenario_dir.exists():
-        metricas = extrair_metricas_validacao(cenario_dir)
-        if metricas:
-            validacoes[cenario] = metricas
+metricas_estruturadas = carregar_metricas_estruturadas()
+validacoes = {
+    cenario: metricas
+    for cenario, metricas in extrair_metricas_validacao(metricas_estruturadas).items()
+    if cenario in nome_cenarios
+}
 
 # Coletar estatísticas descritivas do baseline
-estatisticas_descritivas = extrair_estatisticas_descritivas(tcc_results / "01_baseline")
+estatisticas_descritivas = extrair_estatisticas_descritivas(metricas_estruturadas, "01_baseline")
 
 # Criar diretório de saída
 output_dir = tcc_results / "tabelas_tcc"
@@ -153,7 +121,7 @@ df_t1 = pd.DataFrame(rows)
 latex_t1 = df_t1.to_latex(index=False, escape=False, float_format='%.3f')
 with open(output_dir / "tabela1_metricas_qualidade.tex", 'w', encoding='utf-8') as f:
     f.write("% Tabela 1: Métricas de Qualidade dos Modelos\n")
-    f.write("% Fonte: Arquivos execucao_output.txt de cada cenário\n\n")
+    f.write("% Fonte: Métricas estruturadas (group=validation) de cada cenário\n\n")
     f.write(latex_t1)
 
 # Markdown (sem tabulate)
@@ -173,7 +141,7 @@ def df_to_markdown(df):
 md_t1 = df_to_markdown(df_t1)
 with open(output_dir / "tabela1_metricas_qualidade.md", 'w', encoding='utf-8') as f:
     f.write("# Tabela 1: Métricas de Qualidade dos Modelos\n\n")
-    f.write("*Fonte: Arquivos execucao_output.txt de cada cenário*\n\n")
+    f.write("*Fonte: Métricas estruturadas (group=validation) de cada cenário*\n\n")
     f.write(md_t1)
 
 print(f"[OK] Tabela 1 salva: {output_dir / 'tabela1_metricas_qualidade.tex'}")
@@ -209,14 +177,14 @@ if estatisticas_descritivas:
     latex_t2 = df_t2.to_latex(index=False, escape=False)
     with open(output_dir / "tabela2_estatisticas_descritivas.tex", 'w', encoding='utf-8') as f:
         f.write("% Tabela 2: Estatísticas Descritivas dos Dados Históricos\n")
-        f.write("% Fonte: Cenário Baseline - execucao_output.txt\n\n")
+        f.write("% Fonte: Cenário Baseline - métricas estruturadas (group=descriptive)\n\n")
         f.write(latex_t2)
     
     # Markdown
     md_t2 = df_to_markdown(df_t2)
     with open(output_dir / "tabela2_estatisticas_descritivas.md", 'w', encoding='utf-8') as f:
         f.write("# Tabela 2: Estatísticas Descritivas dos Dados Históricos\n\n")
-        f.write("*Fonte: Cenário Baseline - execucao_output.txt*\n\n")
+        f.write("*Fonte: Cenário Baseline - métricas estruturadas (group=descriptive)*\n\n")
         f.write(md_t2)
     
     print(f"[OK] Tabela 2 salva: {output_dir / 'tabela2_estatisticas_descritivas.tex'}")
@@ -8,79 +8,29 @@ import sys
 import os
 from pathlib import Path
 from datetime import datetime, timedelta
-import yaml
 import pandas as pd
 import numpy as np
 
 # Adicionar src ao path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.data.loader import load_data_with_fallback
+from src.data.dtypes import apply_dtypes
+from src.data.timezones import local_range
+from src.data.loader import load_data_with_fallback, load_partitioned, prepare_data
+from src.data.partitioned import PartitionedDataset
+from src.data.validation import validate_frame
 from src.models.consumption import ConsumptionForecaster
 from src.models.production import ProductionForecaster
-from src.finance.profit import ProfitCalculator
+from src.models.drift import DriftMonitor, check_registered, model_spec, training_profile
+from src.finance.profit import ProfitCalculator, summarize_results
 from src.rules.engine import DecisionEngine
-from src.viz.plots import plot_forecast_comparison, plot_surplus_deficit, plot_cumulative_profit, plot_pld_timeseries
-from src.config.schemas import FinanceParams
-
-def load_config(config_path: Path = None) -> dict:
-    """Carrega configuração do arquivo YAML."""
-    if config_path is None:
-        config_path = Path(__file__).parent / "config" / "default.yaml"
-    
-    if config_path.exists():
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    return {}
-
-def prepare_data(
-    consumption_df: pd.DataFrame,
-    production_df: pd.DataFrame,
-    pld_df: pd.DataFrame,
-    climate_df: pd.DataFrame
-) -> tuple:
-    """Prepara e combina dados para modelagem."""
-    # Garantir que timestamp está presente
-    for df in [consumption_df, production_df, pld_df, climate_df]:
-        if df is not None and 'timestamp' not in df.columns:
-            if 'date' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['date'])
-            else:
-                df['timestamp'] = pd.date_range(start='2024-01-01', periods=len(df), freq='D')
-    
-    # Merge dos dados
-    combined = consumption_df.copy()
-    
-    if production_df is not None:
-        combined = combined.merge(
-            production_df[['timestamp', 'production_kwh']],
-            on='timestamp',
-            how='outer',
-            suffixes=('', '_prod')
-        )
-    
-    if pld_df is not None:
-        combined = combined.merge(
-            pld_df[['timestamp', 'pld_brl_mwh']],
-            on='timestamp',
-            how='left'
-        )
-    
-    if climate_df is not None:
-        climate_cols = ['timestamp'] + [c for c in climate_df.columns if c != 'timestamp']
-        combined = combined.merge(
-            climate_df[climate_cols],
-            on='timestamp',
-            how='left'
-        )
-    
-    # Ordenar por timestamp
-    combined = combined.sort_values('timestamp').reset_index(drop=True)
-    
-    # Preencher valores faltantes
-    combined = combined.ffill().bfill()
-    
-    return combined
+from src.viz.plots import PlotQueue, configure_plots
+from src.config import load_app_config, parse_override
+from src.data.store import RunStore, new_run_id
+from src.models.registry import ModelRegistry
+from src.portfolio.runner import load_sites, run_portfolio
+from src.utils.emitter import MetricsEmitter
+from src.utils.profiling import profiler
 
 def main():
     parser = argparse.ArgumentParser(
@@ -91,15 +41,24 @@ def main():
     parser.add_argument(
         "--config",
         type=Path,
-        default=Path("config/default.yaml"),
-        help="Caminho para arquivo de configuração YAML"
+        default=None,
+        help="Caminho para arquivo de configuração YAML (padrão: config/default.yaml)"
+    )
+    
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="SECAO.CAMPO=VALOR",
+        help="Sobrescrever um valor da configuração (ex: --set finance.cost_rate=0.2); pode ser repetido"
     )
     
     parser.add_argument(
         "--horizon",
         type=int,
-        default=14,
-        help="Horizonte de previsão em dias"
+        default=None,
+        help="Horizonte de previsão em dias (padrão: model.horizon_days da configuração)"
     )
     
     parser.add_argument(
@@ -159,7 +118,7 @@ def main():
         "--inmet-station",
         type=str,
         default=None,
-        help="ID da estação INMET (ex: A701)"
+        help="ID da estação INMET (ex: A701) ou 'auto' (estações mais próximas de --lat/--lon)"
     )
     
     parser.add_argument(
@@ -176,16 +135,118 @@ def main():
         help="Longitude para PVGIS (ex: -46.6333)"
     )
     
+    parser.add_argument(
+        "--scenario",
+        type=str,
+        default="default",
+        help="Nome do cenário registrado no store de execuções"
+    )
+    
+    parser.add_argument(
+        "--scenario-description",
+        type=str,
+        default="",
+        help="Descrição do cenário registrada no store de execuções"
+    )
+    
+    parser.add_argument(
+        "--run-store",
+        type=Path,
+        default=None,
+        help="Diretório do store colunar de execuções (padrão: <output-dir>/run_store)"
+    )
+    
+    parser.add_argument(
+        "--model-registry",
+        type=Path,
+        default=None,
+        help="Diretório do registro de modelos usado pelo serviço HTTP (padrão: <output-dir>/models)"
+    )
+    
+    parser.add_argument(
+        "--force-retrain",
+        action="store_true",
+        help="Re-treinar mesmo sem drift em relação aos modelos registrados"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Instrumentar etapas e conectores (tempo, CPU, memória, linhas) em profile.jsonl"
+    )
+    
+    parser.add_argument(
+        "--plot-dpi",
+        type=int,
+        default=None,
+        help="Resolução dos gráficos salvos (padrão: viz.dpi da configuração ou 300)"
+    )
+    
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=None,
+        help="Processos paralelos para renderizar os gráficos (padrão: viz.workers ou 1)"
+    )
+    
+    parser.add_argument(
+        "--deferred-plots",
+        action="store_true",
+        help="Apenas registrar os dados dos gráficos em plot_jobs.pkl (renderizar depois com python -m src.viz.plots)"
+    )
+    
+    parser.add_argument(
+        "--sites",
+        type=Path,
+        default=None,
+        help="Tabela de sites (CSV/Parquet: site_id, lat, lon, submercado, capacity_kwp) para o modo carteira"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos paralelos do modo carteira (padrão: portfolio.workers ou 1)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Sites por lote no modo carteira (padrão: portfolio.batch_size ou 50)"
+    )
+    
+    parser.add_argument(
+        "--out-of-core",
+        action="store_true",
+        help="Histórico em Parquet particionado, com atributos e backtest partição a partição "
+             "(diretório: data.partitioned_dir ou <output-dir>/partitioned)"
+    )
+    
     args = parser.parse_args()
     
     # Carregar configuração
-    config = load_config(args.config)
+    try:
+        config = load_app_config(args.config, dict(parse_override(item) for item in args.overrides))
+    except Exception as e:
+        print(f"[ERRO] Configuracao invalida: {e}")
+        return 1
     
     # Mesclar argumentos CLI com config
-    region = args.region or config.get('data', {}).get('region', 'SE')
-    submercado = args.submercado or config.get('data', {}).get('submercado', 'SE')
-    horizon = args.horizon or config.get('model', {}).get('horizon_days', 14)
-    inmet_station = args.inmet_station or config.get('data', {}).get('inmet_station', 'A701')
+    region = args.region or config.data.region
+    submercado = args.submercado or config.data.submercado
+    horizon = args.horizon or config.model.horizon_days
+    inmet_station = args.inmet_station or config.data.inmet_station
+    plot_workers = args.plot_workers or config.viz.workers
+    deferred_plots = args.deferred_plots or config.viz.deferred
+    
+    # Gráficos são apenas exportados (a interface usa seu próprio canvas Tk)
+    configure_plots(
+        backend="Agg",
+        dpi=args.plot_dpi or config.viz.dpi,
+        tight_bbox=config.viz.tight_bbox,
+        decimation=config.viz.decimation
+    )
     
     # Datas
     end_date = datetime.now()
@@ -211,30 +272,132 @@ def main():
     output_dir = args.output_dir
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # Identificação da execução no store colunar
+    run_id = new_run_id()
+    run_store = RunStore(args.run_store or output_dir / "run_store")
+    emitter = MetricsEmitter(run_id=run_id, scenario=args.scenario, region=region)
+    profiler.configure(
+        enabled=args.profile,
+        log_file=output_dir / "profile.log" if args.profile else None,
+        run_id=run_id,
+        scenario=args.scenario,
+        region=region
+    )
+    
     # Cache dir
     cache_dir = None
-    if args.cache or config.get('data', {}).get('cache_dir'):
-        cache_dir = Path(config.get('data', {}).get('cache_dir', 'data/raw'))
+    if args.cache or config.data.cache_dir:
+        cache_dir = Path(config.data.cache_dir or 'data/raw')
         cache_dir.mkdir(parents=True, exist_ok=True)
     
+    # Modo carteira: vários sites processados em lotes paralelos
+    if args.sites:
+        try:
+            sites = load_sites(args.sites)
+            print(f"\n[CARTEIRA] {len(sites)} sites em {args.sites}")
+            profiler.begin("portfolio")
+            summary = run_portfolio(
+                sites,
+                start=train_start_str,
+                end=train_end_str,
+                horizon=horizon,
+                output_dir=output_dir,
+                config=config.as_dict(),
+                cache_dir=cache_dir,
+                workers=args.workers or config.portfolio.workers,
+                batch_size=args.batch_size or config.portfolio.batch_size,
+                grid_resolution_deg=config.portfolio.grid_resolution_deg
+            )
+            profiler.end(rows=summary["n_sites"])
+        except Exception as e:
+            print(f"[ERRO] Erro no modo carteira: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+        
+        print(f"[OK] {summary['n_sites']} sites processados ({summary['n_cells']} celulas de clima, {summary['n_failed']} com erro)")
+        print(f"[OK] Resultados por site: {summary['sites_path']}")
+        print(f"[OK] Resumo por site: {summary['summary_path']}")
+        print(f"[OK] Agregado por submercado: {summary['aggregate_path']}")
+        print(f"\nCARTEIRA:")
+        print(f"  Lucro líquido total: R$ {summary['net_profit_total_brl']:.2f}")
+        print(f"  Excedente total: {summary['surplus_total_kwh']:.2f} kWh")
+        print(f"  Déficit total: {summary['deficit_total_kwh']:.2f} kWh")
+        print(f"  Decisões (posição líquida): {summary['decisions']}")
+        
+        # Execução da carteira no store colunar: agregado por submercado e métricas da carteira
+        aggregate = summary["aggregate"]
+        emitter.emit_many("financial", "total", summarize_results(aggregate))
+        emitter.emit_many("portfolio", "sites", {
+            key: float(summary[key]) for key in ("n_sites", "n_failed", "n_cells")
+        })
+        for record in profiler.records:
+            emitter.emit_many("timing", record["stage"], {
+                key: record[key] for key in ("wall_s", "cpu_s", "peak_traced_mb", "rows")
+                if record.get(key) is not None
+            })
+        emitter.write_jsonl(output_dir / "metrics.jsonl")
+        run_store.write_run(
+            run_id=run_id,
+            scenario=args.scenario,
+            region="portfolio",
+            forecasts=apply_dtypes(aggregate.copy()),
+            metrics=emitter.to_frame(),
+            params={
+                "mode": "portfolio",
+                "sites": str(args.sites),
+                "submercados": sorted(aggregate["submercado"].unique()),
+                "horizon": horizon,
+                "train_start": train_start_str,
+                "train_end": train_end_str,
+                "algo_consumption": config.model.algo_consumption,
+                "algo_production": config.model.algo_production,
+                "config_hash": config.hash
+            },
+            description=args.scenario_description
+        )
+        print(f"[OK] Execucao registrada no store: {run_store.root} (run_id={run_id})")
+        print("[OK] Pipeline concluido com sucesso!")
+        return 0
+    
+    # Modo out-of-core: histórico gravado em Parquet particionado e lido com predicate pushdown
+    partitioned_dir = config.data.partitioned_dir or (output_dir / "partitioned" if args.out_of_core else None)
+    history = PartitionedDataset(Path(partitioned_dir) / "history") if partitioned_dir else None
+    
     # 1. Carregar dados
     print("\n[1/7] Carregando dados...")
+    profiler.begin("1_load")
     try:
         # Carregar chave OpenWeatherMap do config
-        openweather_key = config.get('data', {}).get('openweather_api_key') or None
+        openweather_key = config.data.openweather_api_key or None
         
-        consumption_df, production_df, pld_df, climate_df = load_data_with_fallback(
-            start=train_start_str,
-            end=train_end_str,
-            region=region,
-            submercado=submercado,
-            inmet_station=inmet_station,
-            cache_dir=cache_dir,
-            use_real_data=args.use_real_data,
-            lat=args.lat,
-            lon=args.lon,
-            openweather_api_key=openweather_key
-        )
+        if history is not None:
+            # Site único (site_id 0) preparado e gravado por partição; a leitura volta só o recorte do treino
+            site_table = pd.DataFrame([{
+                "site_id": 0, "lat": args.lat, "lon": args.lon, "submercado": submercado,
+                "capacity_kwp": 25.0, "base_kwh_day": 100.0
+            }])
+            written = load_partitioned(
+                history, site_table, train_start_str, train_end_str, cache_dir, args.use_real_data,
+                region=region, inmet_station=inmet_station, openweather_api_key=openweather_key
+            )
+            combined_df = history.read(train_start_str, train_end_str, sites=[0]).drop(columns="site_id")
+            consumption_df = production_df = combined_df
+            pld_df = combined_df[["timestamp", "pld_brl_mwh"]] if "pld_brl_mwh" in combined_df.columns else None
+            print(f"[OK] Historico particionado: {history.root} ({written} registros gravados)")
+        else:
+            consumption_df, production_df, pld_df, climate_df = load_data_with_fallback(
+                start=train_start_str,
+                end=train_end_str,
+                region=region,
+                submercado=submercado,
+                inmet_station=inmet_station,
+                cache_dir=cache_dir,
+                use_real_data=args.use_real_data,
+                lat=args.lat,
+                lon=args.lon,
+                openweather_api_key=openweather_key
+            )
         print(f"[OK] Dados carregados: {len(consumption_df)} registros")
         
         # Validar dados carregados
@@ -255,13 +418,34 @@ def main():
     except Exception as e:
         print(f"[ERRO] Erro ao carregar dados: {e}")
         return 1
+    profiler.end(rows=len(consumption_df))
     
     # 2. Preparar dados combinados
     print("\n[2/7] Preparando dados...")
+    profiler.begin("2_prepare")
     try:
-        combined_df = prepare_data(consumption_df, production_df, pld_df, climate_df)
+        if history is None:
+            combined_df = prepare_data(consumption_df, production_df, pld_df, climate_df)
         print(f"[OK] Dados preparados: {len(combined_df)} registros, {len(combined_df.columns)} colunas")
         
+        if history is not None:
+            # Atributos partição a partição (contexto da partição anterior para lags e janelas)
+            from src.features.engineering import engineer_features_partitioned
+            features = PartitionedDataset(Path(partitioned_dir) / "features")
+            n_features = engineer_features_partitioned(
+                history, features, "consumption_kwh",
+                location=(args.lat, args.lon) if args.lat is not None and args.lon is not None else None,
+                start=train_start_str, end=train_end_str, sites=[0]
+            )
+            print(f"[OK] Atributos gravados por particao: {features.root} ({n_features} registros)")
+        
+        # Validação em lote contra as restrições de EnergySample
+        validation = validate_frame(combined_df, check_missing=False)
+        if not validation.ok:
+            print(f"[AVISO] {len(validation.invalid_rows)} registros violam o schema de dados:")
+            for row in validation.summary().itertuples(index=False):
+                print(f"  {row.rule}: {row.rows} linhas (ex: {row.examples})")
+        
         # Estatísticas descritivas dos dados históricos
         if len(combined_df) > 0:
             print("\nEstatisticas dos dados historicos:")
@@ -270,88 +454,152 @@ def main():
             if available_cols:
                 stats_df = combined_df[available_cols].describe()
                 print(stats_df.to_string())
+                emitter.emit_describe(combined_df, available_cols)
     except Exception as e:
         print(f"[ERRO] Erro ao preparar dados: {e}")
         return 1
+    profiler.end(rows=len(combined_df))
     
     # 3. Treinar modelos
     print("\n[3/7] Treinando modelos...")
-    algo_consumption = config.get('model', {}).get('algo_consumption', 'prophet')
-    algo_production = config.get('model', {}).get('algo_production', 'xgboost')
+    profiler.begin("3_train")
+    # Algoritmo/hiperparâmetros por série (ajuste da região via src.models.tuning, se houver)
+    algo_consumption, params_consumption = config.model.resolve(region, "consumption")
+    algo_production, params_production = config.model.resolve(region, "production")
     
     try:
-        consumption_model = ConsumptionForecaster(algo=algo_consumption)
-        consumption_model.fit(combined_df, target_col='consumption_kwh')
-        print(f"[OK] Modelo de consumo treinado ({algo_consumption})")
-        
-        production_model = ProductionForecaster(algo=algo_production)
         exog_cols = ['ghi_wm2', 'temp_c'] if 'ghi_wm2' in combined_df.columns else None
-        production_model.fit(combined_df, target_col='production_kwh', exog_cols=exog_cols)
-        print(f"[OK] Modelo de producao treinado ({algo_production})")
         
-        # Validação no conjunto de treino (últimos 7-14 dias)
-        if len(combined_df) >= 14:
+        # Seleção automática (algo "auto"): leaderboard de backtest, escolha em cache com TTL
+        if "auto" in (algo_consumption, algo_production):
+            from src.models.selection import SelectionCache, choose_algo
+            selection_cache = SelectionCache(
+                Path(args.model_registry or output_dir / "models") / "selection.json",
+                ttl_hours=config.model.selection.ttl_hours
+            )
+            if algo_consumption == "auto":
+                choice = choose_algo(combined_df, region, "consumption", config.model.selection, selection_cache, horizon)
+                algo_consumption = choice["algo"]
+                print(f"[OK] Selecao automatica (consumo): {algo_consumption} ({choice['metric']} {choice['score']:.2f}{', cache' if choice['cached'] else ''})")
+            if algo_production == "auto":
+                choice = choose_algo(combined_df, region, "production", config.model.selection, selection_cache, horizon, exog_cols)
+                algo_production = choice["algo"]
+                print(f"[OK] Selecao automatica (producao): {algo_production} ({choice['metric']} {choice['score']:.2f}{', cache' if choice['cached'] else ''})")
+        
+        # Modelo físico de produção: coordenadas do site (se não ajustadas na configuração)
+        if algo_production == "physical" and args.lat is not None and args.lon is not None:
+            params_production = {"lat": args.lat, "lon": args.lon, **params_production}
+        
+        # Drift: reutiliza os modelos registrados enquanto os dados seguem o perfil de treino
+        model_registry = ModelRegistry(args.model_registry or output_dir / "models")
+        spec = model_spec(
+            {
+                "consumption": (algo_consumption, params_consumption),
+                "production": (algo_production, params_production)
+            },
+            site={"lat": args.lat, "lon": args.lon} if args.lat is not None and args.lon is not None else None
+        )
+        retrain, reused_version, new_rows = True, None, 0
+        if config.drift.enabled and not args.force_retrain:
+            drift_report, package = check_registered(
+                model_registry, region, combined_df, spec,
+                DriftMonitor(**config.drift.model_dump(exclude={"enabled", "columns"})), exog_cols,
+                train_start=train_start_str, train_end=train_end_str
+            )
+            if drift_report.columns or drift_report.errors:
+                emitter.emit_many("drift", region, drift_report.metrics())
+            if drift_report.retrain:
+                print(f"[OK] Re-treino necessario: {'; '.join(drift_report.reasons)}")
+            else:
+                retrain = False
+                reused_version = package["meta"]["version"]
+                new_rows = drift_report.new_rows
+                consumption_model = package["models"]["consumption"]
+                production_model = package["models"]["production"]
+                print(f"[OK] Sem drift: reutilizando modelos registrados (versao {reused_version}, {new_rows} registros novos)")
+        
+        validation_errors = {}
+        if retrain:
+            consumption_model = ConsumptionForecaster(algo=algo_consumption, params=params_consumption)
+            consumption_model.fit(combined_df, target_col='consumption_kwh')
+            print(f"[OK] Modelo de consumo treinado ({algo_consumption}{', ajustado: ' + str(params_consumption) if params_consumption else ''})")
+            
+            production_model = ProductionForecaster(algo=algo_production, params=params_production)
+            production_model.fit(combined_df, target_col='production_kwh', exog_cols=exog_cols)
+            print(f"[OK] Modelo de producao treinado ({algo_production}{', ajustado: ' + str(params_production) if params_production else ''})")
+        
+        if history is not None:
+            # Backtest out-of-core: o histórico do site é lido do dataset particionado, só com as colunas usadas
+            from src.models.evaluate import backtest_partitioned
+            for series, target_col, make_model, series_exog in (
+                ("consumption", "consumption_kwh",
+                 lambda: ConsumptionForecaster(algo=algo_consumption, params=params_consumption), None),
+                ("production", "production_kwh",
+                 lambda: ProductionForecaster(algo=algo_production, params=params_production), exog_cols),
+            ):
+                board = backtest_partitioned(
+                    history, make_model, target_col, horizon=horizon, n_folds=3,
+                    exog_cols=series_exog, sites=[0], start=train_start_str, end=train_end_str
+                )
+                if board["folds"].sum() > 0:
+                    emitter.emit("backtest", series, "MAE", float(board["score"].iloc[0]))
+                    print(f"[OK] Backtest out-of-core ({series}): MAE {board['score'].iloc[0]:.2f} em {int(board['folds'].iloc[0])} divisoes")
+        
+        # Validação no conjunto de treino (últimos 7-14 dias): as duas séries avaliadas em uma chamada
+        if retrain and len(combined_df) >= 14:
             try:
-                from src.models.evaluate import calculate_metrics
+                from src.models.evaluate import METRICS, calculate_metrics_batch
                 
                 print("\n[VALIDACAO] Avaliando qualidade do modelo no conjunto de treino...")
                 val_size = min(7, len(combined_df) // 4)
                 
                 if val_size > 0 and len(combined_df) > val_size:
-                    train_df = combined_df.iloc[:-val_size].copy()
-                    val_df = combined_df.iloc[-val_size:].copy()
+                    train_df = combined_df.iloc[:-val_size]
+                    val_df = combined_df.iloc[-val_size:]
                     
-                    # Validar modelo de consumo
-                    if 'consumption_kwh' in val_df.columns and len(val_df) > 0:
-                        try:
-                            temp_cons_model = ConsumptionForecaster(algo=algo_consumption)
-                            temp_cons_model.fit(train_df, target_col='consumption_kwh')
-                            val_cons_pred = temp_cons_model.predict(val_size)
-                            
-                            # Converter para Series se necessário
-                            if not isinstance(val_cons_pred, pd.Series):
-                                val_cons_pred = pd.Series(val_cons_pred)
-                            
-                            # Garantir mesmo tamanho
-                            min_len = min(len(val_df), len(val_cons_pred))
-                            val_cons_true = pd.Series(val_df['consumption_kwh'].values[:min_len])
-                            val_cons_pred_trim = pd.Series(val_cons_pred.values[:min_len] if hasattr(val_cons_pred, 'values') else val_cons_pred[:min_len])
-                            
-                            if len(val_cons_true) > 0 and len(val_cons_pred_trim) > 0:
-                                cons_metrics = calculate_metrics(val_cons_true, val_cons_pred_trim)
-                                print(f"  Consumo - MAE: {cons_metrics['MAE']:.2f} kWh, RMSE: {cons_metrics['RMSE']:.2f} kWh")
-                                print(f"  Consumo - MAPE: {cons_metrics['MAPE']:.2f}%, R²: {cons_metrics['R2']:.3f}")
-                        except Exception as e:
-                            print(f"  [AVISO] Nao foi possivel validar modelo de consumo: {e}")
+                    # Exógenas observadas no período de validação (modelo de produção)
+                    val_exog = None
+                    if exog_cols and all(col in val_df.columns for col in exog_cols):
+                        val_exog = val_df[exog_cols]
                     
-                    # Validar modelo de produção
-                    if 'production_kwh' in val_df.columns and len(val_df) > 0:
+                    labels, actual, predicted, history = [], [], [], []
+                    for series, target_col, model, name in (
+                        ("consumption", "consumption_kwh",
+                         ConsumptionForecaster(algo=algo_consumption, params=params_consumption), "consumo"),
+                        ("production", "production_kwh",
+                         ProductionForecaster(algo=algo_production, params=params_production), "producao"),
+                    ):
+                        if target_col not in val_df.columns:
+                            continue
                         try:
-                            temp_prod_model = ProductionForecaster(algo=algo_production)
-                            temp_prod_model.fit(train_df, target_col='production_kwh', exog_cols=exog_cols)
-                            
-                            # Preparar exógenas para validação
-                            val_exog = None
-                            if exog_cols:
-                                val_exog = val_df[exog_cols] if all(col in val_df.columns for col in exog_cols) else None
-                            
-                            val_prod_pred = temp_prod_model.predict(val_size, exog=val_exog)
-                            
-                            # Converter para Series se necessário
-                            if not isinstance(val_prod_pred, pd.Series):
-                                val_prod_pred = pd.Series(val_prod_pred)
-                            
-                            # Garantir mesmo tamanho
-                            min_len = min(len(val_df), len(val_prod_pred))
-                            val_prod_true = pd.Series(val_df['production_kwh'].values[:min_len])
-                            val_prod_pred_trim = pd.Series(val_prod_pred.values[:min_len] if hasattr(val_prod_pred, 'values') else val_prod_pred[:min_len])
-                            
-                            if len(val_prod_true) > 0 and len(val_prod_pred_trim) > 0:
-                                prod_metrics = calculate_metrics(val_prod_true, val_prod_pred_trim)
-                                print(f"  Producao - MAE: {prod_metrics['MAE']:.2f} kWh, RMSE: {prod_metrics['RMSE']:.2f} kWh")
-                                print(f"  Producao - MAPE: {prod_metrics['MAPE']:.2f}%, R²: {prod_metrics['R2']:.3f}")
+                            if series == "production":
+                                model.fit(train_df, target_col=target_col, exog_cols=exog_cols)
+                                pred = model.predict(val_size, exog=val_exog)
+                            else:
+                                model.fit(train_df, target_col=target_col)
+                                pred = model.predict(val_size)
                         except Exception as e:
-                            print(f"  [AVISO] Nao foi possivel validar modelo de producao: {e}")
+                            print(f"  [AVISO] Nao foi possivel validar modelo de {name}: {e}")
+                            continue
+                        # Previsões mais curtas que a validação: períodos faltantes ficam NaN (ignorados)
+                        pred = np.asarray(pred, dtype=float)[:val_size]
+                        labels.append(series)
+                        actual.append(val_df[target_col].to_numpy(dtype=float))
+                        predicted.append(np.pad(pred, (0, val_size - len(pred)), constant_values=np.nan))
+                        history.append(train_df[target_col].to_numpy(dtype=float))
+                    
+                    if labels:
+                        # MASE na escala do previsor ingênuo sobre o treino de cada série
+                        val_metrics = calculate_metrics_batch(
+                            np.vstack(actual), np.vstack(predicted), y_train=history, labels=labels
+                        )
+                        for row in val_metrics.to_dict("records"):
+                            metrics = {metric: float(row[metric]) for metric in METRICS}
+                            emitter.emit_many("validation", row["series"], metrics)
+                            validation_errors[row["series"]] = metrics["MAE"]
+                            title = "Consumo" if row["series"] == "consumption" else "Producao"
+                            print(f"  {title} - MAE: {metrics['MAE']:.2f} kWh, RMSE: {metrics['RMSE']:.2f} kWh, MASE: {metrics['MASE']:.3f}")
+                            print(f"  {title} - MAPE: {metrics['MAPE']:.2f}%, R²: {metrics['R2']:.3f}")
             except ImportError:
                 print("[AVISO] Modulo de avaliacao nao disponivel. Pulando validacao.")
             except Exception as e:
@@ -361,27 +609,32 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    profiler.end(rows=len(combined_df))
     
     # 4. Gerar previsões
     print("\n[4/7] Gerando previsões...")
+    profiler.begin("4_predict")
     try:
         # Preparar dados futuros para exógenas
         future_exog = None
         if exog_cols and pld_df is not None and len(pld_df) >= horizon:
             # Usar últimas observações ou média para previsão
             future_exog = pd.DataFrame({
-                col: [combined_df[col].tail(30).mean()] * horizon
+                col: [combined_df[col].tail(30).mean()] * (horizon + new_rows)
                 for col in exog_cols if col in combined_df.columns
             })
         
-        consumption_pred = consumption_model.predict(horizon)
-        production_pred = production_model.predict(horizon, exog=future_exog)
+        # Modelos reutilizados preveem a partir do fim do seu treino: descartar os períodos já observados
+        consumption_pred = consumption_model.predict(horizon + new_rows)
+        production_pred = production_model.predict(horizon + new_rows, exog=future_exog)
         
         # Garantir que são Series
         if not isinstance(consumption_pred, pd.Series):
             consumption_pred = pd.Series(consumption_pred)
         if not isinstance(production_pred, pd.Series):
             production_pred = pd.Series(production_pred)
+        consumption_pred = consumption_pred.iloc[new_rows:].reset_index(drop=True)
+        production_pred = production_pred.iloc[new_rows:].reset_index(drop=True)
         
         print(f"[OK] Previsoes geradas: {len(consumption_pred)} periodos")
     except Exception as e:
@@ -389,9 +642,11 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    profiler.end(rows=len(consumption_pred))
     
     # 5. Obter PLD futuro (usar últimas observações ou média)
     print("\n[5/7] Preparando PLD para análise financeira...")
+    profiler.begin("5_pld")
     pld_future = None
     if pld_df is not None and 'pld_brl_mwh' in pld_df.columns:
         pld_recent = pld_df['pld_brl_mwh'].tail(30).values
@@ -399,16 +654,17 @@ def main():
             # Repetir média dos últimos 30 dias
             pld_avg = np.mean(pld_recent)
             pld_future = pd.Series([pld_avg] * horizon)
+    profiler.end(rows=horizon)
     
     # 6. Análise financeira
     print("\n[6/7] Calculando análise financeira...")
+    profiler.begin("6_finance")
     try:
-        finance_config = config.get('finance', {})
         calculator = ProfitCalculator(
-            sell_price_brl_per_kwh=finance_config.get('sell_price_brl_per_kwh', 0.75),
-            buy_price_brl_per_kwh=finance_config.get('buy_price_brl_per_kwh', 0.90),
-            cost_rate=finance_config.get('cost_rate', 0.10),
-            use_pld=finance_config.get('use_pld', True)
+            sell_price_brl_per_kwh=config.finance.sell_price_brl_per_kwh,
+            buy_price_brl_per_kwh=config.finance.buy_price_brl_per_kwh,
+            cost_rate=config.finance.cost_rate,
+            use_pld=config.finance.use_pld
         )
         
         results_df = calculator.calculate(
@@ -419,10 +675,9 @@ def main():
         print(f"[OK] Analise financeira concluida")
         
         # Integrar DecisionEngine
-        decision_config = config.get('decisions', {})
         decision_engine = DecisionEngine(
-            buffer_kwh=decision_config.get('buffer_kwh', 1.0),
-            pld_premium_threshold_brl_mwh=decision_config.get('pld_premium_threshold_brl_mwh', 50.0),
+            buffer_kwh=config.decisions.buffer_kwh,
+            pld_premium_threshold_brl_mwh=config.decisions.pld_premium_threshold_brl_mwh,
             strategy="economic"
         )
         
@@ -441,18 +696,17 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    profiler.end(rows=len(results_df))
     
     # 7. Salvar resultados
     print("\n[7/7] Salvando resultados...")
+    profiler.begin("7_save")
     try:
         # Adicionar timestamps futuros
         last_timestamp = combined_df['timestamp'].max()
-        future_timestamps = pd.date_range(
-            start=last_timestamp + timedelta(days=1),
-            periods=horizon,
-            freq='D'
-        )
+        future_timestamps = local_range(last_timestamp, periods=horizon + 1, freq='D')[1:]
         results_df['timestamp'] = future_timestamps
+        apply_dtypes(results_df)
         
         # Salvar CSV
         csv_path = output_dir / "forecast_results.csv"
@@ -464,46 +718,111 @@ def main():
         results_df.to_parquet(parquet_path, index=False)
         print(f"[OK] Parquet salvo: {parquet_path}")
         
-        # Gerar gráficos
-        forecast_fig = plot_forecast_comparison(
+        # Gerar gráficos (registrados e renderizados em lote)
+        plots = PlotQueue()
+        plots.add(
+            "forecast_comparison",
+            output_dir / "forecast_comparison.png",
             consumption=consumption_pred,
-            production=production_pred,
-            save_path=output_dir / "forecast_comparison.png"
+            production=production_pred
         )
+        plots.add("surplus_deficit", output_dir / "surplus_deficit.png", results_df)
+        plots.add("cumulative_profit", output_dir / "cumulative_profit.png", results_df)
+        if pld_df is not None and len(pld_df) > 0:
+            plots.add("pld_timeseries", output_dir / "pld_timeseries.png", pld_df)
         
-        surplus_fig = plot_surplus_deficit(
-            results_df,
-            save_path=output_dir / "surplus_deficit.png"
-        )
+        if deferred_plots:
+            jobs_path = plots.dump(output_dir / "plot_jobs.pkl")
+            print(f"[OK] Graficos registrados em {jobs_path} (renderizar com: python -m src.viz.plots {jobs_path})")
+        else:
+            plots.render(workers=plot_workers)
+            print(f"[OK] Graficos salvos em {output_dir}")
         
-        profit_fig = plot_cumulative_profit(
-            results_df,
-            save_path=output_dir / "cumulative_profit.png"
-        )
+        # Resumo expandido
+        summary = summarize_results(results_df)
+        total_profit = summary['net_profit_total_brl']
+        total_surplus = summary['surplus_total_kwh']
+        total_deficit = summary['deficit_total_kwh']
+        efficiency = summary['efficiency_pct']
+        profit_mean = summary['net_profit_mean_brl']
+        profit_std = summary['net_profit_std_brl']
+        profit_min = summary['net_profit_min_brl']
+        profit_max = summary['net_profit_max_brl']
         
-        if pld_df is not None and len(pld_df) > 0:
-            plot_pld_timeseries(
-                pld_df,
-                save_path=output_dir / "pld_timeseries.png"
-            )
+        # Registrar métricas estruturadas e execução no store colunar
+        emitter.emit_many("financial", "total", summary)
+        profiler.end(rows=len(results_df))
+        for record in profiler.records:
+            emitter.emit_many("timing", record["stage"], {
+                key: record[key] for key in ("wall_s", "cpu_s", "peak_traced_mb", "rows")
+                if record.get(key) is not None
+            })
+        if args.profile:
+            profile_path = profiler.write_jsonl(output_dir / "profile.jsonl")
+            print(f"[OK] Perfil de execucao salvo: {profile_path}")
+        metrics_path = emitter.write_jsonl(output_dir / "metrics.jsonl")
+        print(f"[OK] Metricas estruturadas salvas: {metrics_path}")
         
-        print(f"[OK] Graficos salvos em {output_dir}")
+        run_store.write_run(
+            run_id=run_id,
+            scenario=args.scenario,
+            region=region,
+            forecasts=results_df,
+            metrics=emitter.to_frame(),
+            params={
+                "submercado": submercado,
+                "horizon": horizon,
+                "train_start": train_start_str,
+                "train_end": train_end_str,
+                "use_real_data": args.use_real_data,
+                "lat": args.lat,
+                "lon": args.lon,
+                "algo_consumption": algo_consumption,
+                "algo_production": algo_production,
+                "config_hash": config.hash,
+                "retrained": retrain,
+                "model_version": run_id if retrain else reused_version
+            },
+            description=args.scenario_description
+        )
+        print(f"[OK] Execucao registrada no store: {run_store.root} (run_id={run_id})")
         
-        # Resumo expandido
-        total_profit = results_df['net_profit_brl'].sum()
-        total_surplus = results_df['surplus_kwh'].sum()
-        total_deficit = results_df['deficit_kwh'].sum()
-        
-        # Calcular eficiência energética
-        total_consumption = results_df['consumption_kwh'].sum()
-        total_production = results_df['production_kwh'].sum()
-        efficiency = (total_production / total_consumption * 100) if total_consumption > 0 else 0
-        
-        # Estatísticas de lucro
-        profit_mean = results_df['net_profit_brl'].mean()
-        profit_std = results_df['net_profit_brl'].std()
-        profit_min = results_df['net_profit_brl'].min()
-        profit_max = results_df['net_profit_brl'].max()
+        # Registrar modelos treinados para o serviço de previsão (src.service.server)
+        # Contexto de previsão: mesmo fim de dados e deslocamento usados pelo pipeline
+        serving_context = {
+            "exog_means": {
+                col: float(combined_df[col].tail(30).mean())
+                for col in (exog_cols or []) if col in combined_df.columns
+            },
+            "pld_mean": float(pld_future.iloc[0]) if pld_future is not None else None,
+            "last_timestamp": str(last_timestamp),
+            "offset": new_rows
+        }
+        if retrain:
+            model_registry.register(
+                region=region,
+                version=run_id,
+                models={"consumption": consumption_model, "production": production_model},
+                context={
+                    **serving_context,
+                    "profile": training_profile(
+                        combined_df, list(config.drift.columns), errors=validation_errors,
+                        window_days=config.drift.window_days
+                    )
+                },
+                meta={
+                    "algo_consumption": consumption_model.algo,
+                    "algo_production": production_model.algo,
+                    "model_spec": spec,
+                    "train_start": train_start_str,
+                    "train_end": train_end_str,
+                    "config_hash": config.hash
+                }
+            )
+            print(f"[OK] Modelos registrados: {model_registry.root} (versao {run_id})")
+        else:
+            model_registry.update_context(region, serving_context, version=reused_version)
+            print(f"[OK] Modelos mantidos no registro (versao {reused_version}, {new_rows} periodos observados apos o treino)")
         
         # Percentuais de decisões
         decisions_counts = results_df['decision'].value_counts()
@@ -1,15 +1,121 @@
 """Configuração do projeto."""
+import json
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+from .schemas import AppConfig
 
 _CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "default.yaml"
 
-def load_config(path: Path = None) -> Dict[str, Any]:
-    """Carrega configuração do arquivo YAML."""
-    if path is None:
-        path = _CONFIG_PATH
-    
+# Configurações validadas por arquivo: caminho -> (assinatura dos arquivos, AppConfig)
+_FILE_CACHE: Dict[Path, Tuple[Tuple[int, ...], AppConfig]] = {}
+
+# Configurações com overrides: (hash da base, overrides canônicos) -> AppConfig
+_OVERRIDE_CACHE: Dict[Tuple[str, str], AppConfig] = {}
+_OVERRIDE_CACHE_SIZE = 1024
+
+def _expand(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte chaves pontuadas ("finance.cost_rate") em dicionários aninhados."""
+    nested: Dict[str, Any] = {}
+    for key, value in overrides.items():
+        if isinstance(value, dict):
+            value = _expand(value)
+        node = nested
+        parts = key.split(".")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        if isinstance(value, dict) and isinstance(node.get(parts[-1]), dict):
+            node[parts[-1]] = _merge(node[parts[-1]], value)
+        else:
+            node[parts[-1]] = value
+    return nested
+
+def _merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Mescla recursiva (overrides prevalecem); `base` não é modificado."""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def tuned_path(path: Path = None) -> Path:
+    """Arquivo de ajustes ao lado da configuração (default.yaml -> default.tuned.yaml)."""
+    path = Path(path or _CONFIG_PATH)
+    return path.with_name(f"{path.stem}.tuned.yaml")
+
+def _signature(path: Path) -> Tuple[int, int]:
+    """(mtime_ns, tamanho) do arquivo; (0, -1) se não existir."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (0, -1)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
     with open(path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return yaml.safe_load(f) or {}
+
+def load_app_config(path: Path = None, overrides: Optional[Dict[str, Any]] = None) -> AppConfig:
+    """
+    Carrega e valida a configuração (cache por mtime do arquivo).
+
+    O YAML é lido e validado apenas quando o arquivo muda; overrides são
+    mesclados sobre a configuração já validada e o resultado também é
+    mantido em cache, de modo que varreduras com centenas de conjuntos de
+    overrides não releem o arquivo.
+
+    Se existir `<nome>.tuned.yaml` ao lado do arquivo (gravado por
+    `src.models.tuning`), ele é mesclado sobre a configuração base.
+
+    Args:
+        path: Arquivo YAML (padrão: config/default.yaml)
+        overrides: Valores a sobrescrever, aninhados ({"finance": {"cost_rate": 0.2}})
+            ou com chaves pontuadas ({"finance.cost_rate": 0.2})
+
+    Returns:
+        AppConfig imutável
+
+    Raises:
+        pydantic.ValidationError: Configuração inválida
+    """
+    path = Path(path or _CONFIG_PATH).resolve()
+    overlay = tuned_path(path)
+    signature = (*_signature(path), *_signature(overlay))
+    if signature[1] < 0:
+        raise FileNotFoundError(path)
+    cached = _FILE_CACHE.get(path)
+    if cached is None or cached[0] != signature:
+        raw = _read_yaml(path)
+        if signature[3] >= 0:
+            raw = _merge(raw, _read_yaml(overlay))
+        cached = (signature, AppConfig.model_validate(raw))
+        _FILE_CACHE[path] = cached
+    config = cached[1]
+
+    if not overrides:
+        return config
+
+    key = (config.hash, json.dumps(overrides, sort_keys=True, default=str))
+    if key not in _OVERRIDE_CACHE:
+        if len(_OVERRIDE_CACHE) >= _OVERRIDE_CACHE_SIZE:
+            _OVERRIDE_CACHE.pop(next(iter(_OVERRIDE_CACHE)))
+        _OVERRIDE_CACHE[key] = AppConfig.model_validate(_merge(config.as_dict(), _expand(overrides)))
+    return _OVERRIDE_CACHE[key]
+
+def parse_override(item: str) -> Tuple[str, Any]:
+    """
+    Interpreta um override de linha de comando ("finance.cost_rate=0.2").
+
+    O valor é lido como YAML (números, booleanos, null, listas).
+    """
+    if "=" not in item:
+        raise ValueError(f"Override inválido (use secao.campo=valor): {item}")
+    key, value = item.split("=", 1)
+    return key.strip(), yaml.safe_load(value)
 
+def load_config(path: Path = None, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Carrega configuração do arquivo YAML (validada; ver load_app_config)."""
+    return load_app_config(path, overrides).as_dict()
@@ -1,29 +1,176 @@
 """Schemas Pydantic para validação de dados."""
-from pydantic import BaseModel, Field
-from typing import Optional
+import hashlib
+import json
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from datetime import datetime
 
+# Regiões/submercados aceitos
+Region = Literal["SE", "S", "NE", "N", "CO"]
+
 class EnergySample(BaseModel):
-    """Schema para amostra de energia."""
+    """
+    Schema para amostra de energia.
+    
+    As restrições declaradas aqui (limites `ge`/`le`, regiões permitidas,
+    campos obrigatórios) também são aplicadas em lote a DataFrames por
+    `src.data.validation.validate_frame`.
+    """
     timestamp: datetime
-    region: str = Field(..., description="Região (SE, S, NE, N, CO)")
+    region: Region = Field(..., description="Região (SE, S, NE, N, CO)")
     consumption_kwh: float = Field(..., ge=0, description="Consumo em kWh")
     production_kwh: float = Field(..., ge=0, description="Produção em kWh")
     temp_c: Optional[float] = Field(None, description="Temperatura em Celsius")
     wind_ms: Optional[float] = Field(None, ge=0, description="Velocidade do vento em m/s")
     ghi_wm2: Optional[float] = Field(None, ge=0, description="Irradiação solar global horizontal em W/m²")
     pld_brl_mwh: Optional[float] = Field(None, ge=0, description="PLD em R$/MWh")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class FinanceParams(BaseModel):
     """Parâmetros financeiros para cálculo de lucro."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     sell_price_brl_per_kwh: float = Field(0.75, ge=0, description="Preço de venda em R$/kWh")
     buy_price_brl_per_kwh: float = Field(0.90, ge=0, description="Preço de compra em R$/kWh")
     cost_rate: float = Field(0.10, ge=0, le=1, description="Taxa de custo fixo (0-1)")
     submercado: str = Field("SE", description="Submercado")
     use_pld: bool = Field(True, description="Usar PLD quando disponível")
 
+
+class DataConfig(BaseModel):
+    """Seção `data`: fontes e localização."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    region: str = Field("SE", description="Região (SE, S, NE, N, CO)")
+    submercado: str = Field("SE", description="Submercado do PLD")
+    inmet_station: str = Field("auto", description="Estação INMET ou 'auto'")
+    cache_dir: Optional[str] = Field("data/raw", description="Diretório de cache dos conectores")
+    openweather_api_key: Optional[str] = Field(None, description="Chave OpenWeatherMap")
+    lat: Optional[float] = Field(None, ge=-90, le=90, description="Latitude do site")
+    lon: Optional[float] = Field(None, ge=-180, le=180, description="Longitude do site")
+    partitioned_dir: Optional[str] = Field(
+        None, description="Histórico em Parquet particionado (modo out-of-core do pipeline)"
+    )
+
+class SelectionConfig(BaseModel):
+    """Seção `model.selection`: escolha automática do algoritmo (algo "auto")."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    metric: Literal["MAE", "RMSE", "MAPE", "sMAPE", "MASE"] = "MAE"
+    candidates: List[str] = Field(default_factory=list, description="Algoritmos avaliados (vazio: todos os disponíveis)")
+    window_days: int = Field(90, ge=14, description="Histórico recente usado no backtest")
+    folds: int = Field(3, ge=1)
+    tolerance: float = Field(0.05, ge=0, description="Folga relativa para preferir um algoritmo mais barato")
+    ttl_hours: float = Field(24.0, gt=0, description="Validade da escolha em cache")
+
+class ModelConfig(BaseModel):
+    """Seção `model`: algoritmos e horizonte."""
+    model_config = ConfigDict(frozen=True, extra="forbid", protected_namespaces=())
+    
+    horizon_days: int = Field(14, ge=1, description="Horizonte de previsão (dias)")
+    algo_consumption: str = Field("prophet", description="Algoritmo de consumo (\"auto\": seleção por backtest)")
+    algo_production: str = Field("xgboost", description="Algoritmo de produção (\"auto\": seleção por backtest)")
+    selection: SelectionConfig = SelectionConfig()
+    tuned: Dict[str, Dict[str, Dict[str, Any]]] = Field(
+        default_factory=dict,
+        description="Ajuste por região e série: {região: {consumption|production: {algo, params, ...}}}"
+    )
+    
+    def resolve(self, region: str, series: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Algoritmo e hiperparâmetros de uma série, preferindo o ajuste da região.
+        
+        Args:
+            region: Região/submercado
+            series: "consumption" ou "production"
+        
+        Returns:
+            Tupla (algo, params)
+        """
+        default = self.algo_consumption if series == "consumption" else self.algo_production
+        tuned = self.tuned.get(region, {}).get(series)
+        if not tuned:
+            return default, {}
+        return tuned.get("algo", default), dict(tuned.get("params", {}))
+
+class DecisionParams(BaseModel):
+    """Seção `decisions`: parâmetros do DecisionEngine."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    buffer_kwh: float = Field(1.0, ge=0, description="Buffer de segurança (kWh)")
+    pld_premium_threshold_brl_mwh: float = Field(50.0, ge=0, description="Limiar de prêmio PLD (R$/MWh)")
+
+class VizConfig(BaseModel):
+    """Seção `viz`: exportação de gráficos."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    dpi: int = Field(300, ge=10)
+    tight_bbox: bool = True
+    decimation: Literal["minmax", "lttb", "none"] = "minmax"
+    workers: int = Field(1, ge=1)
+    deferred: bool = False
+
+class IngestSourceConfig(BaseModel):
+    """Fonte do daemon de ingestão."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    enabled: bool = True
+    interval_s: Optional[float] = Field(None, gt=0)
+    min_call_interval_s: Optional[float] = Field(None, ge=0)
+
+class IngestConfig(BaseModel):
+    """Seção `ingest`: daemon de ingestão."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    backfill_days: int = Field(365, ge=1)
+    sources: Dict[Literal["ons", "ccee", "inmet", "pvgis", "openweather"], IngestSourceConfig] = {}
+
+class DriftConfig(BaseModel):
+    """Seção `drift`: re-treino apenas quando dados ou erros mudam."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    enabled: bool = True
+    columns: List[str] = Field(default_factory=lambda: ["ghi_wm2", "temp_c", "consumption_kwh"])
+    psi_threshold: float = Field(0.25, gt=0)
+    ks_alpha: float = Field(0.01, gt=0, lt=1)
+    error_ratio: float = Field(1.5, gt=0, description="Erro recente / erro de validação que dispara re-treino")
+    max_age_days: int = Field(7, ge=0, description="Dias de dados novos tolerados sem re-treino")
+    window_days: int = Field(30, ge=1)
+    min_rows: int = Field(7, ge=1)
+
+class PortfolioConfig(BaseModel):
+    """Seção `portfolio`: modo carteira."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    workers: int = Field(1, ge=1)
+    batch_size: int = Field(50, ge=1)
+    grid_resolution_deg: float = Field(0.25, gt=0)
+
+class AppConfig(BaseModel):
+    """
+    Configuração completa do projeto (config/default.yaml), validada e imutável.
+    
+    `hash` identifica o conteúdo (após overrides) e pode ser usado como chave
+    de cache por outras etapas; `as_dict()` devolve o formato de dicionário
+    aninhado consumido pelos módulos que leem seções com `.get()`.
+    """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
+    data: DataConfig = DataConfig()
+    model: ModelConfig = ModelConfig()
+    finance: FinanceParams = FinanceParams()
+    decisions: DecisionParams = DecisionParams()
+    viz: VizConfig = VizConfig()
+    ingest: IngestConfig = IngestConfig()
+    portfolio: PortfolioConfig = PortfolioConfig()
+    drift: DriftConfig = DriftConfig()
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Configuração como dicionário aninhado (cópia)."""
+        return self.model_dump()
+    
+    @cached_property
+    def hash(self) -> str:
+        """Hash SHA-256 (16 caracteres) do conteúdo canônico da configuração."""
+        canonical = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
@@ -4,6 +4,9 @@ import requests
 from pathlib import Path
 from typing import Optional
 
+from ..utils.profiling import instrument
+
+@instrument()
 def fetch_aneel_gd(cache_dir: Optional[Path] = None) -> pd.DataFrame:
     """
     Busca dados de geração distribuída da ANEEL.
@@ -5,6 +5,13 @@ from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+from ..utils.profiling import instrument
+from .dtypes import enforce_dtypes
+from .timezones import PROJECT_TZ
+from .synthetic import mark_simulated, simulate_pld
+
+@instrument()
+@enforce_dtypes(PROJECT_TZ, source="ccee")
 def fetch_pld(
     submercado: str,
     start: str,
@@ -55,19 +62,12 @@ def fetch_pld(
     else:
         dates = pd.date_range(start=start_date, end=end_date, freq="H")
     
-    import numpy as np
-    np.random.seed(42)
-    
-    # PLD médio varia entre 100-500 BRL/MWh com padrão sazonal
-    pld_base = 300
-    seasonal = np.sin(np.arange(len(dates)) * 2 * np.pi / 365) * 100
-    pld_variation = np.random.normal(0, 50, len(dates))
-    
-    df = pd.DataFrame({
+    # PLD com sazonalidade hidrológica, limitado ao piso/teto regulatório
+    df = mark_simulated(pd.DataFrame({
         "timestamp": dates,
-        "pld_brl_mwh": np.maximum(50, pld_base + seasonal + pld_variation),
+        "pld_brl_mwh": simulate_pld(dates, submercado),
         "submercado": submercado
-    })
+    }))
     
     if cache_dir:
         cache_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,108 @@
+"""
+Política de tipos dos DataFrames do pipeline.
+
+Aplicada na ingestão (conectores) e mantida em merge, engenharia de
+atributos e gravação de resultados:
+
+- medições em ponto flutuante: float32 (valores monetários `*_brl` em float64,
+  inclusive quando calculados em float32);
+- identificadores textuais repetidos (região, submercado, estação, site,
+  decisão): category;
+- timestamp: datetime64 com fuso explícito (src.data.timezones.PROJECT_TZ nos
+  conectores).
+
+Em séries horárias de vários anos e vários sites, isso reduz a memória
+aproximadamente à metade.
+"""
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .timezones import SOURCE_TZ, align_timestamps
+
+FLOAT_DTYPE = np.float32
+
+# Identificadores repetidos em todas as linhas
+CATEGORY_COLUMNS = ("region", "submercado", "station_id", "site_id", "source", "decision")
+
+# Sufixos mantidos em float64 (somas monetárias exigem precisão de centavos)
+FLOAT64_SUFFIXES = ("_brl",)
+
+TIMESTAMP_COLUMNS = ("timestamp",)
+
+
+def apply_dtypes(
+    df: pd.DataFrame,
+    tz: Optional[str] = None,
+    category_columns: Iterable[str] = CATEGORY_COLUMNS,
+    source_tz: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Aplica a política de tipos às colunas de um DataFrame (no próprio objeto).
+
+    Colunas já no tipo da política não são convertidas.
+
+    Args:
+        df: Dados
+        tz: Fuso dos timestamps (com fuso são convertidos); None mantém o
+            fuso atual
+        category_columns: Colunas textuais convertidas em category
+        source_tz: Fuso em que timestamps ingênuos foram publicados
+            (padrão: `tz`; ver src.data.timezones)
+
+    Returns:
+        O próprio DataFrame, com os tipos ajustados
+    """
+    category_columns = set(category_columns)
+    for col in df.columns:
+        series = df[col]
+        if col in TIMESTAMP_COLUMNS:
+            converted = series
+            if not pd.api.types.is_datetime64_any_dtype(converted):
+                converted = pd.to_datetime(converted)
+            if tz is not None:
+                converted = align_timestamps(converted, tz, source_tz)
+            # align_timestamps devolve o próprio objeto se já estiver no fuso
+            if converted is not series:
+                df[col] = converted
+        elif col in category_columns:
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                df[col] = series.astype("category")
+        elif col.endswith(FLOAT64_SUFFIXES):
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) and series.dtype != np.float64:
+                df[col] = series.astype(np.float64)
+        elif pd.api.types.is_float_dtype(series) and series.dtype != FLOAT_DTYPE:
+            df[col] = series.astype(FLOAT_DTYPE)
+    return df
+
+
+def enforce_dtypes(tz: Optional[str] = None, source: Optional[str] = None) -> Callable:
+    """
+    Decorator que aplica a política de tipos ao DataFrame retornado (ex: conectores).
+
+    Args:
+        tz: Fuso dos timestamps (ver apply_dtypes)
+        source: Fonte dos dados (chave de timezones.SOURCE_TZ); define o fuso
+            dos timestamps ingênuos, inclusive os de arquivos de cache antigos
+    """
+    source_tz = SOURCE_TZ[source] if source is not None else None
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if isinstance(result, pd.DataFrame):
+                return apply_dtypes(result, tz=tz, source_tz=source_tz)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """Memória ocupada pelo DataFrame (MB, incluindo strings)."""
+    return float(df.memory_usage(deep=True).sum() / 1024 ** 2)
@@ -0,0 +1,63 @@
+"""
+Troca de resultados entre estágios em Arrow, sem cópias.
+
+Tabelas Arrow são serializadas entre processos como buffers contíguos (sem
+pickle coluna a coluna) e podem ser gravadas em Parquet sem nova conversão.
+Na volta para pandas, `split_blocks` evita a consolidação em blocos 2D, de
+modo que colunas numéricas sem nulos viram visões dos buffers Arrow.
+"""
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from .dtypes import apply_dtypes
+
+
+def to_arrow(df: pd.DataFrame):
+    """
+    Converte um DataFrame em tabela Arrow (sem o índice).
+
+    Args:
+        df: Dados (tipos conforme src.data.dtypes)
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def from_arrow(table) -> pd.DataFrame:
+    """
+    Converte uma tabela Arrow em DataFrame com o mínimo de cópias.
+
+    Colunas numéricas sem nulos são visões somente leitura dos buffers;
+    dicionários viram category (política de src.data.dtypes).
+
+    Args:
+        table: pyarrow.Table
+
+    Returns:
+        DataFrame
+    """
+    return apply_dtypes(table.to_pandas(split_blocks=True, zero_copy_only=False))
+
+
+def column_view(data: Union[pd.DataFrame, "object"], column: str) -> np.ndarray:
+    """
+    Coluna como array NumPy, sem cópia quando possível.
+
+    Args:
+        data: DataFrame ou pyarrow.Table
+        column: Nome da coluna
+
+    Returns:
+        Array NumPy (visão dos dados de origem se o tipo permitir)
+    """
+    if isinstance(data, pd.DataFrame):
+        return data[column].to_numpy()
+    chunked = data.column(column)
+    array = chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()
+    return array.to_numpy(zero_copy_only=False)
@@ -0,0 +1,449 @@
+"""
+Daemon assíncrono de ingestão que mantém o cache de dados atualizado.
+
+Cada fonte configurada (ONS, CCEE, INMET, PVGIS, OpenWeatherMap) é
+consultada periodicamente apenas pelo intervalo ainda não ingerido (delta),
+respeitando um intervalo mínimo entre chamadas por fonte. Os dados são
+consolidados em um Parquet por série em `<cache_dir>/ingest/`, lido pelo
+`load_data_with_fallback` antes de qualquer acesso à rede. Dados simulados
+pelos conectores (fonte indisponível) não são gravados. O estado de cada
+série (última ingestão, erro, atraso) fica em `status.json`.
+
+Uso:
+    python -m src.data.ingest                # executa continuamente
+    python -m src.data.ingest --once         # um ciclo de todas as fontes
+    python -m src.data.ingest --status       # mostra o estado das séries
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .ccee import fetch_pld
+from .inmet import fetch_inmet
+from .ons import fetch_ons_load
+from .openweather import fetch_weather_owm
+from .pvgis import fetch_pvgis_ghi
+from .spatial import GRID_RESOLUTION_DEG, resolve_station, snap_to_grid
+from .synthetic import is_simulated
+from .timezones import SOURCE_TZ, align_timestamps, project_timestamp
+
+# Padrões por fonte: intervalo entre ciclos e intervalo mínimo entre chamadas
+# (limite de taxa). OpenWeatherMap gratuito: 1000 chamadas/dia.
+SOURCE_DEFAULTS: Dict[str, Dict[str, float]] = {
+    "ons": {"interval_s": 3600, "min_call_interval_s": 5},
+    "ccee": {"interval_s": 3600, "min_call_interval_s": 5},
+    "inmet": {"interval_s": 3600, "min_call_interval_s": 2},
+    "pvgis": {"interval_s": 86400, "min_call_interval_s": 2},
+    "openweather": {"interval_s": 1800, "min_call_interval_s": 90},
+}
+
+# Dias re-ingeridos antes do último registro (correções tardias das fontes)
+DEFAULT_OVERLAP_DAYS = 2
+DEFAULT_BACKFILL_DAYS = 365
+
+
+def source_key(source: str, **params: Any) -> str:
+    """
+    Nome da série ingerida para uma fonte e seus parâmetros.
+
+    Args:
+        source: Fonte ("ons", "ccee", "inmet", "pvgis", "openweather")
+        **params: region / submercado / station / lat, lon (e resolution_deg)
+
+    Returns:
+        Chave usada como nome do arquivo (ex: "ccee_SE", "pvgis_-23.6250_-46.6250");
+        coordenadas são ajustadas à grade de clima, como nos conectores
+    """
+    if source == "ons":
+        return f"ons_{params['region']}"
+    if source == "ccee":
+        return f"ccee_{params['submercado']}"
+    if source == "inmet":
+        return f"inmet_{params['station']}"
+    if source in ("pvgis", "openweather"):
+        lat, lon = snap_to_grid(params['lat'], params['lon'], params.get('resolution_deg', GRID_RESOLUTION_DEG))
+        return f"{source}_{lat:.4f}_{lon:.4f}"
+    raise ValueError(f"Fonte de ingestão desconhecida: {source}")
+
+
+class IngestStore:
+    """
+    Séries ingeridas consolidadas em Parquet (uma por fonte/parâmetros).
+
+    Escritas são atômicas (arquivo temporário + rename), de modo que o
+    pipeline pode ler enquanto o daemon grava.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Diretório das séries (ex: data/raw/ingest)
+        """
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.parquet"
+
+    def last_timestamp(self, key: str) -> Optional[pd.Timestamp]:
+        """Último timestamp ingerido da série (None se vazia)."""
+        path = self.path(key)
+        if not path.exists():
+            return None
+        ts = pd.read_parquet(path, columns=["timestamp"])["timestamp"]
+        return ts.max() if len(ts) else None
+
+    def merge(self, key: str, df: pd.DataFrame) -> int:
+        """
+        Incorpora novos registros à série (substitui timestamps repetidos).
+
+        Args:
+            key: Série
+            df: Registros com coluna timestamp
+
+        Returns:
+            Número total de linhas da série
+        """
+        with self._lock:
+            path = self.path(key)
+            if path.exists():
+                stored = pd.read_parquet(path)
+                tz = df["timestamp"].dt.tz
+                if tz is not None and stored["timestamp"].dt.tz is None:
+                    # Série gravada antes do alinhamento de fuso: converter
+                    source = key.split("_", 1)[0]
+                    stored["timestamp"] = align_timestamps(stored["timestamp"], str(tz), SOURCE_TZ.get(source))
+                df = pd.concat([stored, df], ignore_index=True)
+            df = (
+                df.drop_duplicates(subset="timestamp", keep="last")
+                .sort_values("timestamp")
+                .reset_index(drop=True)
+            )
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".parquet.tmp")
+            df.to_parquet(tmp, index=False)
+            tmp.replace(path)
+            return len(df)
+
+    def read(self, key: str, start: str, end: str, max_lag_days: int = 1) -> Optional[pd.DataFrame]:
+        """
+        Recorte [start, end] da série, se ela cobrir o período.
+
+        Args:
+            key: Série
+            start: Data inicial (YYYY-MM-DD)
+            end: Data final (YYYY-MM-DD)
+            max_lag_days: Atraso tolerado no fim do período (dados do dia
+                corrente costumam ainda não estar publicados)
+
+        Returns:
+            DataFrame ou None se a série não existir ou não cobrir o período
+        """
+        path = self.path(key)
+        if not path.exists():
+            return None
+        import pyarrow.parquet as pq
+
+        # Limites no fuso da série gravada (datas são dias civis locais)
+        tz = pq.read_schema(path).field("timestamp").type.tz
+        start_ts = pd.Timestamp(start, tz=tz)
+        end_ts = pd.Timestamp(end, tz=tz) + pd.Timedelta(days=1)
+        df = pd.read_parquet(path, filters=[("timestamp", "<", end_ts)])
+        if df.empty or df["timestamp"].min() > start_ts:
+            return None
+        if df["timestamp"].max() < end_ts - pd.Timedelta(days=1 + max_lag_days):
+            return None
+        return df[df["timestamp"] >= start_ts].reset_index(drop=True)
+
+    def read_status(self) -> Dict[str, Any]:
+        path = self.root / "status.json"
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def write_status(self, status: Dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / "status.json.tmp"
+        tmp.write_text(json.dumps(status, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        tmp.replace(self.root / "status.json")
+
+
+class RateLimiter:
+    """Garante um intervalo mínimo entre chamadas a uma mesma fonte."""
+
+    def __init__(self, min_interval_s: float):
+        self.min_interval_s = min_interval_s
+        self._last = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            delay = self._last + self.min_interval_s - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last = time.monotonic()
+
+
+class IngestJob:
+    """Série a ingerir: fonte, parâmetros do conector e periodicidade."""
+
+    def __init__(
+        self,
+        source: str,
+        params: Dict[str, Any],
+        interval_s: Optional[float] = None,
+        backfill_days: int = DEFAULT_BACKFILL_DAYS,
+        overlap_days: int = DEFAULT_OVERLAP_DAYS
+    ):
+        """
+        Args:
+            source: Fonte ("ons", "ccee", "inmet", "pvgis", "openweather")
+            params: Parâmetros do conector (region, submercado, station, lat/lon,
+                resolution_deg, api_key)
+            interval_s: Intervalo entre ciclos (padrão por fonte)
+            backfill_days: Histórico buscado na primeira ingestão
+            overlap_days: Dias re-ingeridos antes do último registro
+        """
+        if source not in SOURCE_DEFAULTS:
+            raise ValueError(f"Fonte de ingestão desconhecida: {source}")
+        self.source = source
+        self.params = params
+        self.interval_s = interval_s or SOURCE_DEFAULTS[source]["interval_s"]
+        self.backfill_days = backfill_days
+        self.overlap_days = overlap_days
+        self.key = source_key(source, **params)
+
+    def fetch(self, start: str, end: str) -> pd.DataFrame:
+        """Chamada (bloqueante) ao conector da fonte, sem cache próprio."""
+        p = self.params
+        if self.source == "ons":
+            return fetch_ons_load(p["region"], start, end)
+        if self.source == "ccee":
+            return fetch_pld(p["submercado"], start, end, p.get("granularity", "diario"))
+        if self.source == "inmet":
+            return fetch_inmet(p["station"], start, end)
+        resolution_deg = p.get("resolution_deg", GRID_RESOLUTION_DEG)
+        if self.source == "pvgis":
+            return fetch_pvgis_ghi(p["lat"], p["lon"], start, end, resolution_deg=resolution_deg)
+        return fetch_weather_owm(p["lat"], p["lon"], start, end, p["api_key"], resolution_deg=resolution_deg)
+
+
+def build_jobs(config: Dict[str, Any]) -> List[IngestJob]:
+    """
+    Séries a ingerir a partir da configuração do projeto.
+
+    Usa a seção `ingest` (fontes habilitadas, intervalos, backfill) e os
+    parâmetros de `data` (região, submercado, estação, coordenadas, chave).
+
+    Args:
+        config: Configuração carregada de default.yaml
+
+    Returns:
+        Lista de jobs
+    """
+    data_config = config.get('data', {})
+    ingest_config = config.get('ingest', {})
+    sources = ingest_config.get('sources', {})
+    backfill_days = ingest_config.get('backfill_days', DEFAULT_BACKFILL_DAYS)
+    lat, lon = data_config.get('lat'), data_config.get('lon')
+    api_key = data_config.get('openweather_api_key')
+
+    params = {
+        "ons": {"region": data_config.get('region', 'SE')},
+        "ccee": {"submercado": data_config.get('submercado', 'SE')},
+        "inmet": {"station": resolve_station(data_config.get('inmet_station'), lat, lon)},
+        "pvgis": {"lat": lat, "lon": lon} if lat is not None and lon is not None else None,
+        "openweather": (
+            {"lat": lat, "lon": lon, "api_key": api_key}
+            if api_key and lat is not None and lon is not None else None
+        ),
+    }
+
+    jobs = []
+    for source, source_params in params.items():
+        options = sources.get(source, {})
+        if source_params is None or not options.get('enabled', True):
+            continue
+        jobs.append(IngestJob(
+            source,
+            source_params,
+            interval_s=options.get('interval_s'),
+            backfill_days=backfill_days
+        ))
+    return jobs
+
+
+class IngestDaemon:
+    """
+    Agendador asyncio das séries: um laço por job, chamadas de rede em
+    threads (`asyncio.to_thread`) e limite de taxa por fonte.
+    """
+
+    def __init__(
+        self,
+        jobs: List[IngestJob],
+        store: IngestStore,
+        rate_limits: Optional[Dict[str, float]] = None,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        """
+        Args:
+            jobs: Séries a ingerir
+            store: Destino das séries
+            rate_limits: Intervalo mínimo entre chamadas por fonte (s)
+            clock: Relógio (substituível em testes)
+        """
+        self.jobs = jobs
+        self.store = store
+        self.clock = clock
+        limits = {source: d["min_call_interval_s"] for source, d in SOURCE_DEFAULTS.items()}
+        limits.update(rate_limits or {})
+        self.limiters = {source: RateLimiter(interval) for source, interval in limits.items()}
+        self.status: Dict[str, Any] = store.read_status()
+
+    def _window(self, job: IngestJob) -> tuple:
+        """Intervalo [start, end] ainda não ingerido (com sobreposição)."""
+        today = self.clock().date()
+        last = self.store.last_timestamp(job.key)
+        if last is None:
+            start = today - timedelta(days=job.backfill_days)
+        else:
+            start = min(last.date() - timedelta(days=job.overlap_days), today)
+        return start.isoformat(), today.isoformat()
+
+    async def run_job(self, job: IngestJob) -> Dict[str, Any]:
+        """
+        Um ciclo de ingestão de uma série.
+
+        Returns:
+            Estado atualizado da série
+        """
+        start, end = self._window(job)
+        state = dict(self.status.get(job.key, {}), source=job.source, interval_s=job.interval_s)
+        await self.limiters[job.source].wait()
+        t0 = time.perf_counter()
+        try:
+            df = await asyncio.to_thread(job.fetch, start, end)
+            if is_simulated(df):
+                # Fallback simulado do conector: não é gravado como dado observado
+                state.update({
+                    "last_simulated_at": self.clock().isoformat(timespec="seconds"),
+                    "simulated": True,
+                    "error": None
+                })
+                print(f"[AVISO] Ingestao {job.key}: fonte indisponivel, dados simulados descartados")
+            else:
+                rows = await asyncio.to_thread(self.store.merge, job.key, df)
+                last = self.store.last_timestamp(job.key)
+                state.update({
+                    "last_success": self.clock().isoformat(timespec="seconds"),
+                    "last_window": [start, end],
+                    "fetched_rows": len(df),
+                    "rows": rows,
+                    "last_timestamp": str(last),
+                    "fetch_s": round(time.perf_counter() - t0, 3),
+                    "simulated": False,
+                    "error": None
+                })
+        except Exception as e:
+            state.update({
+                "last_error_at": self.clock().isoformat(timespec="seconds"),
+                "error": f"{type(e).__name__}: {e}"
+            })
+            print(f"[AVISO] Ingestao {job.key} falhou: {e}")
+        self.status[job.key] = state
+        self.store.write_status(self.status)
+        return state
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Um ciclo de todas as séries (concorrente entre fontes)."""
+        await asyncio.gather(*(self.run_job(job) for job in self.jobs))
+        return self.health()
+
+    async def _loop(self, job: IngestJob, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await self.run_job(job)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=job.interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Executa continuamente até `stop` ser sinalizado."""
+        stop = stop or asyncio.Event()
+        await asyncio.gather(*(self._loop(job, stop) for job in self.jobs))
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Estado das séries com atraso dos dados.
+
+        Returns:
+            {série: {..., "lag_hours", "stale"}} — `stale` indica que a
+            última ingestão bem-sucedida é mais antiga que 2 ciclos ou que
+            o último ciclo só obteve dados simulados
+        """
+        now = self.clock()
+        report = {}
+        for job in self.jobs:
+            state = dict(self.status.get(job.key, {}))
+            last_ts = state.get("last_timestamp")
+            last_ok = state.get("last_success")
+            state["lag_hours"] = (
+                round((now - project_timestamp(last_ts).tz_localize(None).to_pydatetime()).total_seconds() / 3600, 2)
+                if last_ts and last_ts != "None" else None
+            )
+            state["stale"] = (
+                last_ok is None
+                or state.get("simulated", False)
+                or (now - datetime.fromisoformat(last_ok)).total_seconds() > 2 * job.interval_s
+            )
+            report[job.key] = state
+        return report
+
+
+def main():
+    from src.config import load_config
+
+    parser = argparse.ArgumentParser(description="Daemon de ingestão de dados (mantém o cache atualizado)")
+    parser.add_argument("--config", type=Path, default=None, help="Arquivo de configuração YAML")
+    parser.add_argument("--once", action="store_true", help="Executar um único ciclo e sair")
+    parser.add_argument("--status", action="store_true", help="Mostrar o estado das séries e sair")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    cache_dir = Path(config.get('data', {}).get('cache_dir') or 'data/raw')
+    store = IngestStore(cache_dir / "ingest")
+    jobs = build_jobs(config)
+    rate_limits = {
+        source: options['min_call_interval_s']
+        for source, options in config.get('ingest', {}).get('sources', {}).items()
+        if 'min_call_interval_s' in options
+    }
+    daemon = IngestDaemon(jobs, store, rate_limits=rate_limits)
+
+    if args.status:
+        print(json.dumps(daemon.health(), indent=2, ensure_ascii=False))
+        return
+
+    print(f"[OK] Ingestao de {len(jobs)} series em {store.root}: {', '.join(job.key for job in jobs)}")
+    if args.once:
+        health = asyncio.run(daemon.run_once())
+        failed = [key for key, state in health.items() if state.get("error")]
+        print(f"[OK] Ciclo concluido ({len(health) - len(failed)} ok, {len(failed)} com erro)")
+        return
+
+    try:
+        asyncio.run(daemon.run())
+    except KeyboardInterrupt:
+        print("[OK] Ingestao encerrada")
+
+
+if __name__ == "__main__":
+    main()
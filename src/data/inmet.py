@@ -6,6 +6,14 @@ from typing import Optional
 from datetime import datetime, timedelta
 import time
 
+from ..utils.profiling import instrument
+from .dtypes import enforce_dtypes
+from .timezones import PROJECT_TZ
+from .synthetic import mark_simulated, simulate_climate
+from .spatial import INMET_STATIONS
+
+@instrument()
+@enforce_dtypes(PROJECT_TZ, source="inmet")
 def fetch_inmet(
     station_id: str,
     start: str,
@@ -41,17 +49,14 @@ def fetch_inmet(
     end_date = datetime.strptime(end, "%Y-%m-%d")
     dates = pd.date_range(start=start_date, end=end_date, freq="D")
     
-    # Dados simulados baseados em padrões sazonais
-    import numpy as np
-    np.random.seed(42)
-    
-    df = pd.DataFrame({
-        "timestamp": dates,
-        "temp_c": 25 + 5 * np.sin(np.arange(len(dates)) * 2 * np.pi / 365) + np.random.normal(0, 2, len(dates)),
-        "wind_ms": 5 + 2 * np.random.randn(len(dates)),
-        "ghi_wm2": 800 * np.maximum(0, np.sin(np.arange(len(dates)) * np.pi / 365)) + np.random.normal(0, 100, len(dates)),
-        "station_id": station_id
-    })
+    # Dados simulados baseados em padrões sazonais, na latitude da estação
+    known = INMET_STATIONS.index[INMET_STATIONS["station_id"] == station_id]
+    if len(known):
+        df = simulate_climate(dates, INMET_STATIONS.at[known[0], "lat"], site=int(known[0]))
+    else:
+        df = simulate_climate(dates)
+    df["station_id"] = station_id
+    mark_simulated(df)
     
     if cache_dir:
         cache_dir.mkdir(parents=True, exist_ok=True)
@@ -3,15 +3,44 @@ import pandas as pd
 from pathlib import Path
 from typing import Tuple, Optional
 from datetime import datetime, timedelta
-import numpy as np
 
 from .inmet import fetch_inmet
 from .ons import fetch_ons_load
 from .ccee import fetch_pld
 from .pvgis import fetch_pvgis_ghi
 from .openweather import fetch_weather_owm
+from .synthetic import is_simulated, simulate_climate, simulate_consumption, simulate_production
+from .ingest import IngestStore, source_key
+from .spatial import nearest_station_climate, resolve_station
+from .dtypes import apply_dtypes
+from .timezones import PROJECT_TZ, SOURCE_TZ, local_range
 import yaml
 
+def _ingested(cache_dir: Path, source: str, start: str, end: str, **params) -> Optional[pd.DataFrame]:
+    """Série mantida pelo daemon de ingestão (None se ausente, incompleta ou simulada)."""
+    df = IngestStore(cache_dir / "ingest").read(source_key(source, **params), start, end)
+    if is_simulated(df):
+        # Gravada antes de os conectores marcarem o fallback: não é dado observado
+        print(f"[AVISO] {source.upper()}: ingestao local contem dados simulados; ignorada")
+        return None
+    if df is not None:
+        print(f"[OK] {source.upper()}: dados lidos da ingestao local ({len(df)} registros)")
+        df = apply_dtypes(df, tz=PROJECT_TZ, source_tz=SOURCE_TZ[source])
+    return df
+
+def _station_climate(
+    inmet_station: Optional[str],
+    lat: Optional[float],
+    lon: Optional[float],
+    start: str,
+    end: str,
+    cache_dir: Path
+) -> pd.DataFrame:
+    """Clima INMET da estação informada ou, com "auto", das estações mais próximas (IDW)."""
+    if (not inmet_station or inmet_station == "auto") and lat is not None and lon is not None:
+        return nearest_station_climate(lat, lon, start, end, cache_dir)
+    return fetch_inmet(resolve_station(inmet_station, lat, lon), start, end, cache_dir)
+
 def load_data_with_fallback(
     start: str,
     end: str,
@@ -22,11 +51,29 @@ def load_data_with_fallback(
     use_real_data: bool = True,
     lat: Optional[float] = None,
     lon: Optional[float] = None,
-    openweather_api_key: Optional[str] = None
+    openweather_api_key: Optional[str] = None,
+    pld_df: Optional[pd.DataFrame] = None,
+    climate_df: Optional[pd.DataFrame] = None,
+    capacity_kwp: float = 25.0,
+    base_kwh_day: float = 100.0,
+    site: int = 0
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Carrega dados de múltiplas fontes com fallback para simulação.
     
+    Séries mantidas pelo daemon de ingestão (`python -m src.data.ingest`)
+    em `<cache_dir>/ingest` têm prioridade sobre os conectores, evitando
+    acesso à rede quando o cache local cobre o período. Todas as séries
+    retornam com timestamps no fuso do projeto (src.data.timezones).
+    
+    Args:
+        pld_df: PLD já carregado (ex: compartilhado por sites do mesmo submercado)
+        climate_df: Clima já carregado (ex: compartilhado por sites da mesma célula)
+        capacity_kwp: Potência instalada do site (produção simulada)
+        base_kwh_day: Consumo médio diário do site (consumo simulado)
+        site: Identificador do site (fluxos aleatórios da simulação)
+        inmet_station: Estação INMET ou "auto" (estações mais próximas de lat/lon)
+    
     Returns:
         Tuple[consumption_df, production_df, pld_df, climate_df]
     """
@@ -35,18 +82,27 @@ def load_data_with_fallback(
     
     consumption_df = None
     production_df = None
-    pld_df = None
-    climate_df = None
     
     if use_real_data:
         try:
             # Tentar carregar dados reais
-            ons_data = fetch_ons_load(region, start, end, cache_dir)
-            pld_df = fetch_pld(submercado, start, end, "diario", cache_dir)
+            ons_data = _ingested(cache_dir, "ons", start, end, region=region)
+            if ons_data is None:
+                ons_data = fetch_ons_load(region, start, end, cache_dir)
+            if pld_df is None:
+                pld_df = _ingested(cache_dir, "ccee", start, end, submercado=submercado)
+            if pld_df is None:
+                pld_df = fetch_pld(submercado, start, end, "diario", cache_dir)
             
             # Clima: tentar OpenWeatherMap primeiro, depois PVGIS, depois INMET
-            climate_df = None
-            if openweather_api_key and lat and lon:
+            if climate_df is None and lat and lon:
+                for source in ("openweather", "pvgis"):
+                    if climate_df is None and (source == "pvgis" or openweather_api_key):
+                        climate_df = _ingested(cache_dir, source, start, end, lat=lat, lon=lon)
+            if climate_df is None:
+                climate_df = _ingested(cache_dir, "inmet", start, end, station=resolve_station(inmet_station, lat, lon))
+            
+            if climate_df is None and openweather_api_key and lat and lon:
                 try:
                     climate_df = fetch_weather_owm(lat, lon, start, end, openweather_api_key, cache_dir)
                     print("[OK] Dados climaticos obtidos via OpenWeatherMap")
@@ -63,7 +119,7 @@ def load_data_with_fallback(
             
             if climate_df is None:
                 try:
-                    climate_df = fetch_inmet(inmet_station, start, end, cache_dir)
+                    climate_df = _station_climate(inmet_station, lat, lon, start, end, cache_dir)
                 except Exception as e:
                     print(f"Aviso: Erro ao buscar INMET ({e})")
             
@@ -88,41 +144,158 @@ def load_data_with_fallback(
         # Fallback: dados simulados
         start_date = datetime.strptime(start, "%Y-%m-%d")
         end_date = datetime.strptime(end, "%Y-%m-%d")
-        dates = pd.date_range(start=start_date, end=end_date, freq="D")
-        
-        np.random.seed(42)
-        n_days = len(dates)
-        
-        # Consumo com padrão semanal
-        weekly = np.sin(np.arange(n_days) * 2 * np.pi / 7)
-        consumption = 100 + 20 * weekly + np.random.normal(0, 5, n_days)
-        
-        # Produção solar com padrão sazonal e GHI
-        if climate_df is not None and "ghi_wm2" in climate_df.columns:
-            ghi_normalized = climate_df["ghi_wm2"].values / 1000
-            production = 110 * ghi_normalized + np.random.normal(0, 10, n_days)
-        else:
-            seasonal = np.sin(np.arange(n_days) * 2 * np.pi / 365)
-            production = 90 + 25 * seasonal + np.random.normal(0, 10, n_days)
-        
-        consumption_df = pd.DataFrame({
-            "timestamp": dates,
-            "consumption_kwh": np.maximum(0, consumption)
-        })
-        
-        production_df = pd.DataFrame({
-            "timestamp": dates,
-            "production_kwh": np.maximum(0, production)
-        })
+        dates = local_range(start_date, end_date, freq="D")
+        site_lat = lat if lat else -23.55
         
+        if pld_df is None:
+            pld_df = _ingested(cache_dir, "ccee", start, end, submercado=submercado)
         if pld_df is None:
             pld_df = fetch_pld(submercado, start, end, "diario", cache_dir)
         
+        if climate_df is None:
+            if lat and lon:
+                climate_df = _ingested(cache_dir, "pvgis", start, end, lat=lat, lon=lon)
+            else:
+                climate_df = _ingested(cache_dir, "inmet", start, end, station=resolve_station(inmet_station, lat, lon))
+        
         if climate_df is None:
             if lat and lon:
                 climate_df = fetch_pvgis_ghi(lat, lon, start, end, cache_dir)
             else:
-                climate_df = fetch_inmet(inmet_station, start, end, cache_dir)
+                climate_df = _station_climate(inmet_station, lat, lon, start, end, cache_dir)
+        
+        # Produção solar derivada do clima disponível (GHI e temperatura),
+        # completando com clima simulado onde faltar
+        simulated_climate = simulate_climate(dates, site_lat, site=site)
+        if climate_df is not None and "ghi_wm2" in climate_df.columns:
+            observed = climate_df.set_index("timestamp").reindex(dates)
+            for col in ("ghi_wm2", "temp_c"):
+                if col in observed.columns:
+                    simulated_climate[col] = observed[col].fillna(
+                        simulated_climate.set_index("timestamp")[col]
+                    ).to_numpy()
+        
+        consumption_df = apply_dtypes(pd.DataFrame({
+            "timestamp": dates,
+            "consumption_kwh": simulate_consumption(dates, base_kwh_day, site=site)
+        }))
+        
+        production_df = apply_dtypes(pd.DataFrame({
+            "timestamp": dates,
+            "production_kwh": simulate_production(simulated_climate, capacity_kwp, lat=site_lat, site=site)
+        }))
     
     return consumption_df, production_df, pld_df, climate_df
 
+def prepare_data(
+    consumption_df: pd.DataFrame,
+    production_df: pd.DataFrame,
+    pld_df: pd.DataFrame,
+    climate_df: pd.DataFrame
+) -> tuple:
+    """
+    Prepara e combina dados para modelagem (tipos conforme src.data.dtypes).
+
+    Os joins são feitos no fuso do projeto; séries sem fuso são
+    interpretadas como horário local.
+    """
+    # Garantir que timestamp está presente
+    for df in [consumption_df, production_df, pld_df, climate_df]:
+        if df is not None and 'timestamp' not in df.columns:
+            if 'date' in df.columns:
+                df['timestamp'] = pd.to_datetime(df['date'])
+            else:
+                df['timestamp'] = local_range('2024-01-01', periods=len(df), freq='D')
+    
+    # Alinhar todas as séries ao fuso do projeto antes dos joins
+    consumption_df, production_df, pld_df, climate_df = (
+        apply_dtypes(df.copy(deep=False), tz=PROJECT_TZ) if df is not None else None
+        for df in (consumption_df, production_df, pld_df, climate_df)
+    )
+
+    # Merge dos dados (cada merge gera um novo DataFrame; a entrada não é alterada)
+    combined = consumption_df
+    
+    if production_df is not None:
+        combined = combined.merge(
+            production_df[['timestamp', 'production_kwh']],
+            on='timestamp',
+            how='outer',
+            suffixes=('', '_prod')
+        )
+    
+    if pld_df is not None:
+        combined = combined.merge(
+            pld_df[['timestamp', 'pld_brl_mwh']],
+            on='timestamp',
+            how='left'
+        )
+    
+    if climate_df is not None:
+        climate_cols = ['timestamp'] + [c for c in climate_df.columns if c != 'timestamp']
+        combined = combined.merge(
+            climate_df[climate_cols],
+            on='timestamp',
+            how='left'
+        )
+    
+    # Ordenar por timestamp
+    combined = combined.sort_values('timestamp').reset_index(drop=True)
+    
+    # Preencher valores faltantes
+    combined = combined.ffill().bfill()
+    
+    return apply_dtypes(combined)
+
+def load_partitioned(
+    dataset,
+    sites: pd.DataFrame,
+    start: str,
+    end: str,
+    cache_dir: Optional[Path] = None,
+    use_real_data: bool = False,
+    region: Optional[str] = None,
+    **loader_kwargs
+) -> int:
+    """
+    Carrega e prepara o histórico de cada site em um dataset particionado.
+    
+    Um site por vez: a memória usada é a do histórico de um site, não a
+    da carteira (ver src.data.partitioned).
+    
+    Args:
+        dataset: PartitionedDataset de destino
+        sites: Tabela de sites (site_id, lat, lon, submercado, capacity_kwp, base_kwh_day)
+        start: Data inicial (YYYY-MM-DD)
+        end: Data final (YYYY-MM-DD)
+        cache_dir: Cache dos conectores
+        use_real_data: Tentar fontes reais antes da simulação
+        region: Região da carga ONS (padrão: submercado do site)
+        **loader_kwargs: Demais parâmetros de load_data_with_fallback
+            (ex: inmet_station, openweather_api_key)
+    
+    Returns:
+        Número de linhas gravadas
+    """
+    rows = 0
+    pld_cache = {}
+    for site in sites.itertuples(index=False):
+        consumption_df, production_df, pld_df, climate_df = load_data_with_fallback(
+            start=start,
+            end=end,
+            region=region or site.submercado,
+            submercado=site.submercado,
+            cache_dir=cache_dir,
+            use_real_data=use_real_data,
+            lat=site.lat,
+            lon=site.lon,
+            pld_df=pld_cache.get(site.submercado),
+            capacity_kwp=site.capacity_kwp,
+            base_kwh_day=getattr(site, "base_kwh_day", site.capacity_kwp * 4),
+            site=int(site.site_id),
+            **loader_kwargs
+        )
+        pld_cache[site.submercado] = pld_df
+        combined = prepare_data(consumption_df, production_df, pld_df, climate_df)
+        rows += dataset.write(combined.assign(site_id=int(site.site_id)))
+    return rows
@@ -5,6 +5,13 @@ from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+from ..utils.profiling import instrument
+from .dtypes import enforce_dtypes
+from .timezones import PROJECT_TZ
+from .synthetic import mark_simulated, simulate_grid_load
+
+@instrument()
+@enforce_dtypes(PROJECT_TZ, source="ons")
 def fetch_ons_load(
     region: str,
     start: str,
@@ -40,19 +47,9 @@ def fetch_ons_load(
     end_date = datetime.strptime(end, "%Y-%m-%d")
     dates = pd.date_range(start=start_date, end=end_date, freq="D")
     
-    import numpy as np
-    np.random.seed(42)
-    
     # Simulação de carga com padrão semanal
-    load_base = 50000  # MW
-    weekly_pattern = np.sin(np.arange(len(dates)) * 2 * np.pi / 7)
-    
-    df = pd.DataFrame({
-        "timestamp": dates,
-        "load_mw": load_base + weekly_pattern * 5000 + np.random.normal(0, 1000, len(dates)),
-        "generation_mw": load_base * 0.95 + np.random.normal(0, 2000, len(dates)),
-        "region": region
-    })
+    df = mark_simulated(simulate_grid_load(dates, region))
+    df["region"] = region
     
     if cache_dir:
         cache_dir.mkdir(parents=True, exist_ok=True)
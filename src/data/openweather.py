@@ -6,13 +6,22 @@ from typing import Optional
 from datetime import datetime
 import time
 
+from ..utils.profiling import instrument
+from .dtypes import enforce_dtypes
+from .timezones import PROJECT_TZ
+from .synthetic import mark_simulated, simulate_climate
+from .spatial import GRID_RESOLUTION_DEG, snap_to_grid
+
+@instrument()
+@enforce_dtypes(PROJECT_TZ, source="openweather")
 def fetch_weather_owm(
     lat: float,
     lon: float,
     start: str,
     end: str,
     api_key: str,
-    cache_dir: Optional[Path] = None
+    cache_dir: Optional[Path] = None,
+    resolution_deg: float = GRID_RESOLUTION_DEG
 ) -> pd.DataFrame:
     """
     Busca dados meteorológicos via OpenWeatherMap.
@@ -27,10 +36,14 @@ def fetch_weather_owm(
         end: Data final (YYYY-MM-DD)
         api_key: Chave da API OpenWeatherMap
         cache_dir: Diretório para cache (opcional)
+        resolution_deg: Resolução da grade de clima (graus)
     
     Returns:
         DataFrame com colunas: timestamp, temp_c, wind_ms, ghi_wm2
     """
+    # Sites vizinhos compartilham a série da célula (ver spatial.snap_to_grid)
+    lat, lon = snap_to_grid(lat, lon, resolution_deg)
+    
     if cache_dir:
         cache_file = cache_dir / f"openweather_{lat}_{lon}_{start}_{end}.parquet"
         if cache_file.exists():
@@ -41,6 +54,7 @@ def fetch_weather_owm(
     dates = pd.date_range(start=start_date, end=end_date, freq="D")
     
     all_data = []
+    simulated = None
     
     # OpenWeatherMap One Call API 3.0 (requer pagamento)
     # Alternativa: usar Current Weather API + forecast (gratuita)
@@ -80,18 +94,20 @@ def fetch_weather_owm(
             
         except Exception as e:
             print(f"Erro ao buscar dados OpenWeatherMap para {date}: {e}")
-            # Fallback: dados simulados
-            import numpy as np
+            # Fallback: dados simulados (gerados uma única vez para o período)
+            if simulated is None:
+                simulated = simulate_climate(dates, lat).set_index("timestamp")
             all_data.append({
                 "timestamp": date,
-                "temp_c": 25 + np.random.normal(0, 5),
-                "wind_ms": 5 + np.random.normal(0, 2),
-                "ghi_wm2": 800 + np.random.normal(0, 100),
+                **simulated.loc[date].to_dict(),
                 "humidity": 60,
                 "pressure": 1013
             })
     
     df = pd.DataFrame(all_data)
+    if simulated is not None:
+        # Dias sem resposta da API foram simulados: a série não é toda observada
+        mark_simulated(df)
     
     if cache_dir:
         cache_dir.mkdir(parents=True, exist_ok=True)
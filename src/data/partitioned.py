@@ -0,0 +1,247 @@
+"""
+Processamento out-of-core de históricos maiores que a memória.
+
+Os dados ficam em Parquet particionado por site e ano (layout hive
+`site_id=<id>/year=<ano>/`), no formato de prepare_data. As leituras usam
+predicate pushdown em data e site (só os arquivos e row groups necessários
+são lidos) e os estágios de preparação, atributos e backtest processam uma
+partição por vez, de modo que a memória fica limitada ao tamanho de uma
+partição e não ao do histórico.
+
+Exemplo:
+    dataset = PartitionedDataset("data/history")
+    dataset.write_chunks(iter_site_chunks("2020-01-01", "2024-12-31", "h", n_sites=500))
+    df = dataset.read(start="2024-01-01", sites=[3, 7], columns=["timestamp", "consumption_kwh"])
+"""
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .dtypes import apply_dtypes
+from .timezones import PROJECT_TZ, project_timestamp
+
+# Colunas de partição (layout hive: site_id=X/year=Y/part-0.parquet)
+PARTITION_COLS = ("site_id", "year")
+
+
+class PartitionedDataset:
+    """Histórico em Parquet particionado por site e ano."""
+
+    def __init__(self, root: Path, tz: str = PROJECT_TZ):
+        """
+        Args:
+            root: Diretório do dataset
+            tz: Fuso dos timestamps (o ano da partição é o ano civil local)
+        """
+        self.root = Path(root)
+        self.tz = tz
+
+    def _partitioning(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        return ds.partitioning(pa.schema([("site_id", pa.int64()), ("year", pa.int32())]), flavor="hive")
+
+    def _dataset(self):
+        import pyarrow.dataset as ds
+
+        return ds.dataset(self.root, format="parquet", partitioning=self._partitioning())
+
+    def exists(self) -> bool:
+        return self.root.exists() and any(self.root.rglob("*.parquet"))
+
+    def write(self, df: pd.DataFrame) -> int:
+        """
+        Grava registros (partições que recebem dados são substituídas).
+
+        Args:
+            df: Registros no formato de prepare_data; sem `site_id`, o site 0
+
+        Returns:
+            Número de linhas gravadas
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        if df.empty:
+            return 0
+        df = apply_dtypes(df.copy(deep=False), tz=self.tz)
+        if "site_id" not in df.columns:
+            df["site_id"] = 0
+        df["site_id"] = df["site_id"].astype("int64")
+        df["year"] = df["timestamp"].dt.year.astype("int32")
+        df = df.sort_values(["site_id", "timestamp"], kind="stable")
+
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False),
+            self.root,
+            format="parquet",
+            partitioning=self._partitioning(),
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet"
+        )
+        return len(df)
+
+    def write_chunks(self, chunks: Iterable[pd.DataFrame]) -> int:
+        """
+        Grava blocos em sequência (ex: iter_site_chunks); a memória usada é a de um bloco.
+
+        Cada par (site, ano) deve estar contido em um único bloco.
+
+        Returns:
+            Número total de linhas gravadas
+        """
+        return sum(self.write(chunk) for chunk in chunks)
+
+    def partitions(self, sites: Optional[Sequence[int]] = None) -> List[Tuple[int, int]]:
+        """Pares (site_id, ano) existentes, em ordem."""
+        import pyarrow.dataset as ds
+
+        if not self.exists():
+            return []
+        keys = set()
+        for fragment in self._dataset().get_fragments():
+            key = ds.get_partition_keys(fragment.partition_expression)
+            keys.add((int(key["site_id"]), int(key["year"])))
+        if sites is not None:
+            wanted = {int(site) for site in sites}
+            keys = {key for key in keys if key[0] in wanted}
+        return sorted(keys)
+
+    def sites(self) -> List[int]:
+        """Sites presentes no dataset."""
+        return sorted({site for site, _ in self.partitions()})
+
+    def _filter(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sites: Optional[Sequence[int]] = None,
+        years: Optional[Sequence[int]] = None
+    ):
+        import pyarrow.dataset as ds
+
+        conditions = []
+        if sites is not None:
+            conditions.append(ds.field("site_id").isin([int(site) for site in sites]))
+        if years is not None:
+            conditions.append(ds.field("year").isin([int(year) for year in years]))
+        if start is not None:
+            start_ts = project_timestamp(start, self.tz)
+            conditions += [ds.field("year") >= start_ts.year, ds.field("timestamp") >= start_ts]
+        if end is not None:
+            # Data final inclusiva (dia inteiro)
+            end_ts = project_timestamp(end, self.tz)
+            if end_ts == end_ts.normalize():
+                end_ts += pd.Timedelta(days=1)
+            conditions += [ds.field("year") <= end_ts.year, ds.field("timestamp") < end_ts]
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def read(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sites: Optional[Sequence[int]] = None,
+        columns: Optional[List[str]] = None,
+        years: Optional[Sequence[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Lê um recorte com predicate pushdown em data e site.
+
+        Args:
+            start: Data inicial (YYYY-MM-DD, inclusiva)
+            end: Data final (YYYY-MM-DD, inclusiva)
+            sites: Sites a ler (padrão: todos)
+            columns: Colunas a carregar (padrão: todas)
+            years: Anos (partições) a ler
+
+        Returns:
+            DataFrame ordenado por site e timestamp (sem a coluna `year`)
+        """
+        if not self.exists():
+            return pd.DataFrame(columns=columns or [])
+        if columns is not None:
+            columns = list(dict.fromkeys(["site_id", "timestamp", *columns]))
+        table = self._dataset().to_table(columns=columns, filter=self._filter(start, end, sites, years))
+        df = table.to_pandas().drop(columns="year", errors="ignore")
+        df = df.sort_values(["site_id", "timestamp"], kind="stable").reset_index(drop=True)
+        return apply_dtypes(df)
+
+    def iter_partitions(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sites: Optional[Sequence[int]] = None,
+        columns: Optional[List[str]] = None,
+        overlap_rows: int = 0
+    ) -> Iterator[Tuple[int, int, pd.DataFrame, int]]:
+        """
+        Percorre as partições uma a uma, em ordem de site e ano.
+
+        Cada partição vem precedida das últimas `overlap_rows` linhas da
+        partição anterior do mesmo site, para que lags e janelas móveis sejam
+        calculados sem descontinuidade na virada do ano.
+
+        Args:
+            start, end, sites, columns: Recorte (ver read)
+            overlap_rows: Linhas de contexto da partição anterior
+
+        Yields:
+            (site_id, ano, DataFrame, número de linhas de contexto no início)
+        """
+        previous_site, tail = None, None
+        for site, year in self.partitions(sites):
+            if start is not None and year < project_timestamp(start, self.tz).year:
+                continue
+            if end is not None and year > project_timestamp(end, self.tz).year:
+                continue
+            df = self.read(start, end, [site], columns, years=[year])
+            if df.empty:
+                continue
+            if site != previous_site:
+                tail = None
+            n_context = len(tail) if tail is not None else 0
+            if n_context:
+                df = pd.concat([tail, df], ignore_index=True)
+            yield site, year, df, n_context
+            previous_site = site
+            tail = df.iloc[max(0, len(df) - overlap_rows):].reset_index(drop=True) if overlap_rows else None
+
+    def map_partitions(
+        self,
+        func: Callable[[pd.DataFrame], pd.DataFrame],
+        output: "PartitionedDataset",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sites: Optional[Sequence[int]] = None,
+        columns: Optional[List[str]] = None,
+        overlap_rows: int = 0
+    ) -> int:
+        """
+        Aplica um estágio (DataFrame -> DataFrame) partição por partição.
+
+        As linhas de contexto (overlap) são descartadas do resultado antes
+        da gravação em `output`, pelo timestamp.
+
+        Args:
+            func: Estágio aplicado a cada partição (com contexto)
+            output: Dataset de saída
+            start, end, sites, columns: Recorte (ver read)
+            overlap_rows: Linhas de contexto da partição anterior
+
+        Returns:
+            Número de linhas gravadas
+        """
+        rows = 0
+        for site, _, df, n_context in self.iter_partitions(start, end, sites, columns, overlap_rows):
+            result = func(df)
+            if n_context:
+                result = result[result["timestamp"] > df["timestamp"].iloc[n_context - 1]]
+            if "site_id" not in result.columns:
+                result = result.assign(site_id=site)
+            rows += output.write(result)
+        return rows
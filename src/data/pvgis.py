@@ -5,12 +5,22 @@ from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+from ..utils.profiling import instrument
+from .dtypes import enforce_dtypes
+from .timezones import PROJECT_TZ
+from .solar import clear_sky_irradiance
+from .synthetic import daily_clearness, mark_simulated
+from .spatial import GRID_RESOLUTION_DEG, snap_to_grid
+
+@instrument()
+@enforce_dtypes(PROJECT_TZ, source="pvgis")
 def fetch_pvgis_ghi(
     lat: float,
     lon: float,
     start: str,
     end: str,
-    cache_dir: Optional[Path] = None
+    cache_dir: Optional[Path] = None,
+    resolution_deg: float = GRID_RESOLUTION_DEG
 ) -> pd.DataFrame:
     """
     Busca dados de irradiação solar global horizontal (GHI) do PVGIS.
@@ -21,10 +31,15 @@ def fetch_pvgis_ghi(
         start: Data inicial (YYYY-MM-DD)
         end: Data final (YYYY-MM-DD)
         cache_dir: Diretório para cache local (opcional)
+        resolution_deg: Resolução da grade de clima (graus)
     
     Returns:
         DataFrame com colunas: timestamp, ghi_wm2, dni_wm2, dhi_wm2
+    
+    As coordenadas são ajustadas ao centro da célula da grade de clima
+    (`resolution_deg`): sites vizinhos compartilham a série.
     """
+    lat, lon = snap_to_grid(lat, lon, resolution_deg)
     # API PVGIS: https://joint-research-centre.ec.europa.eu/photovoltaic-geographical-information-system-pvgis/getting-started-pvgis/api-non-interactive-service_en
     # Documentação: https://ec.europa.eu/jrc/en/pvgis/api
     
@@ -78,27 +93,13 @@ def fetch_pvgis_ghi(
     
     # Fallback: dados simulados
     dates = pd.date_range(start=start_date, end=end_date, freq="D")
-    import numpy as np
-    np.random.seed(42)
-    
-    # Simulação de GHI baseada em latitude (aproximação)
-    # Valores mais altos perto do equador, variação sazonal
-    day_of_year = dates.dayofyear
-    declination = 23.45 * np.sin(np.radians(360 * (284 + day_of_year) / 365))
-    lat_rad = np.radians(lat)
-    solar_elevation = 90 - abs(lat - declination)
-    
-    ghi_base = 1000 * np.maximum(0, np.sin(np.radians(solar_elevation)))
-    ghi = ghi_base * 0.7 + np.random.normal(0, 100, len(dates))  # Aproximação
     
-    df = pd.DataFrame({
-        "timestamp": dates,
-        "ghi_wm2": np.maximum(0, ghi),
-        "dni_wm2": ghi * 0.6,  # Irradiação direta normal
-        "dhi_wm2": ghi * 0.3,  # Irradiação difusa horizontal
-        "lat": lat,
-        "lon": lon
-    })
+    # Irradiância de céu claro no meio-dia solar (posição solar do site),
+    # escalada por um índice de claridade diário simulado e decomposta em
+    # direta normal e difusa (ver src.data.solar)
+    df = mark_simulated(clear_sky_irradiance(dates, lat, lon, clearness=daily_clearness(dates)))
+    df["lat"] = lat
+    df["lon"] = lon
     
     if cache_dir:
         cache_dir.mkdir(parents=True, exist_ok=True)
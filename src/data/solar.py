@@ -0,0 +1,339 @@
+"""
+Modelo físico de produção fotovoltaica, vetorizado por timestamps × sites.
+
+Cadeia de cálculo (todas as etapas operam sobre arrays (n_passos, n_sites)
+por broadcasting; grandezas que dependem só do tempo são calculadas uma vez
+por passo):
+
+1. posição solar (declinação, equação do tempo e ângulo horário pelas
+   séries de Spencer/NOAA, com a longitude do site);
+2. irradiância de céu claro (GHI de Haurwitz) e decomposição em direta
+   normal e difusa (Erbs), também aplicável a GHI medido;
+3. transposição para o plano dos módulos (inclinação/azimute, modelo
+   isotrópico com albedo);
+4. temperatura de célula (Faiman) e derating térmico;
+5. perdas do sistema, eficiência e limite (clipping) do inversor.
+
+Convenções: azimutes em graus a partir do norte, no sentido horário;
+longitude positiva a leste. Em passos diários o GHI de referência é o do
+meio-dia solar (como em src.data.synthetic) e a energia do dia é integrada
+em uma grade horária.
+
+Exemplo:
+    energy = pv_energy(make_timestamps("2024-01-01", "2024-12-31 23:00", "h"), lats, lons)
+"""
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .timezones import PROJECT_TZ, align_timestamps
+
+ArrayLike = Union[float, np.ndarray, pd.Series]
+
+SOLAR_CONSTANT = 1361.0      # W/m²
+STC_IRRADIANCE = 1000.0      # W/m² (condição padrão de teste)
+
+# Parâmetros padrão do sistema fotovoltaico
+DEFAULT_SYSTEM = {
+    "gamma": -0.004,             # coeficiente de temperatura da potência (1/°C)
+    "losses": 0.14,              # sujeira, cabos, mismatch, disponibilidade
+    "inverter_efficiency": 0.96,
+    "dc_ac_ratio": 1.2,          # kWp DC por kW AC do inversor
+    "albedo": 0.2,
+}
+
+# Coeficientes de perda térmica do modelo de Faiman (W/m²·K e W·s/m³·K)
+FAIMAN_U0 = 25.0
+FAIMAN_U1 = 6.84
+
+# Abaixo desse cosseno (zênite > ~86°) a componente direta é descartada
+_MIN_COS_ZENITH = 0.065
+
+
+def _utc_index(timestamps) -> pd.DatetimeIndex:
+    """Timestamps em UTC (ingênuos são interpretados no fuso do projeto)."""
+    values = align_timestamps(pd.Series(pd.DatetimeIndex(timestamps)), PROJECT_TZ)
+    return pd.DatetimeIndex(values).tz_convert("UTC")
+
+
+def _step_hours(index: pd.DatetimeIndex) -> float:
+    """Duração de um passo em horas (24 para um único timestamp)."""
+    if len(index) < 2:
+        return 24.0
+    return float(np.median(np.diff(index.as_unit("ns").asi8))) / 3.6e12
+
+
+def _sites(value: ArrayLike, dtype=np.float64) -> np.ndarray:
+    """Parâmetro por site como linha (1, n_sites) para broadcasting."""
+    return np.atleast_1d(np.asarray(value, dtype=dtype))[np.newaxis, :]
+
+
+def _per_step(value: Optional[ArrayLike]) -> Optional[np.ndarray]:
+    """Série por passo (n,) vira coluna (n, 1); matrizes (n, m) são mantidas."""
+    if value is None:
+        return None
+    array = np.asarray(value, dtype=np.float64)
+    return array[:, np.newaxis] if array.ndim == 1 else array
+
+
+def solar_position(timestamps, lat: ArrayLike, lon: ArrayLike, solar_noon: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Posição do sol e irradiância extraterrestre.
+
+    Args:
+        timestamps: Instantes (com fuso; ingênuos no fuso do projeto)
+        lat: Latitude(s) dos sites (graus)
+        lon: Longitude(s) dos sites (graus, positiva a leste)
+        solar_noon: Avaliar no meio-dia solar do dia de cada timestamp
+
+    Returns:
+        Dicionário com arrays (n_passos, n_sites): cos_zenith (>= 0),
+        azimuth (graus a partir do norte) e extraterrestrial (W/m², (n, 1))
+    """
+    index = _utc_index(timestamps)
+    hours = (index.hour.values + index.minute.values / 60 + index.second.values / 3600)[:, np.newaxis]
+    doy = index.dayofyear.values[:, np.newaxis]
+
+    # Ângulo do ano (Spencer)
+    gamma = 2 * np.pi / 365 * (doy - 1 + (hours - 12) / 24)
+    cos_g, sin_g = np.cos(gamma), np.sin(gamma)
+    cos_2g, sin_2g = np.cos(2 * gamma), np.sin(2 * gamma)
+    decl = (
+        0.006918 - 0.399912 * cos_g + 0.070257 * sin_g - 0.006758 * cos_2g
+        + 0.000907 * sin_2g - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma)
+    )
+    eot_min = 229.18 * (0.000075 + 0.001868 * cos_g - 0.032077 * sin_g - 0.014615 * cos_2g - 0.040849 * sin_2g)
+    extraterrestrial = SOLAR_CONSTANT * (
+        1.000110 + 0.034221 * cos_g + 0.001280 * sin_g + 0.000719 * cos_2g + 0.000077 * sin_2g
+    )
+
+    lat_rad = np.radians(_sites(lat))
+    if solar_noon:
+        hour_angle = np.zeros((len(index), 1))
+    else:
+        true_solar_min = hours * 60 + eot_min + 4 * _sites(lon)
+        hour_angle = np.radians(true_solar_min / 4 - 180)
+
+    sin_lat, cos_lat = np.sin(lat_rad), np.cos(lat_rad)
+    sin_decl, cos_decl = np.sin(decl), np.cos(decl)
+    cos_ha = np.cos(hour_angle)
+    cos_zenith = sin_lat * sin_decl + cos_lat * cos_decl * cos_ha
+    azimuth = np.degrees(np.arctan2(np.sin(hour_angle), cos_ha * sin_lat - np.tan(decl) * cos_lat)) + 180
+
+    return {
+        "cos_zenith": np.clip(cos_zenith, 0, 1),
+        "azimuth": np.broadcast_to(azimuth, cos_zenith.shape),
+        "extraterrestrial": extraterrestrial,
+    }
+
+
+def clear_sky_ghi(cos_zenith: np.ndarray) -> np.ndarray:
+    """GHI de céu claro (modelo de Haurwitz, W/m²)."""
+    with np.errstate(divide="ignore", over="ignore"):
+        ghi = 1098.0 * cos_zenith * np.exp(-0.057 / cos_zenith)
+    return np.where(cos_zenith > 0, ghi, 0.0)
+
+
+def decompose(ghi: np.ndarray, cos_zenith: np.ndarray, extraterrestrial: np.ndarray):
+    """
+    Separa o GHI em direta normal (DNI) e difusa horizontal (DHI) (Erbs).
+
+    Args:
+        ghi: Irradiância global horizontal (W/m²)
+        cos_zenith: Cosseno do ângulo zenital
+        extraterrestrial: Irradiância extraterrestre normal (W/m²)
+
+    Returns:
+        (dni, dhi) em W/m²
+    """
+    horizontal = extraterrestrial * cos_zenith
+    kt = np.clip(np.divide(ghi, horizontal, out=np.zeros_like(ghi, dtype=np.float64), where=horizontal > 0), 0, 1)
+    diffuse_fraction = np.select(
+        [kt <= 0.22, kt <= 0.8],
+        [1 - 0.09 * kt, 0.9511 - 0.1604 * kt + 4.388 * kt ** 2 - 16.638 * kt ** 3 + 12.336 * kt ** 4],
+        0.165
+    )
+    dhi = ghi * diffuse_fraction
+    dni = np.divide(ghi - dhi, cos_zenith, out=np.zeros_like(dhi), where=cos_zenith > _MIN_COS_ZENITH)
+    return dni, dhi
+
+
+def poa_irradiance(
+    ghi: np.ndarray,
+    dni: np.ndarray,
+    dhi: np.ndarray,
+    cos_zenith: np.ndarray,
+    azimuth: np.ndarray,
+    tilt: ArrayLike,
+    surface_azimuth: ArrayLike,
+    albedo: float = DEFAULT_SYSTEM["albedo"]
+) -> np.ndarray:
+    """
+    Irradiância no plano dos módulos (modelo isotrópico, W/m²).
+
+    Args:
+        ghi, dni, dhi: Componentes da irradiância (W/m²)
+        cos_zenith: Cosseno do ângulo zenital
+        azimuth: Azimute solar (graus)
+        tilt: Inclinação dos módulos por site (graus)
+        surface_azimuth: Azimute dos módulos por site (graus; 0 = norte)
+        albedo: Refletância do solo
+
+    Returns:
+        Irradiância total no plano (W/m²)
+    """
+    tilt_rad = np.radians(_sites(tilt))
+    cos_tilt = np.cos(tilt_rad)
+    sin_zenith = np.sqrt(1 - cos_zenith ** 2)
+    cos_aoi = cos_zenith * cos_tilt + sin_zenith * np.sin(tilt_rad) * np.cos(np.radians(azimuth - _sites(surface_azimuth)))
+    beam = dni * np.clip(cos_aoi, 0, None)
+    sky = dhi * (1 + cos_tilt) / 2
+    ground = ghi * albedo * (1 - cos_tilt) / 2
+    return beam + sky + ground
+
+
+def cell_temperature(poa: np.ndarray, temp_c: ArrayLike = 25.0, wind_ms: ArrayLike = 1.0) -> np.ndarray:
+    """Temperatura de célula (modelo de Faiman, °C)."""
+    return temp_c + poa / (FAIMAN_U0 + FAIMAN_U1 * np.asarray(wind_ms))
+
+
+def pv_power(
+    poa: np.ndarray,
+    cell_temp: np.ndarray,
+    gamma: float = DEFAULT_SYSTEM["gamma"],
+    losses: float = DEFAULT_SYSTEM["losses"],
+    inverter_efficiency: float = DEFAULT_SYSTEM["inverter_efficiency"],
+    dc_ac_ratio: float = DEFAULT_SYSTEM["dc_ac_ratio"]
+) -> np.ndarray:
+    """
+    Potência AC por kWp instalado (kW/kWp), com derating térmico e clipping.
+
+    Args:
+        poa: Irradiância no plano (W/m²)
+        cell_temp: Temperatura de célula (°C)
+        gamma: Coeficiente de temperatura da potência (1/°C)
+        losses: Perdas do sistema (fração)
+        inverter_efficiency: Eficiência do inversor
+        dc_ac_ratio: Razão DC/AC (o inversor limita a saída a 1/dc_ac_ratio)
+
+    Returns:
+        Potência AC (kW por kWp DC)
+    """
+    dc = poa / STC_IRRADIANCE * (1 + gamma * (cell_temp - 25)) * (1 - losses)
+    return np.clip(dc * inverter_efficiency, 0, 1 / dc_ac_ratio)
+
+
+def default_orientation(lat: ArrayLike):
+    """Inclinação igual à latitude, voltada para o equador (norte no hemisfério sul)."""
+    lat = np.asarray(lat, dtype=np.float64)
+    return np.abs(lat), np.where(lat < 0, 0.0, 180.0)
+
+
+def _hourly_grid(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Meios das 24 horas de cada dia (em ordem: dia, hora)."""
+    days = pd.DatetimeIndex(_utc_index(index).tz_convert(PROJECT_TZ).normalize())
+    offsets = pd.to_timedelta(np.arange(24) + 0.5, unit="h")
+    return days.repeat(24) + pd.TimedeltaIndex(np.tile(offsets.values, len(days)))
+
+
+def pv_energy(
+    timestamps,
+    lat: ArrayLike,
+    lon: ArrayLike,
+    capacity_kwp: ArrayLike = 1.0,
+    tilt: Optional[ArrayLike] = None,
+    surface_azimuth: Optional[ArrayLike] = None,
+    ghi: Optional[ArrayLike] = None,
+    temp_c: Optional[ArrayLike] = None,
+    wind_ms: Optional[ArrayLike] = None,
+    **system
+) -> np.ndarray:
+    """
+    Energia AC por passo (kWh) de um ou vários sites.
+
+    Sem `ghi`, usa céu claro; com `ghi` medido ou previsto, a irradiância é
+    decomposta (Erbs) antes da transposição. Em passos diários, `ghi` é o
+    valor de referência do meio-dia solar: o perfil horário de céu claro do
+    dia é escalado pelo índice de claridade correspondente.
+
+    Args:
+        timestamps: Eixo temporal (n passos regulares)
+        lat, lon: Coordenadas (escalares ou um valor por site)
+        capacity_kwp: Potência instalada DC por site
+        tilt: Inclinação dos módulos (padrão: |latitude|)
+        surface_azimuth: Azimute dos módulos (padrão: voltado ao equador)
+        ghi: GHI por passo, (n,) ou (n, n_sites) (padrão: céu claro)
+        temp_c: Temperatura do ar (°C; padrão 25)
+        wind_ms: Velocidade do vento (m/s; padrão 1)
+        **system: Parâmetros de pv_power (ver DEFAULT_SYSTEM)
+
+    Returns:
+        Array (n,) para um site escalar ou (n, n_sites)
+    """
+    index = pd.DatetimeIndex(timestamps)
+    scalar = np.ndim(lat) == 0
+    default_tilt, default_azimuth = default_orientation(lat)
+    tilt = default_tilt if tilt is None else tilt
+    surface_azimuth = default_azimuth if surface_azimuth is None else surface_azimuth
+    albedo = system.pop("albedo", DEFAULT_SYSTEM["albedo"])
+    step = _step_hours(index)
+    ghi, temp_c, wind_ms = _per_step(ghi), _per_step(temp_c), _per_step(wind_ms)
+
+    if step >= 24:
+        # Grade horária de cada dia; entradas diárias são repetidas por hora
+        n = len(index)
+        grid = _hourly_grid(index)
+        position = solar_position(grid, lat, lon)
+        clear = clear_sky_ghi(position["cos_zenith"])
+        if ghi is not None:
+            noon = clear_sky_ghi(solar_position(index, lat, lon, solar_noon=True)["cos_zenith"])
+            clearness = np.clip(np.divide(ghi, noon, out=np.zeros(np.broadcast(ghi, noon).shape), where=noon > 0), 0, 1.2)
+            ghi = clear * np.repeat(clearness, 24, axis=0)
+        temp_c = None if temp_c is None else np.repeat(temp_c, 24, axis=0)
+        wind_ms = None if wind_ms is None else np.repeat(wind_ms, 24, axis=0)
+        step_hours = 1.0
+    else:
+        position = solar_position(index, lat, lon)
+        clear = clear_sky_ghi(position["cos_zenith"])
+        step_hours = step
+
+    cos_zenith = position["cos_zenith"]
+    if ghi is None:
+        ghi = clear
+    else:
+        ghi = np.where(cos_zenith > 0, np.clip(ghi, 0, None), 0.0)
+    dni, dhi = decompose(ghi, cos_zenith, position["extraterrestrial"])
+    poa = poa_irradiance(ghi, dni, dhi, cos_zenith, position["azimuth"], tilt, surface_azimuth, albedo)
+    cell = cell_temperature(poa, 25.0 if temp_c is None else temp_c, 1.0 if wind_ms is None else wind_ms)
+    energy = pv_power(poa, cell, **system) * step_hours * _sites(capacity_kwp)
+
+    if step >= 24:
+        energy = energy.reshape(n, 24, -1).sum(axis=1)
+    return energy[:, 0] if scalar else energy
+
+
+def clear_sky_irradiance(timestamps, lat: float, lon: float, clearness: Optional[ArrayLike] = None) -> pd.DataFrame:
+    """
+    Componentes de irradiância de um site (W/m²).
+
+    Em passos diários, os valores são os do meio-dia solar (convenção de
+    src.data.synthetic). `clearness` escala o GHI de céu claro (índice de
+    claridade por passo) antes da decomposição.
+
+    Args:
+        timestamps: Eixo temporal
+        lat, lon: Coordenadas do site
+        clearness: Índice de claridade por passo (padrão: 1, céu claro)
+
+    Returns:
+        DataFrame com colunas: timestamp, ghi_wm2, dni_wm2, dhi_wm2
+    """
+    index = pd.DatetimeIndex(timestamps)
+    position = solar_position(index, lat, lon, solar_noon=_step_hours(index) >= 24)
+    cos_zenith = position["cos_zenith"][:, 0]
+    ghi = clear_sky_ghi(cos_zenith)
+    if clearness is not None:
+        ghi = ghi * np.asarray(clearness, dtype=np.float64)
+    dni, dhi = decompose(ghi, cos_zenith, position["extraterrestrial"][:, 0])
+    return pd.DataFrame({"timestamp": index, "ghi_wm2": ghi, "dni_wm2": dni, "dhi_wm2": dhi})
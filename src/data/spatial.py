@@ -0,0 +1,280 @@
+"""
+Índice espacial para consultas de clima.
+
+- Grade: coordenadas são ajustadas ao centro de uma célula regular antes de
+  consultar PVGIS/OpenWeatherMap, de modo que sites vizinhos compartilham a
+  mesma série (e a mesma entrada de cache).
+- Estações INMET: KD-tree sobre as coordenadas das estações automáticas
+  resolve as k estações mais próximas de cada site; as séries são
+  combinadas por ponderação pelo inverso da distância (IDW).
+"""
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+
+# Resolução padrão da grade de clima (graus, ~28 km no equador)
+GRID_RESOLUTION_DEG = 0.25
+
+# Estação usada quando não há coordenadas do site
+DEFAULT_STATION = "A701"
+
+# Estações automáticas do INMET nas capitais (coordenadas aproximadas).
+# Um catálogo completo pode ser informado em CSV (station_id, name, lat, lon).
+INMET_STATIONS = pd.DataFrame(
+    [
+        ("A701", "São Paulo - Mirante", -23.4963, -46.6201),
+        ("A652", "Rio de Janeiro - Forte de Copacabana", -22.9884, -43.1904),
+        ("A521", "Belo Horizonte - Pampulha", -19.8840, -43.9694),
+        ("A612", "Vitória", -20.3156, -40.3172),
+        ("A807", "Curitiba", -25.4487, -49.2307),
+        ("A806", "Florianópolis", -27.6025, -48.6200),
+        ("A801", "Porto Alegre", -30.0535, -51.1748),
+        ("A001", "Brasília", -15.7893, -47.9258),
+        ("A002", "Goiânia", -16.6428, -49.2202),
+        ("A702", "Campo Grande", -20.4471, -54.7226),
+        ("A901", "Cuiabá", -15.5593, -56.0628),
+        ("A401", "Salvador", -13.0055, -38.5058),
+        ("A409", "Aracaju", -10.9500, -37.0500),
+        ("A303", "Maceió", -9.5512, -35.7702),
+        ("A301", "Recife", -8.0592, -34.9592),
+        ("A320", "João Pessoa", -7.1653, -34.8156),
+        ("A304", "Natal", -5.8371, -35.2080),
+        ("A305", "Fortaleza", -3.8158, -38.5378),
+        ("A312", "Teresina", -5.0348, -42.8013),
+        ("A203", "São Luís", -2.5267, -44.2136),
+        ("A201", "Belém", -1.4111, -48.4394),
+        ("A101", "Manaus", -3.1036, -60.0161),
+        ("A009", "Palmas", -10.1903, -48.3018),
+        ("A249", "Macapá", 0.0500, -51.1100),
+        ("A135", "Boa Vista", 2.8203, -60.6761),
+        ("A925", "Porto Velho", -8.7936, -63.8458),
+        ("A104", "Rio Branco", -9.9577, -67.8686),
+    ],
+    columns=["station_id", "name", "lat", "lon"]
+)
+
+
+def snap_to_grid(
+    lat: Union[float, np.ndarray],
+    lon: Union[float, np.ndarray],
+    resolution_deg: float = GRID_RESOLUTION_DEG
+) -> Tuple:
+    """
+    Centro da célula de grade que contém o ponto (escalares ou arrays).
+
+    Args:
+        lat: Latitude(s)
+        lon: Longitude(s)
+        resolution_deg: Tamanho da célula (graus)
+
+    Returns:
+        Tupla (lat, lon) do centro da célula, arredondada a 6 casas
+    """
+    cell_lat = np.round((np.floor(np.asarray(lat, dtype=float) / resolution_deg) + 0.5) * resolution_deg, 6)
+    cell_lon = np.round((np.floor(np.asarray(lon, dtype=float) / resolution_deg) + 0.5) * resolution_deg, 6)
+    if cell_lat.ndim == 0:
+        return float(cell_lat), float(cell_lon)
+    return cell_lat, cell_lon
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Coordenadas na esfera unitária (distância euclidiana ~ distância angular)."""
+    lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+    return np.column_stack([
+        np.cos(lat_rad) * np.cos(lon_rad),
+        np.cos(lat_rad) * np.sin(lon_rad),
+        np.sin(lat_rad)
+    ])
+
+
+def load_station_catalog(path: Optional[Path] = None) -> pd.DataFrame:
+    """
+    Catálogo de estações (CSV com station_id, lat, lon; padrão: INMET_STATIONS).
+    """
+    if path is None:
+        return INMET_STATIONS.copy()
+    catalog = pd.read_csv(path, dtype={"station_id": str})
+    missing = {"station_id", "lat", "lon"} - set(catalog.columns)
+    if missing:
+        raise ValueError(f"Catálogo de estações sem as colunas: {', '.join(sorted(missing))}")
+    return catalog
+
+
+class StationIndex:
+    """
+    Índice de vizinhos mais próximos sobre as coordenadas das estações.
+
+    Usa `scipy.spatial.cKDTree` quando disponível; caso contrário, busca
+    exaustiva vetorizada (adequada para catálogos de centenas de estações).
+    """
+
+    def __init__(self, catalog: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            catalog: Estações (station_id, lat, lon); padrão: INMET_STATIONS
+        """
+        self.catalog = (INMET_STATIONS if catalog is None else catalog).reset_index(drop=True)
+        self._points = _unit_vectors(self.catalog["lat"].to_numpy(), self.catalog["lon"].to_numpy())
+        try:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self._points)
+        except ImportError:
+            self._tree = None
+
+    def query(self, lat, lon, k: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k estações mais próximas de cada ponto.
+
+        Args:
+            lat: Latitude(s)
+            lon: Longitude(s)
+            k: Número de vizinhos
+
+        Returns:
+            Tupla (distâncias em km, posições no catálogo), formato (n, k)
+        """
+        k = min(k, len(self.catalog))
+        points = _unit_vectors(np.atleast_1d(lat), np.atleast_1d(lon))
+        if self._tree is not None:
+            chord, idx = self._tree.query(points, k=k)
+            chord, idx = chord.reshape(len(points), k), idx.reshape(len(points), k)
+        else:
+            dists = np.linalg.norm(points[:, None, :] - self._points[None, :, :], axis=2)
+            idx = np.argsort(dists, axis=1)[:, :k]
+            chord = np.take_along_axis(dists, idx, axis=1)
+        # Corda na esfera unitária → distância de grande círculo
+        distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+        return distance_km, idx
+
+    def nearest(self, lat: float, lon: float, k: int = 3, power: float = 2.0) -> pd.DataFrame:
+        """
+        Estações mais próximas de um ponto com pesos IDW.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            k: Número de estações
+            power: Expoente da ponderação pelo inverso da distância
+
+        Returns:
+            DataFrame com station_id, lat, lon, distance_km, weight (soma 1)
+        """
+        distance_km, idx = self.query(lat, lon, k)
+        stations = self.catalog.iloc[idx[0]].reset_index(drop=True)
+        stations["distance_km"] = distance_km[0]
+        stations["weight"] = idw_weights(distance_km[0], power)
+        return stations
+
+
+def idw_weights(distance_km: np.ndarray, power: float = 2.0) -> np.ndarray:
+    """
+    Pesos normalizados pelo inverso da distância.
+
+    Um ponto coincidente com uma estação (distância ~0) recebe peso 1.
+    """
+    distance_km = np.asarray(distance_km, dtype=float)
+    exact = distance_km < 1e-6
+    if exact.any():
+        return exact / exact.sum()
+    weights = 1.0 / distance_km ** power
+    return weights / weights.sum()
+
+
+def idw_blend(frames: List[pd.DataFrame], weights: np.ndarray) -> pd.DataFrame:
+    """
+    Combina séries de várias estações por média ponderada.
+
+    As colunas numéricas são alinhadas por timestamp; valores ausentes em
+    uma estação redistribuem o peso entre as demais.
+
+    Args:
+        frames: Séries das estações (coluna timestamp)
+        weights: Peso de cada série
+
+    Returns:
+        Série combinada (timestamp + colunas numéricas comuns)
+    """
+    numeric = [
+        col for col in frames[0].columns
+        if col != "timestamp" and all(col in f.columns for f in frames)
+        and pd.api.types.is_numeric_dtype(frames[0][col])
+    ]
+    aligned = [f.set_index("timestamp")[numeric] for f in frames]
+    index = aligned[0].index
+    for frame in aligned[1:]:
+        index = index.union(frame.index)
+
+    values = np.stack([frame.reindex(index).to_numpy(dtype=float) for frame in aligned])
+    w = np.asarray(weights, dtype=float)[:, None, None] * np.isfinite(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        blended = np.nansum(np.nan_to_num(values) * w, axis=0) / w.sum(axis=0)
+
+    result = pd.DataFrame(blended, columns=numeric)
+    result.insert(0, "timestamp", index)
+    return result
+
+
+_default_index: Optional[StationIndex] = None
+
+
+def default_station_index() -> StationIndex:
+    """Índice do catálogo padrão (construído uma vez por processo)."""
+    global _default_index
+    if _default_index is None:
+        _default_index = StationIndex()
+    return _default_index
+
+
+def nearest_station_climate(
+    lat: float,
+    lon: float,
+    start: str,
+    end: str,
+    cache_dir: Optional[Path] = None,
+    k: int = 3,
+    power: float = 2.0,
+    index: Optional[StationIndex] = None
+) -> pd.DataFrame:
+    """
+    Clima INMET no ponto, combinando as k estações mais próximas (IDW).
+
+    Args:
+        lat: Latitude do site
+        lon: Longitude do site
+        start: Data inicial (YYYY-MM-DD)
+        end: Data final (YYYY-MM-DD)
+        cache_dir: Cache dos conectores
+        k: Número de estações
+        power: Expoente da ponderação
+        index: Índice de estações (padrão: catálogo embutido)
+
+    Returns:
+        DataFrame com timestamp e colunas climáticas combinadas, mais
+        `station_id` com as estações usadas (ex: "A701+A652")
+    """
+    from .inmet import fetch_inmet
+    from .synthetic import is_simulated, mark_simulated
+
+    stations = (index or default_station_index()).nearest(lat, lon, k, power)
+    frames = [fetch_inmet(station_id, start, end, cache_dir) for station_id in stations["station_id"]]
+    climate = idw_blend(frames, stations["weight"].to_numpy())
+    climate["station_id"] = "+".join(stations["station_id"])
+    if any(is_simulated(frame) for frame in frames):
+        mark_simulated(climate)
+    return climate
+
+
+def resolve_station(station: Optional[str], lat: Optional[float] = None, lon: Optional[float] = None) -> str:
+    """
+    Estação INMET a usar: a informada ou, com "auto"/None, a mais próxima
+    das coordenadas (DEFAULT_STATION sem coordenadas).
+    """
+    if station and station != "auto":
+        return station
+    if lat is None or lon is None:
+        return DEFAULT_STATION
+    return str(default_station_index().nearest(lat, lon, k=1)["station_id"].iloc[0])
@@ -0,0 +1,240 @@
+"""Armazenamento colunar de execuções do pipeline (Parquet particionado)."""
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from .timezones import PROJECT_TZ, align_timestamps
+
+# Tabelas mantidas pelo store
+TABLES = ("runs", "forecasts", "metrics")
+
+# Colunas de partição (layout hive: tabela/scenario=X/region=Y/<run_id>.parquet)
+PARTITION_COLS = ["scenario", "region"]
+
+
+def new_run_id() -> str:
+    """Gera identificador único e ordenável para uma execução."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class RunStore:
+    """
+    Store append-only de execuções do pipeline.
+
+    Cada execução grava um arquivo Parquet por tabela, particionado por
+    cenário e região. Previsões, decisões e resultados financeiros ficam em
+    `forecasts`; métricas (validação, resumo financeiro etc.) ficam em
+    `metrics` no formato longo (group, series, name, value).
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Diretório raiz do store
+        """
+        self.root = Path(root)
+
+    def _table_dir(self, table: str) -> Path:
+        if table not in TABLES:
+            raise ValueError(f"Tabela desconhecida: {table}. Use uma de {TABLES}")
+        return self.root / table
+
+    def append(
+        self,
+        table: str,
+        df: pd.DataFrame,
+        run_id: str,
+        scenario: str,
+        region: str,
+        created_at: Optional[datetime] = None
+    ) -> Path:
+        """
+        Acrescenta os registros de uma execução a uma tabela.
+
+        Args:
+            table: Nome da tabela ("runs", "forecasts", "metrics")
+            df: Registros da execução
+            run_id: Identificador da execução
+            scenario: Nome do cenário
+            region: Região
+            created_at: Momento da execução (padrão: agora)
+
+        Returns:
+            Caminho do arquivo gravado
+        """
+        partition_dir = self._table_dir(table) / f"scenario={scenario}" / f"region={region}"
+        path = partition_dir / f"{run_id}.parquet"
+        if path.exists():
+            raise FileExistsError(f"Execução {run_id} já registrada em {table}")
+
+        # Colunas de partição vêm do caminho; não duplicar no arquivo
+        records = df.drop(columns=[c for c in PARTITION_COLS if c in df.columns])
+        records = records.assign(
+            run_id=run_id,
+            created_at=pd.Timestamp(created_at or datetime.now())
+        )
+
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        records.to_parquet(path, index=False)
+        return path
+
+    def write_run(
+        self,
+        run_id: str,
+        scenario: str,
+        region: str,
+        forecasts: pd.DataFrame,
+        metrics: Optional[pd.DataFrame] = None,
+        params: Optional[Dict[str, object]] = None,
+        description: str = ""
+    ) -> None:
+        """
+        Registra uma execução completa (metadados, previsões e métricas).
+
+        Args:
+            run_id: Identificador da execução
+            scenario: Nome do cenário
+            region: Região
+            forecasts: DataFrame de resultados (previsões, decisões, financeiro)
+            metrics: Métricas no formato longo (group, series, name, value)
+            params: Parâmetros da execução
+            description: Descrição livre do cenário
+        """
+        created_at = datetime.now()
+        params = params or {}
+
+        run_row = pd.DataFrame([{
+            "description": description,
+            "params": json.dumps(params, default=str, ensure_ascii=False)
+        }])
+        self.append("forecasts", forecasts, run_id, scenario, region, created_at)
+        if metrics is not None and len(metrics) > 0:
+            self.append("metrics", metrics, run_id, scenario, region, created_at)
+        # Metadados por último: uma execução só é visível após gravar os dados
+        self.append("runs", run_row, run_id, scenario, region, created_at)
+
+    def read(
+        self,
+        table: str,
+        filters: Optional[Dict[str, Union[str, Sequence[str]]]] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Lê uma tabela com filtros aplicados via predicate pushdown.
+
+        Args:
+            table: Nome da tabela
+            filters: Filtros por coluna (valor único ou lista de valores),
+                ex: {"scenario": ["01_baseline"], "group": "validation"}
+            columns: Colunas a carregar (padrão: todas)
+
+        Returns:
+            DataFrame com os registros encontrados
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        table_dir = self._table_dir(table)
+        if not table_dir.exists():
+            return pd.DataFrame(columns=columns or [])
+
+        partitioning = ds.partitioning(
+            pa.schema([(c, pa.string()) for c in PARTITION_COLS]),
+            flavor="hive"
+        )
+        dataset = ds.dataset(table_dir, format="parquet", partitioning=partitioning)
+
+        expression = None
+        for col, values in (filters or {}).items():
+            if isinstance(values, str):
+                values = [values]
+            condition = ds.field(col).isin(list(values))
+            expression = condition if expression is None else expression & condition
+
+        # Execuções anteriores ao alinhamento de fuso gravaram timestamp ingênuo
+        # (horário local); ler cada grupo com o próprio schema e alinhar
+        groups: Dict[bool, List[str]] = {}
+        for fragment in dataset.get_fragments():
+            schema = fragment.physical_schema
+            aware = "timestamp" in schema.names and schema.field("timestamp").type.tz is not None
+            groups.setdefault(aware, []).append(fragment.path)
+        if len(groups) < 2:
+            return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+        frames = []
+        for paths in groups.values():
+            part = ds.dataset(paths, format="parquet", partitioning=partitioning, partition_base_dir=str(table_dir))
+            frame = part.to_table(columns=columns, filter=expression).to_pandas()
+            if "timestamp" in frame.columns:
+                frame["timestamp"] = align_timestamps(frame["timestamp"], PROJECT_TZ)
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True)
+
+    def runs(self, latest_per_scenario: bool = False) -> pd.DataFrame:
+        """
+        Lista execuções registradas.
+
+        Args:
+            latest_per_scenario: Se True, mantém apenas a execução mais recente
+                de cada par (cenário, região)
+
+        Returns:
+            DataFrame com uma linha por execução
+        """
+        runs_df = self.read("runs")
+        if len(runs_df) == 0:
+            return runs_df
+
+        runs_df = runs_df.sort_values("created_at").reset_index(drop=True)
+        if latest_per_scenario:
+            runs_df = runs_df.drop_duplicates(subset=PARTITION_COLS, keep="last")
+        return runs_df.reset_index(drop=True)
+
+    def compare(
+        self,
+        group: Optional[str] = None,
+        scenarios: Optional[Sequence[str]] = None,
+        latest_per_scenario: bool = True
+    ) -> pd.DataFrame:
+        """
+        Compara métricas entre execuções (uma linha por execução).
+
+        Args:
+            group: Grupo de métricas (ex: "validation", "financial")
+            scenarios: Cenários a incluir (padrão: todos)
+            latest_per_scenario: Usar apenas a execução mais recente por cenário
+
+        Returns:
+            DataFrame pivotado com colunas "<series>.<name>"
+        """
+        filters = {}
+        if group is not None:
+            filters["group"] = group
+        if scenarios is not None:
+            filters["scenario"] = list(scenarios)
+
+        metrics_df = self.read("metrics", filters=filters)
+        if len(metrics_df) == 0:
+            return pd.DataFrame()
+
+        if latest_per_scenario:
+            latest = self.runs(latest_per_scenario=True)["run_id"]
+            metrics_df = metrics_df[metrics_df["run_id"].isin(latest)]
+
+        metrics_df = metrics_df.assign(
+            metric=metrics_df["series"].astype(str) + "." + metrics_df["name"].astype(str)
+        )
+        return (
+            metrics_df.pivot_table(
+                index=["scenario", "region", "run_id"],
+                columns="metric",
+                values="value",
+                aggfunc="last"
+            )
+            .reset_index()
+            .rename_axis(columns=None)
+        )
@@ -0,0 +1,166 @@
+"""
+Fuso horário único do projeto e alinhamento das fontes.
+
+Cada fonte publica timestamps em uma convenção própria (ONS/CCEE no horário
+de Brasília, INMET/PVGIS/OpenWeatherMap em UTC). Na carga, os timestamps
+ingênuos são interpretados no fuso da fonte e convertidos para
+`PROJECT_TZ`, de modo que os joins horários entre fontes ficam corretos sem
+realinhamentos posteriores.
+
+Séries diárias (todos os registros à meia-noite) representam dias civis: o
+rótulo é localizado diretamente no fuso do projeto, sem deslocamento
+(converter 00:00 UTC daria 21:00 do dia anterior e desalinharia os joins
+diários).
+"""
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+PROJECT_TZ = "America/Sao_Paulo"
+
+# Convenção dos timestamps publicados por fonte
+SOURCE_TZ = {
+    "ons": "America/Sao_Paulo",      # horário de Brasília
+    "ccee": "America/Sao_Paulo",     # PLD horário no horário de Brasília
+    "inmet": "UTC",                  # estações automáticas em UTC
+    "pvgis": "UTC",                  # séries horárias em UTC
+    "openweather": "UTC",            # unix time
+    "synthetic": PROJECT_TZ,
+}
+
+
+def _localize(index: pd.DatetimeIndex, tz: str) -> pd.DatetimeIndex:
+    # Horários inexistentes/ambíguos (horário de verão até 2019) não geram NaT.
+    # Em séries ordenadas, a hora repetida no fim do horário de verão aparece
+    # duas vezes e a ordem define qual é a de verão ("infer"); sem repetição,
+    # a hora ambígua fica no horário padrão.
+    if len(index) > 1 and index.is_monotonic_increasing:
+        try:
+            return index.tz_localize(tz, ambiguous="infer", nonexistent="shift_forward")
+        except ValueError:
+            pass
+    return index.tz_localize(tz, ambiguous=False, nonexistent="shift_forward")
+
+
+def _wall(ts: pd.Timestamp, tz: str) -> pd.Timestamp:
+    return ts if ts.tz is None else ts.tz_convert(tz).tz_localize(None)
+
+
+def local_range(
+    start=None,
+    end=None,
+    periods: Optional[int] = None,
+    freq: str = "D",
+    tz: str = PROJECT_TZ
+) -> pd.DatetimeIndex:
+    """
+    Eixo temporal regular em horário local, com fuso `tz`.
+
+    Passos de um dia ou mais são montados em horário de parede e localizados
+    depois: meias-noites inexistentes (início do horário de verão até 2019)
+    são deslocadas para a primeira hora válida em vez de gerar erro. Passos
+    sub-diários avançam em tempo absoluto entre os limites localizados (sem
+    horas duplicadas nas transições).
+
+    Args:
+        start, end, periods, freq: Ver pandas.date_range (limites com fuso
+            são convertidos para o horário local de `tz`)
+        tz: Fuso do eixo
+
+    Returns:
+        DatetimeIndex com fuso `tz`
+    """
+    start, end = (
+        None if value is None else _wall(pd.Timestamp(value), tz)
+        for value in (start, end)
+    )
+    offset = pd.tseries.frequencies.to_offset(freq)
+    if isinstance(offset, pd.offsets.Tick) and pd.Timedelta(offset) < pd.Timedelta(days=1):
+        start, end = (
+            None if value is None else value.tz_localize(tz, ambiguous=False, nonexistent="shift_forward")
+            for value in (start, end)
+        )
+        return pd.date_range(start=start, end=end, periods=periods, freq=offset)
+    return _localize(pd.date_range(start=start, end=end, periods=periods, freq=offset), tz)
+
+
+@lru_cache(maxsize=256)
+def _aligned_range(
+    start: pd.Timestamp,
+    periods: int,
+    step: pd.Timedelta,
+    unit: str,
+    source_tz: str,
+    tz: str
+) -> pd.DatetimeIndex:
+    """Conversão de uma grade regular (compartilhada por sites/fontes com o mesmo período)."""
+    index = pd.date_range(start, periods=periods, freq=step, unit=unit)
+    return _align_index(index, source_tz, tz)
+
+
+def _align_index(index: pd.DatetimeIndex, source_tz: str, tz: str) -> pd.DatetimeIndex:
+    valid = index[~index.isna()]
+    if len(valid) and (valid == valid.normalize()).all():
+        return _localize(index, tz)
+    return _localize(index, source_tz).tz_convert(tz)
+
+
+def align_timestamps(
+    values: pd.Series,
+    tz: str = PROJECT_TZ,
+    source_tz: Optional[str] = None
+) -> pd.Series:
+    """
+    Converte timestamps para o fuso do projeto.
+
+    Timestamps com fuso são apenas convertidos; ingênuos são interpretados
+    em `source_tz` (padrão: o próprio `tz`). Grades regulares usam cache.
+
+    Args:
+        values: Timestamps
+        tz: Fuso de destino
+        source_tz: Fuso dos timestamps ingênuos
+
+    Returns:
+        Série com fuso `tz` (o próprio objeto se já estiver nele)
+    """
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values)
+    current = values.dt.tz
+    if current is not None:
+        return values if str(current) == tz else values.dt.tz_convert(tz)
+
+    index = pd.DatetimeIndex(values)
+    source_tz = source_tz or tz
+    steps = np.diff(index.asi8)
+    if len(index) > 1 and not index.hasnans and steps[0] > 0 and (steps == steps[0]).all():
+        step = index[1] - index[0]
+        aligned = _aligned_range(index[0], len(index), step, index.unit, source_tz, tz)
+    else:
+        aligned = _align_index(index, source_tz, tz)
+    return pd.Series(aligned, index=values.index, name=values.name)
+
+
+def wall_clock(values: pd.Series, tz: str = PROJECT_TZ) -> pd.Series:
+    """
+    Horário local ingênuo no fuso do projeto (ex: `ds` do Prophet).
+
+    Args:
+        values: Timestamps (com ou sem fuso)
+        tz: Fuso do horário local
+
+    Returns:
+        Série sem fuso
+    """
+    values = pd.to_datetime(values)
+    if values.dt.tz is None:
+        return values
+    return values.dt.tz_convert(tz).dt.tz_localize(None)
+
+
+def project_timestamp(value, tz: str = PROJECT_TZ) -> pd.Timestamp:
+    """Timestamp no fuso do projeto (ingênuo é interpretado como horário local)."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize(tz) if ts.tz is None else ts.tz_convert(tz)
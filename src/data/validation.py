@@ -0,0 +1,182 @@
+"""
+Validação vetorizada de DataFrames contra os schemas Pydantic.
+
+As regras (limites, valores permitidos, obrigatoriedade) são extraídas das
+declarações do modelo (ex: `EnergySample`), que permanece a única fonte das
+restrições; a verificação é feita por coluna com NumPy, sem instanciar um
+objeto por linha.
+"""
+import typing
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from src.config.schemas import EnergySample
+
+# Operadores de limite suportados (metadados annotated_types do Pydantic)
+_BOUNDS = {
+    "ge": np.less,            # viola se valor < limite
+    "gt": np.less_equal,
+    "le": np.greater,
+    "lt": np.greater_equal,
+}
+
+
+def model_constraints(model: Type[BaseModel] = EnergySample) -> Dict[str, Dict[str, Any]]:
+    """
+    Restrições por coluna declaradas em um modelo Pydantic.
+
+    Args:
+        model: Classe do schema
+
+    Returns:
+        {coluna: {"required": bool, "allowed": tupla ou None, "ge"/"gt"/"le"/"lt": limite}}
+    """
+    constraints = {}
+    for name, field in model.model_fields.items():
+        rule: Dict[str, Any] = {"required": field.is_required(), "allowed": None}
+        for meta in field.metadata:
+            for op in _BOUNDS:
+                value = getattr(meta, op, None)
+                if value is not None:
+                    rule[op] = value
+
+        annotation = field.annotation
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+            annotation = args[0]
+        if typing.get_origin(annotation) is typing.Literal:
+            rule["allowed"] = typing.get_args(annotation)
+        constraints[name] = rule
+    return constraints
+
+
+class ValidationReport:
+    """Resultado da validação: índices das linhas que violam cada regra."""
+
+    def __init__(self, n_rows: int):
+        self.n_rows = n_rows
+        self.violations: Dict[str, np.ndarray] = {}
+        self.missing_columns: List[str] = []
+
+    def add(self, rule: str, rows: np.ndarray) -> None:
+        if len(rows):
+            self.violations[rule] = rows
+
+    @property
+    def ok(self) -> bool:
+        """True se nenhuma regra foi violada."""
+        return not self.violations and not self.missing_columns
+
+    @property
+    def invalid_rows(self) -> np.ndarray:
+        """Índices (posicionais) de todas as linhas com alguma violação."""
+        if not self.violations:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate(list(self.violations.values())))
+
+    def summary(self, max_examples: int = 5) -> pd.DataFrame:
+        """Tabela com regra, número de linhas e exemplos de índices."""
+        return pd.DataFrame([
+            {"rule": rule, "rows": len(rows), "examples": rows[:max_examples].tolist()}
+            for rule, rows in self.violations.items()
+        ], columns=["rule", "rows", "examples"])
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationReport(rows={self.n_rows}, violations={len(self.invalid_rows)}, "
+            f"rules={list(self.violations)}, missing={self.missing_columns})"
+        )
+
+
+def _expected_step(positive: np.ndarray, freq: Optional[str], unit: str) -> Optional[int]:
+    """Passo esperado (na unidade dos timestamps): `freq` ou o intervalo mais frequente."""
+    if freq is not None:
+        origin = pd.Timestamp(0)
+        return (origin + pd.tseries.frequencies.to_offset(freq) - origin) // pd.Timedelta(1, unit=unit)
+    if len(positive):
+        values, counts = np.unique(positive, return_counts=True)
+        return values[np.argmax(counts)]
+    return None
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    model: Type[BaseModel] = EnergySample,
+    timestamp_col: str = "timestamp",
+    group_col: Optional[str] = None,
+    freq: Optional[str] = None,
+    check_missing: bool = True
+) -> ValidationReport:
+    """
+    Valida um DataFrame inteiro contra as restrições do schema.
+
+    Regras verificadas (nomes no relatório):
+        "<col>:null"       valor ausente em coluna obrigatória
+        "<col>:ge=0" etc.  limite numérico violado
+        "<col>:allowed"    valor fora dos permitidos (Literal)
+        "timestamp:order"  timestamp não crescente (ou duplicado)
+        "timestamp:gap"    intervalo maior que a frequência esperada
+
+    Args:
+        df: Dados (uma linha por registro)
+        model: Schema com as restrições
+        timestamp_col: Coluna temporal
+        group_col: Coluna de série (ex: site_id) para ordem/lacunas por grupo;
+            as linhas de cada grupo devem estar contíguas
+        freq: Frequência esperada (ex: "D", "h"); padrão: intervalo mais comum
+        check_missing: Reportar colunas obrigatórias ausentes
+
+    Returns:
+        ValidationReport com os índices posicionais das violações
+    """
+    report = ValidationReport(len(df))
+
+    for col, rule in model_constraints(model).items():
+        if col not in df.columns:
+            if rule["required"] and check_missing:
+                report.missing_columns.append(col)
+            continue
+        if col == timestamp_col:
+            continue
+
+        series = df[col]
+        if rule["required"]:
+            report.add(f"{col}:null", np.flatnonzero(series.isna().to_numpy()))
+
+        if rule["allowed"] is not None:
+            bad = ~series.isin(rule["allowed"]).to_numpy() & series.notna().to_numpy()
+            report.add(f"{col}:allowed", np.flatnonzero(bad))
+
+        for op, violates in _BOUNDS.items():
+            if op in rule:
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+                with np.errstate(invalid="ignore"):
+                    report.add(f"{col}:{op}={rule[op]}", np.flatnonzero(violates(values, rule[op])))
+
+    if timestamp_col in df.columns and len(df) > 1:
+        index = pd.DatetimeIndex(df[timestamp_col])
+        ts = index.asi8  # inteiros (UTC) na unidade nativa (s/ms/us/ns)
+        report.add(f"{timestamp_col}:null", np.flatnonzero(ts == np.iinfo(np.int64).min))
+
+        diffs = np.diff(ts)
+        same_group = np.ones(len(diffs), dtype=bool)
+        if group_col is not None and group_col in df.columns:
+            groups = df[group_col].to_numpy()
+            same_group = groups[1:] == groups[:-1]
+
+        valid = same_group & (ts[1:] != np.iinfo(np.int64).min) & (ts[:-1] != np.iinfo(np.int64).min)
+        step = _expected_step(diffs[valid & (diffs > 0)], freq, index.unit)
+        if index.tz is not None and step is not None and step >= pd.Timedelta(days=1) // pd.Timedelta(1, unit=index.unit):
+            # Passos diários são dias civis: intervalos entre datas locais
+            # (nas transições de horário de verão o dia tem 23 ou 25 h)
+            diffs = np.diff(index.tz_localize(None).normalize().asi8)
+            step = _expected_step(diffs[valid & (diffs > 0)], freq, index.unit)
+
+        report.add(f"{timestamp_col}:order", np.flatnonzero(valid & (diffs <= 0)) + 1)
+        if step is not None:
+            report.add(f"{timestamp_col}:gap", np.flatnonzero(valid & (diffs > step)) + 1)
+
+    return report
@@ -0,0 +1,207 @@
+"""
+Matriz de atributos persistida e mapeada em memória (memmap).
+
+A matriz numérica é gravada uma única vez em `.npy` (float32, ordem por
+coluna) com um índice de colunas em JSON; os processos de trabalho a abrem
+com `mmap_mode="r"` e montam DataFrames apenas com as colunas de que
+precisam, sem cópia. As páginas do arquivo ficam no cache do sistema
+operacional e são compartilhadas entre processos, de modo que a memória
+não se multiplica com o número de workers.
+
+Layout de um diretório de matriz:
+    matrix.npy       valores (linhas × colunas numéricas)
+    timestamps.npy   timestamps (int64 na unidade original), se houver
+    index.json       colunas, unidade e fuso dos timestamps, chave de origem
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.dtypes import FLOAT_DTYPE
+
+MATRIX_FILE = "matrix.npy"
+TIMESTAMPS_FILE = "timestamps.npy"
+INDEX_FILE = "index.json"
+
+
+def frame_key(df: pd.DataFrame, **params: Any) -> str:
+    """
+    Chave de conteúdo de um DataFrame (e dos parâmetros que o geraram).
+
+    Args:
+        df: Dados
+        **params: Parâmetros adicionais (ex: lags e janelas)
+
+    Returns:
+        Hash hexadecimal (16 caracteres)
+    """
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(",".join(map(str, df.columns)).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+class FeatureMatrix:
+    """Matriz de atributos em disco, aberta como memmap somente leitura."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Diretório da matriz (ver FeatureMatrix.build)
+        """
+        self.path = Path(path)
+        self.index: Dict[str, Any] = json.loads((self.path / INDEX_FILE).read_text(encoding="utf-8"))
+        self.values = np.load(self.path / MATRIX_FILE, mmap_mode="r")
+        self._positions = {col: i for i, col in enumerate(self.index["columns"])}
+        self._timestamps = None
+        if self.index.get("timestamp_col"):
+            self._timestamps = np.load(self.path / TIMESTAMPS_FILE, mmap_mode="r")
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, path: Path, timestamp_col: str = "timestamp", key: Optional[str] = None) -> "FeatureMatrix":
+        """
+        Grava as colunas numéricas de um DataFrame como matriz mapeável.
+
+        Colunas não numéricas (exceto o timestamp) são ignoradas. A gravação é
+        feita coluna a coluna, sem materializar uma cópia da matriz inteira.
+
+        Args:
+            df: Atributos (ex: saída de engineer_features)
+            path: Diretório de destino (criado/sobrescrito)
+            timestamp_col: Coluna temporal (gravada à parte)
+            key: Chave de origem registrada no índice (ver frame_key)
+
+        Returns:
+            FeatureMatrix aberta sobre os arquivos gravados
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        columns = [
+            col for col in df.columns
+            if col != timestamp_col and (pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]))
+        ]
+
+        matrix = np.lib.format.open_memmap(
+            path / MATRIX_FILE, mode="w+", dtype=FLOAT_DTYPE, shape=(len(df), len(columns)), fortran_order=True
+        )
+        for i, col in enumerate(columns):
+            matrix[:, i] = df[col].to_numpy(dtype=FLOAT_DTYPE, na_value=np.nan)
+        matrix.flush()
+        del matrix
+
+        index: Dict[str, Any] = {"columns": columns, "rows": len(df), "key": key, "timestamp_col": None}
+        if timestamp_col in df.columns:
+            timestamps = pd.DatetimeIndex(df[timestamp_col])
+            np.save(path / TIMESTAMPS_FILE, timestamps.asi8)
+            index.update(
+                timestamp_col=timestamp_col,
+                unit=timestamps.unit,
+                tz=str(timestamps.tz) if timestamps.tz is not None else None
+            )
+        # Índice por último: uma matriz só é válida após gravar os dados
+        tmp = path / f"{INDEX_FILE}.tmp"
+        tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        os.replace(tmp, path / INDEX_FILE)
+        return cls(path)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.index["columns"])
+
+    def __len__(self) -> int:
+        return int(self.index["rows"])
+
+    def column(self, name: str) -> np.ndarray:
+        """Coluna como visão do memmap (contígua, sem cópia)."""
+        return self.values[:, self._positions[name]]
+
+    def timestamps(self) -> Optional[pd.Series]:
+        """Timestamps com a unidade e o fuso originais (None se não gravados)."""
+        if self._timestamps is None:
+            return None
+        values = np.asarray(self._timestamps).view(f"datetime64[{self.index['unit']}]")
+        series = pd.Series(values, name=self.index["timestamp_col"])
+        if self.index.get("tz"):
+            series = series.dt.tz_localize("UTC").dt.tz_convert(self.index["tz"])
+        return series
+
+    def frame(self, columns: Optional[List[str]] = None, rows: Optional[slice] = None) -> pd.DataFrame:
+        """
+        DataFrame com as colunas pedidas, sobre visões do memmap.
+
+        Args:
+            columns: Colunas (padrão: todas; o timestamp é incluído se gravado)
+            rows: Fatia de linhas (padrão: todas)
+
+        Returns:
+            DataFrame somente leitura (colunas numéricas sem cópia)
+        """
+        rows = rows or slice(None)
+        data: Dict[str, Any] = {}
+        timestamp_col = self.index.get("timestamp_col")
+        if timestamp_col:
+            data[timestamp_col] = self.timestamps().iloc[rows].reset_index(drop=True)
+        for col in columns if columns is not None else self.columns:
+            if col != timestamp_col:
+                data[col] = self.column(col)[rows]
+        return pd.DataFrame(data, copy=False)
+
+
+def cached_matrix(
+    df: pd.DataFrame,
+    cache_dir: Path,
+    timestamp_col: str = "timestamp",
+    **params: Any
+) -> FeatureMatrix:
+    """
+    Matriz de um DataFrame, gravada apenas na primeira vez (chave de conteúdo).
+
+    Args:
+        df: Atributos
+        cache_dir: Diretório do cache (uma subpasta por chave)
+        timestamp_col: Coluna temporal
+        **params: Parâmetros que compõem a chave (ver frame_key)
+
+    Returns:
+        FeatureMatrix (reaproveitada se a chave já existir)
+    """
+    key = frame_key(df, **params)
+    path = Path(cache_dir) / key
+    if (path / INDEX_FILE).exists():
+        return FeatureMatrix(path)
+    return FeatureMatrix.build(df, path, timestamp_col, key)
+
+
+def cached_features(
+    df: pd.DataFrame,
+    target_col: str,
+    cache_dir: Path,
+    **kwargs: Any
+) -> FeatureMatrix:
+    """
+    Atributos de engineer_features calculados e persistidos uma única vez.
+
+    Execuções de cenários e processos de backtest com os mesmos dados e
+    parâmetros reaproveitam a matriz gravada em vez de recalcular.
+
+    Args:
+        df: Série histórica (prepare_data)
+        target_col: Coluna alvo
+        cache_dir: Diretório do cache
+        **kwargs: Parâmetros de engineer_features
+
+    Returns:
+        FeatureMatrix dos atributos
+    """
+    from src.features.engineering import engineer_features
+
+    key = frame_key(df, target_col=target_col, **kwargs)
+    path = Path(cache_dir) / key
+    if (path / INDEX_FILE).exists():
+        return FeatureMatrix(path)
+    return FeatureMatrix.build(engineer_features(df, target_col, **kwargs), path, key=key)
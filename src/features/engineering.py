@@ -1,7 +1,15 @@
-"""Engenharia de atributos para modelos de previsão."""
+"""
+Engenharia de atributos para modelos de previsão.
+
+As funções apenas acrescentam colunas: trabalham sobre cópias rasas
+(`copy(deep=False)`), sem duplicar os dados de entrada, que não são alterados.
+"""
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from src.data.dtypes import apply_dtypes
+from src.data.solar import clear_sky_irradiance, pv_energy
 
 def create_lag_features(
     df: pd.DataFrame,
@@ -21,7 +29,7 @@ def create_lag_features(
     Returns:
         DataFrame com colunas de lag adicionadas
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     
     if groupby:
         for lag in lags:
@@ -52,7 +60,7 @@ def create_rolling_features(
     Returns:
         DataFrame com features de janela móvel
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     
     for window in windows:
         if groupby:
@@ -70,7 +78,7 @@ def create_rolling_features(
             elif func == "max":
                 df[f"{column}_rolling{window}_max"] = rolling.max().values
     
-    return df
+    return apply_dtypes(df)
 
 def create_calendar_features(df: pd.DataFrame, timestamp_col: str = "timestamp") -> pd.DataFrame:
     """
@@ -83,7 +91,7 @@ def create_calendar_features(df: pd.DataFrame, timestamp_col: str = "timestamp")
     Returns:
         DataFrame com features de calendário
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     
     if timestamp_col in df.columns:
         df[timestamp_col] = pd.to_datetime(df[timestamp_col])
@@ -102,31 +110,74 @@ def create_calendar_features(df: pd.DataFrame, timestamp_col: str = "timestamp")
         df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
         df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
     
-    return df
+    return apply_dtypes(df)
 
-def create_climate_features(df: pd.DataFrame) -> pd.DataFrame:
+def create_climate_features(df: pd.DataFrame, groupby: Optional[str] = None) -> pd.DataFrame:
     """
     Cria features derivadas de dados climáticos.
     
     Args:
         df: DataFrame com colunas climáticas (temp_c, ghi_wm2, wind_ms)
+        groupby: Coluna para agrupar (opcional; df ordenado por grupo)
     
     Returns:
         DataFrame com features climáticas adicionais
     """
-    df = df.copy()
+    df = df.copy(deep=False)
+    
+    def series(column):
+        return df.groupby(groupby)[column] if groupby else df[column]
     
     if "ghi_wm2" in df.columns:
         # Índice de claridade (clarity index)
         df["clearness_index"] = df["ghi_wm2"] / 1000  # Normalizado
-        df["ghi_lag1"] = df["ghi_wm2"].shift(1)
-        df["ghi_rolling7_mean"] = df["ghi_wm2"].rolling(7, min_periods=1).mean()
+        df["ghi_lag1"] = series("ghi_wm2").shift(1)
+        df["ghi_rolling7_mean"] = series("ghi_wm2").rolling(7, min_periods=1).mean().values
     
     if "temp_c" in df.columns:
-        df["temp_lag1"] = df["temp_c"].shift(1)
-        df["temp_rolling7_mean"] = df["temp_c"].rolling(7, min_periods=1).mean()
+        df["temp_lag1"] = series("temp_c").shift(1)
+        df["temp_rolling7_mean"] = series("temp_c").rolling(7, min_periods=1).mean().values
     
-    return df
+    return apply_dtypes(df)
+
+def create_solar_features(
+    df: pd.DataFrame,
+    lat: float,
+    lon: float,
+    timestamp_col: str = "timestamp"
+) -> pd.DataFrame:
+    """
+    Cria features do modelo físico fotovoltaico (src.data.solar).
+    
+    Args:
+        df: DataFrame com coluna temporal (e, se houver, ghi_wm2, temp_c, wind_ms)
+        lat: Latitude do site
+        lon: Longitude do site
+        timestamp_col: Coluna de timestamp
+    
+    Returns:
+        DataFrame com irradiância de céu claro, índice de céu claro e
+        energia física esperada por kWp (com o clima observado, se houver)
+    """
+    df = df.copy(deep=False)
+    timestamps = df[timestamp_col]
+    
+    clear = clear_sky_irradiance(timestamps, lat, lon)
+    df["clearsky_ghi_wm2"] = clear["ghi_wm2"].to_numpy()
+    
+    weather = {
+        key: df[col].to_numpy(dtype=float)
+        for key, col in (("ghi", "ghi_wm2"), ("temp_c", "temp_c"), ("wind_ms", "wind_ms"))
+        if col in df.columns
+    }
+    if "ghi" in weather:
+        df["clearsky_index"] = np.divide(
+            weather["ghi"], df["clearsky_ghi_wm2"].to_numpy(),
+            out=np.zeros(len(df)), where=df["clearsky_ghi_wm2"].to_numpy() > 0
+        )
+    df["pv_kwh_per_kwp"] = pv_energy(timestamps, lat, lon, **weather)
+    
+    return apply_dtypes(df)
 
 def engineer_features(
     df: pd.DataFrame,
@@ -135,7 +186,9 @@ def engineer_features(
     lags: List[int] = [1, 2, 3, 7, 14, 24],
     windows: List[int] = [7, 14, 30],
     include_climate: bool = True,
-    include_calendar: bool = True
+    include_calendar: bool = True,
+    location: Optional[Tuple[float, float]] = None,
+    groupby: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Pipeline completo de engenharia de atributos.
@@ -148,21 +201,22 @@ def engineer_features(
         windows: Janelas móveis
         include_climate: Incluir features climáticas
         include_calendar: Incluir features de calendário
+        location: (lat, lon) do site; se informado, inclui features solares
+        groupby: Coluna de séries independentes (ex: "site_id"); lags e janelas
+            não atravessam grupos
     
     Returns:
         DataFrame com todas as features
     """
-    df = df.copy()
-    
-    # Ordenar por timestamp
+    # Ordenar por timestamp (dentro de cada grupo)
     if timestamp_col in df.columns:
-        df = df.sort_values(timestamp_col).reset_index(drop=True)
+        df = df.sort_values([groupby, timestamp_col] if groupby else timestamp_col).reset_index(drop=True)
     
     # Features de lag
-    df = create_lag_features(df, target_col, lags)
+    df = create_lag_features(df, target_col, lags, groupby)
     
     # Features de janela móvel
-    df = create_rolling_features(df, target_col, windows, ["mean", "std"])
+    df = create_rolling_features(df, target_col, windows, ["mean", "std"], groupby)
     
     # Features de calendário
     if include_calendar:
@@ -170,7 +224,54 @@ def engineer_features(
     
     # Features climáticas
     if include_climate:
-        df = create_climate_features(df)
+        df = create_climate_features(df, groupby)
+    
+    # Features do modelo físico fotovoltaico
+    if location is not None:
+        df = create_solar_features(df, *location, timestamp_col=timestamp_col)
     
     return df
 
+
+def engineer_features_partitioned(
+    source,
+    output,
+    target_col: str,
+    timestamp_col: str = "timestamp",
+    lags: List[int] = [1, 2, 3, 7, 14, 24],
+    windows: List[int] = [7, 14, 30],
+    include_climate: bool = True,
+    include_calendar: bool = True,
+    location: Optional[Tuple[float, float]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    sites: Optional[List[int]] = None
+) -> int:
+    """
+    Engenharia de atributos out-of-core, partição por partição.
+    
+    Cada partição recebe como contexto as últimas linhas da anterior (maior
+    lag/janela), então o resultado é igual ao de engineer_features sobre o
+    histórico completo de cada site.
+    
+    Args:
+        source: PartitionedDataset de entrada (src.data.partitioned)
+        output: PartitionedDataset de saída
+        target_col, timestamp_col, lags, windows, include_climate,
+            include_calendar, location: ver engineer_features
+        start, end, sites: Recorte do histórico
+    
+    Returns:
+        Número de linhas gravadas
+    """
+    overlap = max([*lags, *windows, 7])
+    return source.map_partitions(
+        lambda df: engineer_features(
+            df, target_col, timestamp_col, lags, windows, include_climate, include_calendar, location
+        ),
+        output,
+        start=start,
+        end=end,
+        sites=sites,
+        overlap_rows=overlap
+    )
@@ -1,7 +1,10 @@
 """Análise financeira e cálculo de lucro com PLD."""
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Dict, Optional
+
+# Decisões possíveis (ProfitCalculator e DecisionEngine)
+DECISIONS = ("Vender", "Comprar", "Neutro")
 
 class ProfitCalculator:
     """
@@ -44,14 +47,20 @@ class ProfitCalculator:
         Returns:
             DataFrame com resultados financeiros padronizados
         """
+        # Aritmética financeira em float64: previsões e PLD podem chegar em float32
+        consumption = pd.Series(np.asarray(consumption, dtype=np.float64))
+        production = pd.Series(np.asarray(production, dtype=np.float64))
+        if pld_brl_mwh is not None:
+            pld_brl_mwh = pd.Series(np.asarray(pld_brl_mwh, dtype=np.float64))
+        
         results = []
         
         for i in range(len(consumption)):
             c = consumption.iloc[i] if hasattr(consumption, 'iloc') else consumption[i]
             p = production.iloc[i] if hasattr(production, 'iloc') else production[i]
             
-            surplus_kwh = max(0, p - c)
-            deficit_kwh = max(0, c - p)
+            surplus_kwh = max(0.0, float(p - c))
+            deficit_kwh = max(0.0, float(c - p))
             
             # Determinar preços
             if self.use_pld and pld_brl_mwh is not None:
@@ -94,3 +103,45 @@ class ProfitCalculator:
         
         return pd.DataFrame(results)
 
+
+def summarize_results(results_df: pd.DataFrame) -> Dict[str, float]:
+    """
+    Resume os resultados financeiros e energéticos de uma execução.
+    
+    Args:
+        results_df: DataFrame retornado por ProfitCalculator.calculate
+            (com coluna 'decision')
+    
+    Returns:
+        Dicionário com totais, médias e contagem de decisões
+    """
+    n_periods = len(results_df)
+    total_consumption = float(results_df['consumption_kwh'].sum())
+    total_production = float(results_df['production_kwh'].sum())
+    
+    summary = {
+        "total_periods": float(n_periods),
+        "net_profit_total_brl": float(results_df['net_profit_brl'].sum()),
+        "net_profit_mean_brl": float(results_df['net_profit_brl'].mean()),
+        "net_profit_std_brl": float(results_df['net_profit_brl'].std()),
+        "net_profit_min_brl": float(results_df['net_profit_brl'].min()),
+        "net_profit_max_brl": float(results_df['net_profit_brl'].max()),
+        "sell_revenue_total_brl": float(results_df['sell_revenue_brl'].sum()),
+        "buy_cost_total_brl": float(results_df['buy_cost_brl'].sum()),
+        "fixed_cost_total_brl": float(results_df.get('fixed_cost_brl', pd.Series([0.0])).sum()),
+        "surplus_total_kwh": float(results_df['surplus_kwh'].sum()),
+        "deficit_total_kwh": float(results_df['deficit_kwh'].sum()),
+        "consumption_total_kwh": total_consumption,
+        "production_total_kwh": total_production,
+        "consumption_mean_kwh": float(results_df['consumption_kwh'].mean()),
+        "production_mean_kwh": float(results_df['production_kwh'].mean()),
+        "efficiency_pct": (total_production / total_consumption * 100) if total_consumption > 0 else 0.0
+    }
+    
+    if 'decision' in results_df.columns:
+        for decision in DECISIONS:
+            count = int((results_df['decision'] == decision).sum())
+            summary[f"decisions_{decision.lower()}"] = float(count)
+            summary[f"decisions_{decision.lower()}_pct"] = count / n_periods * 100 if n_periods else 0.0
+    
+    return summary
@@ -5,20 +5,48 @@ from typing import Optional, Dict, Any
 from pathlib import Path
 import json
 
+from src.data.timezones import wall_clock
+
 class ConsumptionForecaster:
     """Forecaster de consumo com suporte a Prophet, SARIMAX e XGBoost."""
     
-    def __init__(self, algo: str = "prophet"):
+    # Hiperparâmetros padrão por algoritmo (ajustáveis; ver src.models.tuning)
+    DEFAULT_PARAMS: Dict[str, Dict[str, Any]] = {
+        "prophet": {
+            "yearly_seasonality": True,
+            "weekly_seasonality": True,
+            "daily_seasonality": False,
+            "changepoint_prior_scale": 0.05,
+            "seasonality_prior_scale": 10.0,
+            "seasonality_mode": "additive"
+        },
+        "baseline": {
+            "window": 30,        # dias usados na média
+            "trend_window": 7    # dias comparados na tendência (0 desativa)
+        },
+        "seasonal_naive": {
+            "season_length": 7   # repete o valor do mesmo dia da semana anterior
+        }
+    }
+    
+    def __init__(self, algo: str = "prophet", params: Optional[Dict[str, Any]] = None):
         """
         Args:
-            algo: Algoritmo ("prophet", "sarimax", "xgboost")
+            algo: Algoritmo ("prophet", "seasonal_naive", "baseline", "sarimax", "xgboost")
+            params: Hiperparâmetros (sobrescrevem DEFAULT_PARAMS do algoritmo)
         """
         self.algo = algo
+        self.params = dict(params or {})
         self.model = None
         self.scaler = None
         self.feature_cols = None
         self.fitted = False
     
+    def get_params(self, algo: Optional[str] = None) -> Dict[str, Any]:
+        """Hiperparâmetros efetivos do algoritmo (padrões + `params` aplicáveis)."""
+        defaults = self.DEFAULT_PARAMS.get(algo or self.algo, {})
+        return {**defaults, **{k: v for k, v in self.params.items() if k in defaults}}
+    
     def fit(self, df: pd.DataFrame, target_col: str = "consumption_kwh") -> "ConsumptionForecaster":
         """
         Treina o modelo.
@@ -32,32 +60,40 @@ class ConsumptionForecaster:
                 from prophet import Prophet
                 
                 prophet_df = pd.DataFrame({
-                    "ds": pd.to_datetime(df["timestamp"]),
+                    # Prophet não aceita fuso: horário local do projeto
+                    "ds": wall_clock(df["timestamp"]),
                     "y": df[target_col].values
                 })
                 
-                self.model = Prophet(
-                    yearly_seasonality=True,
-                    weekly_seasonality=True,
-                    daily_seasonality=False
-                )
+                self.model = Prophet(**self.get_params("prophet"))
                 self.model.fit(prophet_df)
                 
             except ImportError:
                 print("Prophet não disponível. Usando modelo baseline.")
                 self.algo = "baseline"
         
+        if self.algo == "seasonal_naive":
+            # Sazonal ingênuo: repete o último ciclo observado
+            season_length = self.get_params("seasonal_naive")["season_length"]
+            self.model = {"season": df[target_col].tail(season_length).astype(float).tolist()}
+        
         if self.algo == "baseline" or self.model is None:
             # Modelo baseline: média dos últimos N dias
-            if len(df) >= 30:
-                mean_val = df[target_col].tail(30).mean()
-                trend_val = df[target_col].tail(7).mean() - df[target_col].tail(14).head(7).mean() if len(df) >= 14 else 0
+            params = self.get_params("baseline")
+            window, trend_window = params["window"], params["trend_window"]
+            if len(df) >= window:
+                mean_val = df[target_col].tail(window).mean()
+                if trend_window > 0 and len(df) >= 2 * trend_window:
+                    recent = df[target_col].tail(2 * trend_window)
+                    trend_val = recent.tail(trend_window).mean() - recent.head(trend_window).mean()
+                else:
+                    trend_val = 0
             else:
                 mean_val = df[target_col].mean()
                 trend_val = 0
             self.model = {
-                "mean": mean_val,
-                "trend": trend_val
+                "mean": float(mean_val),
+                "trend": float(trend_val)
             }
             self.algo = "baseline"
         
@@ -83,6 +119,10 @@ class ConsumptionForecaster:
             forecast = self.model.predict(future_df)
             return forecast["yhat"].tail(horizon).reset_index(drop=True)
         
+        elif self.algo == "seasonal_naive":
+            season = self.model["season"]
+            return pd.Series([season[i % len(season)] for i in range(horizon)])
+        
         elif self.algo == "baseline":
             # Previsão constante com tendência
             base = self.model["mean"]
@@ -98,6 +138,7 @@ class ConsumptionForecaster:
         """Salva o modelo treinado."""
         model_dict = {
             "algo": self.algo,
+            "params": self.params,
             "model": self.model,
             "fitted": self.fitted
         }
@@ -109,6 +150,7 @@ class ConsumptionForecaster:
         with open(path, "r") as f:
             model_dict = json.load(f)
         self.algo = model_dict["algo"]
+        self.params = model_dict.get("params", {})
         self.model = model_dict["model"]
         self.fitted = model_dict["fitted"]
 
@@ -0,0 +1,369 @@
+"""
+Detecção de drift para decidir quando re-treinar os modelos.
+
+No treino, o pipeline grava junto aos modelos registrados um perfil dos
+dados (distribuição de GHI, temperatura e consumo; erro de validação). Nas
+execuções seguintes o DriftMonitor compara os dados recentes com esse
+perfil (PSI e estatística KS) e o erro das previsões do modelo registrado
+com os valores observados desde o treino; o re-treino só acontece quando
+algum limiar é ultrapassado.
+"""
+import json
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.timezones import project_timestamp
+from src.models.evaluate import calculate_metrics
+
+DEFAULT_COLUMNS = ["ghi_wm2", "temp_c", "consumption_kwh"]
+
+
+def _finite(values) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return values[np.isfinite(values)]
+
+
+def quantile_edges(expected, bins: int = 5) -> np.ndarray:
+    """Limites internos dos bins por quantis da distribuição de referência."""
+    edges = np.quantile(_finite(expected), np.linspace(0, 1, bins + 1)[1:-1])
+    return np.unique(edges)
+
+
+def population_stability_index(
+    expected_fractions,
+    edges,
+    actual,
+    eps: float = 1e-4
+) -> float:
+    """
+    PSI entre a distribuição de referência (frações por bin) e uma amostra.
+
+    Valores usuais: < 0.1 estável, 0.1-0.25 moderado, > 0.25 mudança relevante.
+
+    Args:
+        expected_fractions: Fração da referência em cada bin
+        edges: Limites internos dos bins (len = bins - 1)
+        actual: Amostra atual
+
+    Returns:
+        PSI (NaN se a amostra estiver vazia)
+    """
+    actual = _finite(actual)
+    if not len(actual):
+        return float("nan")
+    counts = np.bincount(np.searchsorted(edges, actual, side="right"), minlength=len(edges) + 1)
+    expected = np.clip(np.asarray(expected_fractions, dtype=float), eps, None)
+    observed = np.clip(counts / len(actual), eps, None)
+    return float(np.sum((observed - expected) * np.log(observed / expected)))
+
+
+def ks_statistic(expected, actual) -> float:
+    """Estatística de Kolmogorov-Smirnov de duas amostras (maior distância entre as ECDFs)."""
+    expected, actual = np.sort(_finite(expected)), np.sort(_finite(actual))
+    if not len(expected) or not len(actual):
+        return float("nan")
+    grid = np.concatenate([expected, actual])
+    cdf_expected = np.searchsorted(expected, grid, side="right") / len(expected)
+    cdf_actual = np.searchsorted(actual, grid, side="right") / len(actual)
+    return float(np.max(np.abs(cdf_expected - cdf_actual)))
+
+
+def ks_critical(n: int, m: int, alpha: float = 0.01) -> float:
+    """Valor crítico assintótico da estatística KS para amostras de tamanhos n e m."""
+    return float(np.sqrt(-np.log(alpha / 2) / 2) * np.sqrt((n + m) / (n * m)))
+
+
+def psi_critical(n: int, m: int, bins: int, alpha: float = 0.01) -> float:
+    """
+    PSI esperado apenas por variação amostral (quantil 1 - alpha).
+
+    Sob distribuições iguais, PSI ~ qui-quadrado(bins - 1) * (1/n + 1/m);
+    o quantil usa a aproximação de Wilson-Hilferty.
+    """
+    k = max(bins - 1, 1)
+    z = NormalDist().inv_cdf(1 - alpha)
+    chi2 = k * (1 - 2 / (9 * k) + z * np.sqrt(2 / (9 * k))) ** 3
+    return float(chi2 * (1 / n + 1 / m))
+
+
+def training_profile(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    bins: int = 5,
+    sample_size: int = 2000,
+    errors: Optional[Dict[str, float]] = None,
+    timestamp_col: str = "timestamp",
+    window_days: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Perfil dos dados de treino, gravado junto aos modelos no registro.
+
+    Com `window_days`, as distribuições descrevem apenas o fim do treino,
+    comparável à janela recente avaliada pelo DriftMonitor (evita acusar a
+    sazonalidade normal entre o histórico inteiro e o último mês).
+
+    Args:
+        df: Dados de treino (prepare_data)
+        columns: Colunas monitoradas (padrão: DEFAULT_COLUMNS presentes)
+        bins: Bins por quantil usados no PSI
+        sample_size: Tamanho máximo da amostra guardada para o KS
+        errors: Erro de validação por série (ex: {"consumption": MAE})
+        timestamp_col: Coluna temporal
+        window_days: Dias finais do treino usados nas distribuições (padrão: todos)
+
+    Returns:
+        Dicionário serializável com rows, last_timestamp, columns e errors
+    """
+    last_timestamp = pd.Timestamp(df[timestamp_col].max()) if timestamp_col in df.columns else None
+    rows = len(df)
+    if window_days is not None and last_timestamp is not None:
+        df = df[pd.to_datetime(df[timestamp_col]) > last_timestamp - pd.Timedelta(days=window_days)]
+    columns = [col for col in (columns or DEFAULT_COLUMNS) if col in df.columns]
+    profile_columns = {}
+    for col in columns:
+        values = _finite(df[col])
+        if not len(values):
+            continue
+        edges = quantile_edges(values, bins)
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        step = max(1, len(values) // sample_size)
+        profile_columns[col] = {
+            "edges": edges.tolist(),
+            "fractions": (counts / len(values)).tolist(),
+            "count": len(values),
+            "sample": np.sort(values)[::step].tolist(),
+            "mean": float(values.mean()),
+            "std": float(values.std())
+        }
+    return {
+        "rows": rows,
+        "last_timestamp": str(last_timestamp) if last_timestamp is not None else None,
+        "columns": profile_columns,
+        "errors": {k: float(v) for k, v in (errors or {}).items() if v is not None and np.isfinite(v)}
+    }
+
+
+class DriftReport:
+    """Resultado da verificação: motivos para re-treinar e estatísticas por coluna."""
+
+    def __init__(self):
+        self.reasons: List[str] = []
+        self.columns: List[Dict[str, Any]] = []
+        self.errors: Dict[str, Dict[str, float]] = {}
+        self.new_rows = 0
+
+    def add_reason(self, reason: str) -> None:
+        self.reasons.append(reason)
+
+    @property
+    def retrain(self) -> bool:
+        """True se algum limiar foi ultrapassado."""
+        return bool(self.reasons)
+
+    def table(self) -> pd.DataFrame:
+        """PSI e KS por coluna monitorada."""
+        return pd.DataFrame(
+            self.columns, columns=["column", "rows", "psi", "psi_critical", "ks", "ks_critical", "drift"]
+        )
+
+    def metrics(self) -> Dict[str, float]:
+        """Estatísticas achatadas para o registro de métricas da execução."""
+        flat = {}
+        for row in self.columns:
+            flat[f"psi_{row['column']}"] = row["psi"]
+            flat[f"ks_{row['column']}"] = row["ks"]
+        for series, values in self.errors.items():
+            flat[f"error_ratio_{series}"] = values["ratio"]
+        flat["retrain"] = float(self.retrain)
+        return flat
+
+    def __repr__(self) -> str:
+        return f"DriftReport(retrain={self.retrain}, reasons={self.reasons})"
+
+
+class DriftMonitor:
+    """Compara dados recentes e erros de previsão com o perfil de treino."""
+
+    def __init__(
+        self,
+        psi_threshold: float = 0.25,
+        ks_alpha: float = 0.01,
+        error_ratio: float = 1.5,
+        max_age_days: int = 7,
+        window_days: int = 30,
+        min_rows: int = 7
+    ):
+        """
+        Args:
+            psi_threshold: PSI acima do qual a coluna é considerada alterada (e
+                acima do esperado por variação amostral; ver psi_critical)
+            ks_alpha: Nível de significância dos testes KS e PSI
+            error_ratio: Erro recente / erro de validação que dispara re-treino
+            max_age_days: Dias de dados novos tolerados sem re-treino
+            window_days: Janela recente comparada com o perfil
+            min_rows: Mínimo de linhas para avaliar distribuição ou erro
+        """
+        self.psi_threshold = psi_threshold
+        self.ks_alpha = ks_alpha
+        self.error_ratio = error_ratio
+        self.max_age_days = max_age_days
+        self.window_days = window_days
+        self.min_rows = min_rows
+
+    def check(
+        self,
+        profile: Dict[str, Any],
+        df: pd.DataFrame,
+        models: Optional[Dict[str, Any]] = None,
+        exog_cols: Optional[List[str]] = None,
+        timestamp_col: str = "timestamp"
+    ) -> DriftReport:
+        """
+        Verifica drift dos dados e do erro em relação ao perfil.
+
+        Args:
+            profile: Saída de training_profile
+            df: Dados atuais (prepare_data)
+            models: Modelos registrados ({"consumption": ..., "production": ...})
+                para medir o erro nas linhas posteriores ao treino
+            exog_cols: Exógenas do modelo de produção
+            timestamp_col: Coluna temporal
+
+        Returns:
+            DriftReport
+        """
+        report = DriftReport()
+        timestamps = pd.to_datetime(df[timestamp_col])
+        last = timestamps.max()
+
+        # Idade: dados novos desde o treino
+        trained_until = pd.Timestamp(profile["last_timestamp"]) if profile.get("last_timestamp") else None
+        if trained_until is not None and timestamps.dt.tz is not None:
+            # Perfis gravados antes do alinhamento de fuso têm timestamp local ingênuo
+            trained_until = project_timestamp(trained_until, str(timestamps.dt.tz))
+        new = df[timestamps > trained_until] if trained_until is not None else df.iloc[:0]
+        report.new_rows = len(new)
+        if trained_until is not None and last < trained_until:
+            # O modelo viu dados posteriores aos atuais: reutilizá-lo vazaria o futuro
+            report.add_reason(f"dados terminam em {last} antes do fim do treino registrado ({trained_until})")
+            return report
+        if trained_until is not None and (last - trained_until).days > self.max_age_days:
+            report.add_reason(f"modelo com {(last - trained_until).days} dias de dados novos (max {self.max_age_days})")
+
+        # Distribuição das entradas na janela recente
+        recent = df[timestamps > last - pd.Timedelta(days=self.window_days)]
+        for col, ref in profile.get("columns", {}).items():
+            if col not in recent.columns:
+                continue
+            values = _finite(recent[col])
+            if len(values) < self.min_rows:
+                continue
+            psi = population_stability_index(ref["fractions"], np.asarray(ref["edges"]), values)
+            psi_limit = max(
+                self.psi_threshold,
+                psi_critical(ref.get("count", len(ref["sample"])), len(values), len(ref["fractions"]), self.ks_alpha)
+            )
+            ks = ks_statistic(ref["sample"], values)
+            ks_limit = ks_critical(len(ref["sample"]), len(values), self.ks_alpha)
+            drift = psi > psi_limit or ks > ks_limit
+            report.columns.append({
+                "column": col, "rows": len(values), "psi": psi, "psi_critical": psi_limit,
+                "ks": ks, "ks_critical": ks_limit, "drift": drift
+            })
+            if drift:
+                report.add_reason(f"{col}: PSI {psi:.3f} (limite {psi_limit:.3f}), KS {ks:.3f} (limite {ks_limit:.3f})")
+
+        # Erro das previsões do modelo registrado nas linhas novas
+        if models and len(new) >= self.min_rows:
+            for series, target_col in (("consumption", "consumption_kwh"), ("production", "production_kwh")):
+                reference = profile.get("errors", {}).get(series)
+                model = models.get(series)
+                if model is None or not reference or target_col not in new.columns:
+                    continue
+                if series == "production" and exog_cols:
+                    pred = model.predict(len(new), exog=new[exog_cols])
+                else:
+                    pred = model.predict(len(new))
+                mae = calculate_metrics(new[target_col].to_numpy(), np.asarray(pred, dtype=float))["MAE"]
+                ratio = mae / reference
+                report.errors[series] = {"mae": mae, "reference": reference, "ratio": ratio}
+                if ratio > self.error_ratio:
+                    report.add_reason(f"erro de {series} {ratio:.2f}x o de validacao (MAE {mae:.2f})")
+
+        return report
+
+
+def model_spec(
+    algos: Dict[str, Tuple[str, Dict[str, Any]]],
+    site: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Especificação canônica (JSON) de algoritmos e hiperparâmetros por série.
+
+    Args:
+        algos: Série -> (algoritmo, hiperparâmetros)
+        site: Identificação do site (ex: lat/lon); modelos de sites diferentes
+            da mesma região não são reutilizados entre si
+
+    Returns:
+        Especificação comparável com a registrada
+    """
+    spec = {series: [algo, params or {}] for series, (algo, params) in algos.items()}
+    if site:
+        spec["site"] = site
+    return json.loads(json.dumps(spec, sort_keys=True))
+
+
+def check_registered(
+    registry,
+    region: str,
+    df: pd.DataFrame,
+    spec: Dict[str, Any],
+    monitor: Optional[DriftMonitor] = None,
+    exog_cols: Optional[List[str]] = None,
+    train_start: Optional[str] = None,
+    train_end: Optional[str] = None
+) -> Tuple[DriftReport, Optional[Dict[str, Any]]]:
+    """
+    Decide se os modelos registrados de uma região podem ser reutilizados.
+
+    A reutilização exige a mesma especificação (algoritmos, hiperparâmetros e
+    site), o mesmo início de treino e uma janela atual que não termine antes
+    da registrada; janelas estendidas com dados novos passam pelo DriftMonitor.
+
+    Args:
+        registry: ModelRegistry
+        region: Região/submercado
+        df: Dados atuais
+        spec: Especificação atual dos modelos (model_spec)
+        monitor: Limiares (padrão: DriftMonitor())
+        exog_cols: Exógenas do modelo de produção
+        train_start: Início da janela de treino atual (YYYY-MM-DD)
+        train_end: Fim da janela de treino atual (YYYY-MM-DD)
+
+    Returns:
+        Tupla (relatório, pacote registrado ou None)
+    """
+    report = DriftReport()
+    try:
+        package = registry.load(region)
+    except KeyError:
+        report.add_reason("nenhum modelo registrado")
+        return report, None
+
+    meta = package["meta"]
+    profile = package.get("context", {}).get("profile")
+    if meta.get("model_spec") != spec:
+        report.add_reason("configuracao do modelo alterada")
+    elif train_start is not None and meta.get("train_start") != train_start:
+        report.add_reason(f"inicio do treino alterado ({meta.get('train_start')} -> {train_start})")
+    elif train_end is not None and (meta.get("train_end") is None or train_end < meta["train_end"]):
+        report.add_reason(f"janela de treino termina antes da registrada ({train_end} < {meta.get('train_end')})")
+    elif profile is None:
+        report.add_reason("modelo registrado sem perfil de treino")
+    else:
+        report = (monitor or DriftMonitor()).check(profile, df, package["models"], exog_cols)
+    return report, package
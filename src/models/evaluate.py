@@ -1,49 +1,136 @@
 """Avaliação de modelos com métricas e backtests."""
 import pandas as pd
 import numpy as np
-try:
-    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-except ImportError:
-    # Fallback se sklearn não estiver instalado
-    def mean_absolute_error(y_true, y_pred):
-        import numpy as np
-        return np.mean(np.abs(y_true - y_pred))
-    def mean_squared_error(y_true, y_pred, squared=True):
-        import numpy as np
-        mse = np.mean((y_true - y_pred) ** 2)
-        return np.sqrt(mse) if not squared else mse
-    def r2_score(y_true, y_pred):
-        import numpy as np
-        ss_res = np.sum((y_true - y_pred) ** 2)
-        ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
-        return 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
-from typing import Dict, List
-
-def calculate_metrics(y_true: pd.Series, y_pred: pd.Series) -> Dict[str, float]:
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+METRICS = ["MAE", "RMSE", "MAPE", "sMAPE", "MASE", "R2", "Bias"]
+
+def _as_2d(values) -> np.ndarray:
+    """Converte Series/listas/arrays em matriz float (séries × tempo)."""
+    return np.atleast_2d(np.asarray(values, dtype=float))
+
+def _naive_scale(y_train, season: int) -> np.ndarray:
+    """Erro médio absoluto do previsor sazonal ingênuo no treino, por série."""
+    if not isinstance(y_train, (list, tuple)):
+        matrix = _as_2d(y_train)
+        if matrix.shape[1] <= season:
+            return np.full(len(matrix), np.nan)
+        diffs = np.abs(matrix[:, season:] - matrix[:, :-season])
+        finite = np.isfinite(diffs)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(finite, diffs, 0.0).sum(axis=1) / finite.sum(axis=1)
+    scale = []
+    for row in y_train:
+        row = np.asarray(row, dtype=float)
+        if len(row) <= season:
+            scale.append(np.nan)
+            continue
+        diffs = np.abs(row[season:] - row[:-season])
+        diffs = diffs[np.isfinite(diffs)]
+        scale.append(diffs.mean() if len(diffs) else np.nan)
+    return np.asarray(scale, dtype=float)
+
+def calculate_metrics_batch(
+    y_true,
+    y_pred,
+    y_train: Optional[Union[np.ndarray, Sequence[np.ndarray]]] = None,
+    season: int = 1,
+    labels: Optional[Sequence] = None,
+    zero_tol: float = 1e-6
+) -> pd.DataFrame:
+    """
+    Métricas de várias séries (ou divisões de backtest) de uma só vez.
+
+    Cada linha das matrizes é avaliada de forma independente; pares com
+    NaN são ignorados. O MAPE desconsidera valores reais nulos (ex: horas
+    sem produção), em vez de dividir por um épsilon.
+
+    Args:
+        y_true: Valores reais, formato (séries, tempo) ou 1-D
+        y_pred: Valores previstos, mesmo formato
+        y_train: Histórico de treino para a escala do MASE (matriz ou lista
+            de arrays de tamanhos diferentes); sem ele o MASE é NaN
+        season: Período do previsor ingênuo do MASE (1 = não sazonal)
+        labels: Rótulos das linhas (padrão: 0..n-1)
+        zero_tol: |real| abaixo deste valor fica fora do MAPE
+
+    Returns:
+        DataFrame com uma linha por série: series, n, MAE, RMSE, MAPE,
+        sMAPE, MASE, R2, Bias (NaN quando indefinida)
+    """
+    true, pred = _as_2d(y_true), _as_2d(y_pred)
+    if true.shape != pred.shape:
+        raise ValueError(f"Formatos diferentes: y_true {true.shape}, y_pred {pred.shape}")
+
+    valid = np.isfinite(true) & np.isfinite(pred)
+    n = valid.sum(axis=1)
+    t = np.where(valid, true, 0.0)
+    p = np.where(valid, pred, 0.0)
+    err = p - t
+    abs_err = np.abs(err)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mae = abs_err.sum(axis=1) / n
+        rmse = np.sqrt((err ** 2).sum(axis=1) / n)
+        bias = err.sum(axis=1) / n
+
+        nonzero = valid & (np.abs(t) > zero_tol)
+        mape = np.where(nonzero, abs_err / np.where(nonzero, np.abs(t), 1.0), 0.0).sum(axis=1) / nonzero.sum(axis=1) * 100
+
+        denom = np.abs(t) + np.abs(p)
+        smape = np.where(denom > 0, 2 * abs_err / np.where(denom > 0, denom, 1.0), 0.0).sum(axis=1) / n * 100
+
+        mean_true = t.sum(axis=1, keepdims=True) / n[:, None]
+        ss_res = (err ** 2).sum(axis=1)
+        ss_tot = (np.where(valid, t - mean_true, 0.0) ** 2).sum(axis=1)
+        # Como no scikit-learn: série real constante -> 1 se perfeita, senão 0
+        r2 = np.where(ss_tot > 0, 1 - ss_res / np.where(ss_tot > 0, ss_tot, 1.0), np.where(ss_res == 0, 1.0, 0.0))
+
+        # MASE: escala do previsor ingênuo no treino (a do próprio teste vazaria o período avaliado)
+        if y_train is None:
+            mase = np.full(len(true), np.nan)
+        else:
+            scale = _naive_scale(y_train, season)
+            mase = np.where(scale > 0, mae / np.where(scale > 0, scale, 1.0), np.nan)
+
+    empty = n == 0
+    result = pd.DataFrame({
+        "series": list(labels) if labels is not None else np.arange(len(true)),
+        "n": n,
+        "MAE": mae,
+        "RMSE": rmse,
+        "MAPE": mape,
+        "sMAPE": smape,
+        "MASE": mase,
+        "R2": np.where(empty, np.nan, r2),
+        "Bias": bias
+    })
+    return result
+
+def calculate_metrics(
+    y_true: pd.Series,
+    y_pred: pd.Series,
+    y_train: Optional[np.ndarray] = None,
+    season: int = 1
+) -> Dict[str, float]:
     """
     Calcula métricas de avaliação.
     
     Args:
         y_true: Valores reais
         y_pred: Valores previstos
+        y_train: Histórico de treino (escala do MASE; sem ele o MASE é NaN)
+        season: Período do previsor ingênuo do MASE
     
     Returns:
-        Dicionário com métricas: MAE, RMSE, MAPE, R²
+        Dicionário com métricas: MAE, RMSE, MAPE, sMAPE, MASE, R², Bias
+        (ver calculate_metrics_batch)
     """
-    mae = mean_absolute_error(y_true, y_pred)
-    rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-    
-    # MAPE com proteção contra divisão por zero
-    mape = np.mean(np.abs((y_true - y_pred) / (y_true + 1e-10))) * 100
-    
-    r2 = r2_score(y_true, y_pred)
-    
-    return {
-        "MAE": mae,
-        "RMSE": rmse,
-        "MAPE": mape,
-        "R2": r2
-    }
+    row = calculate_metrics_batch(
+        y_true, y_pred, y_train=None if y_train is None else [np.asarray(y_train, dtype=float)], season=season
+    ).iloc[0]
+    return {metric: float(row[metric]) for metric in METRICS}
 
 def expanding_window_backtest(
     model,
@@ -68,7 +155,7 @@ def expanding_window_backtest(
     predictions = []
     actuals = []
     
-    train = train_df.copy()
+    train = train_df
     
     for i in range(0, len(test_df), step_size):
         # Treinar modelo
@@ -92,3 +179,145 @@ def expanding_window_backtest(
     
     return results_df
 
+
+@lru_cache(maxsize=128)
+def make_folds(
+    n_rows: int,
+    horizon: int,
+    n_folds: int = 5,
+    min_train: int = 30,
+    step: Optional[int] = None
+) -> Tuple[Tuple[int, int], ...]:
+    """
+    Divisões de backtest com janela expansiva (posições, sem copiar dados).
+    
+    As divisões dependem apenas do tamanho da série e são memorizadas, de
+    modo que todas as avaliações (e todos os trials de um ajuste) usam os
+    mesmos cortes.
+    
+    Args:
+        n_rows: Número de linhas da série
+        horizon: Períodos previstos em cada divisão
+        n_folds: Número máximo de divisões
+        min_train: Tamanho mínimo do treino
+        step: Distância entre origens (padrão: horizon)
+    
+    Returns:
+        Tupla de (fim_treino, fim_teste), da origem mais recente para a mais
+        antiga; treino = [0, fim_treino), teste = [fim_treino, fim_teste)
+    """
+    step = step or horizon
+    folds = []
+    train_end = n_rows - horizon
+    while len(folds) < n_folds and train_end >= min_train:
+        folds.append((train_end, train_end + horizon))
+        train_end -= step
+    return tuple(folds)
+
+def score_folds(
+    make_model: Callable[[], object],
+    df: pd.DataFrame,
+    target_col: str,
+    folds: Sequence[Tuple[int, int]],
+    metric: str = "MAE",
+    exog_cols: Optional[List[str]] = None,
+    seed: Optional[int] = 0
+) -> List[float]:
+    """
+    Métrica de um modelo em cada divisão de backtest.
+    
+    As previsões de todas as divisões são avaliadas juntas em
+    calculate_metrics_batch (divisão × horizonte).
+    
+    Args:
+        make_model: Fábrica de modelos não treinados (fit/predict)
+        df: Série completa (ordenada por timestamp)
+        target_col: Coluna alvo
+        folds: Divisões (ver make_folds)
+        metric: Métrica de calculate_metrics_batch ("MAE", "RMSE", "MAPE", "sMAPE", "MASE")
+        exog_cols: Exógenas passadas ao fit/predict (modelos de produção)
+        seed: Semente do NumPy por divisão (modelos com ruído); None mantém o estado
+    
+    Returns:
+        Lista com o valor da métrica por divisão (inf se o modelo falhar)
+    """
+    if not folds:
+        return []
+    target = df[target_col].to_numpy(dtype=float)
+    width = max(test_end - train_end for train_end, test_end in folds)
+    actual = np.full((len(folds), width), np.nan)
+    predicted = np.full((len(folds), width), np.nan)
+    failed = np.zeros(len(folds), dtype=bool)
+    
+    for i, (train_end, test_end) in enumerate(folds):
+        train, test = df.iloc[:train_end], df.iloc[train_end:test_end]
+        if seed is not None:
+            np.random.seed(seed + i)
+        try:
+            model = make_model()
+            if exog_cols:
+                model.fit(train, target_col=target_col, exog_cols=exog_cols)
+                pred = model.predict(len(test), exog=test[exog_cols])
+            else:
+                model.fit(train, target_col=target_col)
+                pred = model.predict(len(test))
+            pred = np.asarray(pred, dtype=float)[:len(test)]
+            actual[i, :len(test)] = target[train_end:test_end]
+            predicted[i, :len(pred)] = pred
+            failed[i] = len(pred) < len(test)
+        except Exception:
+            failed[i] = True
+    
+    metrics = calculate_metrics_batch(
+        actual, predicted,
+        y_train=[target[:train_end] for train_end, _ in folds] if metric == "MASE" else None
+    )
+    scores = metrics[metric].to_numpy(dtype=float, copy=True)
+    scores[failed | ~np.isfinite(scores)] = np.inf
+    return scores.tolist()
+
+def backtest_partitioned(
+    dataset,
+    make_model: Callable[[], object],
+    target_col: str,
+    horizon: int = 7,
+    n_folds: int = 5,
+    metric: str = "MAE",
+    exog_cols: Optional[List[str]] = None,
+    sites: Optional[Sequence[int]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    min_train: int = 30
+) -> pd.DataFrame:
+    """
+    Backtest out-of-core: um site por vez, lendo só as colunas necessárias.
+    
+    Args:
+        dataset: PartitionedDataset (src.data.partitioned)
+        make_model: Fábrica de modelos não treinados (fit/predict)
+        target_col: Coluna alvo
+        horizon: Períodos previstos por divisão
+        n_folds: Número de divisões
+        metric: Métrica minimizada (ver score_folds)
+        exog_cols: Exógenas (modelos de produção)
+        sites: Sites avaliados (padrão: todos)
+        start: Data inicial do histórico
+        end: Data final do histórico
+        min_train: Tamanho mínimo do treino
+    
+    Returns:
+        DataFrame com site_id, rows, folds e score (média das divisões)
+    """
+    columns = [target_col, *(exog_cols or [])]
+    rows = []
+    for site in (sites if sites is not None else dataset.sites()):
+        df = dataset.read(start, end, [site], columns).reset_index(drop=True)
+        folds = make_folds(len(df), horizon, n_folds, min_train)
+        scores = score_folds(make_model, df, target_col, folds, metric, exog_cols)
+        rows.append({
+            "site_id": site,
+            "rows": len(df),
+            "folds": len(folds),
+            "score": float(np.mean(scores)) if scores else np.nan
+        })
+    return pd.DataFrame(rows, columns=["site_id", "rows", "folds", "score"])
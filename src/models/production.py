@@ -1,23 +1,80 @@
 """Modelo de previsão de produção de energia."""
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Dict, Any
 from pathlib import Path
 import json
 
+from src.data.solar import pv_energy
+from src.data.timezones import local_range, wall_clock
+
+# Local padrão do modelo físico (o mesmo das simulações)
+DEFAULT_LOCATION = (-23.55, -46.63)
+
+# Colunas de clima usadas pelo modelo físico -> argumentos de pv_energy
+WEATHER_COLUMNS = {"ghi_wm2": "ghi", "temp_c": "temp_c", "wind_ms": "wind_ms"}
+
 class ProductionForecaster:
     """Forecaster de produção com suporte a Prophet e XGBoost."""
     
-    def __init__(self, algo: str = "xgboost"):
+    # Hiperparâmetros padrão por algoritmo (ajustáveis; ver src.models.tuning)
+    DEFAULT_PARAMS: Dict[str, Dict[str, Any]] = {
+        "prophet": {
+            "yearly_seasonality": True,
+            "weekly_seasonality": True,
+            "daily_seasonality": False,
+            "changepoint_prior_scale": 0.05,
+            "seasonality_prior_scale": 10.0,
+            "seasonality_mode": "additive"
+        },
+        "baseline": {
+            "window": 30,   # dias usados na média e no desvio padrão
+            "seed": 0       # semente do ruído (mesma previsão a cada chamada)
+        },
+        "seasonal_naive": {
+            "season_length": 1   # 1 = persistência do último dia
+        },
+        "physical": {
+            "lat": None,         # None: coluna `lat` do histórico ou DEFAULT_LOCATION
+            "lon": None,
+            "tilt": None,        # None: inclinação igual à latitude
+            "azimuth": None,     # None: voltado para o equador
+            "dc_ac_ratio": 1.2,
+            "window": 90         # passos usados na calibração da potência efetiva
+        }
+    }
+    
+    def __init__(self, algo: str = "xgboost", params: Optional[Dict[str, Any]] = None):
         """
         Args:
-            algo: Algoritmo ("prophet", "xgboost")
+            algo: Algoritmo ("prophet", "seasonal_naive", "baseline", "physical", "xgboost")
+            params: Hiperparâmetros (sobrescrevem DEFAULT_PARAMS do algoritmo)
         """
         self.algo = algo
+        self.params = dict(params or {})
         self.model = None
         self.scaler = None
         self.fitted = False
     
+    def get_params(self, algo: Optional[str] = None) -> Dict[str, Any]:
+        """Hiperparâmetros efetivos do algoritmo (padrões + `params` aplicáveis)."""
+        defaults = self.DEFAULT_PARAMS.get(algo or self.algo, {})
+        return {**defaults, **{k: v for k, v in self.params.items() if k in defaults}}
+    
+    def _physical_energy(
+        self,
+        timestamps: pd.DatetimeIndex,
+        weather: Dict[str, np.ndarray],
+        capacity_kwp: float = 1.0
+    ) -> np.ndarray:
+        """Energia do modelo físico (src.data.solar) no local e orientação ajustados."""
+        params = self.get_params("physical")
+        return pv_energy(
+            timestamps, self.model["lat"], self.model["lon"], capacity_kwp,
+            tilt=params["tilt"], surface_azimuth=params["azimuth"],
+            dc_ac_ratio=params["dc_ac_ratio"], **weather
+        )
+    
     def fit(
         self,
         df: pd.DataFrame,
@@ -40,7 +97,8 @@ class ProductionForecaster:
                 from prophet import Prophet
                 
                 prophet_df = pd.DataFrame({
-                    "ds": pd.to_datetime(df["timestamp"]),
+                    # Prophet não aceita fuso: horário local do projeto
+                    "ds": wall_clock(df["timestamp"]),
                     "y": df[target_col].values
                 })
                 
@@ -49,11 +107,7 @@ class ProductionForecaster:
                     if col in df.columns:
                         prophet_df[col] = df[col].values
                 
-                self.model = Prophet(
-                    yearly_seasonality=True,
-                    weekly_seasonality=True,
-                    daily_seasonality=False
-                )
+                self.model = Prophet(**self.get_params("prophet"))
                 
                 # Adicionar regressores
                 for col in exog_cols:
@@ -66,11 +120,49 @@ class ProductionForecaster:
                 print("Prophet não disponível. Usando modelo baseline.")
                 self.algo = "baseline"
         
+        if self.algo == "seasonal_naive":
+            # Sazonal ingênuo: repete o último ciclo observado
+            season_length = self.get_params("seasonal_naive")["season_length"]
+            self.model = {"season": df[target_col].tail(season_length).astype(float).tolist()}
+        
+        if self.algo == "physical":
+            # Modelo físico: posição solar, céu claro, transposição e perdas;
+            # a potência efetiva (kWp) é calibrada no histórico recente
+            params = self.get_params("physical")
+            lat, lon = params["lat"], params["lon"]
+            if lat is None or lon is None:
+                if "lat" in df.columns and "lon" in df.columns:
+                    lat, lon = float(df["lat"].iloc[-1]), float(df["lon"].iloc[-1])
+                else:
+                    lat, lon = DEFAULT_LOCATION
+            timestamps = pd.DatetimeIndex(df["timestamp"])
+            self.model = {"lat": float(lat), "lon": float(lon)}
+            
+            weather = {
+                arg: df[col].to_numpy(dtype=float)
+                for col, arg in WEATHER_COLUMNS.items() if col in exog_cols and col in df.columns
+            }
+            window = min(params["window"], len(df))
+            actual = df[target_col].to_numpy(dtype=float)[-window:]
+            clear = self._physical_energy(timestamps, {})[-window:]
+            physical = self._physical_energy(timestamps, weather)[-window:] if weather else clear
+            valid = ~np.isnan(actual)
+            # Mínimos quadrados com o clima observado; sem clima futuro,
+            # a escala sobre o céu claro absorve a claridade média
+            self.model.update(
+                capacity_kwp=float(np.sum(actual[valid] * physical[valid]) / max(np.sum(physical[valid] ** 2), 1e-9)),
+                clear_capacity_kwp=float(np.sum(actual[valid]) / max(np.sum(clear[valid]), 1e-9)),
+                last_timestamp=str(timestamps[-1]),
+                step_hours=float(np.median(np.diff(timestamps.as_unit("ns").asi8))) / 3.6e12 if len(df) > 1 else 24.0
+            )
+        
         if self.algo == "baseline" or self.model is None:
             # Modelo baseline simples
+            window = self.get_params("baseline")["window"]
+            recent = df[target_col].tail(window) if len(df) >= window else df[target_col]
             self.model = {
-                "mean": df[target_col].tail(30).mean() if len(df) >= 30 else df[target_col].mean(),
-                "std": df[target_col].tail(30).std() if len(df) >= 30 else df[target_col].std()
+                "mean": float(recent.mean()),
+                "std": float(recent.std())
             }
             self.algo = "baseline"
         
@@ -110,6 +202,26 @@ class ProductionForecaster:
             forecast = self.model.predict(future_df)
             return forecast["yhat"].reset_index(drop=True)
         
+        elif self.algo == "seasonal_naive" and self.model is not None:
+            season = self.model["season"]
+            return pd.Series(np.maximum(0, [season[i % len(season)] for i in range(horizon)]))
+        
+        elif self.algo == "physical" and self.model is not None:
+            step_hours = self.model["step_hours"]
+            timestamps = local_range(
+                self.model["last_timestamp"],
+                periods=horizon + 1,
+                freq="D" if step_hours >= 24 else pd.Timedelta(hours=step_hours)
+            )[1:]
+            weather = {}
+            if exog is not None:
+                weather = {
+                    arg: exog[col].to_numpy(dtype=float)[:horizon]
+                    for col, arg in WEATHER_COLUMNS.items() if col in exog.columns and len(exog) >= horizon
+                }
+            capacity = self.model["capacity_kwp"] if "ghi" in weather else self.model["clear_capacity_kwp"]
+            return pd.Series(np.maximum(0, self._physical_energy(timestamps, weather, capacity)))
+        
         elif self.algo == "baseline" or self.model is None:
             # Previsão baseada em média com variação aleatória
             if self.model is None:
@@ -118,7 +230,9 @@ class ProductionForecaster:
             else:
                 mean = self.model.get("mean", 110)
                 std = self.model.get("std", mean * 0.1)
-            predictions = np.random.normal(mean, std, horizon)
+            # Gerador local: previsões reprodutíveis e sem estado global compartilhado entre threads
+            rng = np.random.default_rng(self.get_params("baseline")["seed"])
+            predictions = rng.normal(mean, std, horizon)
             return pd.Series(np.maximum(0, predictions))  # Produção não pode ser negativa
         
         else:
@@ -130,6 +244,7 @@ class ProductionForecaster:
         """Salva o modelo treinado."""
         model_dict = {
             "algo": self.algo,
+            "params": self.params,
             "model": self.model,
             "fitted": self.fitted
         }
@@ -141,6 +256,7 @@ class ProductionForecaster:
         with open(path, "r") as f:
             model_dict = json.load(f)
         self.algo = model_dict["algo"]
+        self.params = model_dict.get("params", {})
         self.model = model_dict["model"]
         self.fitted = model_dict["fitted"]
 
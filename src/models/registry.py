@@ -0,0 +1,131 @@
+"""Registro versionado de modelos treinados por região."""
+import json
+import pickle
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class ModelRegistry:
+    """
+    Armazena os modelos treinados de cada região para reuso sem re-treino.
+
+    Layout:
+        root/<region>/<version>.pkl   pacote com modelos, contexto e metadados
+        root/<region>/latest.json     metadados da versão mais recente
+
+    O pacote guarda os forecasters (consumo e produção) e o contexto usado
+    na previsão (médias recentes das exógenas e do PLD, fim dos dados e
+    deslocamento em relação ao fim do treino), permitindo repetir as etapas
+    de previsão/decisão/lucro do pipeline.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: Diretório raiz do registro
+        """
+        self.root = Path(root)
+
+    def register(
+        self,
+        region: str,
+        version: str,
+        models: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Registra uma nova versão dos modelos de uma região.
+
+        Args:
+            region: Região/submercado
+            version: Identificador da versão (ex: run_id)
+            models: Modelos treinados (ex: {"consumption": ..., "production": ...})
+            context: Dados auxiliares de previsão (ex: exógenas médias, PLD médio)
+            meta: Metadados livres (algoritmos, período de treino)
+
+        Returns:
+            Caminho do pacote gravado
+        """
+        region_dir = self.root / region
+        region_dir.mkdir(parents=True, exist_ok=True)
+        path = region_dir / f"{version}.pkl"
+
+        info = {
+            **(meta or {}),
+            "region": region,
+            "version": version,
+            "created_at": datetime.now().isoformat(timespec="seconds")
+        }
+        with open(path, "wb") as f:
+            pickle.dump({"models": models, "context": context or {}, "meta": info}, f)
+
+        # Ponteiro gravado por último: leitores nunca veem uma versão incompleta
+        tmp = region_dir / "latest.json.tmp"
+        tmp.write_text(json.dumps(info, ensure_ascii=False, default=str), encoding="utf-8")
+        tmp.replace(region_dir / "latest.json")
+        return path
+
+    def update_context(self, region: str, context: Dict[str, Any], version: Optional[str] = None) -> Path:
+        """
+        Atualiza o contexto de previsão de uma versão já registrada.
+
+        Usado quando o pipeline reutiliza os modelos com dados mais recentes:
+        o serviço passa a prever a partir do mesmo fim de dados do pipeline.
+
+        Args:
+            region: Região/submercado
+            context: Chaves do contexto a substituir (ex: last_timestamp, offset)
+            version: Versão (padrão: a mais recente)
+
+        Returns:
+            Caminho do pacote regravado
+        """
+        package = self.load(region, version)
+        package["context"] = {**package["context"], **context}
+        path = self.root / region / f"{package['meta']['version']}.pkl"
+        tmp = path.with_suffix(".pkl.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(package, f)
+        tmp.replace(path)
+        return path
+
+    def regions(self) -> List[str]:
+        """Regiões com ao menos uma versão registrada."""
+        if not self.root.exists():
+            return []
+        return sorted(p.parent.name for p in self.root.glob("*/latest.json"))
+
+    def latest(self, region: str) -> Optional[Dict[str, Any]]:
+        """Metadados da versão mais recente (None se não houver)."""
+        path = self.root / region / "latest.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def load(self, region: str, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Carrega um pacote de modelos.
+
+        Args:
+            region: Região/submercado
+            version: Versão (padrão: a mais recente)
+
+        Returns:
+            Dicionário com "models", "context" e "meta"
+
+        Raises:
+            KeyError: Região ou versão não registrada
+        """
+        if version is None:
+            info = self.latest(region)
+            if info is None:
+                raise KeyError(f"Nenhum modelo registrado para a região {region}")
+            version = info["version"]
+
+        path = self.root / region / f"{version}.pkl"
+        if not path.exists():
+            raise KeyError(f"Versão {version} não registrada para a região {region}")
+        with open(path, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,203 @@
+"""
+Seleção automática de algoritmo por série (`algo: "auto"` na configuração).
+
+Todos os algoritmos disponíveis são avaliados por backtest em uma janela
+recente da série; vence o de menor métrica, mas um algoritmo mais barato é
+preferido quando fica dentro da tolerância do melhor. A escolha é mantida
+em cache (JSON) com validade, de modo que o backtest só é refeito
+periodicamente.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config.schemas import SelectionConfig
+from src.models.evaluate import make_folds, score_folds
+from src.models.tuning import SERIES, prophet_available
+
+# Custo relativo de treino (menor = mais barato), usado no desempate por tolerância
+ALGO_COST = {
+    "seasonal_naive": 0,
+    "baseline": 1,
+    "physical": 1,
+    "prophet": 2,
+}
+
+
+def available_algos(series: str) -> List[str]:
+    """Algoritmos treináveis para a série, do mais barato ao mais caro."""
+    cls, _ = SERIES[series]
+    algos = [algo for algo in cls.DEFAULT_PARAMS if algo != "prophet" or prophet_available()]
+    return sorted(algos, key=lambda algo: ALGO_COST.get(algo, len(ALGO_COST)))
+
+
+def backtest_leaderboard(
+    df: pd.DataFrame,
+    series: str,
+    candidates: Optional[List[str]] = None,
+    metric: str = "MAE",
+    horizon: int = 7,
+    n_folds: int = 3,
+    window_days: int = 90,
+    exog_cols: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Métrica de cada algoritmo em backtest sobre o histórico recente.
+
+    Args:
+        df: Série histórica (prepare_data)
+        series: "consumption" ou "production"
+        candidates: Algoritmos avaliados (padrão: available_algos)
+        metric: Métrica minimizada ("MAE", "RMSE", "MAPE", "sMAPE", "MASE")
+        horizon: Períodos previstos por divisão
+        n_folds: Número de divisões
+        window_days: Linhas mais recentes usadas (treino + teste)
+        exog_cols: Exógenas (apenas produção)
+
+    Returns:
+        DataFrame com algo, score, fit_seconds e cost, ordenado por score
+    """
+    cls, target_col = SERIES[series]
+    recent = df.tail(window_days)
+    folds = make_folds(len(recent), horizon, n_folds, min_train=max(7, min(30, len(recent) // 2)))
+    if not folds:
+        raise ValueError(f"Histórico com {len(recent)} registros é curto demais para horizon={horizon}")
+
+    rows = []
+    for algo in candidates or available_algos(series):
+        started = time.perf_counter()
+        scores = score_folds(
+            lambda: cls(algo=algo), recent, target_col, folds, metric=metric,
+            exog_cols=exog_cols if series == "production" else None
+        )
+        rows.append({
+            "algo": algo,
+            "score": float(np.mean(scores)),
+            "fit_seconds": (time.perf_counter() - started) / len(folds),
+            "cost": ALGO_COST.get(algo, len(ALGO_COST))
+        })
+    return pd.DataFrame(rows).sort_values(["score", "cost"]).reset_index(drop=True)
+
+
+def select_algo(
+    df: pd.DataFrame,
+    series: str,
+    selection: Optional[SelectionConfig] = None,
+    horizon: int = 7,
+    exog_cols: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Escolhe o algoritmo de uma série pelo leaderboard de backtest.
+
+    Entre os algoritmos com métrica até `(1 + tolerance)` vezes a melhor,
+    vence o mais barato.
+
+    Args:
+        df: Série histórica
+        series: "consumption" ou "production"
+        selection: Parâmetros da seleção (model.selection)
+        horizon: Períodos previstos por divisão
+        exog_cols: Exógenas (apenas produção)
+
+    Returns:
+        Dicionário com algo, score, metric, best_algo e leaderboard (lista de registros)
+    """
+    selection = selection or SelectionConfig()
+    board = backtest_leaderboard(
+        df, series, list(selection.candidates) or None, selection.metric,
+        horizon, selection.folds, selection.window_days, exog_cols
+    )
+    best = board.iloc[0]
+    if not np.isfinite(best["score"]):
+        chosen = {"algo": "baseline", "score": float("inf")}
+    else:
+        eligible = board[board["score"] <= best["score"] * (1 + selection.tolerance)]
+        chosen = eligible.sort_values(["cost", "score"]).iloc[0].to_dict()
+    return {
+        "algo": chosen["algo"],
+        "score": float(chosen["score"]),
+        "metric": selection.metric,
+        "best_algo": best["algo"],
+        "leaderboard": board.to_dict(orient="records")
+    }
+
+
+class SelectionCache:
+    """Escolhas de algoritmo em um arquivo JSON, com validade (TTL)."""
+
+    def __init__(self, path: Path, ttl_hours: float = 24.0, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Arquivo JSON do cache
+            ttl_hours: Validade de cada escolha
+            clock: Relógio (segundos desde a época; injetável em testes)
+        """
+        self.path = Path(path)
+        self.ttl_s = ttl_hours * 3600
+        self.clock = clock
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Escolha em cache, ou None se ausente ou expirada."""
+        entry = self._read().get(key)
+        if entry is None or self.clock() - entry.get("selected_ts", 0) > self.ttl_s:
+            return None
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Grava uma escolha (escrita atômica)."""
+        cache = self._read()
+        ts = self.clock()
+        cache[key] = {**entry, "selected_ts": ts, "selected_at": datetime.fromtimestamp(ts).isoformat(timespec="seconds")}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, indent=2, default=float), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def choose_algo(
+    df: pd.DataFrame,
+    region: str,
+    series: str,
+    selection: Optional[SelectionConfig] = None,
+    cache: Optional[SelectionCache] = None,
+    horizon: int = 7,
+    exog_cols: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Algoritmo de uma série no modo "auto", reaproveitando a escolha em cache.
+
+    Args:
+        df: Série histórica
+        region: Região/submercado (parte da chave do cache)
+        series: "consumption" ou "production"
+        selection: Parâmetros da seleção (model.selection)
+        cache: Cache de escolhas (None: sempre reavalia)
+        horizon: Períodos previstos por divisão
+        exog_cols: Exógenas (apenas produção)
+
+    Returns:
+        Resultado de select_algo, com `cached` indicando reaproveitamento
+    """
+    selection = selection or SelectionConfig()
+    key = f"{region}:{series}:{selection.metric}:{','.join(selection.candidates) or 'all'}"
+    entry = cache.get(key) if cache is not None else None
+    if entry is not None:
+        return {**entry, "cached": True}
+    entry = select_algo(df, series, selection, horizon, exog_cols)
+    if cache is not None:
+        cache.put(key, entry)
+    return {**entry, "cached": False}
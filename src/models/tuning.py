@@ -0,0 +1,440 @@
+"""
+Ajuste de hiperparâmetros dos forecasters de consumo e produção.
+
+Busca aleatória com successive halving: todos os trials são avaliados nas
+divisões de backtest mais recentes; apenas a fração 1/eta melhor avança
+para a rodada seguinte, avaliada com mais divisões, até a rodada final com
+todas. Trials ruins são descartados após poucas divisões, de modo que o
+custo fica próximo de alguns ajustes completos.
+
+As avaliações rodam em um pool de processos; a série é gravada uma única
+vez como matriz mapeada em memória (src.features.cache) e cada processo a
+abre sem cópia, de modo que a memória não cresce com o número de workers.
+As divisões vêm de `make_folds` (memorizadas) e as métricas já calculadas
+são reaproveitadas entre rodadas.
+
+O melhor conjunto por região é gravado em `<config>.tuned.yaml` (seção
+`model.tuned`), mesclado automaticamente por `load_app_config`.
+
+Uso:
+    python -m src.models.tuning --region SE --trials 40 --workers 4
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.models.consumption import ConsumptionForecaster
+from src.models.production import ProductionForecaster
+from src.features.cache import FeatureMatrix, cached_matrix
+from src.models.evaluate import make_folds, score_folds
+
+# Série -> (classe do forecaster, coluna alvo)
+SERIES = {
+    "consumption": (ConsumptionForecaster, "consumption_kwh"),
+    "production": (ProductionForecaster, "production_kwh"),
+}
+
+# Espaço de busca por algoritmo: parâmetro -> (tipo, valores)
+# Tipos: "choice" (lista), "int" (mín, máx), "loguniform" (mín, máx)
+SEARCH_SPACES: Dict[str, Dict[str, Tuple[str, Any]]] = {
+    "prophet": {
+        "changepoint_prior_scale": ("loguniform", (0.001, 0.5)),
+        "seasonality_prior_scale": ("loguniform", (0.01, 10.0)),
+        "seasonality_mode": ("choice", ["additive", "multiplicative"]),
+        "yearly_seasonality": ("choice", [True, False]),
+        "weekly_seasonality": ("choice", [True, False]),
+    },
+    "baseline": {
+        "window": ("int", (7, 90)),
+        "trend_window": ("choice", [0, 3, 7, 14]),
+    },
+    "seasonal_naive": {
+        "season_length": ("choice", [1, 7, 14, 28]),
+    },
+    "physical": {
+        "window": ("int", (14, 180)),
+        "dc_ac_ratio": ("choice", [1.0, 1.1, 1.2, 1.3]),
+    },
+}
+
+
+def prophet_available() -> bool:
+    """True se o pacote prophet pode ser importado."""
+    try:
+        import prophet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def effective_algo(algo: str, series: str = "production") -> str:
+    """Algoritmo realmente treinado pelo forecaster da série (Prophet ausente ou não implementado -> baseline)."""
+    if algo == "prophet":
+        return "prophet" if prophet_available() else "baseline"
+    cls, _ = SERIES[series]
+    return algo if algo in cls.DEFAULT_PARAMS else "baseline"
+
+
+def sample_params(space: Dict[str, Tuple[str, Any]], rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Sorteia um conjunto de hiperparâmetros.
+
+    Args:
+        space: Espaço de busca (ver SEARCH_SPACES)
+        rng: Gerador aleatório
+
+    Returns:
+        Dicionário com valores Python nativos (serializáveis em YAML)
+    """
+    params = {}
+    for name, (kind, values) in space.items():
+        if kind == "choice":
+            value = values[int(rng.integers(len(values)))]
+        elif kind == "int":
+            value = int(rng.integers(values[0], values[1] + 1))
+        elif kind == "loguniform":
+            value = float(f"{math.exp(rng.uniform(math.log(values[0]), math.log(values[1]))):.4g}")
+        else:
+            raise ValueError(f"Tipo de parâmetro desconhecido: {kind}")
+        params[name] = value
+    return params
+
+
+def rung_budgets(n_folds: int, eta: int = 3) -> List[int]:
+    """Divisões avaliadas em cada rodada (ex: 6 divisões, eta=3 -> [1, 2, 6])."""
+    budgets = [n_folds]
+    while budgets[0] > 1:
+        budgets.insert(0, max(1, budgets[0] // eta))
+    return budgets
+
+
+# Estado de cada processo do pool (série e divisões enviadas uma única vez)
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(
+    source: Any,
+    series: str,
+    algo: str,
+    folds: Tuple[Tuple[int, int], ...],
+    metric: str,
+    exog_cols: Optional[List[str]]
+) -> None:
+    # Diretório de uma FeatureMatrix (pool) ou o próprio DataFrame (em processo)
+    df = source if isinstance(source, pd.DataFrame) else FeatureMatrix(source).frame()
+    _WORKER.update(df=df, series=series, algo=algo, folds=folds, metric=metric, exog_cols=exog_cols)
+
+
+def _evaluate(trial: int, params: Dict[str, Any], fold_ids: List[int]) -> Tuple[int, Dict[int, float]]:
+    """Métrica de um trial nas divisões pedidas (executado no pool)."""
+    cls, target_col = SERIES[_WORKER["series"]]
+    folds = _WORKER["folds"]
+    scores = {}
+    for fold in fold_ids:
+        scores[fold] = score_folds(
+            lambda: cls(algo=_WORKER["algo"], params=params),
+            _WORKER["df"],
+            target_col,
+            [folds[fold]],
+            metric=_WORKER["metric"],
+            exog_cols=_WORKER["exog_cols"],
+            seed=fold
+        )[0]
+    return trial, scores
+
+
+def tune(
+    df: pd.DataFrame,
+    series: str,
+    algo: str,
+    n_trials: int = 30,
+    n_folds: int = 6,
+    horizon: int = 7,
+    eta: int = 3,
+    metric: str = "MAE",
+    workers: int = 1,
+    seed: int = 0,
+    exog_cols: Optional[List[str]] = None,
+    min_train: int = 30,
+    cache_dir: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Ajusta os hiperparâmetros de uma série por busca aleatória com successive halving.
+
+    O trial 0 usa os parâmetros padrão do algoritmo e não é podado: chega à
+    rodada final e é comparado com os demais nas mesmas divisões, de modo
+    que o resultado nunca é pior que o padrão.
+
+    Args:
+        df: Série histórica (saída de prepare_data, ordenada por timestamp)
+        series: "consumption" ou "production"
+        algo: Algoritmo configurado (ver effective_algo)
+        n_trials: Número de conjuntos avaliados na primeira rodada
+        n_folds: Divisões de backtest na rodada final
+        horizon: Períodos previstos por divisão
+        eta: Fator de redução entre rodadas
+        metric: Métrica minimizada ("MAE", "RMSE", "MAPE", "sMAPE", "MASE")
+        workers: Processos do pool (1 = no próprio processo)
+        seed: Semente da amostragem
+        exog_cols: Exógenas (apenas produção)
+        min_train: Tamanho mínimo do treino por divisão
+        cache_dir: Cache da matriz compartilhada com o pool (padrão:
+            diretório temporário removido ao final)
+
+    Returns:
+        Dicionário com series, algo, params, score, metric, horizon, folds,
+        trials, evaluations e leaderboard (DataFrame)
+
+    Raises:
+        ValueError: Série curta demais para gerar divisões
+    """
+    algo = effective_algo(algo, series)
+    cls, target_col = SERIES[series]
+    # Padrões None são resolvidos pelo forecaster (ex.: coordenadas do site) e não entram no ajuste
+    defaults = {k: v for k, v in cls.DEFAULT_PARAMS.get(algo, {}).items() if v is not None}
+    space = {k: v for k, v in SEARCH_SPACES.get(algo, {}).items() if k in defaults}
+    if series != "production":
+        exog_cols = None
+
+    folds = make_folds(len(df), horizon, n_folds, min_train)
+    if not folds:
+        raise ValueError(
+            f"Série com {len(df)} registros é curta demais para horizon={horizon} e min_train={min_train}"
+        )
+
+    # Trials distintos (o padrão primeiro)
+    rng = np.random.default_rng(seed)
+    trials = [defaults]
+    seen = {json.dumps(defaults, sort_keys=True)}
+    attempts = 0
+    while space and len(trials) < n_trials and attempts < n_trials * 20:
+        attempts += 1
+        params = {**defaults, **sample_params(space, rng)}
+        key = json.dumps(params, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            trials.append(params)
+
+    scores: Dict[int, Dict[int, float]] = {t: {} for t in range(len(trials))}
+    reached = {t: 0 for t in range(len(trials))}
+    alive = list(range(len(trials)))
+    budgets = rung_budgets(len(folds), eta)
+    evaluations = 0
+
+    executor = None
+    matrix_dir = None
+    if workers > 1 and len(trials) > 1:
+        # Pool: os processos abrem a matriz gravada (memmap) em vez de receber o DataFrame
+        columns = [col for col in ["timestamp", target_col, *(exog_cols or [])] if col in df.columns]
+        matrix_dir = Path(cache_dir) if cache_dir is not None else Path(tempfile.mkdtemp(prefix="tuning-"))
+        matrix = cached_matrix(df[columns], matrix_dir)
+        initargs = (str(matrix.path), series, algo, folds, metric, exog_cols)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+    else:
+        _init_worker(df, series, algo, folds, metric, exog_cols)
+
+    def mean_score(trial: int, budget: int) -> float:
+        return float(np.mean([scores[trial][f] for f in range(budget)]))
+
+    try:
+        for rung, budget in enumerate(budgets):
+            tasks = [
+                (t, trials[t], [f for f in range(budget) if f not in scores[t]])
+                for t in alive
+            ]
+            tasks = [task for task in tasks if task[2]]
+            if executor is not None:
+                results = executor.map(_evaluate, *zip(*tasks)) if tasks else []
+            else:
+                results = (_evaluate(*task) for task in tasks)
+            for trial, fold_scores in results:
+                scores[trial].update(fold_scores)
+                evaluations += len(fold_scores)
+            for t in alive:
+                reached[t] = rung
+
+            ranked = sorted(alive, key=lambda t: mean_score(t, budget))
+            if rung < len(budgets) - 1:
+                # Poda: trials que falharam saem; dos demais, avança 1/eta
+                finite = [t for t in ranked if np.isfinite(mean_score(t, budget))] or ranked[:1]
+                alive = finite[:max(1, math.ceil(len(finite) / eta))]
+                # O padrão segue até a rodada final (referência nas mesmas divisões)
+                if 0 not in alive:
+                    alive.append(0)
+            else:
+                alive = ranked
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if matrix_dir is not None and cache_dir is None:
+            shutil.rmtree(matrix_dir, ignore_errors=True)
+
+    best = alive[0]
+    leaderboard = pd.DataFrame([
+        {
+            "trial": t,
+            "rung": reached[t],
+            "folds": len(scores[t]),
+            "score": float(np.mean(list(scores[t].values()))) if scores[t] else float("inf"),
+            "params": json.dumps(trials[t], sort_keys=True)
+        }
+        for t in range(len(trials))
+    ]).sort_values(["rung", "score"], ascending=[False, True]).reset_index(drop=True)
+
+    return {
+        "series": series,
+        "algo": algo,
+        "params": trials[best],
+        "score": mean_score(best, len(folds)),
+        "default_score": mean_score(0, len(folds)),
+        "metric": metric,
+        "horizon": horizon,
+        "folds": len(folds),
+        "trials": len(trials),
+        "evaluations": evaluations,
+        "leaderboard": leaderboard
+    }
+
+
+def save_tuned(config_path: Optional[Path], region: str, results: List[Dict[str, Any]]) -> Path:
+    """
+    Grava o melhor ajuste por série em `<config>.tuned.yaml` (model.tuned.<região>).
+
+    Ajustes de outras regiões/séries já presentes no arquivo são mantidos.
+
+    Args:
+        config_path: Arquivo de configuração (padrão: config/default.yaml)
+        region: Região/submercado ajustado
+        results: Saídas de tune()
+
+    Returns:
+        Caminho do arquivo de ajustes
+    """
+    from src.config import tuned_path
+
+    path = tuned_path(config_path)
+    overlay = {}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            overlay = yaml.safe_load(f) or {}
+
+    region_tuned = overlay.setdefault("model", {}).setdefault("tuned", {}).setdefault(region, {})
+    for result in results:
+        region_tuned[result["series"]] = {
+            "algo": result["algo"],
+            "params": result["params"],
+            "metric": result["metric"],
+            "score": round(result["score"], 4),
+            "horizon": result["horizon"],
+            "folds": result["folds"],
+            "tuned_at": datetime.now().isoformat(timespec="seconds")
+        }
+
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write("# Gerado por src.models.tuning; mesclado sobre a configuração por load_app_config\n")
+        yaml.safe_dump(overlay, f, sort_keys=False, allow_unicode=True)
+    os.replace(tmp, path)
+    return path
+
+
+def main() -> int:
+    """Ajusta os forecasters de uma região e grava o resultado na configuração."""
+    from src.config import load_app_config
+    from src.data.loader import load_data_with_fallback, prepare_data
+
+    parser = argparse.ArgumentParser(description="Ajuste de hiperparâmetros dos forecasters")
+    parser.add_argument("--config", type=Path, default=None, help="Arquivo de configuração YAML")
+    parser.add_argument("--region", type=str, default=None, help="Região (padrão: data.region)")
+    parser.add_argument("--submercado", type=str, default=None, help="Submercado (padrão: data.submercado)")
+    parser.add_argument("--series", nargs="+", choices=list(SERIES), default=list(SERIES),
+                        help="Séries a ajustar")
+    parser.add_argument("--trials", type=int, default=30, help="Trials na primeira rodada")
+    parser.add_argument("--folds", type=int, default=6, help="Divisões de backtest na rodada final")
+    parser.add_argument("--horizon", type=int, default=None,
+                        help="Horizonte por divisão (padrão: model.horizon_days)")
+    parser.add_argument("--eta", type=int, default=3, help="Fator de redução entre rodadas")
+    parser.add_argument("--metric", choices=["MAE", "RMSE", "MAPE", "sMAPE", "MASE"], default="MAE")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos do pool")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=365, help="Dias de histórico usados")
+    parser.add_argument("--train-end", type=str, default=None, help="Fim do histórico (YYYY-MM-DD)")
+    parser.add_argument("--use-real-data", action="store_true", help="Usar conectores de dados reais")
+    parser.add_argument("--no-save", action="store_true", help="Apenas exibir o resultado")
+    args = parser.parse_args()
+
+    try:
+        config = load_app_config(args.config)
+    except Exception as e:
+        print(f"[ERRO] Configuracao invalida: {e}")
+        return 1
+
+    region = args.region or config.data.region
+    submercado = args.submercado or config.data.submercado
+    horizon = args.horizon or config.model.horizon_days
+    end = datetime.strptime(args.train_end, "%Y-%m-%d") if args.train_end else datetime.now()
+    start = end - timedelta(days=args.days)
+
+    consumption_df, production_df, pld_df, climate_df = load_data_with_fallback(
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        region=region,
+        submercado=submercado,
+        inmet_station=config.data.inmet_station,
+        cache_dir=Path(config.data.cache_dir or "data/raw"),
+        use_real_data=args.use_real_data
+    )
+    df = prepare_data(consumption_df, production_df, pld_df, climate_df)
+    exog_cols = ["ghi_wm2", "temp_c"] if "ghi_wm2" in df.columns else None
+    print(f"[OK] {len(df)} registros de {region} ({start:%Y-%m-%d} a {end:%Y-%m-%d})")
+
+    results = []
+    for series in args.series:
+        algo, _ = config.model.resolve(region, series)
+        if algo == "auto":
+            from src.models.selection import select_algo
+            algo = select_algo(
+                df, series, config.model.selection, horizon=horizon,
+                exog_cols=exog_cols if series == "production" else None
+            )["algo"]
+            print(f"[OK] {series}: selecao automatica -> {algo}")
+        started = datetime.now()
+        try:
+            result = tune(
+                df, series, algo,
+                n_trials=args.trials, n_folds=args.folds, horizon=horizon, eta=args.eta,
+                metric=args.metric, workers=args.workers, seed=args.seed, exog_cols=exog_cols
+            )
+        except ValueError as e:
+            print(f"[ERRO] {series}: {e}")
+            return 1
+        elapsed = (datetime.now() - started).total_seconds()
+        print(
+            f"[OK] {series} ({result['algo']}): {args.metric} {result['score']:.3f} "
+            f"(padrao {result['default_score']:.3f}), {result['trials']} trials, "
+            f"{result['evaluations']} avaliacoes em {elapsed:.1f}s"
+        )
+        print(f"  params: {result['params']}")
+        print(result["leaderboard"].head(5).to_string(index=False))
+        results.append(result)
+
+    if not args.no_save:
+        path = save_tuned(args.config, region, results)
+        print(f"[OK] Ajuste gravado em {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Execução do pipeline para carteiras com vários sites."""
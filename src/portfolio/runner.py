@@ -0,0 +1,421 @@
+"""
+Modo carteira: previsão, lucro e decisões para muitos sites.
+
+Os sites são agrupados por célula de grade (clima carregado uma vez por
+célula) e processados em lotes por um pool de processos limitado. Apenas
+`workers × 2` lotes ficam em andamento; os resultados por site são gravados
+incrementalmente em Parquet e os agregados por submercado são acumulados,
+de modo que a memória depende do tamanho do lote e não da carteira.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config.schemas import ModelConfig, SelectionConfig
+from src.data.ccee import fetch_pld
+from src.data.dtypes import apply_dtypes
+from src.data.handoff import from_arrow, to_arrow
+from src.data.loader import load_data_with_fallback, prepare_data
+from src.data.pvgis import fetch_pvgis_ghi
+from src.data.spatial import nearest_station_climate, snap_to_grid
+from src.data.timezones import PROJECT_TZ, local_range
+from src.finance.profit import ProfitCalculator, summarize_results
+from src.models.consumption import ConsumptionForecaster
+from src.models.production import ProductionForecaster
+from src.rules.engine import DecisionEngine
+
+REQUIRED_COLUMNS = ("site_id", "lat", "lon", "submercado", "capacity_kwp")
+
+# Nomes alternativos aceitos na tabela de sites
+COLUMN_ALIASES = {"id": "site_id", "capacity": "capacity_kwp"}
+
+# Colunas somadas no agregado por submercado
+AGGREGATE_COLS = [
+    "consumption_kwh", "production_kwh", "surplus_kwh", "deficit_kwh",
+    "sell_revenue_brl", "buy_cost_brl", "fixed_cost_brl", "net_profit_brl"
+]
+
+
+def results_schema():
+    """
+    Esquema Arrow fixo de portfolio_sites.parquet.
+
+    Segue a política de src.data.dtypes (energia/preços em float32, valores
+    em reais em float64). O gravador usa este esquema em vez do primeiro lote,
+    cujos tipos inferidos podem não servir aos demais (ex: coluna só com
+    zeros inteiros seguida de valores fracionários).
+
+    Returns:
+        pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [("site_id", pa.int64()), ("submercado", category)]
+        + [(col, pa.float64() if col.endswith("_brl") else pa.float32()) for col in AGGREGATE_COLS]
+        + [("decision", category), ("pld_brl_mwh", pa.float32()), ("timestamp", pa.timestamp("us", tz=PROJECT_TZ))]
+    )
+
+
+def load_sites(path: Path) -> pd.DataFrame:
+    """
+    Carrega a tabela de sites (CSV ou Parquet).
+
+    Colunas obrigatórias: site_id (ou id), lat, lon, submercado,
+    capacity_kwp (ou capacity). Opcional: base_kwh_day (padrão: 4 × capacidade).
+
+    Args:
+        path: Arquivo da carteira
+
+    Returns:
+        DataFrame de sites
+
+    Raises:
+        ValueError: Colunas obrigatórias ausentes
+    """
+    path = Path(path)
+    sites = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    sites = sites.rename(columns={k: v for k, v in COLUMN_ALIASES.items() if v not in sites.columns})
+    missing = [col for col in REQUIRED_COLUMNS if col not in sites.columns]
+    if missing:
+        raise ValueError(f"Tabela de sites sem as colunas: {', '.join(missing)}")
+    if "base_kwh_day" not in sites.columns:
+        sites["base_kwh_day"] = sites["capacity_kwp"] * 4
+    return sites.reset_index(drop=True)
+
+
+def plan_batches(sites: pd.DataFrame, batch_size: int, resolution_deg: float) -> Iterator[pd.DataFrame]:
+    """
+    Divide a carteira em lotes de até `batch_size` sites sem separar células.
+
+    Células maiores que o lote são divididas em lotes próprios.
+
+    Yields:
+        Lotes com colunas extras cell_lat/cell_lon
+    """
+    cell_lat, cell_lon = snap_to_grid(sites["lat"].to_numpy(), sites["lon"].to_numpy(), resolution_deg)
+    sites = sites.assign(cell_lat=cell_lat, cell_lon=cell_lon).sort_values(["cell_lat", "cell_lon", "site_id"], kind="stable")
+
+    pending: List[pd.DataFrame] = []
+    pending_size = 0
+    for _, cell_sites in sites.groupby(["cell_lat", "cell_lon"], sort=False):
+        for offset in range(0, len(cell_sites), batch_size):
+            part = cell_sites.iloc[offset:offset + batch_size]
+            if pending_size + len(part) > batch_size:
+                yield pd.concat(pending)
+                pending, pending_size = [], 0
+            pending.append(part)
+            pending_size += len(part)
+    if pending:
+        yield pd.concat(pending)
+
+
+def _load_cell_climate(cell_lat: float, cell_lon: float, settings: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """Clima de uma célula (conectores com cache local)."""
+    start, end, cache_dir = settings["start"], settings["end"], settings["cache_dir"]
+    try:
+        return fetch_pvgis_ghi(cell_lat, cell_lon, start, end, cache_dir, settings["grid_resolution_deg"])
+    except Exception as e:
+        print(f"[AVISO] PVGIS indisponivel para a celula ({cell_lat}, {cell_lon}): {e}")
+        return nearest_station_climate(cell_lat, cell_lon, start, end, cache_dir)
+
+
+def forecast_site(
+    combined_df: pd.DataFrame,
+    horizon: int,
+    settings: Dict[str, Any],
+    site_id: Optional[int] = None,
+    region: Optional[str] = None,
+    location: Optional[Tuple[float, float]] = None
+) -> pd.DataFrame:
+    """
+    Treina, prevê e calcula lucro/decisões de um site (etapas 3 a 6 do pipeline).
+
+    Algoritmos e hiperparâmetros são resolvidos como no pipeline de um site:
+    ajuste da região (model.tuned) sobre os algoritmos configurados e, no
+    modelo físico, as coordenadas do site.
+
+    Args:
+        combined_df: Histórico combinado do site (prepare_data)
+        horizon: Horizonte de previsão (dias)
+        settings: Algoritmos, ajustes e seções finance/decisions da configuração
+        site_id: Site (chave da escolha de algoritmo em cache no modo "auto")
+        region: Região/submercado do site (chave do ajuste em model.tuned)
+        location: (lat, lon) do site (modelo físico de produção)
+
+    Returns:
+        DataFrame com previsões, resultados financeiros e decisões
+    """
+    exog_cols = [col for col in ('ghi_wm2', 'temp_c') if col in combined_df.columns] or None
+    model_config = ModelConfig(
+        algo_consumption=settings["algo_consumption"],
+        algo_production=settings["algo_production"],
+        tuned=settings.get("tuned", {})
+    )
+    algo_consumption, params_consumption = model_config.resolve(region or "", "consumption")
+    algo_production, params_production = model_config.resolve(region or "", "production")
+    if "auto" in (algo_consumption, algo_production):
+        # Seleção por site: cada série recebe o algoritmo mais barato "bom o suficiente"
+        from src.models.selection import SelectionCache, choose_algo
+        selection = SelectionConfig(**settings.get("selection", {}))
+        cache = None
+        if site_id is not None and settings.get("selection_dir"):
+            # Um arquivo por site: cada site é processado por um único worker
+            cache = SelectionCache(Path(settings["selection_dir"]) / f"site_{site_id}.json", ttl_hours=selection.ttl_hours)
+        key = f"site{site_id}"
+        if algo_consumption == "auto":
+            algo_consumption = choose_algo(combined_df, key, "consumption", selection, cache, horizon)["algo"]
+        if algo_production == "auto":
+            algo_production = choose_algo(combined_df, key, "production", selection, cache, horizon, exog_cols)["algo"]
+    if algo_production == "physical" and location is not None:
+        params_production = {"lat": location[0], "lon": location[1], **params_production}
+
+    consumption_model = ConsumptionForecaster(algo=algo_consumption, params=params_consumption)
+    consumption_model.fit(combined_df, target_col='consumption_kwh')
+
+    production_model = ProductionForecaster(algo=algo_production, params=params_production)
+    production_model.fit(combined_df, target_col='production_kwh', exog_cols=exog_cols)
+
+    future_exog = None
+    if exog_cols:
+        future_exog = pd.DataFrame({col: [combined_df[col].tail(30).mean()] * horizon for col in exog_cols})
+    consumption_pred = pd.Series(np.asarray(consumption_model.predict(horizon), dtype=float))
+    production_pred = pd.Series(np.asarray(production_model.predict(horizon, exog=future_exog), dtype=float))
+
+    pld_future = None
+    if 'pld_brl_mwh' in combined_df.columns:
+        pld_future = pd.Series([combined_df['pld_brl_mwh'].tail(30).mean()] * horizon)
+
+    finance_config = settings["finance"]
+    calculator = ProfitCalculator(
+        sell_price_brl_per_kwh=finance_config.get('sell_price_brl_per_kwh', 0.75),
+        buy_price_brl_per_kwh=finance_config.get('buy_price_brl_per_kwh', 0.90),
+        cost_rate=finance_config.get('cost_rate', 0.10),
+        use_pld=finance_config.get('use_pld', True)
+    )
+    results_df = calculator.calculate(consumption_pred, production_pred, pld_brl_mwh=pld_future)
+
+    decision_config = settings["decisions"]
+    decision_engine = DecisionEngine(
+        buffer_kwh=decision_config.get('buffer_kwh', 1.0),
+        pld_premium_threshold_brl_mwh=decision_config.get('pld_premium_threshold_brl_mwh', 50.0),
+        strategy="economic"
+    )
+    results_df['decision'] = decision_engine.decide(
+        consumption_pred, production_pred, pld_brl_mwh=pld_future
+    ).values
+    results_df['pld_brl_mwh'] = pld_future.values if pld_future is not None else np.nan
+
+    last_timestamp = pd.Timestamp(combined_df['timestamp'].max())
+    results_df['timestamp'] = local_range(last_timestamp, periods=horizon + 1, freq='D')[1:]
+    return results_df
+
+
+def run_batch(batch: pd.DataFrame, pld_by_submercado: Dict[str, pd.DataFrame], settings: Dict[str, Any]):
+    """
+    Processa um lote de sites (executado nos processos de trabalho).
+
+    Args:
+        batch: Sites do lote (com cell_lat/cell_lon)
+        pld_by_submercado: PLD histórico por submercado
+        settings: Parâmetros da execução (ver run_portfolio)
+
+    Returns:
+        Tabela Arrow com os resultados por site e período (coluna site_id),
+        ou None se nenhum site foi processado
+    """
+    frames = []
+    for (cell_lat, cell_lon), cell_sites in batch.groupby(["cell_lat", "cell_lon"], sort=False):
+        climate_df = _load_cell_climate(cell_lat, cell_lon, settings)
+        for site in cell_sites.itertuples(index=False):
+            try:
+                consumption_df, production_df, pld_df, site_climate = load_data_with_fallback(
+                    start=settings["start"],
+                    end=settings["end"],
+                    region=site.submercado,
+                    submercado=site.submercado,
+                    cache_dir=settings["cache_dir"],
+                    use_real_data=False,
+                    lat=site.lat,
+                    lon=site.lon,
+                    pld_df=pld_by_submercado.get(site.submercado),
+                    climate_df=climate_df,
+                    capacity_kwp=site.capacity_kwp,
+                    base_kwh_day=site.base_kwh_day,
+                    site=int(site.site_id)
+                )
+                combined_df = prepare_data(consumption_df, production_df, pld_df, site_climate)
+                results_df = forecast_site(
+                    combined_df, settings["horizon"], settings, int(site.site_id),
+                    region=site.submercado, location=(float(site.lat), float(site.lon))
+                )
+            except Exception as e:
+                print(f"[AVISO] Site {site.site_id} ignorado: {e}")
+                continue
+            results_df.insert(0, "site_id", site.site_id)
+            results_df.insert(1, "submercado", site.submercado)
+            frames.append(results_df)
+    if not frames:
+        return None
+    # Arrow: volta ao processo principal em buffers contíguos e é gravada sem nova conversão
+    return to_arrow(apply_dtypes(pd.concat(frames, ignore_index=True)))
+
+
+def run_portfolio(
+    sites: pd.DataFrame,
+    start: str,
+    end: str,
+    horizon: int,
+    output_dir: Path,
+    config: Dict[str, Any],
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    batch_size: int = 50,
+    grid_resolution_deg: float = 0.25
+) -> Dict[str, Any]:
+    """
+    Executa o pipeline para todos os sites da carteira.
+
+    Saídas em `output_dir`:
+        portfolio_sites.parquet     previsões/lucro/decisões por site e período
+        portfolio_summary.csv       resumo financeiro por site
+        portfolio_aggregate.csv     totais por submercado e período, com a
+                                    decisão sobre a posição líquida da carteira
+
+    Args:
+        sites: Tabela de sites (ver load_sites)
+        start: Data inicial de treino (YYYY-MM-DD)
+        end: Data final de treino (YYYY-MM-DD)
+        horizon: Horizonte de previsão (dias)
+        output_dir: Diretório de resultados
+        config: Configuração do projeto
+        cache_dir: Cache dos conectores
+        workers: Processos paralelos (1 executa no processo atual)
+        batch_size: Sites por lote
+        grid_resolution_deg: Resolução da grade de clima (graus)
+
+    Returns:
+        Resumo com número de sites, células, caminhos, totais e o agregado
+        por submercado (DataFrame, registrado no store de execuções)
+    """
+    import pyarrow.parquet as pq
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_config = config.get('model', {})
+    settings = {
+        "start": start,
+        "end": end,
+        "horizon": horizon,
+        "cache_dir": cache_dir,
+        "algo_consumption": model_config.get('algo_consumption', 'prophet'),
+        "algo_production": model_config.get('algo_production', 'xgboost'),
+        "tuned": model_config.get('tuned', {}),
+        "selection": model_config.get('selection', {}),
+        "selection_dir": output_dir / "models" / "selection",
+        "grid_resolution_deg": grid_resolution_deg,
+        "finance": config.get('finance', {}),
+        "decisions": config.get('decisions', {})
+    }
+
+    # PLD é compartilhado por todos os sites do mesmo submercado
+    pld_by_submercado = {
+        submercado: fetch_pld(submercado, start, end, "diario", cache_dir)
+        for submercado in sorted(sites["submercado"].unique())
+    }
+    n_cells = len(set(zip(*snap_to_grid(sites["lat"].to_numpy(), sites["lon"].to_numpy(), grid_resolution_deg))))
+
+    sites_path = output_dir / "portfolio_sites.parquet"
+    writer = None
+    aggregate: Optional[pd.DataFrame] = None
+    summaries: List[Dict[str, Any]] = []
+
+    def collect(table) -> None:
+        nonlocal writer, aggregate
+        if table is None or table.num_rows == 0:
+            return
+        if writer is None:
+            schema = results_schema().with_metadata(table.schema.metadata)
+            writer = pq.ParquetWriter(sites_path, schema)
+        writer.write_table(table.select(writer.schema.names).cast(writer.schema))
+        results_df = from_arrow(table)
+
+        groups = results_df.groupby(["submercado", "timestamp"], observed=True)
+        partial = groups[AGGREGATE_COLS].sum()
+        partial["pld_brl_mwh"] = groups["pld_brl_mwh"].first()
+        partial["n_sites"] = groups.size()
+        if aggregate is None:
+            aggregate = partial
+        else:
+            pld = aggregate["pld_brl_mwh"].combine_first(partial["pld_brl_mwh"])
+            aggregate = aggregate.drop(columns="pld_brl_mwh").add(
+                partial.drop(columns="pld_brl_mwh"), fill_value=0
+            )
+            aggregate["pld_brl_mwh"] = pld
+
+        for site_id, site_df in results_df.groupby("site_id", sort=False, observed=True):
+            summary = summarize_results(site_df)
+            summaries.append({"site_id": site_id, "submercado": site_df["submercado"].iloc[0], **summary})
+
+    batches = plan_batches(sites, batch_size, grid_resolution_deg)
+    try:
+        if workers <= 1:
+            for batch in batches:
+                collect(run_batch(batch, pld_by_submercado, settings))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                in_flight = set()
+                for batch in batches:
+                    in_flight.add(executor.submit(run_batch, batch, pld_by_submercado, settings))
+                    # Limita lotes em andamento (memória proporcional ao lote)
+                    if len(in_flight) >= workers * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                for future in in_flight:
+                    collect(future.result())
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if aggregate is None:
+        raise ValueError("Nenhum site processado com sucesso")
+
+    # Decisão da carteira sobre a posição líquida de cada submercado
+    aggregate = aggregate.reset_index()
+    decision_config = settings["decisions"]
+    decision_engine = DecisionEngine(
+        buffer_kwh=decision_config.get('buffer_kwh', 1.0),
+        pld_premium_threshold_brl_mwh=decision_config.get('pld_premium_threshold_brl_mwh', 50.0),
+        strategy="economic"
+    )
+    aggregate["decision"] = decision_engine.decide(
+        aggregate["consumption_kwh"],
+        aggregate["production_kwh"],
+        pld_brl_mwh=aggregate["pld_brl_mwh"] if aggregate["pld_brl_mwh"].notna().all() else None
+    ).values
+    aggregate["n_sites"] = aggregate["n_sites"].astype(int)
+
+    summary_df = pd.DataFrame(summaries).sort_values("site_id")
+    summary_path = output_dir / "portfolio_summary.csv"
+    aggregate_path = output_dir / "portfolio_aggregate.csv"
+    summary_df.to_csv(summary_path, index=False)
+    aggregate.to_csv(aggregate_path, index=False)
+
+    return {
+        "n_sites": len(summary_df),
+        "n_failed": len(sites) - len(summary_df),
+        "n_cells": n_cells,
+        "sites_path": sites_path,
+        "summary_path": summary_path,
+        "aggregate_path": aggregate_path,
+        "net_profit_total_brl": float(aggregate["net_profit_brl"].sum()),
+        "surplus_total_kwh": float(aggregate["surplus_kwh"].sum()),
+        "deficit_total_kwh": float(aggregate["deficit_kwh"].sum()),
+        "decisions": aggregate["decision"].value_counts().to_dict(),
+        "aggregate": aggregate
+    }
@@ -0,0 +1 @@
+"""Serviço HTTP de previsão com modelos pré-carregados."""
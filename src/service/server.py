@@ -0,0 +1,404 @@
+"""
+Servidor HTTP leve (biblioteca padrão) para previsões, decisões e lucro.
+
+Os modelos registrados pelo pipeline (ver `src.models.registry`) são
+carregados uma única vez na inicialização e mantidos em memória; cada
+requisição apenas executa `predict` e as regras financeiras. Respostas
+recentes ficam em um cache LRU em memória.
+
+Uso:
+    python -m src.service.server --registry results/models --port 8000
+
+Endpoints:
+    GET  /health
+    GET  /forecast?region=SE&horizon=7
+    GET  /decision?region=SE&horizon=7&strategy=economic
+    GET  /profit?region=SE&horizon=7&pld=250
+    POST /forecast|/decision|/profit  corpo JSON com os mesmos parâmetros,
+         ou {"requests": [{...}, ...]} para um lote
+"""
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from src.config import load_config
+from src.data.timezones import local_range
+from src.finance.profit import ProfitCalculator, summarize_results
+from src.models.registry import ModelRegistry
+from src.rules.engine import DecisionEngine
+
+ENDPOINTS = ("forecast", "decision", "profit")
+MAX_HORIZON = 366
+
+
+class ServiceError(Exception):
+    """Erro de requisição com status HTTP associado."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class ForecastService:
+    """
+    Núcleo do serviço: modelos em memória, cache LRU e execução das consultas.
+
+    Independente do transporte HTTP, para ser usado também em testes ou
+    embutido em outras aplicações.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        config: Optional[Dict[str, Any]] = None,
+        cache_size: int = 1024
+    ):
+        """
+        Args:
+            registry: Registro de modelos treinados
+            config: Configuração do projeto (seções finance e decisions)
+            cache_size: Número máximo de respostas no cache LRU (0 desativa)
+        """
+        self.registry = registry
+        self.config = config or {}
+        self.cache_size = cache_size
+        self.bundles: Dict[str, Dict[str, Any]] = {}
+        self._predict_locks: Dict[str, threading.Lock] = {}
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "cache_hits": 0}
+
+        finance_config = self.config.get('finance', {})
+        self.calculator = ProfitCalculator(
+            sell_price_brl_per_kwh=finance_config.get('sell_price_brl_per_kwh', 0.75),
+            buy_price_brl_per_kwh=finance_config.get('buy_price_brl_per_kwh', 0.90),
+            cost_rate=finance_config.get('cost_rate', 0.10),
+            use_pld=finance_config.get('use_pld', True)
+        )
+        self.decision_config = self.config.get('decisions', {})
+
+    def warm_up(self) -> List[str]:
+        """
+        Carrega a versão mais recente dos modelos de todas as regiões.
+
+        Returns:
+            Regiões carregadas
+        """
+        bundles = {region: self.registry.load(region) for region in self.registry.regions()}
+        with self._lock:
+            self.bundles = bundles
+            self._predict_locks = {region: threading.Lock() for region in bundles}
+            self._cache.clear()
+        return sorted(bundles)
+
+    def _bundle(self, region: str) -> Dict[str, Any]:
+        bundle = self.bundles.get(region)
+        if bundle is None:
+            raise ServiceError(f"Região sem modelo registrado: {region}", status=404)
+        return bundle
+
+    # ------------------------------------------------------------------
+    # Cache LRU
+    # ------------------------------------------------------------------
+    def _cached(self, endpoint: str, params: Dict[str, Any], compute) -> Any:
+        key = endpoint + json.dumps(params, sort_keys=True, default=str)
+        with self._lock:
+            self.stats["requests"] += 1
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return self._cache[key]
+
+        result = compute()
+
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _parse(params: Dict[str, Any]) -> Dict[str, Any]:
+        region = params.get("region")
+        if not region:
+            raise ServiceError("Parâmetro obrigatório: region")
+        try:
+            horizon = int(params.get("horizon", 7))
+        except (TypeError, ValueError):
+            raise ServiceError("horizon deve ser inteiro")
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ServiceError(f"horizon deve estar entre 1 e {MAX_HORIZON}")
+
+        parsed = {"region": str(region), "horizon": horizon}
+        if params.get("pld") is not None:
+            try:
+                parsed["pld"] = float(params["pld"])
+            except (TypeError, ValueError):
+                raise ServiceError("pld deve ser numérico")
+        strategy = params.get("strategy", "economic")
+        if strategy not in ("simple", "economic"):
+            raise ServiceError("strategy deve ser 'simple' ou 'economic'")
+        parsed["strategy"] = strategy
+        return parsed
+
+    def _predict(self, region: str, horizon: int) -> Dict[str, pd.Series]:
+        """
+        Previsões de consumo e produção (modelos já carregados).
+
+        Modelos reutilizados pelo pipeline com dados mais recentes preveem a
+        partir do fim do seu treino: os `offset` períodos já observados são
+        descartados, como no pipeline. As chamadas de `predict` de uma região
+        são serializadas (os forecasters não são seguros entre threads).
+        """
+        bundle = self._bundle(region)
+        models = bundle["models"]
+        offset = int(bundle["context"].get("offset") or 0)
+        exog_means = bundle["context"].get("exog_means") or {}
+        future_exog = None
+        if exog_means:
+            future_exog = pd.DataFrame({col: [value] * (horizon + offset) for col, value in exog_means.items()})
+
+        with self._predict_locks[region]:
+            consumption = models["consumption"].predict(horizon + offset)
+            production = models["production"].predict(horizon + offset, exog=future_exog)
+        return {
+            "consumption": pd.Series(np.asarray(consumption, dtype=float)[offset:]),
+            "production": pd.Series(np.asarray(production, dtype=float)[offset:])
+        }
+
+    def _timestamps(self, region: str, horizon: int) -> List[str]:
+        last = self._bundle(region)["context"].get("last_timestamp")
+        if last is None:
+            return []
+        dates = local_range(last, periods=horizon + 1, freq="D")[1:]
+        return [d.strftime("%Y-%m-%d") for d in dates]
+
+    def _pld(self, params: Dict[str, Any]) -> Optional[pd.Series]:
+        pld = params.get("pld")
+        if pld is None:
+            pld = self._bundle(params["region"])["context"].get("pld_mean")
+        return None if pld is None else pd.Series([pld] * params["horizon"])
+
+    def _respond(self, endpoint: str, params: Dict[str, Any], preds: Dict[str, pd.Series]) -> Dict[str, Any]:
+        region, horizon = params["region"], params["horizon"]
+        consumption = preds["consumption"].iloc[:horizon].reset_index(drop=True)
+        production = preds["production"].iloc[:horizon].reset_index(drop=True)
+        response = {
+            "region": region,
+            "horizon": horizon,
+            "version": self._bundle(region)["meta"].get("version"),
+            "timestamp": self._timestamps(region, horizon)
+        }
+
+        if endpoint == "forecast":
+            response["consumption_kwh"] = consumption.round(4).tolist()
+            response["production_kwh"] = production.round(4).tolist()
+            return response
+
+        pld = self._pld(params)
+        if endpoint == "decision":
+            engine = DecisionEngine(
+                buffer_kwh=self.decision_config.get('buffer_kwh', 1.0),
+                pld_premium_threshold_brl_mwh=self.decision_config.get('pld_premium_threshold_brl_mwh', 50.0),
+                strategy=params["strategy"]
+            )
+            response["decision"] = engine.decide(consumption, production, pld_brl_mwh=pld).tolist()
+            return response
+
+        results = self.calculator.calculate(consumption, production, pld_brl_mwh=pld)
+        response["net_profit_brl"] = results["net_profit_brl"].round(4).tolist()
+        response["decision"] = results["decision"].tolist()
+        response["summary"] = {key: float(value) for key, value in summarize_results(results).items()}
+        return response
+
+    def query(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executa uma consulta.
+
+        Args:
+            endpoint: "forecast", "decision" ou "profit"
+            params: region, horizon e opcionalmente pld/strategy
+
+        Returns:
+            Resposta serializável em JSON
+        """
+        if endpoint not in ENDPOINTS:
+            raise ServiceError(f"Endpoint desconhecido: {endpoint}", status=404)
+        params = self._parse(params)
+        self._bundle(params["region"])
+        return self._cached(
+            endpoint, params,
+            lambda: self._respond(endpoint, params, self._predict(params["region"], params["horizon"]))
+        )
+
+    def query_batch(self, endpoint: str, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Executa um lote de consultas.
+
+        Consultas da mesma região compartilham uma única chamada de
+        `predict` com o maior horizonte do lote; cada resposta usa o prefixo
+        correspondente ao seu horizonte. Erros individuais são retornados na
+        posição da consulta sem interromper o lote.
+
+        Args:
+            endpoint: "forecast", "decision" ou "profit"
+            requests: Lista de parâmetros (como em `query`)
+
+        Returns:
+            Lista de respostas na mesma ordem
+        """
+        if endpoint not in ENDPOINTS:
+            raise ServiceError(f"Endpoint desconhecido: {endpoint}", status=404)
+
+        parsed: List[Any] = []
+        horizons: Dict[str, int] = {}
+        for params in requests:
+            try:
+                item = self._parse(params)
+                self._bundle(item["region"])
+                horizons[item["region"]] = max(horizons.get(item["region"], 0), item["horizon"])
+                parsed.append(item)
+            except ServiceError as e:
+                parsed.append(e)
+
+        predictions: Dict[str, Dict[str, pd.Series]] = {}
+        results = []
+        for item in parsed:
+            if isinstance(item, ServiceError):
+                results.append({"error": str(item), "status": item.status})
+                continue
+
+            def compute(item=item):
+                region = item["region"]
+                if region not in predictions:
+                    predictions[region] = self._predict(region, horizons[region])
+                return self._respond(endpoint, item, predictions[region])
+
+            results.append(self._cached(endpoint, item, compute))
+        return results
+
+
+class ForecastRequestHandler(BaseHTTPRequestHandler):
+    """Tradução HTTP/JSON para o `ForecastService` do servidor."""
+
+    server_version = "EnergyForecast/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ForecastService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        # Sem log por requisição (evita I/O no caminho crítico)
+        pass
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, params_from_body: bool) -> None:
+        url = urlparse(self.path)
+        endpoint = url.path.strip("/")
+        start = time.perf_counter()
+        try:
+            if endpoint == "health":
+                self._send(200, {
+                    "status": "ok",
+                    "regions": sorted(self.service.bundles),
+                    **self.service.stats
+                })
+                return
+
+            if params_from_body:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    params = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    raise ServiceError("Corpo JSON inválido")
+            else:
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if isinstance(params, dict) and isinstance(params.get("requests"), list):
+                payload = {"results": self.service.query_batch(endpoint, params["requests"])}
+            else:
+                payload = self.service.query(endpoint, params)
+            # Cópia rasa: o resultado pode ser o objeto compartilhado do cache
+            self._send(200, {**payload, "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)})
+        except ServiceError as e:
+            self._send(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"Erro interno: {e}"})
+
+    def do_GET(self):
+        self._handle(params_from_body=False)
+
+    def do_POST(self):
+        self._handle(params_from_body=True)
+
+
+def create_server(service: ForecastService, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """
+    Cria o servidor HTTP (multithread) associado ao serviço.
+
+    Args:
+        service: Serviço já aquecido (`warm_up`)
+        host: Endereço de escuta
+        port: Porta (0 escolhe uma porta livre)
+
+    Returns:
+        Servidor pronto para `serve_forever()`
+    """
+    server = ThreadingHTTPServer((host, port), ForecastRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP de previsão de energia")
+    parser.add_argument("--registry", type=Path, default=Path("results/models"),
+                        help="Diretório do registro de modelos (gravado pelo pipeline)")
+    parser.add_argument("--config", type=Path, default=None, help="Arquivo de configuração YAML")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Endereço de escuta")
+    parser.add_argument("--port", type=int, default=8000, help="Porta")
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="Respostas mantidas no cache LRU (0 desativa)")
+    args = parser.parse_args()
+
+    service = ForecastService(ModelRegistry(args.registry), load_config(args.config), cache_size=args.cache_size)
+    regions = service.warm_up()
+    if not regions:
+        print(f"[AVISO] Nenhum modelo registrado em {args.registry}. Execute o pipeline antes.")
+    else:
+        print(f"[OK] Modelos carregados: {', '.join(regions)}")
+
+    server = create_server(service, args.host, args.port)
+    print(f"[OK] Servindo em http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
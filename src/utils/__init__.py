@@ -1,6 +1,7 @@
 """Utilitários auxiliares."""
 from .retry import retry_with_backoff
 from .logger import setup_logger, default_logger
+from .emitter import MetricsEmitter
+from .profiling import profiler, instrument
 
-__all__ = ['retry_with_backoff', 'setup_logger', 'default_logger']
-
+__all__ = ['retry_with_backoff', 'setup_logger', 'default_logger', 'MetricsEmitter', 'profiler', 'instrument']
@@ -0,0 +1,107 @@
+"""Emissão estruturada de métricas do pipeline (JSON lines)."""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# Colunas de cada registro de métrica
+METRIC_COLUMNS = ["group", "series", "name", "value"]
+
+
+class MetricsEmitter:
+    """
+    Coleta métricas como registros (group, series, name, value).
+
+    Grupos usados pelo pipeline:
+        validation: MAE/RMSE/MAPE/R2 por série (consumption, production)
+        descriptive: estatísticas de DataFrame.describe() por coluna
+        financial: resumo financeiro/energético (series="total")
+        timing: tempos por etapa do pipeline
+    """
+
+    def __init__(self, **context: Any):
+        """
+        Args:
+            **context: Campos fixos adicionados a cada registro ao gravar
+                (ex: run_id, scenario, region)
+        """
+        self.context = context
+        self.records: List[Dict[str, Any]] = []
+
+    def emit(self, group: str, series: str, name: str, value: float) -> None:
+        """Registra uma métrica."""
+        self.records.append({
+            "group": group,
+            "series": series,
+            "name": name,
+            "value": None if value is None else float(value)
+        })
+
+    def emit_many(self, group: str, series: str, values: Dict[str, float]) -> None:
+        """Registra um dicionário de métricas de uma mesma série."""
+        for name, value in values.items():
+            self.emit(group, series, name, value)
+
+    def emit_describe(self, df: pd.DataFrame, columns: Iterable[str]) -> None:
+        """
+        Registra estatísticas descritivas (count, mean, std, min, quartis, max).
+
+        Args:
+            df: DataFrame de origem
+            columns: Colunas a descrever
+        """
+        columns = [c for c in columns if c in df.columns]
+        if not columns:
+            return
+        described = df[columns].describe()
+        for col in columns:
+            self.emit_many("descriptive", col, described[col].to_dict())
+
+    def to_frame(self) -> pd.DataFrame:
+        """Retorna as métricas como DataFrame (sem os campos de contexto)."""
+        return pd.DataFrame(self.records, columns=METRIC_COLUMNS)
+
+    def write_jsonl(self, path: Path) -> Path:
+        """
+        Grava as métricas em JSON lines (um registro por linha).
+
+        Args:
+            path: Arquivo de saída (sobrescrito)
+
+        Returns:
+            Caminho gravado
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps({**self.context, **record}, ensure_ascii=False, default=str) + "\n")
+        return path
+
+
+def load_metrics(paths: Iterable[Path], scenario_from_parent: bool = True) -> pd.DataFrame:
+    """
+    Carrega em lote arquivos metrics.jsonl de várias execuções.
+
+    Args:
+        paths: Arquivos JSON lines
+        scenario_from_parent: Usar o nome da pasta como cenário quando o
+            registro não tiver o campo "scenario"
+
+    Returns:
+        DataFrame concatenado com todas as métricas
+    """
+    frames = []
+    for path in paths:
+        path = Path(path)
+        if not path.exists() or path.stat().st_size == 0:
+            continue
+        df = pd.read_json(path, lines=True)
+        if scenario_from_parent and "scenario" not in df.columns:
+            df["scenario"] = path.parent.name
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=METRIC_COLUMNS + ["scenario"])
+    return pd.concat(frames, ignore_index=True)
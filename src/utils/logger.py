@@ -8,16 +8,21 @@ def setup_logger(
     name: str = "energy_forecast",
     level: int = logging.INFO,
     log_file: Optional[Path] = None,
-    format_string: Optional[str] = None
+    format_string: Optional[str] = None,
+    console: bool = True
 ) -> logging.Logger:
     """
     Configura logger estruturado.
     
+    Chamadas repetidas não duplicam handlers; um `log_file` ainda não
+    associado ao logger é adicionado mesmo que ele já esteja configurado.
+    
     Args:
         name: Nome do logger
         level: Nível de log (logging.INFO, logging.DEBUG, etc.)
         log_file: Caminho para arquivo de log (opcional)
         format_string: String de formatação customizada (opcional)
+        console: Adicionar handler de console (False: apenas o arquivo)
     
     Returns:
         Logger configurado
@@ -25,10 +30,6 @@ def setup_logger(
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Evitar handlers duplicados
-    if logger.handlers:
-        return logger
-    
     # Formato padrão
     if format_string is None:
         format_string = (
@@ -38,14 +39,19 @@ def setup_logger(
     
     formatter = logging.Formatter(format_string)
     
-    # Handler para console
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Handler para console (apenas na primeira configuração)
+    if console and not logger.handlers:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(level)
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
     
-    # Handler para arquivo (se especificado)
-    if log_file:
+    # Handler para arquivo (se especificado e ainda não associado)
+    if log_file and not any(
+        isinstance(h, logging.FileHandler) and Path(h.baseFilename) == Path(log_file).resolve()
+        for h in logger.handlers
+    ):
+        log_file = Path(log_file)
         log_file.parent.mkdir(parents=True, exist_ok=True)
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(level)
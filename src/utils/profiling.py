@@ -0,0 +1,278 @@
+"""Instrumentação de etapas do pipeline (tempo, CPU, memória e linhas)."""
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .logger import setup_logger
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo (MB), se disponível."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta KB; macOS reporta bytes
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    except ImportError:
+        return None
+
+
+class Profiler:
+    """
+    Registra tempo de parede, tempo de CPU, pico de memória e linhas por etapa.
+
+    Etapas do pipeline são sempre medidas (tempo de parede/CPU, custo
+    desprezível). Com a instrumentação habilitada (`configure(enabled=True)`),
+    chamadas decoradas com `instrument` (ex: conectores) também são medidas,
+    o pico de memória é rastreado via tracemalloc e cada registro é escrito
+    como JSON no arquivo de log (nunca no console).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.context: Dict[str, Any] = {}
+        self.records: List[Dict[str, Any]] = []
+        self.logger: Optional[logging.Logger] = None
+        self._stack: List[Dict[str, Any]] = []
+
+    def configure(
+        self,
+        enabled: bool = True,
+        trace_memory: bool = True,
+        log_file: Optional[Path] = None,
+        **context: Any
+    ) -> "Profiler":
+        """
+        Habilita/desabilita a instrumentação detalhada.
+
+        Args:
+            enabled: Medir chamadas instrumentadas e registrar no logger
+            trace_memory: Rastrear pico de memória Python via tracemalloc
+            log_file: Arquivo de log para os registros (opcional)
+            **context: Campos fixos em cada registro (ex: run_id, scenario)
+        """
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.context = context
+        self.records = []
+        self._stack = []
+
+        if self.enabled:
+            # Arquivos de execuções anteriores (e consoles) deixam de receber registros
+            logger = logging.getLogger("energy_forecast.profiling")
+            for handler in list(logger.handlers):
+                if not isinstance(handler, logging.FileHandler) or (
+                    log_file is None or Path(handler.baseFilename) != Path(log_file).resolve()
+                ):
+                    logger.removeHandler(handler)
+                    handler.close()
+            self.logger = setup_logger(
+                "energy_forecast.profiling",
+                log_file=log_file,
+                format_string="%(message)s",
+                console=False
+            )
+            # Registros JSON não devem repetir no logger padrão
+            self.logger.propagate = False
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+        return self
+
+    def _traced_peak(self) -> int:
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return 0
+        return tracemalloc.get_traced_memory()[1]
+
+    def begin(self, name: str) -> None:
+        """Inicia a medição de uma etapa (pode ser aninhada)."""
+        if self._stack:
+            # Preservar o pico da etapa externa antes de zerar o contador
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], self._traced_peak())
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        self._stack.append({
+            "name": name,
+            "wall": time.perf_counter(),
+            "cpu": time.process_time(),
+            "peak": 0
+        })
+
+    def end(self, rows: Optional[int] = None, **extra: Any) -> Dict[str, Any]:
+        """
+        Finaliza a etapa corrente e registra suas medições.
+
+        Args:
+            rows: Número de linhas processadas/produzidas (opcional)
+            **extra: Campos adicionais do registro
+
+        Returns:
+            Registro da etapa
+        """
+        frame = self._stack.pop()
+        peak = max(frame["peak"], self._traced_peak())
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        if self._stack:
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+
+        record = {
+            **self.context,
+            "stage": "/".join([f["name"] for f in self._stack] + [frame["name"]]),
+            "wall_s": time.perf_counter() - frame["wall"],
+            "cpu_s": time.process_time() - frame["cpu"],
+            "peak_traced_mb": peak / 1024 ** 2 if self.trace_memory else None,
+            "peak_rss_mb": _peak_rss_mb() if self.enabled else None,
+            "rows": rows,
+            **extra
+        }
+        self.records.append(record)
+        if self.enabled and self.logger is not None:
+            self.logger.info(json.dumps(record, ensure_ascii=False, default=str))
+        return record
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Context manager para medir um bloco.
+
+        O dicionário retornado aceita a chave "rows" para informar o número
+        de linhas processadas.
+        """
+        info: Dict[str, Any] = {}
+        self.begin(name)
+        try:
+            yield info
+        finally:
+            self.end(**info)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Retorna os registros como DataFrame."""
+        return pd.DataFrame(self.records)
+
+    def write_jsonl(self, path: Path) -> Path:
+        """Grava os registros em JSON lines."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        return path
+
+
+# Instância global usada pelo pipeline e pelos conectores
+profiler = Profiler()
+
+
+def _count_rows(result: Any) -> Optional[int]:
+    if isinstance(result, tuple):
+        counts = [_count_rows(r) for r in result]
+        counts = [c for c in counts if c is not None]
+        return sum(counts) if counts else None
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def instrument(name: Optional[str] = None) -> Callable:
+    """
+    Decorator que mede uma função quando a instrumentação está habilitada.
+
+    Com a instrumentação desabilitada a função é chamada diretamente.
+    O número de linhas é obtido de `len()` do resultado.
+
+    Args:
+        name: Nome da etapa (padrão: módulo.função)
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            profiler.begin(stage_name)
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                profiler.end(rows=_count_rows(result))
+
+        return wrapper
+    return decorator
+
+
+def load_profiles(paths: Iterable[Path]) -> pd.DataFrame:
+    """Carrega em lote arquivos profile.jsonl de várias execuções."""
+    frames = [
+        pd.read_json(path, lines=True)
+        for path in map(Path, paths)
+        if path.exists() and path.stat().st_size > 0
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def summarize_profiles(profiles: pd.DataFrame, by: str = "stage") -> pd.DataFrame:
+    """
+    Agrega registros de várias execuções por etapa.
+
+    Args:
+        profiles: Registros (ex: retorno de load_profiles)
+        by: Coluna de agrupamento
+
+    Returns:
+        DataFrame com execuções, mediana/p95 de tempo, CPU e pico de memória
+    """
+    grouped = profiles.groupby(by)
+    summary = pd.DataFrame({
+        "runs": grouped.size(),
+        "wall_s_median": grouped["wall_s"].median(),
+        "wall_s_p95": grouped["wall_s"].quantile(0.95),
+        "cpu_s_median": grouped["cpu_s"].median(),
+    })
+    if "peak_traced_mb" in profiles.columns:
+        summary["peak_traced_mb_max"] = grouped["peak_traced_mb"].max()
+    if "rows" in profiles.columns:
+        summary["rows_median"] = grouped["rows"].median()
+    return summary.reset_index()
+
+
+def compare_profiles(
+    baseline: pd.DataFrame,
+    current: pd.DataFrame,
+    threshold: float = 0.10
+) -> pd.DataFrame:
+    """
+    Compara tempos medianos por etapa e sinaliza regressões.
+
+    Args:
+        baseline: Registros de referência
+        current: Registros atuais
+        threshold: Aumento relativo tolerado (0.10 = 10%)
+
+    Returns:
+        DataFrame por etapa com coluna booleana "regression"
+    """
+    base = summarize_profiles(baseline)[["stage", "wall_s_median"]]
+    curr = summarize_profiles(current)[["stage", "wall_s_median"]]
+    merged = base.merge(curr, on="stage", suffixes=("_baseline", "_current"))
+    merged["change"] = merged["wall_s_median_current"] / merged["wall_s_median_baseline"] - 1
+    merged["regression"] = merged["change"] > threshold
+    return merged
@@ -0,0 +1,131 @@
+"""Redução de pontos de séries longas para exibição (min-max e LTTB)."""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("minmax", "lttb")
+
+
+def _as_numeric(x: np.ndarray) -> np.ndarray:
+    """Converte eixos de data (com ou sem fuso) para inteiros (ns, UTC) para cálculos de área."""
+    dtype = getattr(x, "dtype", None)
+    if dtype is not None and pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.DatetimeIndex(x).as_unit("ns").asi8.astype(float)
+    x = np.asarray(x)
+    if x.dtype.kind == "M" or (x.dtype.kind == "O" and len(x) and isinstance(x[0], pd.Timestamp)):
+        # Timestamps com fuso chegam como array de objetos
+        return pd.DatetimeIndex(x).as_unit("ns").asi8.astype(float)
+    return x.astype(float)
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Índices do mínimo e do máximo de cada bucket (preserva picos).
+
+    Args:
+        y: Valores da série
+        n_buckets: Número de buckets (≈ largura em pixels)
+
+    Returns:
+        Índices ordenados (até 2 × n_buckets + 2), incluindo primeiro e último
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= 2 * n_buckets or n_buckets < 1:
+        return np.arange(n)
+
+    # NaN não participa da escolha de extremos
+    finite = np.isfinite(y)
+    filled = np.where(finite, y, np.nanmedian(y) if finite.any() else 0.0)
+
+    size = -(-n // n_buckets)
+    padded = np.pad(filled, (0, size * n_buckets - n), mode="edge").reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    idx = np.concatenate([
+        [0, n - 1],
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1)
+    ])
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: escolhe em cada bucket o ponto que forma
+    o maior triângulo com o ponto anterior escolhido e a média do próximo
+    bucket.
+
+    Args:
+        x: Eixo X (numérico ou datetime64)
+        y: Valores da série
+        n_out: Número de pontos de saída
+
+    Returns:
+        Índices ordenados (n_out pontos), incluindo primeiro e último
+    """
+    x = _as_numeric(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        idx[i + 1] = a
+    return idx
+
+
+def decimate(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int,
+    method: str = "minmax"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduz uma série a aproximadamente `max_points` pontos.
+
+    Séries com até `max_points` pontos são retornadas inalteradas.
+
+    Args:
+        x: Eixo X
+        y: Valores
+        max_points: Número máximo de pontos desejado
+        method: "minmax" (preserva extremos) ou "lttb" (preserva forma)
+
+    Returns:
+        Tupla (x, y) reduzida
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= max_points:
+        return x, y
+    if method == "minmax":
+        idx = minmax_indices(y, max(1, max_points // 2))
+    elif method == "lttb":
+        idx = lttb_indices(x, y, max_points)
+    else:
+        raise ValueError(f"Método de decimação desconhecido: {method} (use {METHODS})")
+    return x[idx], y[idx]
+
+
+def visible_slice(x: np.ndarray, xmin: float, xmax: float) -> slice:
+    """Fatia dos pontos dentro de [xmin, xmax] (x crescente), com um ponto de margem."""
+    start = max(0, int(np.searchsorted(x, xmin, side="left")) - 1)
+    stop = min(len(x), int(np.searchsorted(x, xmax, side="right")) + 1)
+    return slice(start, stop)
@@ -1,14 +1,83 @@
 """Interface gráfica Tkinter para visualização de resultados."""
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import threading
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import numpy as np
 
-from .plots import plot_forecast_comparison, plot_surplus_deficit, plot_cumulative_profit
+from .offscreen import OffscreenPlot, clamp_xlim, pixel_to_x, zoom_xlim
+from .table_model import TableModel
+from .worker import BackgroundWorker, load_image_thumbnail
+
+# Gráficos salvos pelo pipeline exibidos em abas fixas (demais PNGs do
+# diretório de saída entram em abas adicionais)
+SAVED_PLOTS = [
+    ("Previsão", "forecast_comparison.png"),
+    ("Excedente/Déficit", "surplus_deficit.png"),
+    ("Lucro Acumulado", "cumulative_profit.png"),
+]
+
+def prepare_dynamic_series(columns: Dict[str, np.ndarray], view: np.ndarray, plot_type: str) -> dict:
+    """
+    Calcula as séries do gráfico dinâmico (executado fora da thread do Tk).
+    
+    Args:
+        columns: Arrays das colunas de resultados (ordem original)
+        view: Índices das linhas exibidas (ordem/filtro da tabela)
+        plot_type: Tipo de gráfico selecionado
+    
+    Returns:
+        Dicionário com título, rótulo do eixo Y e lista de séries
+        (rótulo, cor, x, y)
+    """
+    x = np.arange(len(view))
+    
+    def col(name):
+        return columns[name][view].astype(float)
+    
+    if plot_type == "Excedente/Déficit":
+        series = [
+            ("Excedente", "green", x, col("surplus_kwh")),
+            ("Déficit", "red", x, -col("deficit_kwh")),
+        ]
+        return {"title": "Excedente vs Déficit", "ylabel": "Energia (kWh)", "series": series}
+    
+    if plot_type == "Receitas/Custos":
+        series = [
+            ("Receitas (Venda)", "green", x, col("sell_revenue_brl")),
+            ("Custos (Compra)", "red", x, -col("buy_cost_brl")),
+        ]
+        return {"title": "Receitas vs Custos", "ylabel": "Valor (R$)", "series": series}
+    
+    series = [("Lucro Acumulado", "blue", x, np.cumsum(col("net_profit_brl")))]
+    return {"title": "Lucro Líquido Acumulado", "ylabel": "Lucro Acumulado (R$)", "series": series}
+
+def render_dynamic_plot(plot: OffscreenPlot, size: tuple, xlim: Optional[tuple] = None, series_args: Optional[tuple] = None):
+    """
+    Atualiza e rasteriza o gráfico dinâmico (executado fora da thread do Tk).
+    
+    Args:
+        plot: Figura fora da tela (usada apenas pela thread de trabalho)
+        size: Largura e altura da área de exibição (pixels)
+        xlim: Intervalo visível do eixo X (None = séries completas)
+        series_args: Argumentos de prepare_dynamic_series, quando os dados mudaram
+    
+    Returns:
+        Quadro de OffscreenPlot.render com a imagem PIL (image) e a extensão
+        das séries (bounds), ou None se a área ainda não tem tamanho
+    """
+    from PIL import Image
+    
+    if series_args is not None:
+        plot.set_series(prepare_dynamic_series(*series_args))
+    if min(size) <= 1:
+        return None
+    frame = plot.render(*size, xlim=xlim)
+    frame["image"] = Image.fromarray(frame.pop("rgba"))
+    frame["bounds"] = plot.x_bounds()
+    return frame
 
 class MainApplication(tk.Tk):
     """Interface principal da aplicação."""
@@ -23,7 +92,18 @@ class MainApplication(tk.Tk):
         
         self.data_frame = data_frame
         self.output_dir = Path(output_dir)
-        self.filtered_df = data_frame.copy()
+        
+        # Tabela virtualizada: só as linhas visíveis existem no Treeview
+        self.table_model = TableModel(data_frame)
+        self.table_offset = 0
+        self.visible_rows = 20
+        self.tree_items = []
+        threading.Thread(target=self.table_model.precompute, daemon=True).start()
+        
+        # Fatias de dados e imagens são preparadas fora da thread do Tk
+        self.worker = BackgroundWorker(self)
+        self.image_tabs = {}
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.title("Análise de Energia - TCC")
         self.geometry("1600x900")
@@ -34,8 +114,22 @@ class MainApplication(tk.Tk):
         # Carregar gráficos
         self.load_plots()
     
+    @property
+    def filtered_df(self) -> pd.DataFrame:
+        """DataFrame na ordem e filtro exibidos na tabela."""
+        return self.table_model.to_frame()
+    
     def create_widgets(self):
         """Cria todos os widgets da interface."""
+        # Barra de status (empacotada primeiro para permanecer visível)
+        self.status_bar = ttk.Label(
+            self,
+            text=f"Total de registros: {len(self.data_frame)}",
+            relief=tk.SUNKEN,
+            anchor=tk.W
+        )
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
         # Frame principal com notebook (abas)
         notebook = ttk.Notebook(self)
         notebook.pack(fill="both", expand=True, padx=5, pady=5)
@@ -48,15 +142,6 @@ class MainApplication(tk.Tk):
         
         # Aba 3: Resumo
         self.create_summary_tab(notebook)
-        
-        # Barra de status
-        self.status_bar = ttk.Label(
-            self,
-            text=f"Total de registros: {len(self.data_frame)}",
-            relief=tk.SUNKEN,
-            anchor=tk.W
-        )
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
     
     def create_data_tab(self, notebook):
         """Cria aba com tabela de dados."""
@@ -99,12 +184,17 @@ class MainApplication(tk.Tk):
         
         # Treeview (tabela)
         columns = list(self.data_frame.columns)
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=20)
+        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=self.visible_rows)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
+        # Scrollbars (a vertical percorre o modelo, não os itens do Treeview)
+        self.v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.scroll_table)
         h_scrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        self.tree.bind("<Configure>", self.on_table_resize)
+        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_table("scroll", -3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_table("scroll", 3, "units"))
         
         # Configurar colunas
         for col in columns:
@@ -113,7 +203,7 @@ class MainApplication(tk.Tk):
         
         # Layout
         self.tree.grid(row=0, column=0, sticky="nsew")
-        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         
         table_frame.grid_rowconfigure(0, weight=1)
@@ -128,47 +218,33 @@ class MainApplication(tk.Tk):
         notebook.add(plots_frame, text="📈 Gráficos")
         
         # Notebook para múltiplos gráficos
-        plots_notebook = ttk.Notebook(plots_frame)
-        plots_notebook.pack(fill="both", expand=True)
-        
-        # Gráfico 1: Previsão
-        self.create_plot_subtab(
-            plots_notebook,
-            "Previsão",
-            self.output_dir / "forecast_comparison.png"
-        )
-        
-        # Gráfico 2: Excedente/Déficit
-        self.create_plot_subtab(
-            plots_notebook,
-            "Excedente/Déficit",
-            self.output_dir / "surplus_deficit.png"
-        )
+        self.plots_notebook = ttk.Notebook(plots_frame)
+        self.plots_notebook.pack(fill="both", expand=True)
         
-        # Gráfico 3: Lucro Acumulado
-        self.create_plot_subtab(
-            plots_notebook,
-            "Lucro Acumulado",
-            self.output_dir / "cumulative_profit.png"
-        )
+        # Gráficos salvos: conhecidos primeiro, depois demais PNGs do diretório
+        known = {filename for _, filename in SAVED_PLOTS}
+        extra = sorted(p for p in self.output_dir.glob("*.png") if p.name not in known)
+        for title, filename in SAVED_PLOTS:
+            self.create_plot_subtab(self.plots_notebook, title, self.output_dir / filename)
+        for image_path in extra:
+            self.create_plot_subtab(self.plots_notebook, image_path.stem, image_path)
         
         # Gráfico dinâmico
-        self.create_dynamic_plot_tab(plots_notebook)
+        self.create_dynamic_plot_tab(self.plots_notebook)
+        
+        # Imagens só são carregadas quando a aba fica visível
+        self.plots_notebook.bind("<<NotebookTabChanged>>", self.on_plot_tab_changed)
     
     def create_plot_subtab(self, parent, title, image_path):
-        """Cria subtab com gráfico estático."""
+        """Cria subtab com gráfico estático (carregado sob demanda)."""
         frame = ttk.Frame(parent, padding="10")
         parent.add(frame, text=title)
         
         if image_path.exists():
-            fig, ax = plt.subplots(figsize=(10, 5))
-            img = plt.imread(image_path)
-            ax.imshow(img)
-            ax.axis('off')
-            
-            canvas = FigureCanvasTkAgg(fig, master=frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
+            label = ttk.Label(frame, text="Carregando...", anchor="center")
+            label.pack(fill="both", expand=True)
+            self.image_tabs[str(frame)] = {"path": image_path, "label": label, "size": None}
+            label.bind("<Configure>", lambda e, key=str(frame): self.request_image(key))
         else:
             ttk.Label(
                 frame,
@@ -176,6 +252,35 @@ class MainApplication(tk.Tk):
                 font=("Arial", 12)
             ).pack(expand=True)
     
+    def on_plot_tab_changed(self, event=None):
+        """Carrega a imagem da aba selecionada."""
+        self.request_image(self.plots_notebook.select())
+    
+    def request_image(self, key):
+        """Agenda o carregamento reduzido da imagem de uma aba visível."""
+        tab = self.image_tabs.get(key)
+        if tab is None or self.plots_notebook.select() != key:
+            return
+        label = tab["label"]
+        size = (label.winfo_width(), label.winfo_height())
+        if min(size) <= 1 or tab["size"] == size:
+            # Ainda não dimensionada (o <Configure> chamará novamente) ou já carregada
+            return
+        tab["size"] = size
+        self.worker.submit(
+            load_image_thumbnail, tab["path"], size,
+            callback=lambda img, key=key: self.show_image(key, img),
+            key=f"image:{key}"
+        )
+    
+    def show_image(self, key, image):
+        """Exibe a imagem carregada (thread do Tk)."""
+        from PIL import ImageTk
+        
+        tab = self.image_tabs[key]
+        tab["photo"] = ImageTk.PhotoImage(image)
+        tab["label"].configure(image=tab["photo"], text="")
+    
     def create_dynamic_plot_tab(self, parent):
         """Cria subtab com gráfico gerado dinamicamente."""
         frame = ttk.Frame(parent, padding="10")
@@ -194,6 +299,7 @@ class MainApplication(tk.Tk):
         )
         self.plot_type.set("Lucro Acumulado")
         self.plot_type.pack(side=tk.LEFT, padx=5)
+        self.plot_type.bind("<<ComboboxSelected>>", lambda e: self.update_dynamic_plot())
         
         ttk.Button(
             options_frame,
@@ -201,9 +307,33 @@ class MainApplication(tk.Tk):
             command=self.update_dynamic_plot
         ).pack(side=tk.LEFT, padx=10)
         
-        # Frame para o gráfico
-        self.plot_frame = ttk.Frame(frame)
-        self.plot_frame.pack(fill="both", expand=True)
+        ttk.Button(
+            options_frame,
+            text="Zoom inicial",
+            command=self.reset_dynamic_zoom
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(
+            options_frame,
+            text="Roda do mouse: zoom | Arrastar: deslocar | Duplo clique: zoom inicial"
+        ).pack(side=tk.LEFT, padx=10)
+        
+        # Figura criada uma única vez e renderizada pela thread de trabalho;
+        # a thread do Tk só exibe o quadro pronto
+        self.dynamic_plot = OffscreenPlot()
+        self.dynamic_frame = None
+        self.dynamic_xlim = None
+        self.dynamic_drag = None
+        
+        self.dynamic_view = tk.Canvas(frame, background="white", highlightthickness=0)
+        self.dynamic_view.pack(fill="both", expand=True)
+        self.dynamic_view.bind("<Configure>", lambda e: self.request_dynamic_render())
+        self.dynamic_view.bind("<MouseWheel>", self.on_dynamic_zoom)
+        self.dynamic_view.bind("<Button-4>", self.on_dynamic_zoom)
+        self.dynamic_view.bind("<Button-5>", self.on_dynamic_zoom)
+        self.dynamic_view.bind("<ButtonPress-1>", self.on_dynamic_press)
+        self.dynamic_view.bind("<B1-Motion>", self.on_dynamic_pan)
+        self.dynamic_view.bind("<Double-Button-1>", lambda e: self.reset_dynamic_zoom())
         
         # Gerar gráfico inicial
         self.update_dynamic_plot()
@@ -265,34 +395,67 @@ class MainApplication(tk.Tk):
         return summary
     
     def populate_table(self):
-        """Preenche a tabela com dados."""
-        # Limpar dados existentes
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Inserir dados filtrados
-        for index, row in self.filtered_df.iterrows():
-            values = [str(row[col]) for col in self.data_frame.columns]
-            self.tree.insert("", "end", values=values)
+        """Preenche a tabela apenas com as linhas visíveis."""
+        total = len(self.table_model)
+        self.table_offset = max(0, min(self.table_offset, total - self.visible_rows))
+        rows = self.table_model.rows(self.table_offset, self.table_offset + self.visible_rows)
+        
+        # Reaproveitar itens existentes; criar/remover apenas a diferença
+        while len(self.tree_items) < len(rows):
+            self.tree_items.append(self.tree.insert("", "end"))
+        while len(self.tree_items) > len(rows):
+            self.tree.delete(self.tree_items.pop())
+        for item, values in zip(self.tree_items, rows):
+            self.tree.item(item, values=values)
+        
+        if total:
+            self.v_scrollbar.set(self.table_offset / total, (self.table_offset + len(rows)) / total)
+        else:
+            self.v_scrollbar.set(0, 1)
         
-        self.status_bar.config(text=f"Registros exibidos: {len(self.filtered_df)} / {len(self.data_frame)}")
+        self.status_bar.config(text=f"Registros exibidos: {total} / {len(self.data_frame)}")
+    
+    def scroll_table(self, action, amount, unit=None):
+        """Desloca a janela visível (comandos da scrollbar vertical)."""
+        if action == "moveto":
+            self.table_offset = int(float(amount) * len(self.table_model))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.table_offset += int(amount) * step
+        self.populate_table()
+    
+    def on_mouse_wheel(self, event):
+        """Rolagem pela roda do mouse (Windows/macOS)."""
+        self.scroll_table("scroll", -3 if event.delta > 0 else 3, "units")
+        return "break"
+    
+    def on_table_resize(self, event):
+        """Ajusta o número de linhas visíveis à altura do Treeview."""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        rows = max(1, (event.height - row_height) // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.populate_table()
     
     def apply_filters(self, event=None):
         """Aplica filtros selecionados."""
-        self.filtered_df = self.data_frame.copy()
-        
-        # Filtro por decisão
         decision = self.decision_filter.get()
         if decision != "Todos":
-            self.filtered_df = self.filtered_df[self.filtered_df['decision'] == decision]
+            self.table_model.filter_equals('decision', decision)
+        else:
+            self.table_model.set_filter(None)
         
+        self.table_offset = 0
         self.populate_table()
+        self.update_dynamic_plot()
     
     def reset_filters(self):
         """Reseta todos os filtros."""
         self.decision_filter.set("Todos")
-        self.filtered_df = self.data_frame.copy()
+        self.table_model.set_filter(None)
+        self.table_offset = 0
         self.populate_table()
+        self.update_dynamic_plot()
     
     def sort_column(self, col):
         """Ordena coluna quando clicada."""
@@ -304,11 +467,9 @@ class MainApplication(tk.Tk):
         
         self.sort_col = col
         
-        # Ordenar DataFrame
-        self.filtered_df = self.filtered_df.sort_values(
-            by=col,
-            ascending=not self.sort_reverse
-        )
+        # Ordenar apenas os índices da visão
+        self.table_model.sort(col, descending=self.sort_reverse)
+        self.table_offset = 0
         self.populate_table()
     
     def export_csv(self):
@@ -322,38 +483,75 @@ class MainApplication(tk.Tk):
             self.filtered_df.to_csv(file_path, index=False)
             messagebox.showinfo("Sucesso", f"Arquivo salvo em: {file_path}")
     
+    def dynamic_size(self) -> tuple:
+        """Tamanho atual da área do gráfico dinâmico (pixels)."""
+        return self.dynamic_view.winfo_width(), self.dynamic_view.winfo_height()
+    
     def update_dynamic_plot(self):
-        """Atualiza gráfico dinâmico."""
-        # Limpar frame
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
-        
-        plot_type = self.plot_type.get()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        if plot_type == "Lucro Acumulado":
-            plot_cumulative_profit(self.filtered_df)
-            fig = plt.gcf()
-        elif plot_type == "Excedente/Déficit":
-            plot_surplus_deficit(self.filtered_df)
-            fig = plt.gcf()
-        elif plot_type == "Receitas/Custos":
-            periods = range(len(self.filtered_df))
-            ax.bar(periods, self.filtered_df['sell_revenue_brl'], 
-                   label="Receitas (Venda)", color='green', alpha=0.7)
-            ax.bar(periods, -self.filtered_df['buy_cost_brl'], 
-                   label="Custos (Compra)", color='red', alpha=0.7)
-            ax.set_xlabel("Período")
-            ax.set_ylabel("Valor (R$)")
-            ax.set_title("Receitas vs Custos")
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        toolbar = NavigationToolbar2Tk(canvas, self.plot_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        """Agenda a atualização do gráfico dinâmico com a visão corrente."""
+        model = self.table_model
+        columns = {col: model.column_values(col) for col in model.columns}
+        self.dynamic_xlim = None
+        self.worker.submit(
+            render_dynamic_plot, self.dynamic_plot, self.dynamic_size(), None,
+            (columns, model.view, self.plot_type.get()),
+            callback=self.show_dynamic_plot,
+            key="dynamic_data"
+        )
+    
+    def request_dynamic_render(self):
+        """Agenda um novo quadro (tamanho ou intervalo visível alterado)."""
+        self.worker.submit(
+            render_dynamic_plot, self.dynamic_plot, self.dynamic_size(), self.dynamic_xlim,
+            callback=self.show_dynamic_plot,
+            key="dynamic_view"
+        )
+    
+    def show_dynamic_plot(self, frame):
+        """Exibe o quadro renderizado (thread do Tk)."""
+        from PIL import ImageTk
+        
+        if frame is None:
+            return
+        self.dynamic_frame = frame
+        self.dynamic_photo = ImageTk.PhotoImage(frame["image"])
+        self.dynamic_view.delete("all")
+        self.dynamic_view.create_image(0, 0, anchor=tk.NW, image=self.dynamic_photo)
+    
+    def on_dynamic_zoom(self, event):
+        """Zoom em torno do cursor; a série é re-decimada ao novo intervalo."""
+        frame = self.dynamic_frame
+        if frame is None or frame["bounds"] is None:
+            return
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        center = pixel_to_x(frame, event.x)
+        self.dynamic_xlim = zoom_xlim(frame["xlim"], center, 0.8 if zoom_in else 1.25, frame["bounds"])
+        self.request_dynamic_render()
+    
+    def on_dynamic_press(self, event):
+        """Início do deslocamento com o mouse."""
+        if self.dynamic_frame is not None:
+            self.dynamic_drag = (event.x, self.dynamic_frame)
+    
+    def on_dynamic_pan(self, event):
+        """Desloca o intervalo visível acompanhando o mouse."""
+        if self.dynamic_drag is None or self.dynamic_drag[1]["bounds"] is None:
+            return
+        start_x, frame = self.dynamic_drag
+        shift = pixel_to_x(frame, start_x) - pixel_to_x(frame, event.x)
+        xmin, xmax = frame["xlim"]
+        self.dynamic_xlim = clamp_xlim((xmin + shift, xmax + shift), frame["bounds"])
+        self.request_dynamic_render()
+    
+    def reset_dynamic_zoom(self):
+        """Volta a exibir as séries completas."""
+        self.dynamic_xlim = None
+        self.request_dynamic_render()
+    
+    def on_close(self):
+        """Encerra a thread de trabalho e fecha a janela."""
+        self.worker.shutdown()
+        self.destroy()
     
     def load_plots(self):
         """Carrega gráficos salvos (já criados na aba de gráficos)."""
@@ -0,0 +1,143 @@
+"""
+Renderização do gráfico dinâmico fora da thread do Tkinter.
+
+A figura (API orientada a objetos, backend Agg) pertence à thread de
+trabalho: os artistas são atualizados e rasterizados lá, e a thread do Tk
+apenas exibe o quadro RGBA resultante. Zoom e deslocamento pedem um novo
+quadro do intervalo visível, decimado à largura do eixo em pixels.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .decimate import decimate, visible_slice
+
+
+class OffscreenPlot:
+    """
+    Figura reutilizada entre renderizações (só troca os dados dos artistas).
+
+    Não é thread-safe: deve ser usada sempre pela mesma thread (a do
+    BackgroundWorker).
+    """
+
+    def __init__(self, n_lines: int = 2, dpi: int = 100):
+        """
+        Args:
+            n_lines: Máximo de séries exibidas simultaneamente
+            dpi: Resolução da figura (pixels por polegada)
+        """
+        self.fig = Figure(dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.lines = [self.ax.plot([], [], linewidth=1.5)[0] for _ in range(n_lines)]
+        self.ax.axhline(y=0, color="black", linestyle="--", linewidth=0.8)
+        self.ax.set_xlabel("Período")
+        self.ax.grid(True, alpha=0.3)
+        self.series: List[Tuple[str, str, np.ndarray, np.ndarray]] = []
+
+    def set_series(self, data: Dict[str, Any]) -> None:
+        """
+        Troca as séries exibidas.
+
+        Args:
+            data: Saída de prepare_dynamic_series (title, ylabel, series)
+        """
+        self.series = data["series"][:len(self.lines)]
+        self.ax.set_title(data["title"])
+        self.ax.set_ylabel(data["ylabel"])
+        for line, (label, color, _, _) in zip(self.lines, self.series):
+            line.set_label(label)
+            line.set_color(color)
+
+    def x_bounds(self) -> Optional[Tuple[float, float]]:
+        """Extensão do eixo X de todas as séries (None sem dados)."""
+        xs = [x for _, _, x, _ in self.series if len(x)]
+        if not xs:
+            return None
+        return float(min(x[0] for x in xs)), float(max(x[-1] for x in xs))
+
+    def render(self, width_px: int, height_px: int, xlim: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+        """
+        Rasteriza a figura no tamanho pedido.
+
+        Args:
+            width_px: Largura do quadro (pixels)
+            height_px: Altura do quadro (pixels)
+            xlim: Intervalo visível do eixo X (None = todas as séries)
+
+        Returns:
+            Dicionário com rgba (array altura × largura × 4), xlim efetivo e
+            axes_px (esquerda, topo, direita, base do eixo em pixels do quadro,
+            origem no canto superior esquerdo)
+        """
+        dpi = self.fig.dpi
+        self.fig.set_size_inches(max(width_px, 1) / dpi, max(height_px, 1) / dpi)
+        self.fig.tight_layout()
+        width = max(1, int(self.ax.get_position().width * width_px))
+
+        for i, line in enumerate(self.lines):
+            if i < len(self.series):
+                _, _, x, y = self.series[i]
+                if xlim is not None:
+                    visible = visible_slice(x, *xlim)
+                    x, y = x[visible], y[visible]
+                line.set_data(*decimate(x, y, 2 * width))
+                line.set_visible(True)
+            else:
+                line.set_data([], [])
+                line.set_visible(False)
+
+        visible_lines = [line for line in self.lines if line.get_visible()]
+        if visible_lines:
+            self.ax.legend(handles=visible_lines)
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
+        if xlim is not None:
+            self.ax.set_xlim(*xlim)
+
+        self.canvas.draw()
+        rgba = np.asarray(self.canvas.buffer_rgba()).copy()
+        x0, y0, x1, y1 = self.ax.bbox.extents
+        frame_height = rgba.shape[0]
+        return {
+            "rgba": rgba,
+            "xlim": tuple(float(v) for v in self.ax.get_xlim()),
+            "axes_px": (x0, frame_height - y1, x1, frame_height - y0),
+        }
+
+
+def pixel_to_x(frame: Dict[str, Any], px: float) -> float:
+    """Coordenada X dos dados sob a coluna de pixels `px` de um quadro renderizado."""
+    left, _, right, _ = frame["axes_px"]
+    xmin, xmax = frame["xlim"]
+    return xmin + (px - left) / max(right - left, 1.0) * (xmax - xmin)
+
+
+def zoom_xlim(
+    xlim: Tuple[float, float],
+    center: float,
+    factor: float,
+    bounds: Optional[Tuple[float, float]] = None
+) -> Tuple[float, float]:
+    """
+    Intervalo após zoom em torno de `center` (factor < 1 aproxima).
+
+    O intervalo resultante é mantido dentro de `bounds` quando informado.
+    """
+    xmin, xmax = xlim
+    new = (center - (center - xmin) * factor, center + (xmax - center) * factor)
+    return clamp_xlim(new, bounds)
+
+
+def clamp_xlim(xlim: Tuple[float, float], bounds: Optional[Tuple[float, float]]) -> Tuple[float, float]:
+    """Desloca (e, se preciso, reduz) o intervalo para caber em `bounds`."""
+    if bounds is None:
+        return xlim
+    low, high = bounds
+    xmin, xmax = xlim
+    span = min(xmax - xmin, high - low)
+    xmin = min(max(xmin, low), high - span)
+    return xmin, xmin + span
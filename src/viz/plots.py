@@ -1,9 +1,95 @@
 """Módulo para geração de gráficos e visualizações."""
+import argparse
+import os
+import pickle
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from .decimate import decimate
+
+# Opções de exportação (ver configure_plots)
+PLOT_CONFIG: Dict[str, Any] = {
+    "dpi": 300,
+    "bbox_inches": "tight",
+    "close_after_save": True,
+    "reuse_figures": False,
+    "decimation": "minmax",
+}
+
+def configure_plots(
+    backend: Optional[str] = None,
+    dpi: Optional[int] = None,
+    tight_bbox: Optional[bool] = None,
+    close_after_save: Optional[bool] = None,
+    reuse_figures: Optional[bool] = None,
+    decimation: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Configura a exportação de gráficos.
+    
+    Args:
+        backend: Backend matplotlib (ex: "Agg" para exportar sem janela)
+        dpi: Resolução das imagens salvas
+        tight_bbox: Recortar margens (bbox_inches="tight"; mais lento)
+        close_after_save: Fechar a figura após salvar (evita acúmulo de memória)
+        reuse_figures: Reutilizar uma figura por tipo de gráfico em vez de
+            criar uma nova a cada chamada
+        decimation: Redução de séries longas à resolução em pixels
+            ("minmax", "lttb" ou "none")
+    
+    Returns:
+        Configuração vigente
+    """
+    if backend:
+        matplotlib.use(backend)
+    if dpi is not None:
+        PLOT_CONFIG["dpi"] = dpi
+    if tight_bbox is not None:
+        PLOT_CONFIG["bbox_inches"] = "tight" if tight_bbox else None
+    if close_after_save is not None:
+        PLOT_CONFIG["close_after_save"] = close_after_save
+    if reuse_figures is not None:
+        PLOT_CONFIG["reuse_figures"] = reuse_figures
+    if decimation is not None:
+        PLOT_CONFIG["decimation"] = None if decimation == "none" else decimation
+    return dict(PLOT_CONFIG)
+
+def _new_figure(name: str):
+    """Cria (ou reutiliza, se configurado) a figura de um tipo de gráfico."""
+    if PLOT_CONFIG["reuse_figures"]:
+        fig = plt.figure(num=name, figsize=(12, 6), clear=True)
+        return fig, fig.add_subplot()
+    return plt.subplots(figsize=(12, 6))
+
+def _thin(ax, x, y):
+    """
+    Reduz a série à resolução em pixels do eixo na exportação.
+    
+    Só atua acima do limiar de 2 pontos por pixel; retorna (x, y, reduzida).
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    method = PLOT_CONFIG["decimation"]
+    width_px = int(ax.get_position().width * ax.figure.get_figwidth() * PLOT_CONFIG["dpi"])
+    if not method or len(y) <= 2 * width_px:
+        return x, y, False
+    max_points = 2 * width_px if method == "minmax" else width_px
+    x, y = decimate(x, y, max_points, method)
+    return x, y, True
+
+def _save_figure(fig: plt.Figure, save_path: Optional[Path]) -> None:
+    """Salva a figura com a configuração vigente e a fecha, se configurado."""
+    if not save_path:
+        return
+    fig.savefig(save_path, dpi=PLOT_CONFIG["dpi"], bbox_inches=PLOT_CONFIG["bbox_inches"])
+    print(f"Gráfico salvo em: {save_path}")
+    if PLOT_CONFIG["close_after_save"] and not PLOT_CONFIG["reuse_figures"]:
+        plt.close(fig)
 
 def plot_forecast_comparison(
     consumption: pd.Series,
@@ -27,29 +113,33 @@ def plot_forecast_comparison(
     Returns:
         Figura matplotlib
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure("forecast_comparison")
     
-    periods = range(len(consumption))
+    periods = np.arange(len(consumption))
     
-    # Plotar valores históricos
-    ax.plot(periods, consumption, label="Consumo", marker="o", linestyle="-", linewidth=2)
-    ax.plot(periods, production, label="Produção", marker="s", linestyle="-", linewidth=2)
+    # Plotar valores históricos (marcadores apenas em séries curtas)
+    x, y, thinned = _thin(ax, periods, consumption)
+    ax.plot(x, y, label="Consumo", marker=None if thinned else "o", linestyle="-", linewidth=2)
+    x, y, thinned = _thin(ax, periods, production)
+    ax.plot(x, y, label="Produção", marker=None if thinned else "s", linestyle="-", linewidth=2)
     
     # Plotar previsões se disponíveis
     if consumption_pred is not None:
         start_idx = len(consumption)
-        pred_periods = range(start_idx, start_idx + len(consumption_pred))
-        ax.plot(pred_periods, consumption_pred, label="Consumo Previsto", 
-                marker="o", linestyle="--", linewidth=2, color='blue', alpha=0.7)
+        pred_periods = np.arange(start_idx, start_idx + len(consumption_pred))
+        x, y, thinned = _thin(ax, pred_periods, consumption_pred)
+        ax.plot(x, y, label="Consumo Previsto", 
+                marker=None if thinned else "o", linestyle="--", linewidth=2, color='blue', alpha=0.7)
     
     if production_pred is not None:
         if consumption_pred is None:
             start_idx = len(consumption)
         else:
             start_idx = len(consumption)
-        pred_periods = range(start_idx, start_idx + len(production_pred))
-        ax.plot(pred_periods, production_pred, label="Produção Prevista", 
-                marker="s", linestyle="--", linewidth=2, color='orange', alpha=0.7)
+        pred_periods = np.arange(start_idx, start_idx + len(production_pred))
+        x, y, thinned = _thin(ax, pred_periods, production_pred)
+        ax.plot(x, y, label="Produção Prevista", 
+                marker=None if thinned else "s", linestyle="--", linewidth=2, color='orange', alpha=0.7)
     
     ax.set_xlabel("Período", fontsize=12)
     ax.set_ylabel("Energia (kWh)", fontsize=12)
@@ -58,11 +148,9 @@ def plot_forecast_comparison(
     ax.grid(True, alpha=0.3)
     ax.set_facecolor('#f8f9fa')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Gráfico salvo em: {save_path}")
+    _save_figure(fig, save_path)
     
     return fig
 
@@ -82,15 +170,22 @@ def plot_surplus_deficit(
     Returns:
         Figura matplotlib
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure("surplus_deficit")
     
-    periods = range(len(results_df))
+    periods = np.arange(len(results_df))
     surplus = results_df["surplus_kwh"].values
     deficit = results_df["deficit_kwh"].values
     
-    # Barras de excedente (verde) e déficit (vermelho)
-    ax.bar(periods, surplus, label="Excedente (Venda)", color='green', alpha=0.7)
-    ax.bar(periods, -deficit, label="Déficit (Compra)", color='red', alpha=0.7)
+    # Barras de excedente (verde) e déficit (vermelho); em séries longas,
+    # áreas em degrau sobre a série reduzida (picos preservados)
+    x_s, y_s, thinned = _thin(ax, periods, surplus)
+    if thinned:
+        x_d, y_d, _ = _thin(ax, periods, -deficit)
+        ax.fill_between(x_s, 0, y_s, step="mid", label="Excedente (Venda)", color='green', alpha=0.7)
+        ax.fill_between(x_d, 0, y_d, step="mid", label="Déficit (Compra)", color='red', alpha=0.7)
+    else:
+        ax.bar(periods, surplus, label="Excedente (Venda)", color='green', alpha=0.7)
+        ax.bar(periods, -deficit, label="Déficit (Compra)", color='red', alpha=0.7)
     
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.8)
     
@@ -101,11 +196,9 @@ def plot_surplus_deficit(
     ax.grid(True, alpha=0.3, axis='y')
     ax.set_facecolor('#f8f9fa')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Gráfico salvo em: {save_path}")
+    _save_figure(fig, save_path)
     
     return fig
 
@@ -125,17 +218,18 @@ def plot_cumulative_profit(
     Returns:
         Figura matplotlib
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure("cumulative_profit")
     
     periods = range(len(results_df))
     cumulative_profit = results_df["net_profit_brl"].cumsum()
+    x, y, thinned = _thin(ax, np.arange(len(results_df)), cumulative_profit)
     
     # Plotar linha e área preenchida
-    ax.plot(periods, cumulative_profit, marker="o", linewidth=2, markersize=6)
-    ax.fill_between(periods, 0, cumulative_profit, 
-                     where=(cumulative_profit >= 0), color='green', alpha=0.3, label="Lucro")
-    ax.fill_between(periods, 0, cumulative_profit, 
-                     where=(cumulative_profit < 0), color='red', alpha=0.3, label="Prejuízo")
+    ax.plot(x, y, marker=None if thinned else "o", linewidth=2, markersize=6)
+    ax.fill_between(x, 0, y, 
+                     where=(y >= 0), color='green', alpha=0.3, label="Lucro")
+    ax.fill_between(x, 0, y, 
+                     where=(y < 0), color='red', alpha=0.3, label="Prejuízo")
     
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.8)
     
@@ -151,11 +245,9 @@ def plot_cumulative_profit(
     ax.text(len(periods) - 1, final_profit, f'R$ {final_profit:.2f}', 
             verticalalignment='bottom' if final_profit >= 0 else 'top', fontsize=10)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Gráfico salvo em: {save_path}")
+    _save_figure(fig, save_path)
     
     return fig
 
@@ -175,13 +267,14 @@ def plot_pld_timeseries(
     Returns:
         Figura matplotlib
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure("pld_timeseries")
     
     if "timestamp" in pld_df.columns:
-        ax.plot(pld_df["timestamp"], pld_df["pld_brl_mwh"], marker="o", linewidth=2)
+        x = pld_df["timestamp"].to_numpy()
     else:
-        periods = range(len(pld_df))
-        ax.plot(periods, pld_df["pld_brl_mwh"], marker="o", linewidth=2)
+        x = np.arange(len(pld_df))
+    x, y, thinned = _thin(ax, x, pld_df["pld_brl_mwh"])
+    ax.plot(x, y, marker=None if thinned else "o", linewidth=2)
     
     ax.set_xlabel("Data", fontsize=12)
     ax.set_ylabel("PLD (R$/MWh)", fontsize=12)
@@ -189,10 +282,106 @@ def plot_pld_timeseries(
     ax.grid(True, alpha=0.3)
     ax.set_facecolor('#f8f9fa')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
-    if save_path:
-        fig.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Gráfico salvo em: {save_path}")
+    _save_figure(fig, save_path)
     
     return fig
+
+# Funções disponíveis para renderização adiada (nome -> função)
+PLOT_FUNCTIONS = {
+    "forecast_comparison": plot_forecast_comparison,
+    "surplus_deficit": plot_surplus_deficit,
+    "cumulative_profit": plot_cumulative_profit,
+    "pld_timeseries": plot_pld_timeseries,
+}
+
+def _render_job(job: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """Renderiza um gráfico registrado (executado em processo separado)."""
+    matplotlib.use("Agg")
+    PLOT_CONFIG.update(config)
+    fig = PLOT_FUNCTIONS[job["plot"]](*job["args"], save_path=job["save_path"], **job["kwargs"])
+    plt.close(fig)
+    return str(job["save_path"])
+
+class PlotQueue:
+    """
+    Registra os dados de cada gráfico para renderização posterior.
+    
+    No modo adiado o pipeline apenas registra os gráficos; a renderização
+    ocorre depois, em paralelo (`render`), ou sob demanda a partir do arquivo
+    gravado por `dump`:
+    
+        python -m src.viz.plots results/plot_jobs.pkl --workers 4
+    """
+    
+    def __init__(self):
+        self.jobs: List[Dict[str, Any]] = []
+    
+    def add(self, plot: str, save_path: Path, *args: Any, **kwargs: Any) -> None:
+        """
+        Registra um gráfico.
+        
+        Args:
+            plot: Nome do gráfico (ver PLOT_FUNCTIONS)
+            save_path: Arquivo de saída
+            *args, **kwargs: Argumentos da função de plotagem
+        """
+        if plot not in PLOT_FUNCTIONS:
+            raise ValueError(f"Gráfico desconhecido: {plot}")
+        self.jobs.append({"plot": plot, "save_path": Path(save_path), "args": args, "kwargs": kwargs})
+    
+    def render(self, workers: int = 1) -> List[str]:
+        """
+        Renderiza os gráficos registrados.
+        
+        Args:
+            workers: Processos paralelos (1 = sequencial no processo atual)
+        
+        Returns:
+            Caminhos dos arquivos gerados
+        """
+        config = dict(PLOT_CONFIG)
+        if workers <= 1 or len(self.jobs) <= 1:
+            return [_render_job(job, config) for job in self.jobs]
+        with ProcessPoolExecutor(max_workers=min(workers, len(self.jobs))) as executor:
+            return list(executor.map(_render_job, self.jobs, [config] * len(self.jobs)))
+    
+    def dump(self, path: Path) -> Path:
+        """Grava os gráficos registrados (dados incluídos) para renderização posterior."""
+        path = Path(path)
+        # Caminhos de saída relativos ao arquivo, para renderizar de qualquer diretório
+        base = path.resolve().parent
+        jobs = [
+            {**job, "save_path": Path(os.path.relpath(job["save_path"].resolve(), base))}
+            for job in self.jobs
+        ]
+        with open(path, "wb") as f:
+            pickle.dump({"config": dict(PLOT_CONFIG), "jobs": jobs}, f)
+        return path
+    
+    @classmethod
+    def load(cls, path: Path) -> "PlotQueue":
+        """Carrega gráficos gravados por `dump` (restaura a configuração)."""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        PLOT_CONFIG.update(data["config"])
+        base = Path(path).resolve().parent
+        queue = cls()
+        queue.jobs = [{**job, "save_path": base / job["save_path"]} for job in data["jobs"]]
+        return queue
+
+def main():
+    parser = argparse.ArgumentParser(description="Renderiza gráficos registrados em modo adiado")
+    parser.add_argument("jobs", type=Path, help="Arquivo plot_jobs.pkl gravado pelo pipeline")
+    parser.add_argument("--workers", type=int, default=4, help="Processos paralelos")
+    parser.add_argument("--dpi", type=int, default=None, help="Sobrescrever a resolução gravada")
+    args = parser.parse_args()
+    
+    queue = PlotQueue.load(args.jobs)
+    configure_plots(backend="Agg", dpi=args.dpi)
+    paths = queue.render(workers=args.workers)
+    print(f"[OK] {len(paths)} graficos gerados")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Modelo de tabela em colunas NumPy para exibição virtualizada."""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class TableModel:
+    """
+    Visão ordenada/filtrada de um DataFrame sem copiar linhas.
+
+    Cada coluna é mantida como array NumPy sem cópia: numéricas são visões
+    dos dados de origem, category mantém apenas os códigos e datas com fuso
+    ficam como DatetimeIndex. A ordenação usa índices de
+    argsort calculados uma vez por coluna (cache) e o filtro é uma máscara
+    booleana; a visão corrente é apenas um array de índices de linha, de modo
+    que ordenar/filtrar custa O(n) mesmo com milhões de linhas. Somente as
+    linhas visíveis são formatadas como texto (ver `rows`).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: DataFrame de origem (não é modificado)
+        """
+        self.df = df
+        self.columns: List[str] = list(df.columns)
+        self._values: Dict[str, np.ndarray] = {}
+        self._argsort: Dict[str, np.ndarray] = {}
+        self._factorized: Dict[str, tuple] = {}
+        self._categorical = set()
+        for col in self.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Códigos renumerados na ordem das categorias (texto ordenável sem
+                # objetos); ausentes (código -1) vão para o fim
+                categories = np.asarray(series.cat.categories, dtype=object)
+                rank = np.append(np.argsort(np.argsort(categories, kind="stable")), len(categories))
+                labels = np.append(np.sort(categories), np.nan)
+                self._factorized[col] = (rank[series.cat.codes.to_numpy()], labels)
+                self._values[col] = self._factorized[col][0]
+                self._categorical.add(col)
+            elif isinstance(series.dtype, pd.DatetimeTZDtype):
+                self._values[col] = pd.DatetimeIndex(series)
+            else:
+                self._values[col] = series.to_numpy()
+        self.mask: Optional[np.ndarray] = None
+        self.sort_col: Optional[str] = None
+        self.descending = False
+        self.view = np.arange(len(df))
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    @property
+    def total_rows(self) -> int:
+        """Número de linhas do DataFrame de origem."""
+        return len(self.df)
+
+    def _is_text(self, col: str) -> bool:
+        return col in self._categorical or self._values[col].dtype == object
+
+    def column_values(self, col: str) -> np.ndarray:
+        """Array de uma coluna (todas as linhas, ordem original)."""
+        if col in self._categorical:
+            codes, uniques = self._factorized[col]
+            return uniques[codes]
+        return self._values[col]
+
+    def _codes(self, col: str):
+        """Códigos ordenados e categorias de uma coluna de texto (em cache)."""
+        if col not in self._factorized:
+            self._factorized[col] = pd.factorize(self._values[col], sort=True)
+        return self._factorized[col]
+
+    def sort_index(self, col: str) -> np.ndarray:
+        """
+        Índices que ordenam a coluna de forma crescente (em cache).
+
+        Colunas de texto são ordenadas pelos códigos fatorizados.
+        """
+        if col not in self._argsort:
+            values = self._codes(col)[0] if self._is_text(col) else self._values[col]
+            self._argsort[col] = np.argsort(values, kind="stable")
+        return self._argsort[col]
+
+    def precompute(self) -> None:
+        """Calcula os índices de ordenação de todas as colunas."""
+        for col in self.columns:
+            self.sort_index(col)
+
+    def sort(self, col: Optional[str], descending: bool = False) -> None:
+        """Ordena a visão pela coluna (None restaura a ordem original)."""
+        self.sort_col = col
+        self.descending = descending
+        self._rebuild_view()
+
+    def set_filter(self, mask: Optional[np.ndarray]) -> None:
+        """Aplica uma máscara booleana sobre as linhas (None remove o filtro)."""
+        self.mask = None if mask is None else np.asarray(mask, dtype=bool)
+        self._rebuild_view()
+
+    def filter_equals(self, col: str, value: Any) -> None:
+        """Mantém apenas as linhas em que a coluna é igual ao valor."""
+        values = self._values[col]
+        if self._is_text(col):
+            codes, uniques = self._codes(col)
+            matches = np.flatnonzero(uniques == value)
+            self.set_filter(codes == matches[0] if len(matches) else np.zeros(len(codes), dtype=bool))
+        else:
+            self.set_filter(values == value)
+
+    def _rebuild_view(self) -> None:
+        if self.sort_col is None:
+            order = np.arange(self.total_rows)
+        else:
+            order = self.sort_index(self.sort_col)
+            if self.descending:
+                order = order[::-1]
+        if self.mask is not None:
+            order = order[self.mask[order]]
+        self.view = order
+
+    def rows(self, start: int, stop: int) -> List[List[str]]:
+        """
+        Linhas [start, stop) da visão formatadas como texto.
+
+        Args:
+            start: Primeira posição na visão
+            stop: Posição final (exclusiva)
+
+        Returns:
+            Lista de linhas, cada uma com um texto por coluna
+        """
+        idx = self.view[start:stop]
+        columns = []
+        for col in self.columns:
+            values = self._values[col][idx]
+            if col in self._categorical:
+                values = self._factorized[col][1][values]
+            elif values.dtype.kind == "M":
+                values = pd.DatetimeIndex(values)
+            columns.append(values)
+        return [[str(value) for value in row] for row in zip(*columns)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame correspondente à visão corrente (ordenada/filtrada)."""
+        return self.df.iloc[self.view]
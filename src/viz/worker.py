@@ -0,0 +1,105 @@
+"""Execução de tarefas fora da thread principal do Tkinter."""
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+
+class BackgroundWorker:
+    """
+    Thread de trabalho com fila de tarefas e entrega de resultados via `after()`.
+
+    As tarefas rodam em uma thread separada e nunca acessam widgets; o
+    resultado é entregue ao callback na thread do Tk por polling da fila de
+    resultados. Tarefas com a mesma `key` são coalescidas: apenas o resultado
+    da submissão mais recente chega ao callback, evitando redesenhos
+    obsoletos quando o usuário altera filtros rapidamente.
+    """
+
+    def __init__(self, root, poll_ms: int = 30):
+        """
+        Args:
+            root: Widget Tk usado para agendar o polling (`after`)
+            poll_ms: Intervalo de polling da fila de resultados (ms)
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self._tasks: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._generations: Dict[str, int] = {}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def submit(
+        self,
+        func: Callable,
+        *args: Any,
+        callback: Optional[Callable[[Any], None]] = None,
+        key: Optional[str] = None
+    ) -> None:
+        """
+        Agenda uma tarefa.
+
+        Args:
+            func: Função executada na thread de trabalho
+            *args: Argumentos da função
+            callback: Chamado na thread do Tk com o resultado
+            key: Chave de coalescência (opcional)
+        """
+        generation = None
+        if key is not None:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+        self._tasks.put((func, args, callback, key, generation))
+
+    def _is_stale(self, key: Optional[str], generation: Optional[int]) -> bool:
+        return key is not None and self._generations.get(key) != generation
+
+    def _run(self) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            func, args, callback, key, generation = task
+            if self._is_stale(key, generation):
+                continue
+            try:
+                result = func(*args)
+            except Exception:
+                traceback.print_exc()
+                continue
+            self._results.put((callback, result, key, generation))
+
+    def _poll(self) -> None:
+        try:
+            while True:
+                callback, result, key, generation = self._results.get_nowait()
+                if callback is not None and not self._is_stale(key, generation):
+                    callback(result)
+        except queue.Empty:
+            pass
+        self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def shutdown(self) -> None:
+        """Encerra a thread e o polling."""
+        self._tasks.put(None)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+
+
+def load_image_thumbnail(path, max_size: tuple):
+    """
+    Carrega uma imagem reduzida para caber em `max_size` (largura, altura).
+
+    Executado na thread de trabalho; retorna uma imagem PIL (a conversão
+    para PhotoImage deve ocorrer na thread do Tk).
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.draft("RGB", max_size)
+        img = img.convert("RGB")
+        img.thumbnail(max_size, Image.LANCZOS)
+        return img
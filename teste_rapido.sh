@@ -65,6 +65,26 @@ else
 fi
 echo ""
 
+# Teste 5: Benchmarks contra o baseline (regressão de desempenho)
+echo "📋 Teste 5: Benchmarks (falha se a média piorar mais de 20%)"
+echo "---------------------------------------------"
+if python -c "import pytest_benchmark" &> /dev/null; then
+    if ls .benchmarks/*/*.json &> /dev/null; then
+        pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+    else
+        echo "Nenhum baseline em .benchmarks/: registrando o atual"
+        pytest tests/benchmarks --benchmark-autosave
+    fi
+    if [ $? -eq 0 ]; then
+        echo "✅ Teste 5: PASSOU"
+    else
+        echo "❌ Teste 5: FALHOU"
+    fi
+else
+    echo "⚠️  pytest-benchmark não instalado. Pule este teste ou instale: pip install pytest-benchmark"
+fi
+echo ""
+
 echo "=================================================="
 echo "✅ Testes concluídos!"
 echo "Verifique os resultados em: results/"
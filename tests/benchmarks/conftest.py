@@ -0,0 +1,79 @@
+"""
+Fixtures dos benchmarks (pytest-benchmark), totalmente offline.
+
+Escalas (variável de ambiente BENCH_SCALES, separadas por vírgula):
+    small:  90 dias, diário, 1 site            (padrão)
+    medium: 1 ano, horário, 1 site
+    large:  5 anos, horário, 50 sites
+
+Uso:
+    # Registrar baseline (salvo em .benchmarks/)
+    pytest tests/benchmarks --benchmark-autosave
+
+    # Comparar com o último baseline e falhar em regressões > 20%
+    # (etapa 5 de teste_rapido.sh; margem para o ruído entre execuções)
+    pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+
+    # Escalas maiores
+    BENCH_SCALES=small,medium,large pytest tests/benchmarks --benchmark-autosave
+
+Sem o plugin pytest-benchmark (requirements_minimal.txt) os módulos de
+benchmark são pulados.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.data.synthetic import make_timestamps, simulate_site, simulate_sites
+
+# Escala -> (início, fim, frequência, sites)
+SCALES = {
+    "small": ("2024-01-01", "2024-03-30", "D", 1),
+    "medium": ("2024-01-01", "2024-12-31 23:00", "h", 1),
+    "large": ("2020-01-01", "2024-12-31 23:00", "h", 50),
+}
+
+
+def _selected_scales():
+    names = [s.strip() for s in os.environ.get("BENCH_SCALES", "small").split(",") if s.strip()]
+    unknown = set(names) - set(SCALES)
+    if unknown:
+        raise ValueError(f"Escalas desconhecidas em BENCH_SCALES: {sorted(unknown)}")
+    return names
+
+
+@pytest.fixture(scope="session", params=_selected_scales())
+def scale(request):
+    """Nome da escala corrente."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def bench_rounds(scale):
+    """Número de rodadas por escala (escalas grandes usam menos repetições)."""
+    return {"small": 5, "medium": 3}.get(scale, 1)
+
+
+@pytest.fixture(scope="session")
+def energy_frame(scale):
+    """Histórico combinado sintético na escala corrente."""
+    start, end, freq, sites = SCALES[scale]
+    if sites == 1:
+        return simulate_site(make_timestamps(start, end, freq))
+    return simulate_sites(start, end, freq, n_sites=sites)
+
+
+@pytest.fixture(scope="session")
+def source_frames(energy_frame):
+    """Fontes separadas (consumo, produção, PLD, clima) para prepare_data."""
+    df = energy_frame[energy_frame["site_id"] == 0].drop(columns="site_id")
+    return (
+        df[["timestamp", "consumption_kwh"]].copy(),
+        df[["timestamp", "production_kwh"]].copy(),
+        df[["timestamp", "pld_brl_mwh"]].copy(),
+        df[["timestamp", "ghi_wm2", "temp_c", "wind_ms"]].copy(),
+    )
@@ -0,0 +1,67 @@
+"""Benchmarks de treino, previsão e backtest dos modelos."""
+import pytest
+from pathlib import Path
+import sys
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.models.consumption import ConsumptionForecaster
+from src.models.production import ProductionForecaster
+from src.models.evaluate import expanding_window_backtest
+
+# Backtest limitado a poucos re-treinos para manter o custo previsível
+BACKTEST_STEPS = 5
+
+@pytest.fixture(scope="module")
+def site_frame(energy_frame):
+    """Histórico de um único site."""
+    return energy_frame[energy_frame["site_id"] == 0].reset_index(drop=True)
+
+@pytest.mark.parametrize("algo", ["baseline", "prophet"])
+def test_bench_consumption_fit_predict(benchmark, site_frame, bench_rounds, algo):
+    """Treino e previsão do forecaster de consumo."""
+    if algo == "prophet":
+        pytest.importorskip("prophet")
+
+    def run():
+        model = ConsumptionForecaster(algo=algo)
+        model.fit(site_frame, target_col="consumption_kwh")
+        return model.predict(horizon=30)
+
+    predictions = benchmark.pedantic(run, rounds=bench_rounds, iterations=1)
+    assert len(predictions) == 30
+
+@pytest.mark.parametrize("algo", ["baseline", "prophet"])
+def test_bench_production_fit_predict(benchmark, site_frame, bench_rounds, algo):
+    """Treino e previsão do forecaster de produção com exógenas."""
+    if algo == "prophet":
+        pytest.importorskip("prophet")
+
+    def run():
+        model = ProductionForecaster(algo=algo)
+        model.fit(site_frame, target_col="production_kwh", exog_cols=["ghi_wm2", "temp_c"])
+        return model.predict(horizon=30, exog=site_frame[["ghi_wm2", "temp_c"]].tail(30))
+
+    predictions = benchmark.pedantic(run, rounds=bench_rounds, iterations=1)
+    assert len(predictions) == 30
+
+def test_bench_expanding_window_backtest(benchmark, site_frame, bench_rounds):
+    """Backtest com janela expansiva (número fixo de re-treinos)."""
+    split = int(len(site_frame) * 0.8)
+    train_df = site_frame.iloc[:split]
+    test_df = site_frame.iloc[split:]
+    step_size = max(1, len(test_df) // BACKTEST_STEPS)
+
+    results = benchmark.pedantic(
+        expanding_window_backtest,
+        args=(ConsumptionForecaster(algo="baseline"), train_df, test_df, "consumption_kwh"),
+        kwargs={"step_size": step_size},
+        rounds=bench_rounds,
+        iterations=1
+    )
+    assert len(results) == len(test_df)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
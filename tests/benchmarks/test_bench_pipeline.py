@@ -0,0 +1,65 @@
+"""Benchmarks das etapas de dados, regras e finanças do pipeline."""
+import pytest
+from pathlib import Path
+import sys
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from run_pipeline import prepare_data
+from src.features.engineering import engineer_features
+from src.finance.profit import ProfitCalculator
+from src.rules.engine import DecisionEngine
+
+def test_bench_prepare_data(benchmark, source_frames, bench_rounds):
+    """Merge das fontes de dados em um histórico combinado."""
+    combined = benchmark.pedantic(
+        prepare_data, args=source_frames, rounds=bench_rounds, iterations=1
+    )
+    assert len(combined) == len(source_frames[0])
+
+def test_bench_engineer_features(benchmark, energy_frame, bench_rounds):
+    """Engenharia de atributos (lags, janelas, calendário e clima), por site."""
+    features = benchmark.pedantic(
+        engineer_features,
+        args=(energy_frame, "consumption_kwh"),
+        kwargs={"groupby": "site_id"},
+        rounds=bench_rounds,
+        iterations=1
+    )
+    assert len(features) == len(energy_frame)
+
+def test_bench_profit_calculate(benchmark, energy_frame, bench_rounds):
+    """Cálculo financeiro período a período."""
+    calculator = ProfitCalculator()
+    results = benchmark.pedantic(
+        calculator.calculate,
+        args=(
+            energy_frame["consumption_kwh"],
+            energy_frame["production_kwh"],
+            energy_frame["pld_brl_mwh"]
+        ),
+        rounds=bench_rounds,
+        iterations=1
+    )
+    assert len(results) == len(energy_frame)
+
+@pytest.mark.parametrize("strategy", ["simple", "economic"])
+def test_bench_decision_engine(benchmark, energy_frame, bench_rounds, strategy):
+    """Motor de decisão Comprar/Vender/Neutro."""
+    engine = DecisionEngine(strategy=strategy)
+    decisions = benchmark.pedantic(
+        engine.decide,
+        args=(
+            energy_frame["consumption_kwh"],
+            energy_frame["production_kwh"],
+            energy_frame["pld_brl_mwh"]
+        ),
+        rounds=bench_rounds,
+        iterations=1
+    )
+    assert len(decisions) == len(energy_frame)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
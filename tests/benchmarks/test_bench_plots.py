@@ -0,0 +1,77 @@
+"""Benchmarks das funções de visualização (backend Agg, sem janela)."""
+import pytest
+from pathlib import Path
+import sys
+
+pytest.importorskip("pytest_benchmark")
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.finance.profit import ProfitCalculator
+from src.viz.plots import (
+    plot_forecast_comparison,
+    plot_surplus_deficit,
+    plot_cumulative_profit,
+    plot_pld_timeseries
+)
+
+@pytest.fixture(scope="module")
+def site_frame(energy_frame):
+    """Histórico de um único site."""
+    return energy_frame[energy_frame["site_id"] == 0].reset_index(drop=True)
+
+@pytest.fixture(scope="module")
+def results_df(site_frame):
+    """Resultados financeiros usados pelos gráficos."""
+    return ProfitCalculator().calculate(
+        site_frame["consumption_kwh"],
+        site_frame["production_kwh"],
+        site_frame["pld_brl_mwh"]
+    )
+
+def _render(plot_func, tmp_path, *args):
+    """Gera e salva a figura, fechando-a para não acumular memória."""
+    fig = plot_func(*args, save_path=tmp_path / "plot.png")
+    plt.close(fig)
+    return fig
+
+def test_bench_plot_forecast_comparison(benchmark, site_frame, bench_rounds, tmp_path):
+    """Gráfico de consumo vs produção."""
+    benchmark.pedantic(
+        _render,
+        args=(plot_forecast_comparison, tmp_path, site_frame["consumption_kwh"], site_frame["production_kwh"]),
+        rounds=bench_rounds,
+        iterations=1
+    )
+    assert (tmp_path / "plot.png").exists()
+
+def test_bench_plot_surplus_deficit(benchmark, results_df, bench_rounds, tmp_path):
+    """Gráfico de barras de excedente/déficit."""
+    benchmark.pedantic(
+        _render, args=(plot_surplus_deficit, tmp_path, results_df), rounds=bench_rounds, iterations=1
+    )
+    assert (tmp_path / "plot.png").exists()
+
+def test_bench_plot_cumulative_profit(benchmark, results_df, bench_rounds, tmp_path):
+    """Gráfico de lucro acumulado."""
+    benchmark.pedantic(
+        _render, args=(plot_cumulative_profit, tmp_path, results_df), rounds=bench_rounds, iterations=1
+    )
+    assert (tmp_path / "plot.png").exists()
+
+def test_bench_plot_pld_timeseries(benchmark, site_frame, bench_rounds, tmp_path):
+    """Gráfico da série de PLD."""
+    benchmark.pedantic(
+        _render,
+        args=(plot_pld_timeseries, tmp_path, site_frame[["timestamp", "pld_brl_mwh"]]),
+        rounds=bench_rounds,
+        iterations=1
+    )
+    assert (tmp_path / "plot.png").exists()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,47 @@
+"""Testes básicos para a camada de configuração."""
+import os
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import ValidationError
+from src.config import load_app_config
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Arquivo de configuração mínimo."""
+    path = tmp_path / "config.yaml"
+    path.write_text("finance:\n  cost_rate: 0.10\nmodel:\n  horizon_days: 7\n", encoding="utf-8")
+    return path
+
+def test_cache_and_overrides(config_file):
+    """Teste de cache por mtime, overrides e hash de conteúdo."""
+    config = load_app_config(config_file)
+    assert load_app_config(config_file) is config
+    assert config.model.horizon_days == 7
+    assert config.data.region == "SE"
+
+    swept = load_app_config(config_file, {"finance.cost_rate": 0.2, "model": {"algo_consumption": "baseline"}})
+    assert swept.finance.cost_rate == 0.2
+    assert swept.model.algo_consumption == "baseline"
+    assert swept.hash != config.hash
+    assert load_app_config(config_file, {"finance.cost_rate": 0.2, "model": {"algo_consumption": "baseline"}}) is swept
+
+    with pytest.raises(ValidationError):
+        config.finance.cost_rate = 0.5
+
+    config_file.write_text("model:\n  horizon_days: 3\n", encoding="utf-8")
+    os.utime(config_file, ns=(0, 10**18))
+    assert load_app_config(config_file).model.horizon_days == 3
+
+def test_invalid_config(config_file):
+    """Teste de rejeição de valores e seções inválidos."""
+    with pytest.raises(ValidationError):
+        load_app_config(config_file, {"finance.cost_rate": 1.5})
+    with pytest.raises(ValidationError):
+        load_app_config(config_file, {"modle.horizon_days": 3})
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,55 @@
+"""Testes básicos para a decimação de séries longas."""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.viz.decimate import decimate, lttb_indices, minmax_indices
+
+def test_minmax_preserves_peaks():
+    """Teste de que a decimação min-max mantém os extremos globais."""
+    rng = np.random.default_rng(0)
+    y = rng.normal(0, 1, 100_000)
+    y[54_321] = 50.0
+    y[12_345] = -50.0
+
+    x_dec, y_dec = decimate(np.arange(len(y)), y, max_points=2000, method="minmax")
+
+    assert len(y_dec) <= 2002
+    assert y_dec.max() == 50.0 and y_dec.min() == -50.0
+    assert np.all(np.diff(x_dec) > 0)
+
+def test_lttb_keeps_endpoints_and_size():
+    """Teste do LTTB com eixo de datas."""
+    x = pd.date_range("2020-01-01", periods=10_000, freq="h").to_numpy()
+    y = np.sin(np.arange(10_000) / 100)
+
+    idx = lttb_indices(x, y, 500)
+
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == 9_999
+    assert np.all(np.diff(idx) > 0)
+
+def test_lttb_with_timezone_aware_axis():
+    """Teste do LTTB com timestamps com fuso (saída dos conectores)."""
+    x = pd.Series(pd.date_range("2020-01-01", periods=50_000, freq="h", tz="America/Sao_Paulo"))
+    y = np.sin(np.arange(50_000) / 100)
+
+    naive_idx = lttb_indices(x.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(), y, 500)
+    np.testing.assert_array_equal(lttb_indices(x, y, 500), naive_idx)
+    x_dec, y_dec = decimate(x, y, 500, method="lttb")
+    assert len(x_dec) == 500 and x_dec[0] == x.iloc[0]
+
+def test_short_series_unchanged():
+    """Teste de que séries abaixo do limiar não são alteradas."""
+    y = np.arange(10.0)
+    x_dec, y_dec = decimate(np.arange(10), y, max_points=100)
+
+    assert np.array_equal(y_dec, y)
+    assert len(minmax_indices(y, 50)) == 10
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
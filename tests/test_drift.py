@@ -0,0 +1,88 @@
+"""Testes básicos para a detecção de drift."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.consumption import ConsumptionForecaster
+from src.models.drift import DriftMonitor, check_registered, model_spec, training_profile
+from src.models.registry import ModelRegistry
+
+def make_df(days, shift=0.0, seed=0):
+    """Histórico diário com consumo e temperatura."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start="2024-01-01", periods=days, freq="D"),
+        "consumption_kwh": 100 + shift + rng.normal(0, 5, days),
+        "temp_c": 25 + rng.normal(0, 2, days)
+    })
+
+def test_monitor_detects_shift():
+    """Teste de PSI/KS: mesma distribuição passa, deslocamento dispara re-treino."""
+    train = make_df(120)
+    profile = training_profile(train, window_days=60, errors={"consumption": 4.0})
+    monitor = DriftMonitor(window_days=60, max_age_days=30)
+
+    stable = pd.concat([train, make_df(125, seed=1).tail(5).assign(
+        timestamp=pd.date_range("2024-04-30", periods=5, freq="D"))])
+    assert not monitor.check(profile, stable).retrain
+
+    shifted = make_df(120, shift=15, seed=2)
+    report = monitor.check(profile, shifted)
+    assert report.retrain
+    assert report.table().set_index("column").loc["consumption_kwh", "drift"]
+    assert not report.table().set_index("column").loc["temp_c", "drift"]
+
+def test_check_registered(tmp_path):
+    """Teste da decisão de reutilizar os modelos registrados."""
+    registry = ModelRegistry(tmp_path / "models")
+    df = make_df(90)
+    spec = model_spec({"consumption": ("baseline", {}), "production": ("baseline", {})})
+
+    report, package = check_registered(registry, "SE", df, spec)
+    assert report.retrain and package is None
+
+    model = ConsumptionForecaster(algo="baseline").fit(df)
+    registry.register("SE", "v1", {"consumption": model}, context={"profile": training_profile(df, window_days=30)},
+                      meta={"model_spec": spec})
+    report, package = check_registered(registry, "SE", df, spec)
+    assert not report.retrain
+    assert package["meta"]["version"] == "v1"
+
+    changed = model_spec({"consumption": ("baseline", {"window": 14}), "production": ("baseline", {})})
+    report, _ = check_registered(registry, "SE", df, changed)
+    assert report.reasons == ["configuracao do modelo alterada"]
+
+def test_registered_window_and_site(tmp_path):
+    """Teste de que modelos de outra janela ou de outro site não são reutilizados."""
+    registry = ModelRegistry(tmp_path / "models")
+    df = make_df(95)
+    spec = model_spec({"consumption": ("baseline", {})}, site={"lat": -23.55, "lon": -46.63})
+    model = ConsumptionForecaster(algo="baseline").fit(df)
+    registry.register("SE", "v1", {"consumption": model}, context={"profile": training_profile(df, window_days=30)},
+                      meta={"model_spec": spec, "train_start": "2024-01-01", "train_end": "2024-04-04"})
+
+    # Janela estendida com dados novos: decisão do DriftMonitor
+    longer = make_df(98)
+    report, _ = check_registered(registry, "SE", longer, spec, train_start="2024-01-01", train_end="2024-04-07")
+    assert not report.retrain and report.new_rows == 3
+
+    # Janela que termina antes do treino registrado (o modelo viu o futuro)
+    shorter = make_df(91)
+    report, _ = check_registered(registry, "SE", shorter, spec, train_start="2024-01-01", train_end="2024-03-31")
+    assert report.retrain and "termina antes" in report.reasons[0]
+    report = DriftMonitor().check(training_profile(df, window_days=30), shorter)
+    assert report.retrain and report.new_rows == 0
+
+    # Outro início de janela ou outro site da mesma região
+    report, _ = check_registered(registry, "SE", df, spec, train_start="2023-10-04", train_end="2024-04-04")
+    assert report.retrain and "inicio do treino" in report.reasons[0]
+    other_site = model_spec({"consumption": ("baseline", {})}, site={"lat": -22.91, "lon": -43.17})
+    report, _ = check_registered(registry, "SE", df, other_site, train_start="2024-01-01", train_end="2024-04-04")
+    assert report.reasons == ["configuracao do modelo alterada"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""Testes básicos para a política de tipos."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.dtypes import apply_dtypes, enforce_dtypes, memory_mb
+from src.data.loader import prepare_data
+
+def make_frame(rows=1000):
+    """Frame com medições em float64 e identificadores como objeto."""
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start="2024-01-01", periods=rows, freq="h"),
+        "consumption_kwh": np.linspace(0, 100, rows),
+        "net_profit_brl": np.linspace(-10, 10, rows),
+        "region": ["SE"] * rows,
+        "station_id": ["A701"] * rows
+    })
+
+def test_apply_dtypes():
+    """Teste de conversão: float32, category e `*_brl` em float64, com fuso."""
+    df = make_frame()
+    before = memory_mb(df)
+    apply_dtypes(df, tz="America/Sao_Paulo")
+
+    assert df["consumption_kwh"].dtype == np.float32
+    assert df["net_profit_brl"].dtype == np.float64
+    assert isinstance(df["region"].dtype, pd.CategoricalDtype)
+    assert str(df["timestamp"].dt.tz) == "America/Sao_Paulo"
+    assert memory_mb(df) < before / 2
+
+    wrapped = enforce_dtypes()(lambda: make_frame(10))
+    assert wrapped()["consumption_kwh"].dtype == np.float32
+
+    # Valores monetários calculados em float32 (ou inteiros) sobem para float64
+    money = apply_dtypes(pd.DataFrame({
+        "sell_revenue_brl": np.ones(3, dtype=np.float32),
+        "fixed_cost_brl": np.zeros(3, dtype=np.int64),
+        "pld_brl_mwh": np.ones(3)
+    }))
+    assert (money.dtypes[["sell_revenue_brl", "fixed_cost_brl"]] == np.float64).all()
+    assert money["pld_brl_mwh"].dtype == np.float32
+
+def test_aligned_timestamps_not_reassigned():
+    """Teste de que timestamps já no fuso do projeto não são regravados."""
+    assigned = []
+
+    class TrackingFrame(pd.DataFrame):
+        def __setitem__(self, key, value):
+            assigned.append(key)
+            super().__setitem__(key, value)
+
+    df = TrackingFrame(make_frame(10))
+    apply_dtypes(df, tz="America/Sao_Paulo")
+    assert "timestamp" in assigned
+
+    assigned.clear()
+    apply_dtypes(df, tz="America/Sao_Paulo")
+    assert assigned == []
+
+def test_prepare_data_preserves_dtypes():
+    """Teste de merge: prepare_data mantém a política após ffill/bfill."""
+    ts = pd.date_range(start="2024-01-01", periods=10, freq="D")
+    consumption = pd.DataFrame({"timestamp": ts, "consumption_kwh": np.arange(10.0), "region": "SE"})
+    production = pd.DataFrame({"timestamp": ts, "production_kwh": np.arange(10.0)})
+    pld = pd.DataFrame({"timestamp": ts[::2], "pld_brl_mwh": np.arange(5.0), "submercado": "SE"})
+    climate = pd.DataFrame({"timestamp": ts, "temp_c": np.full(10, 25.0), "station_id": "A701"})
+
+    combined = prepare_data(consumption, production, pld, climate)
+
+    assert combined["pld_brl_mwh"].notna().all()
+    for col in ["consumption_kwh", "production_kwh", "pld_brl_mwh", "temp_c"]:
+        assert combined[col].dtype == np.float32
+    for col in ["region", "submercado", "station_id"]:
+        if col in combined.columns:
+            assert isinstance(combined[col].dtype, pd.CategoricalDtype)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
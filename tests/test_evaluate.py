@@ -0,0 +1,45 @@
+"""Testes básicos para as métricas de avaliação."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from src.models.evaluate import calculate_metrics, calculate_metrics_batch
+
+def test_batch_matches_reference():
+    """Teste das métricas em lote contra o cálculo por série (scikit-learn)."""
+    rng = np.random.default_rng(0)
+    y_true = rng.uniform(50, 150, (4, 30))
+    y_pred = y_true + rng.normal(0, 10, (4, 30))
+
+    y_train = rng.uniform(50, 150, (4, 60))
+    metrics = calculate_metrics_batch(y_true, y_pred, y_train=y_train, labels=["a", "b", "c", "d"])
+    assert list(metrics["series"]) == ["a", "b", "c", "d"]
+    for i, row in enumerate(metrics.itertuples()):
+        assert row.MAE == pytest.approx(mean_absolute_error(y_true[i], y_pred[i]))
+        assert row.RMSE == pytest.approx(np.sqrt(mean_squared_error(y_true[i], y_pred[i])))
+        assert row.R2 == pytest.approx(r2_score(y_true[i], y_pred[i]))
+        assert row.Bias == pytest.approx(np.mean(y_pred[i] - y_true[i]))
+        assert row.MASE == pytest.approx(row.MAE / np.mean(np.abs(np.diff(y_train[i]))))
+
+    # Sem histórico de treino o MASE fica indefinido (não usa a escala do próprio teste)
+    assert calculate_metrics_batch(y_true, y_pred)["MASE"].isna().all()
+    assert calculate_metrics(y_true[0], y_pred[0], y_train=y_train[0])["MASE"] == pytest.approx(metrics["MASE"].iloc[0])
+
+def test_nan_masking_and_zero_production():
+    """Teste de NaN ignorados e MAPE finito com horas sem produção."""
+    y_true = pd.Series([0.0, 0.0, 10.0, 20.0, np.nan])
+    y_pred = pd.Series([1.0, 0.0, 12.0, 18.0, 5.0])
+
+    metrics = calculate_metrics(y_true, y_pred)
+    assert metrics["MAE"] == pytest.approx(5 / 4)
+    assert metrics["MAPE"] == pytest.approx((20 + 10) / 2)
+    assert metrics["sMAPE"] == pytest.approx((200 + 0 + 2 * 2 / 22 * 100 + 2 * 2 / 38 * 100) / 4)
+    assert np.isnan(calculate_metrics_batch([[np.nan, np.nan]], [[1.0, 2.0]])["MAE"].iloc[0])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
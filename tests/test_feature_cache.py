@@ -0,0 +1,44 @@
+"""Testes básicos para a matriz de atributos mapeada em memória."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.synthetic import simulate_sites
+from src.features.cache import FeatureMatrix, cached_features
+from src.features.engineering import engineer_features
+
+def test_matrix_is_zero_copy(tmp_path):
+    """Teste de gravação/abertura: colunas são visões somente leitura do memmap."""
+    df = simulate_sites("2024-01-01", "2024-03-31", "D", n_sites=1)
+
+    FeatureMatrix.build(df, tmp_path / "m")
+    matrix = FeatureMatrix(tmp_path / "m")
+    frame = matrix.frame(["consumption_kwh"], rows=slice(10, 20))
+
+    assert "site_id" in matrix.columns and "timestamp" not in matrix.columns
+    assert list(frame.columns) == ["timestamp", "consumption_kwh"]
+    assert np.shares_memory(frame["consumption_kwh"].to_numpy(), matrix.values)
+    assert not frame["consumption_kwh"].to_numpy().flags.writeable
+    pd.testing.assert_series_equal(frame["timestamp"], df["timestamp"].iloc[10:20].reset_index(drop=True))
+    np.testing.assert_array_equal(frame["consumption_kwh"], df["consumption_kwh"].iloc[10:20])
+
+def test_cached_features_built_once(tmp_path):
+    """Teste do cache: mesmos dados e parâmetros reaproveitam a matriz gravada."""
+    df = simulate_sites("2024-01-01", "2024-03-31", "D", n_sites=1)
+
+    first = cached_features(df, "consumption_kwh", tmp_path, lags=[1, 7])
+    mtime = (first.path / "matrix.npy").stat().st_mtime_ns
+    second = cached_features(df, "consumption_kwh", tmp_path, lags=[1, 7])
+    other = cached_features(df, "consumption_kwh", tmp_path, lags=[1])
+
+    assert second.path == first.path and (second.path / "matrix.npy").stat().st_mtime_ns == mtime
+    assert other.path != first.path
+    expected = engineer_features(df, "consumption_kwh", lags=[1, 7])
+    np.testing.assert_allclose(second.column("consumption_kwh_lag7"), expected["consumption_kwh_lag7"])
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
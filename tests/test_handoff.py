@@ -0,0 +1,63 @@
+"""Testes básicos para a troca de dados entre estágios sem cópias."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.handoff import column_view, from_arrow, to_arrow
+from src.data.loader import prepare_data
+from src.data.synthetic import simulate_sites
+from src.features.engineering import engineer_features
+from src.viz.table_model import TableModel
+
+@pytest.fixture
+def deep_copies(monkeypatch):
+    """Conta as cópias profundas de DataFrame/Series feitas durante o teste."""
+    calls = []
+    for cls in (pd.DataFrame, pd.Series):
+        original = cls.copy
+
+        def counting_copy(self, deep=True, _original=original):
+            if deep:
+                calls.append(type(self).__name__)
+            return _original(self, deep=deep)
+
+        monkeypatch.setattr(cls, "copy", counting_copy)
+    return calls
+
+def test_arrow_handoff_is_zero_copy():
+    """Teste de conversão Arrow -> NumPy/pandas sem cópia das colunas numéricas."""
+    df = simulate_sites("2024-01-01", "2024-03-31", "D", n_sites=2)
+    table = to_arrow(df)
+    buffer = np.frombuffer(table.column("consumption_kwh").chunk(0).buffers()[1], dtype=np.float32)
+
+    back = from_arrow(table)
+
+    assert np.shares_memory(column_view(table, "consumption_kwh"), buffer)
+    assert np.shares_memory(back["consumption_kwh"].to_numpy(), buffer)
+    pd.testing.assert_frame_equal(back, df)
+
+def test_stages_make_no_deep_copies(deep_copies):
+    """Teste de regressão: preparação, atributos e tabela da interface sem cópias profundas."""
+    df = simulate_sites("2024-01-01", "2024-03-31", "D", n_sites=1)
+    consumption = df[["timestamp", "consumption_kwh"]]
+    production = df[["timestamp", "production_kwh"]]
+    pld = df[["timestamp", "pld_brl_mwh"]]
+    climate = df[["timestamp", "ghi_wm2", "temp_c"]]
+    before = consumption["consumption_kwh"].to_numpy().copy()
+
+    combined = prepare_data(consumption, production, pld, climate)
+    features = engineer_features(combined, "consumption_kwh")
+    model = TableModel(features)
+
+    assert deep_copies == []
+    assert len(features) == len(df) and "consumption_kwh_lag7" in features.columns
+    assert np.shares_memory(model.column_values("consumption_kwh"), features["consumption_kwh"].to_numpy())
+    np.testing.assert_array_equal(consumption["consumption_kwh"], before)
+    assert list(consumption.columns) == ["timestamp", "consumption_kwh"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,68 @@
+"""Testes básicos para o daemon de ingestão."""
+import asyncio
+import pytest
+from datetime import datetime
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.ingest import IngestDaemon, IngestJob, IngestStore
+from src.data.loader import _ingested
+
+def observed(job):
+    """Substitui o conector (simulado) por uma fonte observada com os mesmos dados."""
+    fetch = job.fetch
+
+    def fetch_observed(start, end):
+        df = fetch(start, end)
+        df.attrs.clear()
+        return df
+
+    job.fetch = fetch_observed
+    return job
+
+def test_incremental_ingestion(tmp_path):
+    """Teste de backfill, ingestão incremental (delta) e leitura do cache."""
+    now = {"value": datetime(2024, 3, 31, 12)}
+    store = IngestStore(tmp_path / "ingest")
+    job = observed(IngestJob("ccee", {"submercado": "SE"}, backfill_days=30))
+    daemon = IngestDaemon([job], store, rate_limits={"ccee": 0}, clock=lambda: now["value"])
+
+    asyncio.run(daemon.run_once())
+    assert daemon.status["ccee_SE"]["rows"] == 31
+
+    now["value"] = datetime(2024, 4, 5, 12)
+    health = asyncio.run(daemon.run_once())
+    state = health["ccee_SE"]
+    assert state["last_window"] == ["2024-03-29", "2024-04-05"]
+    assert state["rows"] == 36
+    assert not state["stale"]
+
+    df = store.read("ccee_SE", "2024-03-10", "2024-04-05")
+    assert len(df) == 27
+    assert store.read("ccee_SE", "2024-01-01", "2024-04-05") is None
+
+def test_simulated_data_not_ingested(tmp_path):
+    """Teste de que o fallback simulado não é gravado nem tratado como atual."""
+    now = {"value": datetime(2024, 3, 31, 12)}
+    store = IngestStore(tmp_path / "ingest")
+    real = observed(IngestJob("ccee", {"submercado": "SE"}, backfill_days=30))
+    daemon = IngestDaemon([real], store, rate_limits={"ccee": 0}, clock=lambda: now["value"])
+    asyncio.run(daemon.run_once())
+
+    # Fonte indisponível no ciclo seguinte: o conector volta a simular
+    daemon.jobs = [IngestJob("ccee", {"submercado": "SE"}, backfill_days=30)]
+    now["value"] = datetime(2024, 4, 5, 12)
+    state = asyncio.run(daemon.run_once())["ccee_SE"]
+    assert state["simulated"] and state["stale"]
+    assert state["rows"] == 31
+    assert str(store.last_timestamp("ccee_SE").date()) == "2024-03-31"
+
+    # Série gravada com a marca de simulação (versões anteriores): ignorada pelo carregador
+    store.merge("ons_SE", IngestJob("ons", {"region": "SE"}).fetch("2024-03-01", "2024-03-31"))
+    assert store.read("ons_SE", "2024-03-01", "2024-03-31") is not None
+    assert _ingested(tmp_path, "ons", "2024-03-01", "2024-03-31", region="SE") is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""Testes básicos para as tarefas da interface executadas fora da thread do Tk."""
+import pytest
+import numpy as np
+from pathlib import Path
+import threading
+import time
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.viz.interface import prepare_dynamic_series, render_dynamic_plot
+from src.viz.offscreen import OffscreenPlot, clamp_xlim, pixel_to_x, zoom_xlim
+from src.viz.worker import BackgroundWorker
+
+class FakeRoot:
+    """Substitui o Tk: `after` apenas registra o polling, executado pelo teste."""
+
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, ms, func):
+        self.next_id += 1
+        self.pending[self.next_id] = func
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for func in pending.values():
+            func()
+
+def make_columns(n=10):
+    """Colunas de resultados sintéticas."""
+    rng = np.random.default_rng(0)
+    return {
+        "surplus_kwh": rng.uniform(0, 10, n),
+        "deficit_kwh": rng.uniform(0, 10, n),
+        "sell_revenue_brl": rng.uniform(0, 5, n),
+        "buy_cost_brl": rng.uniform(0, 5, n),
+        "net_profit_brl": rng.uniform(-5, 5, n),
+    }
+
+def test_prepare_dynamic_series():
+    """Teste das séries do gráfico dinâmico na ordem/filtro da tabela."""
+    columns = make_columns()
+    view = np.array([3, 1, 7])
+
+    data = prepare_dynamic_series(columns, view, "Excedente/Déficit")
+    (_, _, x, surplus), (_, _, _, deficit) = data["series"]
+    assert x.tolist() == [0, 1, 2]
+    assert surplus.tolist() == columns["surplus_kwh"][view].tolist()
+    assert deficit.tolist() == (-columns["deficit_kwh"][view]).tolist()
+
+    data = prepare_dynamic_series(columns, view, "Lucro Acumulado")
+    assert len(data["series"]) == 1
+    assert data["series"][0][3] == pytest.approx(np.cumsum(columns["net_profit_brl"][view]))
+
+def test_worker_coalesces_and_delivers_on_poll():
+    """Teste do worker: resultados só na thread que faz o polling, e só o mais recente por chave."""
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    gate = threading.Event()
+    received = []
+
+    worker.submit(gate.wait, callback=lambda result: received.append("bloqueio"))
+    for i in range(5):
+        worker.submit(lambda i=i: i, callback=received.append, key="plot")
+    worker.submit(lambda: "sem chave", callback=received.append)
+    gate.set()
+
+    deadline = time.time() + 5
+    while len(received) < 3 and time.time() < deadline:
+        root.run_pending()
+        time.sleep(0.01)
+    worker.shutdown()
+    assert received == ["bloqueio", 4, "sem chave"]
+    assert not root.pending
+
+def test_offscreen_render_and_zoom():
+    """Teste da renderização fora da tela: quadro no tamanho pedido e zoom re-decimado."""
+    n = 100_000
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 500.0)
+    y[54_321] = 5.0
+    plot = OffscreenPlot()
+    plot.set_series({"title": "Teste", "ylabel": "y", "series": [("seno", "blue", x, y)]})
+
+    frame = plot.render(400, 300)
+    assert frame["rgba"].shape == (300, 400, 4)
+    left, top, right, bottom = frame["axes_px"]
+    assert 0 <= left < right <= 400 and 0 <= top < bottom <= 300
+    line = plot.lines[0]
+    assert len(line.get_xdata()) <= 2 * 400 + 2
+    assert max(line.get_ydata()) == 5.0  # pico preservado pela decimação
+    assert not plot.lines[1].get_visible()
+
+    # Zoom: só o intervalo visível é decimado, com o eixo Y ajustado a ele
+    frame = plot.render(400, 300, xlim=(1000.0, 2000.0))
+    assert frame["xlim"] == (1000.0, 2000.0)
+    assert line.get_xdata()[0] >= 999 and line.get_xdata()[-1] <= 2001
+    assert plot.ax.get_ylim()[1] < 5.0
+
+def test_render_dynamic_plot_and_navigation():
+    """Teste do quadro entregue à interface e da conversão pixel -> dados."""
+    plot = OffscreenPlot()
+    columns = make_columns(50)
+    assert render_dynamic_plot(plot, (1, 1), None, (columns, np.arange(50), "Receitas/Custos")) is None
+
+    frame = render_dynamic_plot(plot, (320, 240))
+    assert frame["image"].size == (320, 240)
+    assert frame["bounds"] == (0.0, 49.0)
+    left, _, right, _ = frame["axes_px"]
+    assert pixel_to_x(frame, left) == pytest.approx(frame["xlim"][0])
+    assert pixel_to_x(frame, right) == pytest.approx(frame["xlim"][1])
+
+    assert zoom_xlim((0.0, 40.0), 10.0, 0.5) == (5.0, 25.0)
+    assert zoom_xlim((0.0, 40.0), 10.0, 2.0, bounds=(0.0, 49.0)) == (0.0, 49.0)
+    assert clamp_xlim((45.0, 55.0), (0.0, 49.0)) == (39.0, 49.0)
+    assert clamp_xlim((-5.0, 5.0), (0.0, 49.0)) == (0.0, 10.0)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,94 @@
+"""Testes básicos para o processamento out-of-core."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.partitioned import PartitionedDataset
+from src.data.synthetic import iter_site_chunks, simulate_sites
+from src.features.engineering import engineer_features, engineer_features_partitioned
+from src.models.consumption import ConsumptionForecaster
+from src.models.evaluate import backtest_partitioned
+
+def test_write_and_read_with_pushdown(tmp_path):
+    """Teste de particionamento por site/ano e leitura de um recorte."""
+    dataset = PartitionedDataset(tmp_path / "history")
+    rows = dataset.write_chunks(iter_site_chunks("2023-11-01", "2024-02-29", "D", n_sites=3, chunk_sites=2))
+
+    assert rows == 121 * 3
+    assert dataset.partitions() == [(s, y) for s in range(3) for y in (2023, 2024)]
+
+    df = dataset.read(start="2023-12-30", end="2024-01-02", sites=[1], columns=["consumption_kwh"])
+    assert list(df.columns) == ["site_id", "timestamp", "consumption_kwh"]
+    assert len(df) == 4 and (df["site_id"] == 1).all()
+
+def test_partitioned_features_match_in_memory(tmp_path):
+    """Teste dos estágios por partição: atributos iguais aos do histórico completo e backtest por site."""
+    source = PartitionedDataset(tmp_path / "history")
+    source.write_chunks(iter_site_chunks("2023-10-01", "2024-03-31", "D", n_sites=2))
+    output = PartitionedDataset(tmp_path / "features")
+
+    engineer_features_partitioned(source, output, "consumption_kwh")
+
+    full = simulate_sites("2023-10-01", "2024-03-31", "D", n_sites=2)
+    expected = engineer_features(full[full["site_id"] == 1], "consumption_kwh")
+    result = output.read(sites=[1])
+    for col in ["consumption_kwh_lag24", "consumption_kwh_rolling30_std", "temp_rolling7_mean"]:
+        np.testing.assert_allclose(result[col], expected[col], rtol=1e-5)
+
+    board = backtest_partitioned(source, lambda: ConsumptionForecaster(algo="baseline"), "consumption_kwh", n_folds=2)
+    assert board["site_id"].tolist() == [0, 1]
+    assert np.isfinite(board["score"]).all()
+
+def test_short_first_partition(tmp_path):
+    """Teste de uma primeira partição menor que o contexto (histórico iniciando em dezembro)."""
+    source = PartitionedDataset(tmp_path / "history")
+    source.write_chunks(iter_site_chunks("2023-12-10", "2024-02-29", "D", n_sites=1))
+    output = PartitionedDataset(tmp_path / "features")
+
+    engineer_features_partitioned(source, output, "consumption_kwh")
+
+    expected = engineer_features(simulate_sites("2023-12-10", "2024-02-29", "D", n_sites=1), "consumption_kwh")
+    result = output.read()
+    assert len(result) == len(expected)
+    for col in ["consumption_kwh_lag14", "consumption_kwh_lag24", "consumption_kwh_rolling30_mean"]:
+        np.testing.assert_allclose(result[col], expected[col], rtol=1e-5)
+
+def test_grouped_features_match_per_site():
+    """Teste de lags e janelas por site: nenhum atributo atravessa sites."""
+    full = simulate_sites("2024-01-01", "2024-02-29", "D", n_sites=3)
+    features = engineer_features(full.sample(frac=1, random_state=0), "consumption_kwh", groupby="site_id")
+
+    for site_id in range(3):
+        expected = engineer_features(full[full["site_id"] == site_id], "consumption_kwh")
+        result = features[features["site_id"] == site_id].reset_index(drop=True)
+        for col in ["consumption_kwh_lag1", "consumption_kwh_rolling30_std", "ghi_lag1", "temp_rolling7_mean"]:
+            np.testing.assert_allclose(result[col], expected[col], rtol=1e-5)
+        assert np.isnan(result["consumption_kwh_lag1"].iloc[0])
+
+def test_pipeline_out_of_core(tmp_path, monkeypatch):
+    """Teste do pipeline com --out-of-core: mesmo resultado do processamento em memória."""
+    import run_pipeline
+
+    monkeypatch.chdir(tmp_path)
+    base = ["run_pipeline.py", "--no-gui", "--train-start", "2024-01-01", "--train-end", "2024-03-31",
+            "--horizon", "7", "--set", "model.algo_consumption=baseline", "--set", "model.algo_production=baseline"]
+    for name, extra in (("memory", []), ("ooc", ["--out-of-core"])):
+        monkeypatch.setattr(sys, "argv", base + ["--output-dir", name] + extra)
+        assert run_pipeline.main() == 0
+
+    history = PartitionedDataset(tmp_path / "ooc" / "partitioned" / "history")
+    assert history.partitions() == [(0, 2024)]
+    assert PartitionedDataset(tmp_path / "ooc" / "partitioned" / "features").exists()
+    metrics = pd.read_json(tmp_path / "ooc" / "metrics.jsonl", lines=True)
+    assert set(metrics.query("group == 'backtest'")["series"]) == {"consumption", "production"}
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "ooc" / "forecast_results.csv"),
+        pd.read_csv(tmp_path / "memory" / "forecast_results.csv")
+    )
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+"""Testes básicos para a exportação e a renderização adiada de gráficos."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from src.viz.plots import PLOT_CONFIG, PlotQueue, configure_plots
+
+@pytest.fixture(autouse=True)
+def restore_plot_config():
+    """Restaura a configuração global de exportação após cada teste."""
+    saved = dict(PLOT_CONFIG)
+    yield
+    PLOT_CONFIG.clear()
+    PLOT_CONFIG.update(saved)
+    plt.close("all")
+
+def make_pld(n=30):
+    """PLD diário sintético."""
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n, freq="D"),
+        "pld_brl_mwh": np.linspace(100.0, 200.0, n)
+    })
+
+def test_configure_plots():
+    """Teste das opções de exportação (None mantém o valor vigente)."""
+    config = configure_plots(dpi=50, tight_bbox=False, decimation="none")
+    assert config["dpi"] == 50
+    assert config["bbox_inches"] is None
+    assert config["decimation"] is None
+
+    config["dpi"] = 1  # cópia: não altera a configuração vigente
+    assert configure_plots()["dpi"] == 50
+    assert configure_plots(tight_bbox=True, decimation="lttb")["bbox_inches"] == "tight"
+    assert PLOT_CONFIG["decimation"] == "lttb"
+
+def test_queue_renders_and_closes_figures(tmp_path):
+    """Teste da fila: gráficos desconhecidos rejeitados, renderização sem figuras abertas."""
+    configure_plots(dpi=30)
+    queue = PlotQueue()
+    with pytest.raises(ValueError):
+        queue.add("histograma", tmp_path / "x.png")
+
+    queue.add("pld_timeseries", tmp_path / "pld.png", make_pld())
+    queue.add("cumulative_profit", tmp_path / "lucro.png", pd.DataFrame({"net_profit_brl": [1.0, -2.0, 3.0]}))
+    paths = queue.render(workers=1)
+
+    assert paths == [str(tmp_path / "pld.png"), str(tmp_path / "lucro.png")]
+    assert all(Path(path).stat().st_size > 0 for path in paths)
+    assert plt.get_fignums() == []
+
+def test_dump_and_load(tmp_path, monkeypatch):
+    """Teste do arquivo de gráficos adiados: caminhos relativos e configuração restaurada."""
+    out_dir = tmp_path / "results"
+    out_dir.mkdir()
+    configure_plots(dpi=40)
+    queue = PlotQueue()
+    queue.add("pld_timeseries", out_dir / "pld_a.png", make_pld(), title="A")
+    queue.add("pld_timeseries", out_dir / "pld_b.png", make_pld(60), title="B")
+    jobs_path = queue.dump(out_dir / "plot_jobs.pkl")
+    assert not list(out_dir.glob("*.png"))
+
+    # Renderização a partir de outro diretório (diretório movido) e com outra configuração
+    moved = tmp_path / "moved"
+    out_dir.rename(moved)
+    monkeypatch.chdir(tmp_path)
+    configure_plots(dpi=300)
+
+    loaded = PlotQueue.load(moved / jobs_path.name)
+    assert PLOT_CONFIG["dpi"] == 40
+    assert [job["kwargs"] for job in loaded.jobs] == [{"title": "A"}, {"title": "B"}]
+    paths = loaded.render(workers=2)
+    assert sorted(Path(path).name for path in paths) == ["pld_a.png", "pld_b.png"]
+    assert all(Path(path).parent == moved for path in paths)
+    assert all(Path(path).exists() for path in paths)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,178 @@
+"""Testes básicos para o modo carteira."""
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.models.selection as selection_module
+from src.data.synthetic import make_timestamps, simulate_site
+from src.data.dtypes import apply_dtypes
+from src.data.handoff import to_arrow
+from src.portfolio.runner import AGGREGATE_COLS, forecast_site, load_sites, plan_batches, results_schema, run_portfolio
+
+def test_batches_keep_cells_together(tmp_path):
+    """Teste de aliases da tabela de sites e de lotes sem separar células."""
+    pd.DataFrame({
+        "id": range(6),
+        "lat": [-23.51, -23.52, -23.53, -10.1, -10.2, -5.0],
+        "lon": [-46.61, -46.62, -46.63, -40.1, -40.2, -38.0],
+        "submercado": ["SE", "SE", "SE", "NE", "NE", "NE"],
+        "capacity": [10.0, 20.0, 30.0, 10.0, 10.0, 10.0]
+    }).to_csv(tmp_path / "sites.csv", index=False)
+
+    sites = load_sites(tmp_path / "sites.csv")
+    assert sites["base_kwh_day"].tolist()[:3] == [40.0, 80.0, 120.0]
+
+    batches = list(plan_batches(sites, batch_size=3, resolution_deg=0.25))
+    assert [len(b) for b in batches] == [3, 3]
+    # Sites da mesma célula ficam no mesmo lote (clima carregado uma vez)
+    groups = [set(b["site_id"]) for b in batches]
+    assert {0, 1, 2} in groups
+    assert any({3, 4} <= group for group in groups)
+    assert sorted(pd.concat(batches)["site_id"]) == list(range(6))
+
+def test_site_selection_is_cached(tmp_path, monkeypatch):
+    """Teste da seleção "auto" por site: reaproveitada do cache dentro do TTL."""
+    calls = []
+    select_algo = selection_module.select_algo
+    monkeypatch.setattr(selection_module, "select_algo", lambda *args, **kwargs: calls.append(args[1]) or select_algo(*args, **kwargs))
+    settings = {
+        "algo_consumption": "auto",
+        "algo_production": "auto",
+        "selection": {"candidates": ["seasonal_naive", "baseline"], "folds": 2},
+        "selection_dir": tmp_path / "selection",
+        "finance": {},
+        "decisions": {}
+    }
+    df = simulate_site(make_timestamps("2024-01-01", "2024-04-30"), site_id=3)
+
+    for _ in range(2):
+        forecast_site(df, 7, settings, site_id=3)
+    forecast_site(df, 7, settings, site_id=4)
+
+    assert calls == ["consumption", "production", "consumption", "production"]
+    assert (tmp_path / "selection" / "site_3.json").exists()
+
+def test_writer_schema_is_pinned(tmp_path):
+    """Teste do esquema de gravação: lote só com inteiros seguido de frações."""
+    import pyarrow.parquet as pq
+
+    def batch(site_id, value):
+        df = pd.DataFrame({
+            "site_id": [site_id] * 2,
+            "submercado": ["SE", "SE"],
+            **{col: [value, value] for col in AGGREGATE_COLS},
+            "decision": ["sell", "buy"],
+            "pld_brl_mwh": [100.0, 120.5],
+            "timestamp": make_timestamps("2024-01-01", "2024-01-02", "D")
+        })
+        return to_arrow(apply_dtypes(df))
+
+    first, second = batch(1, 0), batch(2, 1.25)
+    assert str(first.schema.field("deficit_kwh").type) == "int64"
+
+    schema = results_schema().with_metadata(first.schema.metadata)
+    with pq.ParquetWriter(tmp_path / "sites.parquet", schema) as writer:
+        for table in (first, second):
+            writer.write_table(table.select(schema.names).cast(schema))
+
+    result = pd.read_parquet(tmp_path / "sites.parquet")
+    assert result["deficit_kwh"].tolist() == [0.0, 0.0, 1.25, 1.25]
+    assert result["net_profit_brl"].dtype == "float64"
+    assert result["deficit_kwh"].dtype == "float32"
+
+def test_run_portfolio_in_batches(tmp_path):
+    """Teste da carteira em dois lotes: gravação incremental e agregado por submercado."""
+    sites = pd.DataFrame({
+        "site_id": [1, 2, 3, 4],
+        "lat": [-23.2, -23.9, -8.1, -8.2],
+        "lon": [-46.2, -46.9, -35.1, -35.2],
+        "submercado": ["SE", "SE", "NE", "NE"],
+        "capacity_kwp": [10.0, 20.0, 10.0, 5.0],
+        "base_kwh_day": [40.0, 80.0, 40.0, 20.0]
+    })
+    config = {"model": {"algo_consumption": "baseline", "algo_production": "baseline"}}
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+
+    summary = run_portfolio(
+        sites, "2024-01-01", "2024-03-31", 3, tmp_path / "results", config,
+        cache_dir, workers=1, batch_size=2, grid_resolution_deg=1.0
+    )
+    assert summary["n_sites"] == 4 and summary["n_failed"] == 0
+    # Grade de 1°: os sites de cada submercado compartilham a célula e a série de clima
+    assert summary["n_cells"] == 2
+    assert sorted(path.name.split("_")[1] for path in cache_dir.glob("pvgis_*")) == ["-23.5", "-8.5"]
+
+    results = pd.read_parquet(summary["sites_path"])
+    assert sorted(results["site_id"].unique()) == [1, 2, 3, 4]
+    assert len(results) == 4 * 3
+
+    aggregate = pd.read_csv(summary["aggregate_path"])
+    assert len(aggregate) == 2 * 3
+    assert (aggregate["n_sites"] == 2).all()
+    totals = results.groupby("submercado", observed=True)["production_kwh"].sum()
+    assert aggregate.groupby("submercado")["production_kwh"].sum().to_dict() == pytest.approx(totals.to_dict(), rel=1e-5)
+
+def test_site_params_resolved_like_pipeline(monkeypatch):
+    """Teste de que o site usa o ajuste da região e as próprias coordenadas no modelo físico."""
+    import src.portfolio.runner as runner
+
+    created = []
+
+    class RecordingForecaster(runner.ProductionForecaster):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(runner, "ProductionForecaster", RecordingForecaster)
+    settings = {
+        "algo_consumption": "baseline",
+        "algo_production": "baseline",
+        "tuned": {"NE": {"production": {"algo": "physical", "params": {"window": 30, "dc_ac_ratio": 1.1}}}},
+        "finance": {},
+        "decisions": {}
+    }
+    df = simulate_site(make_timestamps("2024-01-01", "2024-03-31"), site_id=5, lat=-8.1)
+
+    forecast_site(df, 7, settings, site_id=5, region="NE", location=(-8.1, -35.1))
+    forecast_site(df, 7, settings, site_id=6, region="SE", location=(-23.5, -46.6))
+
+    tuned, default = created
+    assert tuned.algo == "physical"
+    assert tuned.get_params()["lat"] == -8.1 and tuned.get_params()["dc_ac_ratio"] == 1.1
+    assert tuned.model["lat"] == -8.1 and tuned.model["lon"] == -35.1
+    assert default.algo == "baseline" and default.params == {}
+
+def test_portfolio_run_recorded(tmp_path, monkeypatch):
+    """Teste de que a execução da carteira pelo pipeline fica no store de execuções."""
+    import run_pipeline
+    from src.data.store import RunStore
+
+    pd.DataFrame({
+        "site_id": [1, 2],
+        "lat": [-23.5, -23.6],
+        "lon": [-46.6, -46.7],
+        "submercado": ["SE", "SE"],
+        "capacity_kwp": [10.0, 20.0]
+    }).to_csv(tmp_path / "sites.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [
+        "run_pipeline.py", "--no-gui", "--sites", "sites.csv", "--horizon", "3", "--scenario", "carteira",
+        "--train-start", "2024-01-01", "--train-end", "2024-03-31",
+        "--set", "model.algo_consumption=baseline", "--set", "model.algo_production=baseline"
+    ])
+    assert run_pipeline.main() == 0
+
+    store = RunStore(tmp_path / "results" / "run_store")
+    runs = store.runs()
+    assert runs[["scenario", "region"]].values.tolist() == [["carteira", "portfolio"]]
+    forecasts = store.read("forecasts")
+    assert len(forecasts) == 3 and (forecasts["n_sites"] == 2).all()
+    metrics = store.read("metrics")
+    assert metrics.query("group == 'portfolio' and name == 'n_sites'")["value"].tolist() == [2.0]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
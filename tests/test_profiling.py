@@ -0,0 +1,90 @@
+"""Testes básicos para a instrumentação de etapas."""
+import logging
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.profiling import Profiler, profiler, instrument, compare_profiles
+
+def test_profiler_nested_stages():
+    """Teste de etapas aninhadas com contagem de linhas."""
+    prof = Profiler().configure(enabled=False)
+    
+    with prof.stage("outer") as info:
+        prof.begin("inner")
+        prof.end(rows=10)
+        info["rows"] = 20
+    
+    stages = {r["stage"]: r for r in prof.records}
+    assert set(stages) == {"outer", "outer/inner"}
+    assert stages["outer/inner"]["rows"] == 10
+    assert stages["outer"]["wall_s"] >= stages["outer/inner"]["wall_s"]
+
+def test_instrument_only_records_when_enabled():
+    """Teste do decorator: sem registros com a instrumentação desabilitada."""
+    @instrument("fake.fetch")
+    def fetch():
+        return pd.DataFrame({"a": range(5)})
+    
+    profiler.configure(enabled=False)
+    fetch()
+    assert profiler.records == []
+    
+    profiler.configure(enabled=True, trace_memory=False)
+    fetch()
+    records = list(profiler.records)
+    profiler.configure(enabled=False)
+    
+    assert [(r["stage"], r["rows"]) for r in records] == [("fake.fetch", 5)]
+
+def test_compare_profiles_flags_regression():
+    """Teste da detecção de regressão acima do limiar."""
+    baseline = pd.DataFrame({"stage": ["a", "b"], "wall_s": [1.0, 1.0], "cpu_s": [1.0, 1.0]})
+    current = pd.DataFrame({"stage": ["a", "b"], "wall_s": [1.05, 1.5], "cpu_s": [1.0, 1.0]})
+    
+    result = compare_profiles(baseline, current, threshold=0.10).set_index("stage")
+    
+    assert not result.loc["a", "regression"]
+    assert result.loc["b", "regression"]
+
+def test_log_file_attached_after_first_configure(tmp_path):
+    """Teste do arquivo de log: associado mesmo com o logger já configurado."""
+    @instrument("fake.stage")
+    def stage():
+        return None
+    
+    first, second = tmp_path / "a" / "profile.jsonl", tmp_path / "b" / "profile.jsonl"
+    profiler.configure(enabled=True, trace_memory=False)
+    profiler.configure(enabled=True, trace_memory=False, log_file=first)
+    stage()
+    profiler.configure(enabled=True, trace_memory=False, log_file=second, run_id="r2")
+    profiler.configure(enabled=True, trace_memory=False, log_file=second, run_id="r2")
+    stage()
+    profiler.configure(enabled=False)
+    
+    assert len(first.read_text(encoding="utf-8").splitlines()) == 1
+    lines = second.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1 and '"run_id": "r2"' in lines[0]
+
+def test_records_not_printed_to_console(tmp_path, capsys):
+    """Teste do console: registros de perfil vão apenas para o arquivo."""
+    @instrument("fake.stage")
+    def stage():
+        return None
+    
+    log_file = tmp_path / "profile.jsonl"
+    logging.getLogger("energy_forecast.profiling").addHandler(logging.StreamHandler(sys.stdout))
+    profiler.configure(enabled=True, trace_memory=False)
+    stage()
+    profiler.configure(enabled=True, trace_memory=False, log_file=log_file)
+    stage()
+    profiler.configure(enabled=False)
+    
+    assert capsys.readouterr().out == ""
+    assert len(log_file.read_text(encoding="utf-8").splitlines()) == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -63,6 +63,20 @@ def test_profit_calculator_decisions():
     assert results.iloc[1]['decision'] == 'Comprar'  # Déficit
     assert results.iloc[2]['decision'] == 'Comprar'  # Déficit
 
+def test_profit_float32_inputs_use_float64():
+    """Teste de que previsões e PLD em float32 são calculados em float64."""
+    calculator = ProfitCalculator(cost_rate=0.10, use_pld=True)
+    consumption = pd.Series([100.1, 80.3], dtype=np.float32)
+    production = pd.Series([130.7, 70.9], dtype=np.float32)
+    pld = pd.Series([250.7, 301.3], dtype=np.float32)
+
+    results = calculator.calculate(consumption, production, pld_brl_mwh=pld)
+
+    c, p, price = (s.to_numpy(dtype=np.float64) for s in (consumption, production, pld))
+    assert results["net_profit_brl"].dtype == np.float64
+    assert results["sell_revenue_brl"].iloc[0] == (p[0] - c[0]) * (price[0] / 1000 * 0.9)
+    assert results["buy_cost_brl"].iloc[1] == (c[1] - p[1]) * (price[1] / 1000 * 1.1)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,50 @@
+"""Testes básicos para a seleção automática de algoritmo."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.schemas import SelectionConfig
+from src.models.consumption import ConsumptionForecaster
+from src.models.selection import SelectionCache, choose_algo, select_algo
+
+@pytest.fixture
+def weekly_df():
+    """Consumo com forte sazonalidade semanal."""
+    dates = pd.date_range(start="2024-01-01", periods=120, freq="D")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "timestamp": dates,
+        "consumption_kwh": 100 + 30 * (dates.dayofweek >= 5) + rng.normal(0, 1, 120)
+    })
+
+def test_seasonal_naive_and_selection(weekly_df):
+    """Teste do sazonal ingênuo e da escolha pelo leaderboard."""
+    model = ConsumptionForecaster(algo="seasonal_naive").fit(weekly_df)
+    predictions = model.predict(horizon=14)
+    assert len(predictions) == 14
+    np.testing.assert_allclose(predictions.values[:7], weekly_df["consumption_kwh"].tail(7).values)
+
+    result = select_algo(weekly_df, "consumption", SelectionConfig(candidates=["baseline", "seasonal_naive"]))
+    assert result["algo"] == "seasonal_naive"
+    assert [row["algo"] for row in result["leaderboard"]][0] == "seasonal_naive"
+
+def test_selection_cache_ttl(weekly_df, tmp_path):
+    """Teste da reutilização da escolha em cache até expirar."""
+    now = [1000.0]
+    cache = SelectionCache(tmp_path / "selection.json", ttl_hours=1, clock=lambda: now[0])
+    selection = SelectionConfig(candidates=["baseline", "seasonal_naive"])
+
+    first = choose_algo(weekly_df, "SE", "consumption", selection, cache)
+    assert first["cached"] is False
+    assert choose_algo(weekly_df, "SE", "consumption", selection, cache)["cached"] is True
+    assert choose_algo(weekly_df, "NE", "consumption", selection, cache)["cached"] is False
+
+    now[0] += 2 * 3600
+    assert choose_algo(weekly_df, "SE", "consumption", selection, cache)["cached"] is False
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
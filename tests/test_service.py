@@ -0,0 +1,108 @@
+"""Testes básicos para o registro de modelos e o serviço de previsão."""
+import json
+import threading
+import urllib.request
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.consumption import ConsumptionForecaster
+from src.models.production import ProductionForecaster
+from src.models.registry import ModelRegistry
+from src.service.server import ForecastService, ServiceError, create_server
+
+@pytest.fixture
+def service(tmp_path):
+    """Serviço com modelos baseline registrados para a região SE."""
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=60, freq="D"),
+        "consumption_kwh": [100.0 + i % 7 for i in range(60)],
+        "production_kwh": [110.0 + i % 5 for i in range(60)]
+    })
+    models = {
+        "consumption": ConsumptionForecaster(algo="baseline").fit(df),
+        "production": ProductionForecaster(algo="baseline").fit(df)
+    }
+    registry = ModelRegistry(tmp_path)
+    registry.register("SE", "v1", models, context={"pld_mean": 250.0, "last_timestamp": "2024-02-29"})
+
+    service = ForecastService(registry, cache_size=8)
+    assert service.warm_up() == ["SE"]
+    return service
+
+def test_query_and_cache(service):
+    """Teste de consulta, acerto de cache e região desconhecida."""
+    first = service.query("profit", {"region": "SE", "horizon": "5"})
+    assert len(first["net_profit_brl"]) == 5
+    assert first["timestamp"][0] == "2024-03-01"
+
+    assert service.query("profit", {"region": "SE", "horizon": 5}) is first
+    assert service.stats["cache_hits"] == 1
+
+    with pytest.raises(ServiceError) as exc:
+        service.query("forecast", {"region": "NE"})
+    assert exc.value.status == 404
+
+def test_batch_shares_prediction(service):
+    """Teste de que o lote usa uma previsão por região e isola erros."""
+    results = service.query_batch("forecast", [
+        {"region": "SE", "horizon": 3},
+        {"region": "SE", "horizon": 10},
+        {"region": "NE", "horizon": 3}
+    ])
+    assert len(results[0]["consumption_kwh"]) == 3
+    assert results[1]["production_kwh"][:3] == results[0]["production_kwh"]
+    assert results[2]["status"] == 404
+
+def test_http_timing_does_not_touch_cache(service):
+    """Teste de que `elapsed_ms` vai só na resposta, não no resultado em cache."""
+    server = create_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/profit?region=SE&horizon=4"
+        for _ in range(2):
+            with urllib.request.urlopen(url) as response:
+                assert "elapsed_ms" in json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    cached = service.query("profit", {"region": "SE", "horizon": 4})
+    assert service.stats["cache_hits"] == 2
+    assert "elapsed_ms" not in cached
+
+def test_concurrent_predictions_are_deterministic(service):
+    """Teste de que consultas simultâneas (sem cache) retornam a mesma previsão."""
+    service.cache_size = 0
+    results = []
+
+    def worker():
+        for _ in range(5):
+            results.append(service.query("forecast", {"region": "SE", "horizon": 7})["production_kwh"])
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 40
+    assert all(result == results[0] for result in results)
+
+def test_reused_models_follow_pipeline_data_end(service):
+    """Teste do contexto atualizado quando o pipeline reutiliza os modelos."""
+    registry = service.registry
+    models = registry.load("SE")["models"]
+    registry.update_context("SE", {"last_timestamp": "2024-03-03", "offset": 3})
+    assert service.warm_up() == ["SE"]
+
+    response = service.query("forecast", {"region": "SE", "horizon": 4})
+    assert response["timestamp"][0] == "2024-03-04"
+    expected = models["consumption"].predict(7).iloc[3:].round(4).tolist()
+    assert response["consumption_kwh"] == expected
+    assert registry.load("SE")["context"]["pld_mean"] == 250.0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,56 @@
+"""Testes básicos para o modelo físico fotovoltaico."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.solar import pv_energy, solar_position
+from src.data.synthetic import make_timestamps, simulate_site
+from src.features.engineering import engineer_features
+from src.models.production import ProductionForecaster
+
+def test_vectorized_year_many_sites():
+    """Teste de um ano horário para 1.000 sites (tempo, forma, noite e clipping)."""
+    timestamps = make_timestamps("2023-01-01", "2023-12-31 23:00", "h")
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(-33, 5, 1000), rng.uniform(-73, -35, 1000)
+
+    start = time.perf_counter()
+    energy = pv_energy(timestamps, lats, lons)
+    elapsed = time.perf_counter() - start
+
+    assert energy.shape == (8760, 1000)
+    assert elapsed < 10
+    assert (energy >= 0).all() and energy.max() <= 1 / 1.2 + 1e-9
+    night = solar_position(timestamps, lats, lons)["cos_zenith"] == 0
+    assert (energy[night] == 0).all()
+    # Céu claro: produtividade anual plausível para o Brasil (kWh/kWp)
+    assert 1500 < energy.sum(axis=0).min() and energy.sum(axis=0).max() < 2400
+    # Um site escalar é a coluna correspondente do cálculo vetorizado
+    np.testing.assert_allclose(pv_energy(timestamps, lats[3], lons[3]), energy[:, 3])
+
+def test_physical_forecaster_and_features():
+    """Teste do modelo físico como previsão (calibrado no histórico) e como feature."""
+    df = simulate_site(make_timestamps("2023-01-01", "2024-06-30", "D"), capacity_kwp=25.0)
+    train, test = df.iloc[:-14], df.iloc[-14:]
+    exog_cols = ["ghi_wm2", "temp_c"]
+
+    physical = ProductionForecaster("physical").fit(train, exog_cols=exog_cols)
+    baseline = ProductionForecaster("baseline").fit(train, exog_cols=exog_cols)
+    mae = lambda model: np.abs(model.predict(14, exog=test[exog_cols]).to_numpy() - test["production_kwh"].to_numpy()).mean()
+
+    assert 10 < physical.model["capacity_kwp"] < 30
+    assert mae(physical) < mae(baseline)
+    assert len(ProductionForecaster("physical").fit(train).predict(14)) == 14
+
+    features = engineer_features(df, "production_kwh", location=(-23.55, -46.63))
+    for col in ("clearsky_ghi_wm2", "clearsky_index", "pv_kwh_per_kwp"):
+        assert col in features.columns
+    assert features["pv_kwh_per_kwp"].corr(features["production_kwh"]) > 0.9
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,39 @@
+"""Testes básicos para o índice espacial de clima."""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.spatial import INMET_STATIONS, StationIndex, idw_blend, snap_to_grid
+
+def test_nearest_matches_haversine():
+    """Teste de que o KD-tree retorna as estações da busca exaustiva."""
+    lat, lon = -21.0, -44.0
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    st_lat, st_lon = np.radians(INMET_STATIONS["lat"]), np.radians(INMET_STATIONS["lon"])
+    hav = np.sin((st_lat - lat_r) / 2) ** 2 + np.cos(lat_r) * np.cos(st_lat) * np.sin((st_lon - lon_r) / 2) ** 2
+    expected_km = 2 * 6371.0 * np.arcsin(np.sqrt(hav))
+
+    stations = StationIndex().nearest(lat, lon, k=3)
+    order = np.argsort(expected_km.to_numpy())[:3]
+    assert stations["station_id"].tolist() == INMET_STATIONS["station_id"].iloc[order].tolist()
+    np.testing.assert_allclose(stations["distance_km"], expected_km.iloc[order], rtol=1e-6)
+    assert stations["weight"].is_monotonic_decreasing
+    assert stations["weight"].sum() == pytest.approx(1.0)
+
+def test_grid_and_blend():
+    """Teste de células compartilhadas e da média ponderada com faltantes."""
+    assert snap_to_grid(-23.5505, -46.6333) == snap_to_grid(-23.60, -46.70)
+    assert snap_to_grid(-23.5505, -46.6333) != snap_to_grid(-23.80, -46.70)
+
+    ts = pd.date_range("2024-01-01", periods=2, freq="D")
+    a = pd.DataFrame({"timestamp": ts, "ghi_wm2": [100.0, np.nan]})
+    b = pd.DataFrame({"timestamp": ts, "ghi_wm2": [200.0, 400.0]})
+    blended = idw_blend([a, b], np.array([0.75, 0.25]))
+    assert blended["ghi_wm2"].tolist() == [125.0, 400.0]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
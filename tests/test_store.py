@@ -0,0 +1,55 @@
+"""Testes básicos para o store colunar de execuções."""
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.store import RunStore, new_run_id
+from src.finance.profit import ProfitCalculator, summarize_results
+
+def _write_run(store, scenario, region="SE"):
+    results = ProfitCalculator().calculate(pd.Series([100, 120]), pd.Series([110, 100]))
+    metrics = pd.DataFrame([
+        {"group": "financial", "series": "total", "name": k, "value": v}
+        for k, v in summarize_results(results).items()
+    ])
+    run_id = new_run_id()
+    store.write_run(run_id, scenario, region, results, metrics, params={"horizon": 2})
+    return run_id
+
+def test_run_store_roundtrip(tmp_path):
+    """Teste de gravação e leitura filtrada por cenário."""
+    store = RunStore(tmp_path)
+    _write_run(store, "01_baseline")
+    _write_run(store, "05_regiao_ne", region="NE")
+
+    forecasts = store.read("forecasts", filters={"scenario": "05_regiao_ne"})
+
+    assert len(forecasts) == 2
+    assert set(forecasts["region"]) == {"NE"}
+    assert "decision" in forecasts.columns
+
+def test_run_store_compare_latest(tmp_path):
+    """Teste da comparação usando apenas a execução mais recente por cenário."""
+    store = RunStore(tmp_path)
+    _write_run(store, "01_baseline")
+    latest = _write_run(store, "01_baseline")
+
+    comparison = store.compare(group="financial")
+
+    assert list(comparison["run_id"]) == [latest]
+    assert comparison["total.decisions_vender"].iloc[0] == 1
+
+def test_run_store_is_append_only(tmp_path):
+    """Teste de que uma execução não pode ser regravada."""
+    store = RunStore(tmp_path)
+    df = pd.DataFrame({"value": [1.0]})
+    store.append("metrics", df, "run-1", "s", "SE")
+
+    with pytest.raises(FileExistsError):
+        store.append("metrics", df, "run-1", "s", "SE")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
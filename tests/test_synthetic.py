@@ -0,0 +1,64 @@
+"""Testes básicos para o gerador de dados sintéticos."""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.synthetic import iter_site_chunks, make_timestamps, simulate_grid_load, simulate_pld, simulate_sites, write_parquet
+
+def test_sites_are_independent_of_chunking():
+    """Teste de que o resultado não depende do tamanho dos blocos."""
+    full = simulate_sites("2024-01-01", "2024-01-10", freq="h", n_sites=4)
+    chunked = pd.concat(
+        iter_site_chunks("2024-01-01", "2024-01-10", freq="h", n_sites=4, chunk_sites=1),
+        ignore_index=True
+    )
+
+    pd.testing.assert_frame_equal(full, chunked)
+
+def test_overlapping_windows_match():
+    """Teste de que a mesma data tem os mesmos valores em janelas diferentes."""
+    for freq, first, second in [
+        ("D", ("2023-12-01", "2024-06-30"), ("2024-01-15", "2024-07-03")),
+        ("h", ("2024-01-01", "2024-01-20 23:00"), ("2024-01-10", "2024-02-05 23:00")),
+    ]:
+        a = simulate_sites(*first, freq=freq, n_sites=2)
+        b = simulate_sites(*second, freq=freq, n_sites=2)
+        merged = a.merge(b, on=["site_id", "timestamp"])
+        assert len(merged) > 0
+        for col in ("consumption_kwh", "production_kwh", "pld_brl_mwh", "ghi_wm2", "temp_c", "wind_ms"):
+            np.testing.assert_array_equal(merged[f"{col}_x"], merged[f"{col}_y"])
+
+def test_hourly_profiles_are_realistic():
+    """Teste do perfil diurno solar e da consistência diário vs horário."""
+    hourly = simulate_sites("2024-01-01", "2024-12-31 23:00", freq="h", n_sites=1)
+    daily = simulate_sites("2024-01-01", "2024-12-31", freq="D", n_sites=1)
+    by_hour = hourly.groupby(hourly["timestamp"].dt.hour)["production_kwh"].mean()
+
+    assert by_hour.loc[0] == 0 and by_hour.loc[12] > 0
+    assert np.isclose(hourly["production_kwh"].sum(), daily["production_kwh"].sum(), rtol=0.1)
+    assert np.isclose(hourly["consumption_kwh"].sum(), daily["consumption_kwh"].sum(), rtol=0.05)
+
+def test_region_codes():
+    """Teste do Centro-Oeste (submercado SE/CO) e de códigos desconhecidos."""
+    timestamps = make_timestamps("2024-01-01", "2024-01-31")
+    np.testing.assert_array_equal(simulate_pld(timestamps, "CO"), simulate_pld(timestamps, "SE"))
+    assert len(simulate_grid_load(timestamps, "CO")) == 31
+    with pytest.raises(ValueError, match="desconhecido"):
+        simulate_pld(timestamps, "XX")
+
+def test_write_parquet_in_chunks(tmp_path):
+    """Teste da gravação em blocos (um row group por bloco)."""
+    import pyarrow.parquet as pq
+    path = tmp_path / "carga.parquet"
+
+    rows = write_parquet(path, "2024-01-01", "2024-01-31", freq="D", n_sites=5, chunk_sites=2)
+
+    assert rows == 31 * 5
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
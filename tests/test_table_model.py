@@ -0,0 +1,46 @@
+"""Testes básicos para o modelo da tabela virtualizada."""
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.viz.table_model import TableModel
+
+@pytest.fixture
+def results_df():
+    """Resultados fictícios com colunas numéricas, texto e data."""
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=6, freq="D"),
+        "net_profit_brl": [5.0, -2.0, 8.0, 0.0, 3.0, -1.0],
+        "decision": ["Vender", "Comprar", "Vender", "Neutro", "Vender", "Comprar"]
+    })
+
+def test_sort_and_filter_match_pandas(results_df):
+    """Teste de que ordenação + filtro equivalem às operações do pandas."""
+    model = TableModel(results_df)
+    model.sort("net_profit_brl", descending=True)
+    model.filter_equals("decision", "Vender")
+
+    expected = results_df[results_df["decision"] == "Vender"].sort_values("net_profit_brl", ascending=False)
+    pd.testing.assert_frame_equal(model.to_frame(), expected)
+
+    model.set_filter(None)
+    model.sort("decision")
+    assert list(model.to_frame()["decision"]) == sorted(results_df["decision"])
+
+def test_rows_formats_only_requested_window(results_df):
+    """Teste da formatação da janela visível."""
+    model = TableModel(results_df)
+    model.sort("net_profit_brl")
+
+    rows = model.rows(0, 2)
+
+    assert rows == [["2024-01-02 00:00:00", "-2.0", "Comprar"], ["2024-01-06 00:00:00", "-1.0", "Comprar"]]
+    model.filter_equals("decision", "Inexistente")
+    assert len(model) == 0 and model.rows(0, 10) == []
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,72 @@
+"""Testes básicos para o alinhamento de fuso horário."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.dtypes import apply_dtypes
+from src.data.ingest import IngestStore
+from src.data.loader import prepare_data
+from src.data.loader import load_data_with_fallback
+from src.data.synthetic import make_timestamps
+from src.data.timezones import PROJECT_TZ, SOURCE_TZ, _aligned_range, align_timestamps
+
+def test_hourly_sources_align():
+    """Teste de join horário: UTC (INMET) e horário de Brasília (CCEE) no mesmo instante."""
+    local = pd.date_range("2024-01-01", periods=48, freq="h")
+    pld = pd.DataFrame({"timestamp": local, "pld_brl_mwh": np.arange(48.0)})
+    climate = pd.DataFrame({"timestamp": local + pd.Timedelta(hours=3), "temp_c": np.arange(48.0)})
+    apply_dtypes(pld, tz=PROJECT_TZ, source_tz=SOURCE_TZ["ccee"])
+    apply_dtypes(climate, tz=PROJECT_TZ, source_tz=SOURCE_TZ["inmet"])
+
+    consumption = pd.DataFrame({"timestamp": pld["timestamp"], "consumption_kwh": 1.0})
+    production = pd.DataFrame({"timestamp": pld["timestamp"], "production_kwh": 1.0})
+    combined = prepare_data(consumption, production, pld, climate)
+
+    assert str(combined["timestamp"].dt.tz) == PROJECT_TZ
+    assert len(combined) == 48
+    np.testing.assert_array_equal(combined["pld_brl_mwh"], combined["temp_c"])
+
+def test_daily_labels_and_cache():
+    """Teste de séries diárias (dias civis, sem deslocamento) e do cache da conversão."""
+    _aligned_range.cache_clear()
+    dates = pd.Series(pd.date_range("2024-01-01", periods=30, freq="D"))
+
+    aligned = align_timestamps(dates, PROJECT_TZ, "UTC")
+    again = align_timestamps(dates.copy(), PROJECT_TZ, "UTC")
+
+    assert (aligned.dt.hour == 0).all()
+    assert aligned.dt.date.tolist() == dates.dt.date.tolist()
+    assert _aligned_range.cache_info().hits == 1
+    assert align_timestamps(aligned, PROJECT_TZ) is aligned
+    pd.testing.assert_series_equal(aligned, again)
+
+def test_axes_across_pre_2019_dst():
+    """Teste de eixos em 2018 (meia-noite inexistente no início do horário de verão)."""
+    daily = make_timestamps("2018-01-01", "2018-12-31", "D")
+    hourly = make_timestamps("2018-01-01", "2018-12-31 23:00", "h")
+
+    assert len(daily) == 365 and daily.is_unique
+    assert daily.date.tolist() == pd.date_range("2018-01-01", "2018-12-31").date.tolist()
+    assert hourly.is_unique and hourly.is_monotonic_increasing
+    assert (np.diff(hourly.asi8) == np.diff(hourly.asi8)[0]).all()
+
+    consumption, _, _, _ = load_data_with_fallback("2018-10-01", "2018-11-30", use_real_data=False)
+    assert len(consumption) == 61
+
+def test_repeated_fall_back_hour(tmp_path):
+    """Teste da hora repetida no fim do horário de verão (ONS/CCEE horário, até 2019)."""
+    wall = pd.date_range("2018-02-17 20:00", "2018-02-18 02:00", freq="h")
+    naive = wall.insert(4, pd.Timestamp("2018-02-17 23:00"))
+    df = pd.DataFrame({"timestamp": naive, "load_mw": np.arange(len(naive), dtype=float)})
+    apply_dtypes(df, tz=PROJECT_TZ, source_tz=SOURCE_TZ["ons"])
+
+    assert df["timestamp"].is_unique
+    assert df["timestamp"].is_monotonic_increasing
+    assert IngestStore(tmp_path).merge("ons_SE", df) == len(naive)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
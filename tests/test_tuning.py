@@ -0,0 +1,67 @@
+"""Testes básicos para o ajuste de hiperparâmetros."""
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import load_app_config
+from src.models.evaluate import make_folds
+from src.models.tuning import rung_budgets, save_tuned, tune
+
+def test_folds_and_budgets():
+    """Teste das divisões de backtest e das rodadas do successive halving."""
+    folds = make_folds(100, 7, n_folds=4, min_train=30)
+    assert folds == ((93, 100), (86, 93), (79, 86), (72, 79))
+    assert make_folds(100, 7, n_folds=4, min_train=30) is folds
+    assert make_folds(20, 7, min_train=30) == ()
+    assert rung_budgets(6, eta=3) == [1, 2, 6]
+    assert rung_budgets(1) == [1]
+
+def test_tune_and_persist(tmp_path):
+    """Teste do ajuste (nunca pior que o padrão) e da gravação na configuração."""
+    dates = pd.date_range(start="2024-01-01", periods=200, freq="D")
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "timestamp": dates,
+        "consumption_kwh": 100 + 0.3 * np.arange(200) + rng.normal(0, 5, 200)
+    })
+
+    # eta alto: só o melhor trial da primeira rodada avança (além do padrão)
+    result = tune(df, "consumption", "baseline", n_trials=12, n_folds=3, horizon=7, eta=12)
+    assert result["algo"] == "baseline"
+    assert result["trials"] == 12
+    assert result["evaluations"] < result["trials"] * result["folds"]  # trials podados
+    # Padrão avaliado nas mesmas divisões da rodada final
+    default = result["leaderboard"].query("trial == 0").iloc[0]
+    assert default["folds"] == result["folds"]
+    assert result["score"] <= result["default_score"] == default["score"]
+
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("data:\n  region: SE\n", encoding="utf-8")
+    save_tuned(config_file, "SE", [result])
+    config = load_app_config(config_file)
+    assert config.model.resolve("SE", "consumption") == ("baseline", result["params"])
+    assert config.model.resolve("NE", "consumption") == ("prophet", {})
+
+def test_tune_physical():
+    """Teste de que o modelo físico de produção é ajustado (e não trocado pelo baseline)."""
+    dates = pd.date_range(start="2024-01-01", periods=160, freq="D")
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "timestamp": dates,
+        "production_kwh": 40 + 10 * np.sin(np.arange(160) / 29) + rng.normal(0, 3, 160)
+    })
+
+    result = tune(df, "production", "physical", n_trials=6, n_folds=2, horizon=7)
+    assert result["algo"] == "physical"
+    assert set(result["params"]) == {"window", "dc_ac_ratio"}  # coordenadas ficam com o site
+    assert result["score"] <= result["default_score"]
+    # Sem implementação para a série: baseline
+    assert tune(df.rename(columns={"production_kwh": "consumption_kwh"}), "consumption", "physical",
+                n_trials=2, n_folds=1, horizon=7)["algo"] == "baseline"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])